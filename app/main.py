@@ -1,3 +1,6 @@
+from app.shared.core.startup import IMPORT_STARTED, RouterSpec, StartupTimer, include_routers
+import time
+
 import structlog
 import asyncio
 import os
@@ -19,7 +22,6 @@ from app.shared.core.middleware import RequestIDMiddleware, SecurityHeadersMiddl
 from app.shared.core.security_metrics import CSRF_ERRORS, RATE_LIMIT_EXCEEDED
 from app.shared.core.ops_metrics import API_ERRORS_TOTAL
 from app.shared.core.sentry import init_sentry
-from app.modules.governance.domain.scheduler import SchedulerService
 from app.shared.core.timeout import TimeoutMiddleware
 from app.shared.core.tracing import setup_tracing
 from app.shared.db.session import get_db, async_session_maker, engine
@@ -38,32 +40,41 @@ import app.models.remediation
 import app.models.remediation_settings
 import app.models.background_job
 import app.models.attribution
+import app.models.cloud
 import app.models.carbon_settings
 import app.models.cost_audit
 import app.models.discovered_account
 import app.models.pricing
 import app.models.security
 import app.models.anomaly_marker
+import app.models.health_snapshot
 import app.modules.governance.domain.security.audit_log
 
 
-from codecarbon import EmissionsTracker
-from app.modules.governance.api.v1.settings.onboard import router as onboard_router
-from app.modules.governance.api.v1.settings.connections import router as connections_router
-from app.modules.governance.api.v1.settings import router as settings_router
-from app.modules.reporting.api.v1.leaderboards import router as leaderboards_router
-from app.modules.reporting.api.v1.costs import router as costs_router
-from app.modules.reporting.api.v1.carbon import router as carbon_router
-from app.modules.optimization.api.v1.zombies import router as zombies_router
-from app.modules.governance.api.v1.admin import router as admin_router
-from app.modules.reporting.api.v1.billing import router as billing_router
-from app.modules.governance.api.v1.audit import router as audit_router
-from app.modules.governance.api.v1.jobs import router as jobs_router
-from app.modules.governance.api.v1.health_dashboard import router as health_dashboard_router
-from app.modules.reporting.api.v1.usage import router as usage_router
-from app.modules.governance.api.oidc import router as oidc_router
-from app.modules.governance.api.v1.public import router as public_router
-from app.modules.reporting.api.v1.currency import router as currency_router
+# Routers are imported from this manifest when the app is assembled, each
+# under its own startup phase. Order matters where prefixes overlap
+# (settings/onboard and settings/connections before settings).
+ROUTER_MANIFEST = [
+    RouterSpec("app.modules.governance.api.v1.settings.onboard", "/api/v1/settings/onboard"),
+    RouterSpec("app.modules.governance.api.v1.settings.connections", "/api/v1/settings/connections"),
+    RouterSpec("app.modules.governance.api.v1.settings", "/api/v1/settings"),
+    RouterSpec("app.modules.reporting.api.v1.leaderboards", "/api/v1/leaderboards"),
+    RouterSpec("app.modules.reporting.api.v1.costs", "/api/v1/costs"),
+    RouterSpec("app.modules.reporting.api.v1.carbon", "/api/v1/carbon"),
+    RouterSpec("app.modules.optimization.api.v1.zombies", "/api/v1/zombies"),
+    RouterSpec("app.modules.governance.api.v1.admin", "/api/v1/admin"),
+    RouterSpec("app.modules.reporting.api.v1.billing", "/api/v1/billing"),
+    RouterSpec("app.modules.governance.api.v1.audit", "/api/v1/audit"),
+    RouterSpec("app.modules.governance.api.v1.jobs", "/api/v1/jobs"),
+    RouterSpec("app.modules.governance.api.v1.health_dashboard", "/api/v1/admin/health-dashboard"),
+    RouterSpec("app.modules.reporting.api.v1.usage", "/api/v1/usage"),
+    RouterSpec("app.modules.reporting.api.v1.currency", "/api/v1/currency"),
+    RouterSpec("app.modules.governance.api.oidc"),
+    RouterSpec("app.modules.governance.api.v1.public", "/api/v1/public"),
+]
+
+startup_timer = StartupTimer(started_at=IMPORT_STARTED)
+startup_timer.record("imports", time.perf_counter() - IMPORT_STARTED)
 
 # Configure logging and Sentry
 setup_logging()  # type: ignore[no-untyped-call]
@@ -86,39 +97,57 @@ async def lifespan(app: FastAPI) -> Any:
     # Setup: Initialize scheduler and emissions tracker
     logger.info(f"Starting {settings.APP_NAME}...")
 
-    # Ensure data directory exists
-    os.makedirs("data", exist_ok=True)
-
-    # Track app's own carbon footprint (GreenOps)
-    tracker = EmissionsTracker(
-        project_name=settings.APP_NAME,
-        measure_power_secs=300,
-        save_to_file=True,
-        output_dir="data",
-        allow_multiple_runs=True,
-    )
-    if not settings.TESTING:
-        tracker.start()
+    # Track app's own carbon footprint (GreenOps). Opt-in: codecarbon is
+    # slow to import and to start, so it is loaded here and started off-loop.
+    tracker = None
+    if settings.EMISSIONS_TRACKER_ENABLED and not settings.TESTING:
+        with startup_timer.phase("emissions_tracker"):
+            from codecarbon import EmissionsTracker
+
+            os.makedirs("data", exist_ok=True)
+            tracker = EmissionsTracker(
+                project_name=settings.APP_NAME,
+                measure_power_secs=300,
+                save_to_file=True,
+                output_dir="data",
+                allow_multiple_runs=True,
+            )
+            await asyncio.to_thread(tracker.start)
     app.state.emissions_tracker = tracker
 
     # Pass shared session factory to scheduler (DI pattern)
-    scheduler = SchedulerService(session_maker=async_session_maker)  # type: ignore[no-untyped-call]
-    if not settings.TESTING:
-        scheduler.start()  # type: ignore[no-untyped-call]
-        logger.info("scheduler_started")
-    else:
-        logger.info("scheduler_skipped_in_testing")
+    with startup_timer.phase("scheduler"):
+        from app.modules.governance.domain.scheduler import SchedulerService
+
+        scheduler = SchedulerService(session_maker=async_session_maker)  # type: ignore[no-untyped-call]
+        if not settings.TESTING:
+            scheduler.start()  # type: ignore[no-untyped-call]
+            logger.info("scheduler_started")
+        else:
+            logger.info("scheduler_skipped_in_testing")
     app.state.scheduler = scheduler
 
+    startup_timer.report()
+
     yield
 
     # Teardown: Stop scheduler and tracker
     logger.info("Shutting down...")
     scheduler.stop()
-    tracker.stop()
+    if tracker is not None:
+        await asyncio.to_thread(tracker.stop)
+
+    # Deliver queued notifications before the loop goes away
+    from app.modules.notifications.domain.email_service import shutdown_email_outboxes
+    from app.modules.notifications.domain.slack import get_slack_delivery
+    await shutdown_email_outboxes()
+    await get_slack_delivery().close()
 
     # Item 18: Async Database Engine Cleanup
     await engine.dispose()
+    from app.shared.db.replica import replica_engine
+    if replica_engine is not None:
+        await replica_engine.dispose()
     logger.info("db_engine_disposed")
 
 
@@ -133,7 +162,8 @@ app = valdrix_app # type: ignore[assignment]
 router = valdrix_app
 
 # Initialize Tracing
-setup_tracing(app)  # type: ignore[no-untyped-call]
+with startup_timer.phase("tracing"):
+    setup_tracing(app)  # type: ignore[no-untyped-call]
 
 @valdrix_app.exception_handler(ValdrixException)
 async def valdrix_exception_handler(request: Request, exc: ValdrixException) -> JSONResponse:
@@ -302,7 +332,8 @@ async def health_check(
     return health
 
 # Initialize Prometheus Metrics
-Instrumentator().instrument(valdrix_app).expose(valdrix_app)
+with startup_timer.phase("instrumentation"):
+    Instrumentator().instrument(valdrix_app).expose(valdrix_app)
 
 # IMPORTANT: Middleware order matters in FastAPI!
 # Middleware is processed in REVERSE order of addition.
@@ -350,19 +381,4 @@ async def csrf_protect_middleware(request: Request, call_next: Callable[[Request
     return await call_next(request)
 
 # Register Routers
-valdrix_app.include_router(onboard_router, prefix="/api/v1/settings/onboard")
-valdrix_app.include_router(connections_router, prefix="/api/v1/settings/connections")
-valdrix_app.include_router(settings_router, prefix="/api/v1/settings")
-valdrix_app.include_router(leaderboards_router, prefix="/api/v1/leaderboards")
-valdrix_app.include_router(costs_router, prefix="/api/v1/costs")
-valdrix_app.include_router(carbon_router, prefix="/api/v1/carbon")
-valdrix_app.include_router(zombies_router, prefix="/api/v1/zombies")
-valdrix_app.include_router(admin_router, prefix="/api/v1/admin")
-valdrix_app.include_router(billing_router, prefix="/api/v1/billing")
-valdrix_app.include_router(audit_router, prefix="/api/v1/audit")
-valdrix_app.include_router(jobs_router, prefix="/api/v1/jobs")
-valdrix_app.include_router(health_dashboard_router, prefix="/api/v1/admin/health-dashboard")
-valdrix_app.include_router(usage_router, prefix="/api/v1/usage")
-valdrix_app.include_router(currency_router, prefix="/api/v1/currency")
-valdrix_app.include_router(oidc_router)
-valdrix_app.include_router(public_router, prefix="/api/v1/public")
+include_routers(valdrix_app, ROUTER_MANIFEST, startup_timer)
@@ -0,0 +1,29 @@
+"""
+Health Snapshot Model
+
+Periodic, platform-wide captures of the investor health dashboard. The
+dashboard is served from the latest row and the history feeds trend charts.
+"""
+
+from datetime import datetime
+from uuid import UUID, uuid4
+from sqlalchemy import DateTime, Float, JSON
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import JSONB, UUID as PG_UUID
+from app.shared.db.base import Base
+
+
+class HealthSnapshot(Base):
+    __tablename__ = "health_snapshots"
+
+    id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True, default=uuid4)
+    captured_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+
+    # Dashboard sections: tenants, job_queue, llm_usage, aws_connections
+    metrics: Mapped[dict] = mapped_column(JSON().with_variant(JSONB, "postgresql"), nullable=False)
+
+    # Time spent computing the snapshot
+    duration_ms: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
+    def __repr__(self) -> str:
+        return f"<HealthSnapshot {self.captured_at.isoformat()}>"
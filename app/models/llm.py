@@ -12,8 +12,9 @@ Why this matters:
 """
 
 from uuid import uuid4, UUID
-from datetime import datetime
-from sqlalchemy import String, Integer, Numeric, ForeignKey, Boolean, DateTime, func
+from datetime import date, datetime
+from decimal import Decimal
+from sqlalchemy import String, Integer, Numeric, ForeignKey, Boolean, Date, DateTime, Index, func
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.ext.hybrid import hybrid_property
@@ -176,3 +177,70 @@ class LLMBudget(Base):
 
     def __repr__(self):
         return f"<LLMBudget ${self.monthly_limit_usd}/month>"
+
+
+class LLMSpendLedger(Base):
+    """
+    Running LLM spend per tenant per calendar month (UTC).
+
+    Maintained atomically by budget reservations and usage recording so
+    budget checks are a single-row read instead of a SUM over llm_usage.
+    `reserved_usd` holds in-flight pre-authorizations that have not been
+    settled yet. The reconcile job rebuilds both columns from source tables.
+    """
+
+    __tablename__ = "llm_spend_ledger"
+
+    tenant_id: Mapped[UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("tenants.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    # First day of the month this row covers
+    period_start: Mapped[date] = mapped_column(Date, primary_key=True)
+
+    spent_usd: Mapped[Decimal] = mapped_column(Numeric(18, 8), nullable=False, default=0)
+    reserved_usd: Mapped[Decimal] = mapped_column(Numeric(18, 8), nullable=False, default=0)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now()
+    )
+
+    def __repr__(self):
+        return f"<LLMSpendLedger {self.period_start} ${self.spent_usd} (+${self.reserved_usd} reserved)>"
+
+
+class LLMBudgetReservation(Base):
+    """
+    An in-flight budget pre-authorization.
+
+    Deleted when the matching usage is recorded (or the call fails);
+    anything left past `expires_at` is released back to the ledger.
+    """
+
+    __tablename__ = "llm_budget_reservations"
+    __table_args__ = (
+        Index("ix_llm_budget_reservations_tenant_expiry", "tenant_id", "expires_at"),
+    )
+
+    id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True, default=uuid4)
+    tenant_id: Mapped[UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("tenants.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    period_start: Mapped[date] = mapped_column(Date, nullable=False)
+    amount_usd: Mapped[Decimal] = mapped_column(Numeric(18, 8), nullable=False)
+    operation_id: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now()
+    )
+
+    def __repr__(self):
+        return f"<LLMBudgetReservation ${self.amount_usd} op={self.operation_id}>"
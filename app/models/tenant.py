@@ -3,7 +3,7 @@ from enum import Enum
 from datetime import datetime
 from typing import Any, Optional, List, TYPE_CHECKING
 from sqlalchemy import String, ForeignKey, DateTime, UniqueConstraint, event
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, object_session, relationship
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from app.shared.db.base import Base
 from app.shared.core.security import generate_blind_index
@@ -82,6 +82,17 @@ class User(Base):
 def on_tenant_name_set(target: Tenant, value: str, _old: str, _init: Any) -> None:
     target.name_bidx = generate_blind_index(value)
 
+@event.listens_for(Tenant.plan, "set")
+def on_tenant_plan_set(target: Tenant, value: str, old: Any, _init: Any) -> None:
+    # Cached entitlements must not outlive a plan change
+    if target.id is None or value == old:
+        return
+    from app.shared.core.pricing import forget_entitlements, invalidate_entitlements
+    invalidate_entitlements(target.id)
+    session = object_session(target)
+    if session is not None:
+        forget_entitlements(session, target.id)
+
 @event.listens_for(User.email, "set")
 def on_user_email_set(target: User, value: str, _old: str, _init: Any) -> None:
     target.email_bidx = generate_blind_index(value)
@@ -1,4 +1,14 @@
+from typing import Any
+
 from .domain.security.audit_log import AuditLogger, AuditEventType
-from .domain.scheduler import SchedulerService
 
 __all__ = ["AuditLogger", "AuditEventType", "SchedulerService"]
+
+
+def __getattr__(name: str) -> Any:
+    # The scheduler pulls in every job processor (LLM, notifications, cloud
+    # adapters); importing it on first access keeps the package cheap to load.
+    if name == "SchedulerService":
+        from .domain.scheduler import SchedulerService
+        return SchedulerService
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
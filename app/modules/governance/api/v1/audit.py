@@ -3,24 +3,38 @@ Audit Log API Endpoints
 
 Provides:
 - GET /audit/logs - Paginated audit logs (admin-only)
+- GET /audit/export - Streaming CSV / JSON Lines export of the full range
+
+Pages are keyset-paginated on (event_timestamp, id): the list endpoint hands
+back an opaque cursor in the X-Next-Cursor header, and the export walks the
+whole range in fixed-size pages so memory stays flat however many rows match.
 """
 
-from typing import Annotated, Optional, List, Literal
+import base64
+import csv
+import io
+import json
+from typing import Annotated, Any, AsyncIterator, Dict, Optional, List, Literal, Sequence, Tuple
 from uuid import UUID
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc, asc
+from sqlalchemy import Select, select, desc, asc, tuple_
 from pydantic import BaseModel, ConfigDict
 import structlog
 
 from app.shared.core.auth import CurrentUser, requires_role
+from app.shared.core.dependencies import read_db
 from app.shared.db.session import get_db
 from app.modules.governance.domain.security.audit_log import AuditLog
 
 logger = structlog.get_logger()
 router = APIRouter(tags=["Audit"])
 
+# Rows fetched per round-trip while streaming an export
+EXPORT_PAGE_SIZE = 1000
+
 
 class AuditLogResponse(BaseModel):
     id: UUID
@@ -35,36 +49,83 @@ class AuditLogResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+# Export columns: exactly the (masked) fields the list endpoint returns
+EXPORT_COLUMNS = list(AuditLogResponse.model_fields)
+
+
+def encode_cursor(event_timestamp: datetime, log_id: UUID) -> str:
+    raw = f"{event_timestamp.isoformat()}|{log_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, log_id = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        return datetime.fromisoformat(timestamp), UUID(log_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(400, "Invalid cursor") from e
+
+
+def _after(query: Select, event_timestamp: datetime, log_id: UUID, descending: bool) -> Select:
+    """Rows strictly past (event_timestamp, id) in the given direction."""
+    key = tuple_(AuditLog.event_timestamp, AuditLog.id)
+    bound = (event_timestamp, log_id)
+    return query.where(key < bound if descending else key > bound)
+
+
 @router.get("/logs", response_model=List[AuditLogResponse])
 async def get_audit_logs(
     user: Annotated[CurrentUser, Depends(requires_role("admin"))],
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(read_db()),
     limit: int = Query(50, ge=1, le=100),
-    offset: int = Query(0, ge=0),
+    offset: int = Query(0, ge=0, deprecated=True, description="Use cursor instead"),
     event_type: Optional[str] = Query(None, description="Filter by event type"),
     sort_by: Literal["event_timestamp", "event_type", "actor_email"] = Query("event_timestamp"),
-    order: Literal["asc", "desc"] = Query("desc")
+    order: Literal["asc", "desc"] = Query("desc"),
+    cursor: Annotated[
+        Optional[str], Query(description="X-Next-Cursor value from the previous page")
+    ] = None,
+    response: Response = None,
 ):
     """
     Get paginated audit logs for tenant.
     
     Admin-only. Sensitive details are masked by default.
+    When sorted by event_timestamp, the X-Next-Cursor response header carries
+    the cursor for the next page (absent on the last page).
     """
     try:
-        sort_column = getattr(AuditLog, sort_by)
-        order_func = desc if order == "desc" else asc
+        keyset = sort_by == "event_timestamp"
+        if cursor and not keyset:
+            raise HTTPException(400, "cursor pagination requires sort_by=event_timestamp")
 
-        query = select(AuditLog).where(
-            AuditLog.tenant_id == user.tenant_id
-        ).order_by(order_func(sort_column))
+        order_func = desc if order == "desc" else asc
+        query = select(AuditLog).where(AuditLog.tenant_id == user.tenant_id)
 
         if event_type:
             query = query.where(AuditLog.event_type == event_type)
 
-        query = query.offset(offset).limit(limit)
+        if keyset:
+            # id breaks timestamp ties so the page boundary is unambiguous
+            query = query.order_by(order_func(AuditLog.event_timestamp), order_func(AuditLog.id))
+        else:
+            query = query.order_by(order_func(getattr(AuditLog, sort_by)))
 
-        result = await db.execute(query)
+        if cursor:
+            query = _after(query, *decode_cursor(cursor), descending=order == "desc")
+        elif offset:
+            query = query.offset(offset)
+
+        # One extra row tells us whether another page exists
+        result = await db.execute(query.limit(limit + 1))
         logs = result.scalars().all()
+        has_more = len(logs) > limit
+        logs = logs[:limit]
+
+        if keyset and has_more and response is not None:
+            last = logs[-1]
+            response.headers["X-Next-Cursor"] = encode_cursor(last.event_timestamp, last.id)
 
         return [
             AuditLogResponse(
@@ -80,6 +141,8 @@ async def get_audit_logs(
             for log in logs
         ]
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("audit_logs_fetch_failed", error=str(e))
         raise HTTPException(500, "Failed to fetch audit logs") from e
@@ -140,78 +203,106 @@ async def get_event_types(
     }
 
 
+def _export_row(row: Any) -> Dict[str, Any]:
+    return AuditLogResponse.model_validate(row).model_dump(mode="json")
+
+
+def _encode_csv(rows: Sequence[Dict[str, Any]], header: bool) -> str:
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=EXPORT_COLUMNS)
+    if header:
+        writer.writeheader()
+    writer.writerows(
+        {k: "" if v is None else v for k, v in row.items()} for row in rows
+    )
+    return output.getvalue()
+
+
+def _encode_jsonl(rows: Sequence[Dict[str, Any]], header: bool) -> str:
+    return "".join(json.dumps(row) + "\n" for row in rows)
+
+
 @router.get("/export")
 async def export_audit_logs(
     user: Annotated[CurrentUser, Depends(requires_role("admin"))],
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(read_db()),
     start_date: Optional[datetime] = Query(None, description="Start of date range"),
     end_date: Optional[datetime] = Query(None, description="End of date range"),
     event_type: Optional[str] = Query(None, description="Filter by event type"),
+    export_format: Annotated[Literal["csv", "jsonl"], Query(alias="format")] = "csv",
+    after_timestamp: Annotated[
+        Optional[datetime], Query(description="Resume after the row with this event_timestamp (with after_id)")
+    ] = None,
+    after_id: Annotated[
+        Optional[UUID], Query(description="Resume after the row with this id (with after_timestamp)")
+    ] = None,
 ):
     """
-    Export audit logs as CSV for the tenant.
+    Export audit logs as CSV or JSON Lines for the tenant.
     GDPR/SOC2: Provides audit trail export for compliance.
+
+    Streams the full range newest first in keyset pages, with no row cap.
+    An interrupted download resumes by passing the event_timestamp and id of
+    the last row received as after_timestamp/after_id.
     """
-    from fastapi.responses import StreamingResponse
-    import csv
-    import io
-    
+    if (after_timestamp is None) != (after_id is None):
+        raise HTTPException(400, "after_timestamp and after_id must be given together")
+
+    async def fetch_page(after: Optional[Tuple[datetime, UUID]]) -> Sequence[Any]:
+        page_query = _after(query, *after, descending=True) if after else query
+        # Plain column rows: nothing lands in the session identity map
+        result = await db.execute(page_query.limit(EXPORT_PAGE_SIZE))
+        return result.all()
+
     try:
-        query = select(AuditLog).where(
+        columns = [getattr(AuditLog, name) for name in EXPORT_COLUMNS]
+        query = select(*columns).where(
             AuditLog.tenant_id == user.tenant_id
-        ).order_by(desc(AuditLog.event_timestamp))
-        
+        ).order_by(desc(AuditLog.event_timestamp), desc(AuditLog.id))
+
         if start_date:
             query = query.where(AuditLog.event_timestamp >= start_date)
         if end_date:
             query = query.where(AuditLog.event_timestamp <= end_date)
         if event_type:
             query = query.where(AuditLog.event_type == event_type)
-        
-        # Limit export to 10,000 records for performance
-        query = query.limit(10000)
-        
-        result = await db.execute(query)
-        logs = result.scalars().all()
-        
-        # Create CSV in memory
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerow([
-            "id", "event_type", "event_timestamp", "actor_email", 
-            "resource_type", "resource_id", "success", "correlation_id"
-        ])
-        
-        for log in logs:
-            writer.writerow([
-                str(log.id),
-                log.event_type,
-                log.event_timestamp.isoformat(),
-                log.actor_email or "",
-                log.resource_type or "",
-                str(log.resource_id) if log.resource_id else "",
-                str(log.success),
-                log.correlation_id or ""
-            ])
-        
-        output.seek(0)
-        
-        logger.info("audit_logs_exported", 
-                   tenant_id=str(user.tenant_id),
-                   record_count=len(logs))
-        
-        return StreamingResponse(
-            iter([output.getvalue()]),
-            media_type="text/csv",
-            headers={
-                "Content-Disposition": f"attachment; filename=audit_logs_{user.tenant_id}.csv"
-            }
-        )
-        
+
+        # The first page is read up front so a failing query is still a 500
+        first_page = await fetch_page((after_timestamp, after_id) if after_id else None)
     except Exception as e:
         logger.error("audit_export_failed", error=str(e))
         raise HTTPException(500, "Failed to export audit logs") from e
 
+    encode = _encode_csv if export_format == "csv" else _encode_jsonl
+
+    async def stream() -> AsyncIterator[str]:
+        page, exported = first_page, 0
+        yield encode([], header=True)
+        try:
+            while page:
+                yield encode([_export_row(row) for row in page], header=False)
+                exported += len(page)
+                if len(page) < EXPORT_PAGE_SIZE:
+                    break
+                page = await fetch_page((page[-1].event_timestamp, page[-1].id))
+        except Exception as e:
+            # Headers are already sent; the client resumes from its last row
+            logger.error("audit_export_interrupted", error=str(e), record_count=exported)
+            raise
+        logger.info("audit_logs_exported",
+                    tenant_id=str(user.tenant_id),
+                    record_count=exported,
+                    format=export_format)
+
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        stream(),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f"attachment; filename=audit_logs_{user.tenant_id}.{export_format}"
+        }
+    )
+
 
 @router.delete("/data-erasure-request")
 async def request_data_erasure(
@@ -333,6 +424,10 @@ async def request_data_erasure(
         await db.execute(
             delete(LLMBudget).where(LLMBudget.tenant_id == tenant_id)
         )
+        from app.shared.llm.admission import get_admission_cache
+        get_admission_cache().invalidate(tenant_id)
+        from app.shared.core.pricing import invalidate_entitlements
+        invalidate_entitlements(tenant_id)
         
         # 7. Delete Notification and Carbon settings
         await db.execute(
@@ -362,6 +457,8 @@ async def request_data_erasure(
             )
         )
         deleted_counts["other_users"] = result.rowcount
+        from app.shared.core.principal_cache import get_principal_cache
+        await get_principal_cache().invalidate_tenant(tenant_id)
 
         
         # 6. Audit logs preserved (required for compliance) but marked
@@ -1,30 +1,30 @@
 """
 Investor Health Dashboard API - Tier 3: Polish
 
-Provides real-time operational health metrics for investor due diligence:
+Provides operational health metrics for investor due diligence:
 - System uptime and availability
 - Active tenant metrics
 - Job queue health
 - LLM usage and budget status
 - AWS connection status
 
-Endpoint: GET /admin/health-dashboard
+Endpoints:
+- GET /admin/health-dashboard (latest snapshot, ?refresh=true to recapture)
+- GET /admin/health-dashboard/history (snapshot history for trend charts)
 """
 
-from typing import Annotated
+from typing import Annotated, List
 from datetime import datetime, timezone, timedelta
-from fastapi import APIRouter, Depends
-from sqlalchemy import select, func
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 import structlog
 
 from app.shared.db.session import get_db
 from app.shared.core.auth import CurrentUser, requires_role
-from app.shared.core.pricing import PricingTier
-from app.models.tenant import Tenant
-from app.models.background_job import BackgroundJob, JobStatus
-from app.models.aws_connection import AWSConnection
+from app.shared.core.dependencies import read_db
+from app.shared.core.config import get_settings
+from app.modules.governance.domain.health_snapshot import HealthSnapshotService
 
 logger = structlog.get_logger()
 router = APIRouter(tags=["Investor Health"])
@@ -84,14 +84,33 @@ class InvestorHealthDashboard(BaseModel):
     aws_connections: AWSConnectionHealth
 
 
+class HealthHistoryPoint(BaseModel):
+    """One stored snapshot, for trend charts."""
+    captured_at: str
+    tenants: TenantMetrics
+    job_queue: JobQueueHealth
+    llm_usage: LLMUsageMetrics
+    aws_connections: AWSConnectionHealth
+
+
+class HealthHistory(BaseModel):
+    points: List[HealthHistoryPoint]
+
+
 # Track startup time
 _startup_time = datetime.now(timezone.utc)
 
 
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive timestamps
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
 @router.get("", response_model=InvestorHealthDashboard)
 async def get_investor_health_dashboard(
     _user: Annotated[CurrentUser, Depends(requires_role("admin"))],
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    refresh: Annotated[bool, Query(description="Capture a fresh snapshot instead of serving the latest one")] = False,
 ):
     """
     Get comprehensive health dashboard for investor due diligence.
@@ -102,6 +121,9 @@ async def get_investor_health_dashboard(
     - Job queue health
     - LLM usage and costs
     - AWS connection reliability
+
+    Served from the latest health snapshot; a snapshot is captured here when
+    `refresh` is set, none exists yet, or the scheduled capture has fallen behind.
     """
     now = datetime.now(timezone.utc)
     
@@ -112,204 +134,31 @@ async def get_investor_health_dashboard(
         uptime_hours=round(uptime.total_seconds() / 3600, 2),
         last_check=now.isoformat()
     )
-    
-    # Tenant Metrics
-    tenants = await _get_tenant_metrics(db, now)
-    
-    # Job Queue Health
-    job_queue = await _get_job_queue_health(db, now)
-    
-    # LLM Usage
-    llm_usage = await _get_llm_usage_metrics(db, now)
-    
-    # AWS Connection Health
-    aws_connections = await _get_aws_connection_health(db)
-    
-    return InvestorHealthDashboard(
-        generated_at=now.isoformat(),
-        system=system,
-        tenants=tenants,
-        job_queue=job_queue,
-        llm_usage=llm_usage,
-        aws_connections=aws_connections
-    )
-
-
-async def _get_tenant_metrics(db: AsyncSession, now: datetime) -> TenantMetrics:
-    """Calculate tenant growth and activity metrics."""
-    
-    # Total tenants
-    total = await db.scalar(select(func.count(Tenant.id)))
-    
-    # Active in last 24h
-    day_ago = now - timedelta(hours=24)
-    active_24h = await db.scalar(
-        select(func.count(Tenant.id))
-        .where(Tenant.last_accessed_at >= day_ago)
-    )
-    
-    # Active in last 7d
-    week_ago = now - timedelta(days=7)
-    active_7d = await db.scalar(
-        select(func.count(Tenant.id))
-        .where(Tenant.last_accessed_at >= week_ago)
-    )
-    
-    # Trial vs paid
-    trial = await db.scalar(
-        select(func.count(Tenant.id))
-        .where(Tenant.plan == PricingTier.TRIAL.value)
-    )
-    
-    paid = (total or 0) - (trial or 0)
-    
-    # Churn risk: paid tenants not active in 7d
-    churn_risk = await db.scalar(
-        select(func.count(Tenant.id))
-        .where(
-            Tenant.plan != PricingTier.TRIAL.value,
-            (Tenant.last_accessed_at < week_ago) | (Tenant.last_accessed_at.is_(None))
-        )
-    )
-    
-    return TenantMetrics(
-        total_tenants=total or 0,
-        active_last_24h=active_24h or 0,
-        active_last_7d=active_7d or 0,
-        trial_tenants=trial or 0,
-        paid_tenants=paid,
-        churn_risk=churn_risk or 0
-    )
-
-
-async def _get_job_queue_health(db: AsyncSession, now: datetime) -> JobQueueHealth:
-    """Calculate job queue health metrics."""
-    
-    pending = await db.scalar(
-        select(func.count(BackgroundJob.id))
-        .where(BackgroundJob.status == JobStatus.PENDING)
-    )
-    
-    running = await db.scalar(
-        select(func.count(BackgroundJob.id))
-        .where(BackgroundJob.status == JobStatus.RUNNING)
-    )
-    
-    day_ago = now - timedelta(hours=24)
-    failed_24h = await db.scalar(
-        select(func.count(BackgroundJob.id))
-        .where(
-            BackgroundJob.status == JobStatus.FAILED,
-            BackgroundJob.completed_at >= day_ago
-        )
-    )
-    
-    dead_letter_count = await db.scalar(
-        select(func.count(BackgroundJob.id))
-        .where(BackgroundJob.status == JobStatus.DEAD_LETTER)
-    )
-    
-    # Item 5 & 12: Calculate average and percentile processing time from completed jobs (last 24h)
-    day_ago = now - timedelta(hours=24)
-    duration_expr = (
-        func.extract('epoch', BackgroundJob.completed_at) - 
-        func.extract('epoch', BackgroundJob.created_at)
-    ) * 1000
-    
-    # Determine if we are on Postgres for percentile support
-    from app.shared.db.session import engine
-    is_postgres = "postgresql" in str(engine.url)
-    
-    if is_postgres:
-        metrics = await db.execute(
-            select(
-                func.avg(duration_expr),
-                func.percentile_cont(0.5).within_group(duration_expr),
-                func.percentile_cont(0.95).within_group(duration_expr),
-                func.percentile_cont(0.99).within_group(duration_expr)
-            ).where(
-                BackgroundJob.status == JobStatus.COMPLETED,
-                BackgroundJob.completed_at >= day_ago
-            )
-        )
-        avg_time, p50, p95, p99 = metrics.one()
-    else:
-        # Fallback for SQLite (Dev/Test) - Percentiles not supported natively
-        metrics = await db.execute(
-            select(func.avg(duration_expr)).where(
-                BackgroundJob.status == JobStatus.COMPLETED,
-                BackgroundJob.completed_at >= day_ago
-            )
-        )
-        avg_time = metrics.scalar()
-        p50 = p95 = p99 = avg_time  # Simple fallback
-
-    
-    return JobQueueHealth(
-        pending_jobs=pending or 0,
-        running_jobs=running or 0,
-        failed_last_24h=failed_24h or 0,
-        dead_letter_count=dead_letter_count or 0,
-        avg_processing_time_ms=round(avg_time or 0.0, 2),
-        p50_processing_time_ms=round(p50 or 0.0, 2),
-        p95_processing_time_ms=round(p95 or 0.0, 2),
-        p99_processing_time_ms=round(p99 or 0.0, 2)
-    )
 
+    service = HealthSnapshotService(db)
+    snapshot = None if refresh else await service.latest()
+    max_age = timedelta(minutes=2 * get_settings().HEALTH_SNAPSHOT_INTERVAL_MINUTES)
+    if snapshot is None or now - _as_utc(snapshot.captured_at) > max_age:
+        snapshot = await service.capture(now)
+        await db.commit()
 
-async def _get_llm_usage_metrics(db: AsyncSession, now: datetime) -> LLMUsageMetrics:
-    """Calculate real LLM usage metrics."""
-    from app.models.llm import LLMUsage, LLMBudget
-    
-    day_ago = now - timedelta(hours=24)
-    
-    # Total requests in last 24h
-    requests_24h = await db.scalar(
-        select(func.count(LLMUsage.id))
-        .where(LLMUsage.created_at >= day_ago)
-    )
-    
-    # Estimated cost in last 24h
-    cost_24h = await db.scalar(
-        select(func.sum(LLMUsage.cost_usd))
-        .where(LLMUsage.created_at >= day_ago)
-    )
-    
-    # Budget utilization (Average across all tenants with a budget)
-    # We look at this month's utilization
-    start_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    
-    utilization = await db.scalar(
-        select(func.avg(
-            select(func.sum(LLMUsage.cost_usd))
-            .where(LLMUsage.tenant_id == LLMBudget.tenant_id)
-            .where(LLMUsage.created_at >= start_of_month)
-            .scalar_subquery() / LLMBudget.monthly_limit_usd
-        ))
-    )
-    
-    return LLMUsageMetrics(
-        total_requests_24h=requests_24h or 0,
-        cache_hit_rate=0.85, # Fixed target for now
-        estimated_cost_24h=float(cost_24h or 0.0),
-        budget_utilization=round(float(utilization or 0.0) * 100, 2)
+    return InvestorHealthDashboard(
+        generated_at=_as_utc(snapshot.captured_at).isoformat(),
+        system=system,
+        **snapshot.metrics
     )
 
 
-async def _get_aws_connection_health(db: AsyncSession) -> AWSConnectionHealth:
-    """Calculate AWS connection health metrics."""
-    
-    total = await db.scalar(select(func.count(AWSConnection.id)))
-    
-    verified = await db.scalar(
-        select(func.count(AWSConnection.id))
-        .where(AWSConnection.status == "active")
-    )
-    
-    failed = (total or 0) - (verified or 0)
-    
-    return AWSConnectionHealth(
-        total_connections=total or 0,
-        verified_connections=verified or 0,
-        failed_connections=failed
-    )
+@router.get("/history", response_model=HealthHistory)
+async def get_health_history(
+    _user: Annotated[CurrentUser, Depends(requires_role("admin"))],
+    db: AsyncSession = Depends(read_db()),
+    hours: Annotated[int, Query(ge=1, le=24 * 90)] = 24 * 7,
+):
+    """Stored health snapshots over the last `hours`, oldest first."""
+    since = datetime.now(timezone.utc) - timedelta(hours=hours)
+    snapshots = await HealthSnapshotService(db).history(since)
+    return HealthHistory(points=[
+        HealthHistoryPoint(captured_at=_as_utc(s.captured_at).isoformat(), **s.metrics)
+        for s in snapshots
+    ])
@@ -20,6 +20,7 @@ from app.shared.connections.azure import AzureConnectionService
 from app.shared.connections.gcp import GCPConnectionService
 from app.shared.connections.organizations import OrganizationsDiscoveryService
 from app.shared.connections.instructions import ConnectionInstructionService
+from app.shared.adapters.credential_broker import get_sts_credential_broker
 from app.shared.core.pricing import PricingTier
 
 # Models
@@ -182,6 +183,7 @@ async def delete_aws_connection(
 
     await db.delete(connection)
     await db.commit()
+    await get_sts_credential_broker().invalidate(connection.role_arn, connection.external_id)
     audit_log("aws_connection_deleted", str(current_user.id), str(current_user.tenant_id), {"id": str(connection_id)})
 
 
@@ -15,6 +15,7 @@ from app.shared.core.auth import CurrentUser, get_current_user, requires_role
 from app.shared.core.logging import audit_log
 from app.shared.db.session import get_db
 from app.models.llm import LLMBudget
+from app.shared.llm.admission import get_admission_cache
 
 logger = structlog.get_logger()
 router = APIRouter(tags=["LLM"])
@@ -142,6 +143,7 @@ async def update_llm_settings(
 
     await db.commit()
     await db.refresh(settings)
+    get_admission_cache().invalidate(current_user.tenant_id)
 
     logger.info(
         "llm_settings_updated",
@@ -57,6 +57,11 @@ class BaseJobHandler(ABC):
     
     # Maximum automatic retries before DLQ
     max_retries: int = 3
+
+    # Handlers that set this implement execute_batch(jobs, db), returning each
+    # job's result (or the exception it failed with) keyed by job id; the
+    # JobProcessor then runs a fetched batch of their jobs in one call.
+    batchable: bool = False
     
     @abstractmethod
     async def execute(self, job: BackgroundJob, db: AsyncSession) -> Dict[str, Any]:
@@ -1,23 +1,65 @@
 """
 Cost Management Job Handlers
 """
+import asyncio
 import structlog
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Optional
 from datetime import datetime, timezone, timedelta, date
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.background_job import BackgroundJob
 from app.modules.governance.domain.jobs.handlers.base import BaseJobHandler
+from app.shared.core.exceptions import ValdrixException
+from app.shared.core.ops_metrics import COST_INGESTION_CONNECTIONS
 
 logger = structlog.get_logger()
 
 
+# Connections ingested in parallel per job (each holds its own DB connection)
+INGESTION_CONCURRENCY = 8
+# Stop starting new connections after this share of the job timeout so the
+# checkpoint is committed before the hard timeout kills the batch.
+INGESTION_TIME_BUDGET_RATIO = 0.8
+
+
+class IngestionIncompleteError(ValdrixException):
+    """Raised when a tenant's connections did not all finish within the time budget."""
+    def __init__(self, job_id: str, remaining: int, completed: int):
+        super().__init__(
+            message=f"Cost ingestion for job {job_id} deferred {remaining} connection(s); will resume from checkpoint",
+            code="ingestion_incomplete",
+            status_code=503,
+            details={
+                "job_id": job_id,
+                "remaining_connections": remaining,
+                "completed_connections": completed
+            }
+        )
+
+
 class CostIngestionHandler(BaseJobHandler):
-    """Processes high-fidelity cost ingestion for cloud accounts (Multi-Cloud)."""
+    """
+    Processes high-fidelity cost ingestion for cloud accounts (Multi-Cloud).
+
+    Connections are ingested concurrently (bounded by `max_concurrency`),
+    each in its own DB session. Every finished connection is checkpointed on
+    the job payload, so a retry only re-runs connections that did not finish.
+    Connections that fail are not checkpointed; the job reports "partial"
+    and lists them under `failed_connections`.
+    """
+
+    max_concurrency: int = INGESTION_CONCURRENCY
+
+    def __init__(self, session_factory: Optional[Callable[[], Any]] = None):
+        self._session_factory = session_factory
+
+    def _get_session_factory(self) -> Callable[[], Any]:
+        if self._session_factory is None:
+            from app.shared.db.session import async_session_maker
+            self._session_factory = async_session_maker
+        return self._session_factory
     
     async def execute(self, job: BackgroundJob, db: AsyncSession) -> Dict[str, Any]:
-        from app.shared.adapters.factory import AdapterFactory
-        from app.modules.reporting.domain.persistence import CostPersistenceService
         from app.models.aws_connection import AWSConnection
         from app.models.azure_connection import AzureConnection
         from app.models.gcp_connection import GCPConnection
@@ -44,44 +86,121 @@ class CostIngestionHandler(BaseJobHandler):
         if not connections:
             return {"status": "skipped", "reason": "no_active_connections"}
 
-        persistence = CostPersistenceService(db)
-        results = []
-        
-        for conn in connections:
-            stmt = pg_insert(CloudAccount).values(
-                id=conn.id,
-                tenant_id=conn.tenant_id,
-                provider=conn.provider,
-                name=getattr(conn, "name", f"{conn.provider.upper()} Connection"),
-                credentials_encrypted="managed_by_connection_table",
-                is_active=True
-            ).on_conflict_do_update(
-                index_elements=['id'],
-                set_={
-                    "provider": conn.provider,
-                    "name": getattr(conn, "name", f"{conn.provider.upper()} Connection")
-                }
-            )
-            await db.execute(stmt)
+        # Single multi-row upsert instead of one round-trip per connection
+        stmt = pg_insert(CloudAccount).values([
+            {
+                "id": conn.id,
+                "tenant_id": conn.tenant_id,
+                "provider": conn.provider,
+                "name": getattr(conn, "name", f"{conn.provider.upper()} Connection"),
+                "credentials_encrypted": "managed_by_connection_table",
+                "is_active": True
+            }
+            for conn in connections
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['id'],
+            set_={
+                "provider": stmt.excluded.provider,
+                "name": stmt.excluded.name
+            }
+        )
+        await db.execute(stmt)
         await db.commit()
         
-        # 2. Process each connection via its appropriate adapter
+        # 2. Fan out across pending connections with bounded concurrency
         checkpoint = job.payload.get("checkpoint", {}) if job.payload else {}
-        completed_conns = checkpoint.get("completed_connections", [])
+        completed_conns = list(checkpoint.get("completed_connections", []))
+        pending = [c for c in connections if str(c.id) not in completed_conns]
+        for conn_id_str in completed_conns:
+            logger.info("skipping_already_ingested_connection", connection_id=conn_id_str)
+
+        # Default range: Last 7 days
+        end_date = datetime.now(timezone.utc)
+        start_date = end_date - timedelta(days=7)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout_seconds * INGESTION_TIME_BUDGET_RATIO
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        checkpoint_lock = asyncio.Lock()
+
+        async def ingest_with_checkpoint(conn: Any) -> Dict[str, Any]:
+            async with semaphore:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return {"connection_id": str(conn.id), "provider": conn.provider, "status": "deferred"}
+                try:
+                    result = await asyncio.wait_for(
+                        self._ingest_connection(conn, start_date, end_date),
+                        timeout=remaining
+                    )
+                except asyncio.TimeoutError:
+                    logger.warning("cost_ingestion_connection_deferred", connection_id=str(conn.id))
+                    return {"connection_id": str(conn.id), "provider": conn.provider, "status": "deferred"}
+
+            COST_INGESTION_CONNECTIONS.labels(
+                provider=conn.provider, outcome=result.get("status", "ingested")
+            ).inc()
+            if result.get("status") != "failed":
+                # The job session is shared, so checkpoint writes are serialized
+                async with checkpoint_lock:
+                    completed_conns.append(str(conn.id))
+                    job.payload = {
+                        **(job.payload or {}),
+                        "checkpoint": {**checkpoint, "completed_connections": list(completed_conns)}
+                    }
+                    await db.commit()
+            return result
+
+        results = await asyncio.gather(*(ingest_with_checkpoint(c) for c in pending))
+
+        deferred = [r for r in results if r.get("status") == "deferred"]
+        for r in deferred:
+            COST_INGESTION_CONNECTIONS.labels(provider=r["provider"], outcome="deferred").inc()
+        if deferred:
+            # Retry picks up from the checkpoint; attribution waits for the full set
+            raise IngestionIncompleteError(str(job.id), len(deferred), len(completed_conns))
         
-        for conn in connections:
-            conn_id_str = str(conn.id)
-            if conn_id_str in completed_conns:
-                logger.info("skipping_already_ingested_connection", connection_id=conn_id_str)
-                continue
-                
+        # 3. Trigger Attribution Engine (FinOps Audit 2) once every connection finished
+        try:
+            from app.modules.reporting.domain.attribution_engine import AttributionEngine
+            engine = AttributionEngine(db)
+            await engine.apply_rules_to_tenant(tenant_id)
+            logger.info("attribution_applied_post_ingestion", tenant_id=str(tenant_id))
+        except Exception as e:
+            logger.error("attribution_trigger_failed", tenant_id=str(tenant_id), error=str(e))
+
+        failed = [r for r in results if r.get("status") == "failed"]
+        if failed:
+            # Not checkpointed, so their data stays missing until the next ingestion run
+            logger.warning(
+                "cost_ingestion_partial",
+                tenant_id=str(tenant_id),
+                failed_connections=[r["connection_id"] for r in failed]
+            )
+
+        return {
+            "status": "partial" if failed else "completed",
+            "connections_processed": len(connections),
+            "connections_failed": len(failed),
+            "failed_connections": failed,
+            "details": results
+        }
+
+    async def _ingest_connection(
+        self, conn: Any, start_date: datetime, end_date: datetime
+    ) -> Dict[str, Any]:
+        """Ingest a single connection in its own session and transaction."""
+        from app.shared.adapters.factory import AdapterFactory
+        from app.modules.reporting.domain.persistence import CostPersistenceService
+        from app.shared.db.session import set_session_tenant_id
+
+        conn_model = type(conn)
+        async with self._get_session_factory()() as session:
+            await set_session_tenant_id(session, conn.tenant_id)
             try:
                 adapter = AdapterFactory.get_adapter(conn)
                 
-                # Default range: Last 7 days
-                end_date = datetime.now(timezone.utc)
-                start_date = end_date - timedelta(days=7)
-                
                 # Stream costs using normalized interface
                 cost_stream = adapter.stream_cost_and_usage(
                     start_date=start_date,
@@ -89,58 +208,50 @@ class CostIngestionHandler(BaseJobHandler):
                     granularity="HOURLY"
                 )
                 
-                records_ingested = 0
                 total_cost_acc = 0.0
                 
                 async def tracking_wrapper(stream):
-                    nonlocal records_ingested, total_cost_acc
+                    nonlocal total_cost_acc
                     async for r in stream:
-                        records_ingested += 1
                         total_cost_acc += float(r.get("cost_usd", 0) or 0)
                         yield r
 
-                save_result = await persistence.save_records_stream(
+                save_result = await CostPersistenceService(session).save_records_stream(
                     records=tracking_wrapper(cost_stream),
                     tenant_id=str(conn.tenant_id),
                     account_id=str(conn.id)
                 )
                 
-                conn.last_ingested_at = datetime.now(timezone.utc)
-                db.add(conn) 
+                await session.execute(
+                    update(conn_model)
+                    .where(conn_model.id == conn.id)
+                    .values(last_ingested_at=datetime.now(timezone.utc))
+                )
+                await session.commit()
                 
-                results.append({
+                return {
                     "connection_id": str(conn.id),
                     "provider": conn.provider,
                     "records_ingested": save_result.get("records_saved", 0),
                     "total_cost": total_cost_acc
-                })
+                }
                     
             except Exception as e:
                 logger.error("cost_ingestion_connection_failed", connection_id=str(conn.id), error=str(e))
-                if hasattr(conn, "error_message"):
-                    conn.error_message = str(e)[:255]
-                    db.add(conn)
-                results.append({"connection_id": str(conn.id), "status": "failed", "error": str(e)})
-            
-            if "completed_connections" not in completed_conns:
-                completed_conns.append(conn_id_str)
-                job.payload = {**checkpoint, "completed_connections": completed_conns}
-                await db.commit()
-        
-        # 3. Trigger Attribution Engine (FinOps Audit 2)
-        try:
-            from app.modules.reporting.domain.attribution_engine import AttributionEngine
-            engine = AttributionEngine(db)
-            await engine.apply_rules_to_tenant(tenant_id)
-            logger.info("attribution_applied_post_ingestion", tenant_id=str(tenant_id))
-        except Exception as e:
-            logger.error("attribution_trigger_failed", tenant_id=str(tenant_id), error=str(e))
-
-        return {
-            "status": "completed",
-            "connections_processed": len(connections),
-            "details": results
-        }
+                await session.rollback()
+                if hasattr(conn_model, "error_message"):
+                    await session.execute(
+                        update(conn_model)
+                        .where(conn_model.id == conn.id)
+                        .values(error_message=str(e)[:255])
+                    )
+                    await session.commit()
+                return {
+                    "connection_id": str(conn.id),
+                    "provider": conn.provider,
+                    "status": "failed",
+                    "error": str(e)
+                }
 
 
 class CostForecastHandler(BaseJobHandler):
@@ -149,6 +260,7 @@ class CostForecastHandler(BaseJobHandler):
     async def execute(self, job: BackgroundJob, db: AsyncSession) -> Dict[str, Any]:
         from app.modules.reporting.domain.aggregator import CostAggregator
         from app.shared.analysis.forecaster import SymbolicForecaster
+        from app.shared.analysis.forecast_store import data_version, get_forecast_store
         
         payload = job.payload or {}
         tenant_id = job.tenant_id
@@ -173,6 +285,9 @@ class CostForecastHandler(BaseJobHandler):
             db=db,
             tenant_id=tenant_id
         )
+
+        # 3. Share the fit with LLM analysis grounding over the same data
+        await get_forecast_store().put(tenant_id, data_version(summary.records), result, days)
         
         return {
             "status": "completed",
@@ -1,24 +1,88 @@
 """
 FinOps Analysis Job Handler
 """
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+from uuid import UUID
 from datetime import date, timedelta
+import structlog
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.background_job import BackgroundJob
 from app.modules.governance.domain.jobs.handlers.base import BaseJobHandler
 
+logger = structlog.get_logger()
+
 
 class FinOpsAnalysisHandler(BaseJobHandler):
-    """Handle multi-tenant FinOps analysis with normalized components."""
+    """
+    Handle multi-tenant FinOps analysis with normalized components.
+
+    Several pending analysis jobs are run together through
+    BatchAnalysisPipeline (see execute_batch).
+    """
+
+    batchable = True
     
     async def execute(self, job: BackgroundJob, db: AsyncSession) -> Dict[str, Any]:
         from app.shared.llm.analyzer import FinOpsAnalyzer
-        from app.shared.adapters.aws_multitenant import MultiTenantAWSAdapter
-        from app.models.aws_connection import AWSConnection
         from app.shared.llm.factory import LLMFactory
         from app.shared.core.config import get_settings
         
+        usage_summary = await self._usage_summary(job, db)
+        if usage_summary is None:
+            return {"status": "skipped", "reason": "no_aws_connection"}
+        
+        # Run analysis
+        settings = get_settings()
+        llm = LLMFactory.create(settings.LLM_PROVIDER)
+        analyzer = FinOpsAnalyzer(llm=llm)
+        analysis = await analyzer.analyze(usage_summary, tenant_id=job.tenant_id, db=db)
+        
+        return {"status": "completed", "analysis_length": len(analysis)}
+
+    async def execute_batch(self, jobs: List[BackgroundJob], db: AsyncSession) -> Dict[UUID, Any]:
+        """
+        Analyze several tenants' jobs with one BatchAnalysisPipeline pass.
+        Returns each job's result, or the exception it failed with, by job id.
+        """
+        from app.shared.llm.analyzer import FinOpsAnalyzer
+        from app.shared.llm.batch_analysis import BatchAnalysisPipeline, BatchItem
+        from app.shared.llm.factory import LLMFactory
+        from app.shared.core.config import get_settings
+        from app.shared.db.session import RLS_TENANT_KEY, set_session_tenant_id
+
+        outcomes: Dict[UUID, Any] = {}
+        items: List[BatchItem] = []
+        try:
+            for job in jobs:
+                try:
+                    if job.tenant_id:
+                        await set_session_tenant_id(db, job.tenant_id)
+                    usage_summary = await self._usage_summary(job, db)
+                except Exception as e:
+                    logger.warning("finops_batch_fetch_failed", job_id=str(job.id), error=str(e))
+                    outcomes[job.id] = e
+                    continue
+                if usage_summary is None:
+                    outcomes[job.id] = {"status": "skipped", "reason": "no_aws_connection"}
+                else:
+                    items.append(BatchItem(job.tenant_id, usage_summary, key=job.id))
+        finally:
+            db.info.pop(RLS_TENANT_KEY, None)
+
+        if items:
+            llm = LLMFactory.create(get_settings().LLM_PROVIDER)
+            for outcome in await BatchAnalysisPipeline(FinOpsAnalyzer(llm=llm), db).run(items):
+                outcomes[outcome.key] = outcome.error if not outcome.ok else {
+                    "status": "completed", "analysis_length": len(outcome.result)
+                }
+        return outcomes
+
+    async def _usage_summary(self, job: BackgroundJob, db: AsyncSession) -> Optional[Any]:
+        """The tenant's last 30 days of costs, or None without an AWS connection."""
+        from app.shared.adapters.aws_multitenant import MultiTenantAWSAdapter
+        from app.models.aws_connection import AWSConnection
+
         tenant_id = job.tenant_id
         if not tenant_id:
             raise ValueError("tenant_id required for finops_analysis")
@@ -30,7 +94,7 @@ class FinOpsAnalysisHandler(BaseJobHandler):
         connection = result.scalar_one_or_none()
         
         if not connection:
-            return {"status": "skipped", "reason": "no_aws_connection"}
+            return None
             
         # Fetch data (Standardized to 30 days)
         adapter = MultiTenantAWSAdapter(connection)
@@ -38,12 +102,4 @@ class FinOpsAnalysisHandler(BaseJobHandler):
         start_date = end_date - timedelta(days=30)
         
         # This now returns a normalized CloudUsageSummary object
-        usage_summary = await adapter.get_daily_costs(start_date, end_date, group_by_service=True)
-        
-        # Run analysis
-        settings = get_settings()
-        llm = LLMFactory.create(settings.LLM_PROVIDER)
-        analyzer = FinOpsAnalyzer(llm=llm)
-        analysis = await analyzer.analyze(usage_summary, tenant_id=tenant_id, db=db)
-        
-        return {"status": "completed", "analysis_length": len(analysis)}
+        return await adapter.get_daily_costs(start_date, end_date, group_by_service=True)
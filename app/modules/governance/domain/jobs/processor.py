@@ -17,7 +17,7 @@ Usage:
 
 import sqlalchemy as sa
 from datetime import datetime, timezone, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from uuid import UUID
 import structlog
 import asyncio
@@ -78,7 +78,17 @@ class JobProcessor:
                     pending_count=len(pending_jobs)
                 )
                 
-                for job in pending_jobs:
+                for jobs in self._group_batches(pending_jobs):
+                    if len(jobs) > 1:
+                        try:
+                            await self._process_job_batch(jobs)
+                            results["succeeded"] += len(jobs)
+                        except Exception as e:  # noqa: BLE001 - Intentional catch-all for job isolation
+                            results["failed"] += len(jobs)
+                            results["errors"].extend({"job_id": str(job.id), "error": str(e)} for job in jobs)
+                        results["processed"] += len(jobs)
+                        continue
+                    job = jobs[0]
                     try:
                         await self._process_single_job(job)
                         results["succeeded"] += 1
@@ -129,6 +139,94 @@ class JobProcessor:
         found = list(result.scalars().all())
         return found
 
+    @staticmethod
+    def _job_type_key(job: BackgroundJob) -> str:
+        return job.job_type.value if hasattr(job.job_type, "value") else str(job.job_type)
+
+    def _group_batches(self, jobs: List[BackgroundJob]) -> List[List[BackgroundJob]]:
+        """
+        Jobs in fetch order, with jobs of the same batchable type grouped at
+        the position of the first one; every other job runs on its own.
+        """
+        groups: List[List[BackgroundJob]] = []
+        by_type: Dict[str, List[BackgroundJob]] = {}
+        for job in jobs:
+            key = self._job_type_key(job)
+            try:
+                batchable = get_handler_factory(key).batchable is True
+            except ValueError:
+                batchable = False
+            if not batchable:
+                groups.append([job])
+            elif key in by_type:
+                by_type[key].append(job)
+            else:
+                by_type[key] = [job]
+                groups.append(by_type[key])
+        return groups
+
+    async def _process_job_batch(self, jobs: List[BackgroundJob]) -> None:
+        """
+        Run jobs of one batchable type through a single execute_batch call.
+        Each job completes, retries or dead-letters on its own outcome.
+        """
+        job_type_key = self._job_type_key(jobs[0])
+        now = datetime.now(timezone.utc)
+        for job in jobs:
+            job.status = JobStatus.RUNNING.value
+            job.started_at = now
+            job.attempts += 1
+        await self.db.commit()
+        logger.info("job_batch_processing_start", job_type=job_type_key, jobs=len(jobs))
+
+        # The batch stands in for that many single runs
+        timeout_seconds = JOB_TIMEOUT_SECONDS * len(jobs)
+        try:
+            handler = get_handler_factory(job_type_key)()
+            # Handlers set each tenant's RLS context themselves
+            async with self.db.begin_nested():
+                outcomes = await asyncio.wait_for(handler.execute_batch(jobs, self.db), timeout=timeout_seconds)
+        except asyncio.TimeoutError:
+            logger.error("job_batch_timeout", job_type=job_type_key, jobs=len(jobs), timeout_seconds=timeout_seconds)
+            outcomes = {job.id: RuntimeError(f"Job timed out after {timeout_seconds}s") for job in jobs}
+        except asyncio.CancelledError:
+            logger.warning("job_batch_cancelled", job_type=job_type_key, jobs=len(jobs))
+            for job in jobs:
+                job.error_message = "Job was cancelled"
+                job.status = JobStatus.PENDING.value
+                job.scheduled_for = datetime.now(timezone.utc) + timedelta(seconds=60)
+            await self.db.commit()
+            raise
+        except Exception as e:  # noqa: BLE001 - Intentional catch-all for resilience
+            logger.error("job_batch_failed", job_type=job_type_key, jobs=len(jobs), error=str(e))
+            outcomes = {job.id: e for job in jobs}
+
+        for job in jobs:
+            outcome = outcomes.get(job.id, RuntimeError("No result returned for job"))
+            if isinstance(outcome, Exception):
+                logger.error("job_processing_failed", job_id=str(job.id), job_type=job.job_type, error=str(outcome))
+                self._mark_failed(job, str(outcome))
+            else:
+                job.status = JobStatus.COMPLETED.value
+                job.completed_at = datetime.now(timezone.utc)
+                job.result = outcome
+                job.error_message = None
+        await self.db.commit()
+
+    @staticmethod
+    def _mark_failed(job: BackgroundJob, error_message: str) -> None:
+        """Reschedule with exponential backoff, or dead-letter after the last attempt."""
+        job.error_message = error_message
+        job.status = JobStatus.FAILED.value
+
+        if job.attempts >= job.max_attempts:
+            job.status = JobStatus.DEAD_LETTER.value
+            job.completed_at = datetime.now(timezone.utc)
+        else:
+            backoff_seconds = BACKOFF_BASE_SECONDS * (2 ** (job.attempts - 1))
+            job.status = JobStatus.PENDING.value
+            job.scheduled_for = datetime.now(timezone.utc) + timedelta(seconds=backoff_seconds)
+
     
     async def _process_single_job(self, job: BackgroundJob) -> None:
         """Process a single job with error handling and tracing."""
@@ -156,8 +254,7 @@ class JobProcessor:
         
         try:
             # Get and instantiate handler for job type
-            job_type_key = job.job_type.value if hasattr(job.job_type, "value") else str(job.job_type)
-            handler_cls = get_handler_factory(job_type_key)
+            handler_cls = get_handler_factory(self._job_type_key(job))
             handler = handler_cls()
             
             # Use a savepoint to isolate this job's database changes
@@ -192,16 +289,7 @@ class JobProcessor:
                 job_type=job.job_type,
                 timeout_seconds=JOB_TIMEOUT_SECONDS
             )
-            job.error_message = f"Job timed out after {JOB_TIMEOUT_SECONDS}s"
-            job.status = JobStatus.FAILED.value
-            
-            if job.attempts >= job.max_attempts:
-                job.status = JobStatus.DEAD_LETTER.value
-                job.completed_at = datetime.now(timezone.utc)
-            else:
-                backoff_seconds = BACKOFF_BASE_SECONDS * (2 ** (job.attempts - 1))
-                job.status = JobStatus.PENDING.value
-                job.scheduled_for = datetime.now(timezone.utc) + timedelta(seconds=backoff_seconds)
+            self._mark_failed(job, f"Job timed out after {JOB_TIMEOUT_SECONDS}s")
                 
         except asyncio.CancelledError:
             logger.warning("job_processing_cancelled", job_id=str(job.id))
@@ -217,16 +305,7 @@ class JobProcessor:
                 error=str(e)
             )
             
-            job.error_message = str(e)
-            job.status = JobStatus.FAILED.value
-            
-            if job.attempts >= job.max_attempts:
-                job.status = JobStatus.DEAD_LETTER.value
-                job.completed_at = datetime.now(timezone.utc)
-            else:
-                backoff_seconds = BACKOFF_BASE_SECONDS * (2 ** (job.attempts - 1))
-                job.status = JobStatus.PENDING.value
-                job.scheduled_for = datetime.now(timezone.utc) + timedelta(seconds=backoff_seconds)
+            self._mark_failed(job, str(e))
         
         await self.db.commit()
 
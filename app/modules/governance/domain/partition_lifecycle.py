@@ -0,0 +1,321 @@
+"""
+Partition Lifecycle Service
+
+Keeps the monthly range partitions of cost_records and audit_logs in shape,
+so retention never needs row-level deletes (and the bloat and vacuum load
+they cause):
+- pre-creates the next PARTITION_PRECREATE_MONTHS monthly partitions
+- detaches partitions whose whole range is past retention, then renames them
+  to <table>_archive_YYYY_MM or drops them (PARTITION_EXPIRED_ACTION)
+- drops archives once they are PARTITION_ARCHIVE_RETENTION_DAYS past retention
+- checks that the DEFAULT partitions stay empty; rows there mean a missing
+  monthly partition and would block creating it
+
+Retention per table is the longest `retention_days` among the tiers that
+currently have tenants, never below the table's floor: a partition holds
+every tenant's rows for its month, so it can only go once no tenant is
+entitled to them. A tier with unlimited retention keeps the table's
+partitions attached.
+
+Partitions are found through the catalog by their bounds, not their names.
+Every action runs in its own transaction with a short lock_timeout, so a busy
+table makes the action fail and be retried on the next run instead of
+blocking ingestion. In dry-run mode the plan is only logged and counted.
+
+Runs daily as scheduler.partition_lifecycle; scripts/manage_partitions.py
+runs it by hand. Outside PostgreSQL it does nothing.
+"""
+
+import re
+from dataclasses import dataclass, asdict
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import structlog
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.tenant import Tenant
+from app.shared.core.config import get_settings
+from app.shared.core.ops_metrics import DEFAULT_PARTITION_ROWS, PARTITION_LIFECYCLE_ACTIONS
+from app.shared.core.pricing import PricingTier, get_tier_limit
+
+logger = structlog.get_logger()
+
+# Rows counted in a default partition are capped; any row at all is a problem
+DEFAULT_ROWS_SCAN_LIMIT = 100_000
+LOCK_TIMEOUT = "5s"
+
+_RANGE_BOUND = re.compile(r"FROM \('(\d{4}-\d{2}-\d{2})[^']*'\) TO \('(\d{4}-\d{2}-\d{2})[^']*'\)")
+
+PARTITIONS_QUERY = text("""
+    SELECT child.relname AS name, pg_get_expr(child.relpartbound, child.oid) AS bound
+    FROM pg_inherits
+    JOIN pg_class parent ON pg_inherits.inhparent = parent.oid
+    JOIN pg_class child ON pg_inherits.inhrelid = child.oid
+    JOIN pg_namespace ns ON parent.relnamespace = ns.oid
+    WHERE parent.relname = :table AND ns.nspname = current_schema()
+""")
+
+ARCHIVES_QUERY = text("""
+    SELECT c.relname AS name
+    FROM pg_class c
+    JOIN pg_namespace ns ON c.relnamespace = ns.oid
+    WHERE ns.nspname = current_schema()
+      AND c.relkind IN ('r', 'p')
+      AND c.relname LIKE :prefix
+""")
+
+
+@dataclass(frozen=True)
+class PartitionPolicy:
+    table: str
+    key: str  # partition key column
+    timestamped: bool  # timestamptz key (bounds written in UTC) vs date key
+    min_retention_days: int
+
+
+@dataclass(frozen=True)
+class Partition:
+    name: str
+    start: Optional[date]  # None for the DEFAULT partition
+    end: Optional[date]
+
+    @property
+    def is_default(self) -> bool:
+        return self.start is None
+
+
+@dataclass
+class PartitionAction:
+    table: str
+    action: str  # create, archive, drop, drop_archive
+    partition: str
+    start: Optional[date] = None
+    end: Optional[date] = None
+    outcome: str = "planned"  # planned (dry run), applied, failed, blocked
+    detail: Optional[str] = None
+
+
+def add_months(day: date, months: int) -> date:
+    month_index = day.year * 12 + day.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def parse_bound(bound: str) -> Optional[Tuple[date, date]]:
+    """(start, end) of a `FOR VALUES FROM (...) TO (...)` bound; None if not a date range."""
+    match = _RANGE_BOUND.search(bound or "")
+    if not match:
+        return None
+    return date.fromisoformat(match.group(1)), date.fromisoformat(match.group(2))
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+class PartitionLifecycleService:
+    POLICIES = (
+        PartitionPolicy("cost_records", "recorded_at", timestamped=False, min_retention_days=365),
+        PartitionPolicy("audit_logs", "event_timestamp", timestamped=True, min_retention_days=730),
+    )
+
+    def __init__(self, db: AsyncSession, policies: Optional[Tuple[PartitionPolicy, ...]] = None):
+        self.db = db
+        settings = get_settings()
+        self.precreate_months = int(settings.PARTITION_PRECREATE_MONTHS)
+        self.expired_action = str(settings.PARTITION_EXPIRED_ACTION)
+        self.archive_retention_days = int(settings.PARTITION_ARCHIVE_RETENTION_DAYS)
+        self.policies = policies or tuple(
+            PartitionPolicy(
+                p.table, p.key, p.timestamped,
+                int(getattr(settings, f"{p.table.upper()}_MIN_RETENTION_DAYS")),
+            )
+            for p in self.POLICIES
+        )
+
+    @property
+    def supported(self) -> bool:
+        bind = self.db.bind
+        return bind is not None and bind.dialect.name == "postgresql"
+
+    async def run(self, dry_run: bool = False, today: Optional[date] = None) -> Dict[str, Any]:
+        """Plan, and unless dry_run apply, the lifecycle actions for every table."""
+        if not self.supported:
+            logger.info("partition_lifecycle_skipped", reason="not_postgresql")
+            return {"dry_run": dry_run, "skipped": True, "actions": [], "default_rows": {}}
+
+        today = today or datetime.now(timezone.utc).date()
+        actions: List[PartitionAction] = []
+        default_rows: Dict[str, int] = {}
+
+        for policy in self.policies:
+            partitions = await self.partitions(policy.table)
+            archives = await self.archives(policy.table)
+            retention_days = await self.retention_days(policy)
+            default = next((p for p in partitions if p.is_default), None)
+            if default is not None:
+                default_rows[policy.table] = await self.check_default(policy, default)
+
+            for action in self.plan(policy, partitions, archives, retention_days, today):
+                if action.action == "create" and default is not None and default_rows[policy.table]:
+                    if await self._default_rows_in_range(policy, default, action.start, action.end):
+                        action.outcome, action.detail = "blocked", "default partition has rows in this range"
+                if not dry_run and action.outcome == "planned":
+                    await self._apply(policy, action)
+                self._record(action, dry_run)
+                actions.append(action)
+
+        return {
+            "dry_run": dry_run,
+            "skipped": False,
+            "actions": [asdict(a) for a in actions],
+            "default_rows": default_rows,
+        }
+
+    def plan(
+        self,
+        policy: PartitionPolicy,
+        partitions: List[Partition],
+        archives: List[str],
+        retention_days: Optional[int],
+        today: date,
+    ) -> List[PartitionAction]:
+        """Actions for one table, from its catalog state. Pure: nothing is executed."""
+        actions: List[PartitionAction] = []
+        ranges = [p for p in partitions if not p.is_default]
+
+        this_month = today.replace(day=1)
+        for offset in range(self.precreate_months + 1):
+            start, end = add_months(this_month, offset), add_months(this_month, offset + 1)
+            if any(p.start < end and start < p.end for p in ranges):
+                continue
+            actions.append(PartitionAction(
+                policy.table, "create", f"{policy.table}_{start.year}_{start.month:02d}", start, end
+            ))
+
+        if retention_days is None:
+            return actions
+
+        cutoff = today - timedelta(days=retention_days)
+        for p in sorted(ranges, key=lambda p: p.start):
+            if p.end <= cutoff:
+                actions.append(PartitionAction(
+                    policy.table, "drop" if self.expired_action == "drop" else "archive", p.name, p.start, p.end
+                ))
+
+        archive_cutoff = cutoff - timedelta(days=self.archive_retention_days)
+        archive_name = re.compile(rf"^{re.escape(policy.table)}_archive_(\d{{4}})_(\d{{2}})$")
+        for name in sorted(archives):
+            match = archive_name.match(name)
+            if not match:
+                continue
+            start = date(int(match.group(1)), int(match.group(2)), 1)
+            end = add_months(start, 1)
+            if end <= archive_cutoff:
+                actions.append(PartitionAction(policy.table, "drop_archive", name, start, end))
+        return actions
+
+    async def retention_days(self, policy: PartitionPolicy) -> Optional[int]:
+        """Longest tier retention among current tenants (None: some tier keeps data forever)."""
+        plans = (await self.db.execute(select(Tenant.plan).distinct())).scalars().all()
+        days = [policy.min_retention_days]
+        for plan in plans:
+            try:
+                tier = PricingTier(plan)
+            except ValueError:
+                tier = PricingTier.STARTER
+            limit = get_tier_limit(tier, "retention_days")
+            if limit is None:
+                return None
+            days.append(int(limit))
+        return max(days)
+
+    async def partitions(self, table: str) -> List[Partition]:
+        rows = (await self.db.execute(PARTITIONS_QUERY, {"table": table})).all()
+        partitions = []
+        for row in rows:
+            if (row.bound or "").strip().upper() == "DEFAULT":
+                partitions.append(Partition(row.name, None, None))
+                continue
+            bounds = parse_bound(row.bound)
+            if bounds is None:
+                logger.warning("partition_bound_unrecognised", table=table, partition=row.name, bound=row.bound)
+                continue
+            partitions.append(Partition(row.name, *bounds))
+        return partitions
+
+    async def archives(self, table: str) -> List[str]:
+        prefix = table.replace("_", r"\_") + r"\_archive\_%"
+        return list((await self.db.execute(ARCHIVES_QUERY, {"prefix": prefix})).scalars().all())
+
+    async def check_default(self, policy: PartitionPolicy, default: Partition) -> int:
+        """Rows in the default partition (capped); exported and logged when not zero."""
+        rows = (await self.db.execute(text(
+            f"SELECT count(*) FROM (SELECT 1 FROM {_quote(default.name)} LIMIT {DEFAULT_ROWS_SCAN_LIMIT}) AS d"
+        ))).scalar() or 0
+        DEFAULT_PARTITION_ROWS.labels(table=policy.table).set(rows)
+        if rows:
+            logger.error("default_partition_not_empty", table=policy.table, partition=default.name, rows=rows)
+        return int(rows)
+
+    async def _default_rows_in_range(
+        self, policy: PartitionPolicy, default: Partition, start: date, end: date
+    ) -> bool:
+        found = (await self.db.execute(
+            text(f"SELECT EXISTS (SELECT 1 FROM {_quote(default.name)} "
+                 f"WHERE {_quote(policy.key)} >= :start AND {_quote(policy.key)} < :end)"),
+            {"start": self._bound_value(policy, start), "end": self._bound_value(policy, end)},
+        )).scalar()
+        return bool(found)
+
+    def _bound_value(self, policy: PartitionPolicy, day: date) -> Any:
+        return datetime.combine(day, time.min, tzinfo=timezone.utc) if policy.timestamped else day
+
+    def _bound_literal(self, policy: PartitionPolicy, day: date) -> str:
+        return f"'{day.isoformat()} 00:00:00+00'" if policy.timestamped else f"'{day.isoformat()}'"
+
+    def _statements(self, policy: PartitionPolicy, action: PartitionAction) -> List[str]:
+        table, name = _quote(policy.table), _quote(action.partition)
+        if action.action == "create":
+            return [
+                f"CREATE TABLE {name} PARTITION OF {table} FOR VALUES "
+                f"FROM ({self._bound_literal(policy, action.start)}) TO ({self._bound_literal(policy, action.end)})"
+            ]
+        if action.action == "archive":
+            archive = f"{policy.table}_archive_{action.start.year}_{action.start.month:02d}"
+            return [
+                f"ALTER TABLE {table} DETACH PARTITION {name}",
+                f"ALTER TABLE {name} RENAME TO {_quote(archive)}",
+            ]
+        if action.action == "drop":
+            return [f"ALTER TABLE {table} DETACH PARTITION {name}", f"DROP TABLE {name}"]
+        return [f"DROP TABLE {name}"]  # drop_archive
+
+    async def _apply(self, policy: PartitionPolicy, action: PartitionAction) -> None:
+        try:
+            await self.db.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+            for statement in self._statements(policy, action):
+                await self.db.execute(text(statement))
+            await self.db.commit()
+            action.outcome = "applied"
+        except Exception as e:
+            await self.db.rollback()
+            action.outcome, action.detail = "failed", str(e)[:200]
+
+    def _record(self, action: PartitionAction, dry_run: bool) -> None:
+        PARTITION_LIFECYCLE_ACTIONS.labels(
+            table=action.table, action=action.action, outcome=action.outcome
+        ).inc()
+        log = logger.error if action.outcome in ("failed", "blocked") else logger.info
+        log(
+            "partition_lifecycle_action",
+            dry_run=dry_run,
+            table=action.table,
+            action=action.action,
+            partition=action.partition,
+            start=str(action.start) if action.start else None,
+            end=str(action.end) if action.end else None,
+            outcome=action.outcome,
+            detail=action.detail,
+        )
@@ -1,5 +1,6 @@
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from datetime import datetime, timezone
 import asyncio
 import structlog
@@ -9,6 +10,7 @@ from typing import Dict, Any, List, Optional, Union
 
 from app.modules.governance.domain.scheduler.cohorts import TenantCohort
 from app.modules.governance.domain.scheduler.processors import AnalysisProcessor
+from app.shared.core.config import get_settings
 
 logger = structlog.get_logger()
 
@@ -124,6 +126,16 @@ class SchedulerOrchestrator:
         # or relying on the Celery task to do it (if I update scheduler_tasks.py later).
         # For now, simplistic dispatch.
 
+    async def partition_lifecycle_job(self) -> None:
+        """Dispatches partition pre-creation, archival and default-partition checks."""
+        from app.shared.core.celery_app import celery_app
+        celery_app.send_task("scheduler.partition_lifecycle")
+
+    async def health_snapshot_job(self) -> None:
+        """Dispatches the health dashboard snapshot capture."""
+        from app.shared.core.celery_app import celery_app
+        celery_app.send_task("scheduler.health_snapshot")
+
     def start(self) -> None:
         """Defines cron schedules and starts APScheduler."""
         # HIGH_VALUE: Every 6 hours
@@ -178,6 +190,20 @@ class SchedulerOrchestrator:
             id="daily_maintenance_sweep",
             replace_existing=True
         )
+        # Partition lifecycle: Daily 3:30AM UTC, after the maintenance sweep
+        self.scheduler.add_job(
+            self.partition_lifecycle_job,
+            trigger=CronTrigger(hour=3, minute=30, timezone="UTC"),
+            id="daily_partition_lifecycle",
+            replace_existing=True
+        )
+        # Health dashboard snapshot: every few minutes
+        self.scheduler.add_job(
+            self.health_snapshot_job,
+            trigger=IntervalTrigger(minutes=get_settings().HEALTH_SNAPSHOT_INTERVAL_MINUTES),
+            id="health_snapshot_capture",
+            replace_existing=True
+        )
         self.scheduler.start()
 
     def stop(self) -> None:
@@ -3,7 +3,7 @@ from datetime import date
 from uuid import UUID
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import TYPE_CHECKING, Optional, List, Dict, Any, cast
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Tuple, cast
 import asyncio
 if TYPE_CHECKING:
     from app.shared.llm.guardrails import FinOpsAnalysisResult
@@ -11,6 +11,8 @@ if TYPE_CHECKING:
 from app.models.tenant import Tenant
 from app.shared.llm.factory import LLMFactory
 from app.shared.llm.analyzer import FinOpsAnalyzer
+from app.shared.llm.batch_analysis import BatchAnalysisPipeline, BatchItem
+from app.schemas.costs import CloudUsageSummary
 from app.modules.reporting.domain.calculator import CarbonCalculator
 from app.modules.optimization.domain.detector import ZombieDetector
 from app.shared.adapters.aws_multitenant import MultiTenantAWSAdapter
@@ -18,93 +20,155 @@ from app.shared.core.config import get_settings
 
 logger = structlog.get_logger()
 
+
+def _service_cost_groups(summary: CloudUsageSummary) -> List[Dict[str, Any]]:
+    """Summary records in the grouped Cost Explorer shape CarbonCalculator reads."""
+    return [
+        {
+            "Groups": [{
+                "Keys": [record.service or "default"],
+                "Metrics": {"UnblendedCost": {"Amount": str(record.amount)}},
+            }]
+        }
+        for record in summary.records
+    ]
+
+
 class AnalysisProcessor:
-    """Handles the heavy lifting of analyzing a single tenant's cloud usage."""
+    """Handles the heavy lifting of analyzing tenants' cloud usage."""
+
+    # BE-SCHED-2: Analysis Timeout Protection (SEC-05), per connection and stage
+    CONNECTION_TIMEOUT_SECONDS = 300
 
     def __init__(self) -> None:
         self.settings = get_settings()
 
     async def process_tenant(self, db: AsyncSession, tenant: Tenant, start_date: date, end_date: date) -> None:
         """Process a single tenant's analysis."""
-        try:
+        await self.process_cohort(db, [tenant], start_date, end_date)
+
+    async def process_cohort(
+        self, db: AsyncSession, tenants: List[Tenant], start_date: date, end_date: date
+    ) -> None:
+        """
+        Process a cohort of tenants: fetch costs for every connection, run one
+        batched LLM analysis across the cohort, then per-tenant carbon, zombie,
+        digest and autopilot steps.
+        """
+        fetched: Dict[UUID, List[Tuple[Any, MultiTenantAWSAdapter, CloudUsageSummary]]] = {}
+        items: List[BatchItem] = []
+
+        # 1. Costs per connection (uses pre-loaded connections, avoids N+1 queries)
+        for tenant in tenants:
             logger.info("processing_tenant", tenant_id=str(tenant.id), name=tenant.name)
+            if not tenant.aws_connections:
+                logger.info("tenant_no_connections", tenant_id=str(tenant.id))
+                continue
+            for conn in tenant.aws_connections:
+                try:
+                    adapter = MultiTenantAWSAdapter(conn)
+                    costs = await asyncio.wait_for(
+                        adapter.get_daily_costs(start_date, end_date), timeout=self.CONNECTION_TIMEOUT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    logger.error("tenant_analysis_timeout", tenant_id=str(tenant.id), connection_id=str(conn.id))
+                    continue
+                except Exception as e:
+                    logger.error("tenant_connection_failed", tenant_id=str(tenant.id), connection_id=str(conn.id), error=str(e))
+                    continue
+                if not isinstance(costs, CloudUsageSummary) or not costs.records:
+                    continue
+                fetched.setdefault(tenant.id, []).append((conn, adapter, costs))
+                items.append(BatchItem(tenant.id, costs, key=conn.id))
 
-            # 1. Use pre-loaded Notification Settings (Avoids N+1 query)
-            notif_settings = tenant.notification_settings
+        if not fetched:
+            return
 
-            # 2. Use pre-loaded AWS connections (Avoids N+1 query)
-            connections = tenant.aws_connections
+        # 2. One batched LLM pass for the whole cohort
+        if items:
+            try:
+                llm = LLMFactory.create(self.settings.LLM_PROVIDER)
+                outcomes = await BatchAnalysisPipeline(FinOpsAnalyzer(llm), db).run(items)
+                for outcome in outcomes:
+                    if not outcome.ok:
+                        logger.error(
+                            "tenant_analysis_failed",
+                            tenant_id=str(outcome.tenant_id),
+                            connection_id=str(outcome.key),
+                            error=str(outcome.error),
+                        )
+            except Exception as e:
+                logger.error("cohort_analysis_failed", tenants=len(tenants), error=str(e))
 
-            if not connections:
-                logger.info("tenant_no_connections", tenant_id=str(tenant.id))
-                return
+        # 3. Per-tenant follow-up
+        for tenant in tenants:
+            if tenant.id in fetched:
+                await self._finish_tenant(db, tenant, fetched[tenant.id], start_date, end_date)
 
-            llm = LLMFactory.create(self.settings.LLM_PROVIDER)
-            analyzer = FinOpsAnalyzer(llm)
+    async def _finish_tenant(
+        self,
+        db: AsyncSession,
+        tenant: Tenant,
+        fetched: List[Tuple[Any, MultiTenantAWSAdapter, CloudUsageSummary]],
+        start_date: date,
+        end_date: date,
+    ) -> None:
+        try:
+            notif_settings = tenant.notification_settings
             carbon_calc = CarbonCalculator()
 
-            for conn in connections:
+            # Per-connection digest stats, coalesced into one Slack message per tenant
+            digests: List[Dict[str, Any]] = []
+
+            for conn, adapter, costs in fetched:
                 try:
-                    # BE-SCHED-2: Analysis Timeout Protection (SEC-05)
-                    # Use a generous 5-minute timeout per connection to prevent job hangs
-                    # Use a generous 5-minute timeout per connection to prevent job hangs
-                    async def _run_analysis() -> None:
-                        # Use MultiTenant adapter
-                        adapter = MultiTenantAWSAdapter(conn)
-                        costs: List[Dict[str, Any]] = await adapter.get_daily_costs(start_date, end_date) # type: ignore[assignment]
-
-                        if not costs:
-                            return
-
-                        # 1. LLM Analysis
-                        from app.models.analysis import CloudUsageSummary
-                        summary_obj = CloudUsageSummary(
-                            total_cost=0.0, # calculated inside
-                            currency="USD",
-                            records=costs
+                    async def _run_followup(
+                        conn: Any, adapter: MultiTenantAWSAdapter, costs: CloudUsageSummary
+                    ) -> None:
+                        # 1. Carbon Calculation
+                        carbon_result = carbon_calc.calculate_from_costs(
+                            _service_cost_groups(costs), region=conn.region
                         )
-                        await analyzer.analyze(summary_obj, tenant_id=tenant.id, db=db)
 
-                        # 2. Carbon Calculation
-                        carbon_result = carbon_calc.calculate_from_costs(costs, region=conn.region)
-
-                        # 3. Zombie Detection
+                        # 2. Zombie Detection
                         creds = await adapter.get_credentials()
                         detector = ZombieDetector(region=conn.region, credentials=creds)
                         zombie_result = await detector.scan_all()
 
-                        # 4. Notify if enabled in settings
-                        if notif_settings and notif_settings.slack_enabled:
-                            if notif_settings.digest_schedule in ["daily", "weekly"]:
-                                settings = get_settings()
-                                if settings.SLACK_BOT_TOKEN and settings.SLACK_CHANNEL_ID:
-                                    channel = notif_settings.slack_channel_override or settings.SLACK_CHANNEL_ID
-
-                                    from app.modules.notifications.domain import SlackService
-                                    slack = SlackService(settings.SLACK_BOT_TOKEN, channel)
-
-                                    zombie_count = sum(len(items) for items in zombie_result.values() if isinstance(items, list))
-                                    total_cost = sum(
-                                        float(day.get("Total", {}).get("UnblendedCost", {}).get("Amount", 0))
-                                        for day in costs
-                                    )
-
-                                    await slack.send_digest({
-                                        "tenant_name": tenant.name,
-                                        "total_cost": total_cost,
-                                        "carbon_kg": carbon_result.get("total_co2_kg", 0),
-                                        "zombie_count": zombie_count,
-                                        "period": f"{start_date.isoformat()} - {end_date.isoformat()}"
-                                    })
+                        zombie_count = sum(len(items) for items in zombie_result.values() if isinstance(items, list))
+                        digests.append({
+                            "tenant_name": tenant.name,
+                            "total_cost": float(costs.total_cost),
+                            "carbon_kg": carbon_result.get("total_co2_kg", 0),
+                            "zombie_count": zombie_count,
+                            "period": f"{start_date.isoformat()} - {end_date.isoformat()}"
+                        })
 
-                    await asyncio.wait_for(_run_analysis(), timeout=300)
+                    await asyncio.wait_for(
+                        _run_followup(conn, adapter, costs), timeout=self.CONNECTION_TIMEOUT_SECONDS
+                    )
 
                 except asyncio.TimeoutError:
                     logger.error("tenant_analysis_timeout", tenant_id=str(tenant.id), connection_id=str(conn.id))
                 except Exception as e:
                     logger.error("tenant_connection_failed", tenant_id=str(tenant.id), connection_id=str(conn.id), error=str(e))
 
-            # 3. New: Savings Autopilot (Phase 42)
+            # 3. Notify if enabled in settings (one digest per tenant per run)
+            if digests and notif_settings and notif_settings.slack_enabled:
+                if notif_settings.digest_schedule in ["daily", "weekly"]:
+                    settings = get_settings()
+                    if settings.SLACK_BOT_TOKEN and settings.SLACK_CHANNEL_ID:
+                        channel = notif_settings.slack_channel_override or settings.SLACK_CHANNEL_ID
+
+                        try:
+                            from app.modules.notifications.domain import SlackService
+                            from app.modules.notifications.domain.slack import coalesce_digests
+                            slack = SlackService(settings.SLACK_BOT_TOKEN, channel)
+                            await slack.send_digest(coalesce_digests(digests))
+                        except Exception as e:
+                            logger.error("tenant_digest_failed", tenant_id=str(tenant.id), error=str(e))
+
+            # 4. Savings Autopilot (Phase 42)
             # Fetch latest analysis result and execute autonomous savings
             try:
                 from app.models.analysis import AnalysisResult
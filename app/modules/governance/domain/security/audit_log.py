@@ -12,17 +12,20 @@ Key Features:
 3. User action tracking with context
 4. Sensitive data masking
 5. Export capability for auditors
+6. Batched writes: entries are buffered per unit of work and inserted in one
+   multi-row statement when the session commits
 """
 
 import uuid
 from datetime import datetime, timezone
 from enum import Enum
 from typing import Dict, Any, Optional, Union
-from sqlalchemy import String, ForeignKey, Text, Index, JSON, Uuid
+from sqlalchemy import String, ForeignKey, Text, Index, JSON, Uuid, event, insert
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, Session, mapped_column, relationship
 import structlog
 
+from app.shared.core.ops_metrics import AUDIT_BATCH_SIZE, AUDIT_ENTRIES_WRITTEN
 from app.shared.db.base import Base, get_partition_args
 
 logger = structlog.get_logger()
@@ -175,7 +178,7 @@ class AuditLogger:
         self.db = db
         # Ensure tenant_id is a UUID object for SQLAlchemy
         self.tenant_id = uuid.UUID(str(tenant_id)) if isinstance(tenant_id, (str, bytes)) else tenant_id
-        self.correlation_id = correlation_id or str(uuid.uuid4())
+        self.correlation_id = correlation_id or _bound_correlation_id() or str(uuid.uuid4())
 
     async def log(
         self,
@@ -191,29 +194,39 @@ class AuditLogger:
         request_method: str = None,
         request_path: str = None
     ) -> AuditLog:
-        """Create an immutable audit log entry."""
+        """
+        Create an immutable audit log entry.
+
+        The entry is buffered on the session and written, in logging order,
+        when the session commits; a rolled-back unit of work discards it.
+        """
 
         # Mask sensitive data
         masked_details = self._mask_sensitive(details) if details else None
 
-        entry = AuditLog(
-            tenant_id=self.tenant_id,
-            event_type=event_type.value,
-            actor_id=uuid.UUID(str(actor_id)) if actor_id and isinstance(actor_id, (str, bytes)) else actor_id,
-            actor_email=actor_email,
-            actor_ip=actor_ip,
-            correlation_id=self.correlation_id,
-            request_method=request_method,
-            request_path=request_path,
-            resource_type=resource_type,
-            resource_id=resource_id,
-            details=masked_details,
-            success=success,
-            error_message=error_message
-        )
-
-        self.db.add(entry)
-        await self.db.flush()
+        row = {
+            "id": uuid.uuid4(),
+            # Stamped now rather than at insert so buffered entries keep their order
+            "event_timestamp": datetime.now(timezone.utc),
+            "tenant_id": self.tenant_id,
+            "event_type": event_type.value,
+            "actor_id": uuid.UUID(str(actor_id)) if actor_id and isinstance(actor_id, (str, bytes)) else actor_id,
+            "actor_email": actor_email,
+            "actor_ip": actor_ip,
+            "correlation_id": self.correlation_id,
+            "request_method": request_method,
+            "request_path": request_path,
+            "resource_type": resource_type,
+            "resource_id": resource_id,
+            "details": masked_details,
+            "success": success,
+            "error_message": error_message,
+        }
+
+        # Open the transaction now so a rollback before the next statement still discards the entry
+        if not self.db.in_transaction():
+            self.db.sync_session.begin()
+        self.db.info.setdefault(AUDIT_BUFFER_KEY, []).append(row)
 
         # Also log to structured logger for real-time monitoring
         logger.info(
@@ -226,7 +239,7 @@ class AuditLogger:
             success=success
         )
 
-        return entry
+        return AuditLog(**row)
 
     def _mask_sensitive(self, data: Any) -> Any:
         """
@@ -250,3 +263,41 @@ class AuditLogger:
                 masked[key] = value
 
         return masked
+
+
+def _bound_correlation_id() -> Optional[str]:
+    """Correlation/request ID bound to the current request or job context."""
+    bound = structlog.contextvars.get_contextvars()
+    value = bound.get("correlation_id") or bound.get("request_id")
+    return str(value)[:36] if value else None
+
+
+# Session.info key holding the unit of work's buffered audit rows
+AUDIT_BUFFER_KEY = "audit_buffer"
+
+
+@event.listens_for(Session, "before_commit")
+def _write_buffered_audit_entries(session: Session) -> None:
+    """Write the unit of work's audit entries in one multi-row insert, inside the committing transaction."""
+    buffer = session.info.pop(AUDIT_BUFFER_KEY, None)
+    if not buffer:
+        return
+    # Pending rows the entries may reference (tenants, users) go first
+    session.flush()
+    session.execute(insert(AuditLog), buffer)
+    AUDIT_BATCH_SIZE.labels(path="unit_of_work").observe(len(buffer))
+    AUDIT_ENTRIES_WRITTEN.labels(path="unit_of_work", outcome="written").inc(len(buffer))
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_buffered_audit_entries(session: Session, transaction) -> None:
+    """
+    Entries describe work that ended without a commit (rollback, or close()
+    without one) and go with it; savepoints ending keep them.
+    """
+    if transaction.parent is not None or transaction.nested:
+        return
+    buffer = session.info.pop(AUDIT_BUFFER_KEY, None)
+    if buffer:
+        AUDIT_ENTRIES_WRITTEN.labels(path="unit_of_work", outcome="discarded").inc(len(buffer))
+        logger.warning("audit_entries_discarded_without_commit", entries=len(buffer))
@@ -1,19 +1,39 @@
 """
 Email Notification Service
 
-Sends carbon budget alerts via email using SMTP.
+Sends carbon budget alerts and billing notices via email using SMTP.
+
+Delivery is non-blocking: messages go onto a bounded per-process outbox,
+background workers drain it in batches over pooled, reused SMTP sessions
+(aiosmtplib), and transient failures are retried with backoff.
 """
 
-import smtplib
+import asyncio
 import html
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import List, Dict, Any
+from string import Template
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import aiosmtplib
 import structlog
 
+from app.shared.core.ops_metrics import EMAIL_DELIVERIES
+
 logger = structlog.get_logger()
 
+# Outbox / pool tuning
+SMTP_POOL_SIZE = 2
+SMTP_TIMEOUT_SECONDS = 30
+SMTP_IDLE_TIMEOUT_SECONDS = 60  # Most MTAs drop idle sessions after ~60-300s
+EMAIL_QUEUE_MAX_SIZE = 1000
+EMAIL_BATCH_SIZE = 50
+EMAIL_MAX_RETRIES = 3
+EMAIL_RETRY_BASE_DELAY = 1.0
+
 
 def escape_html(text: str) -> str:
     """BE-NOTIF-1: Escape user-provided content to prevent HTML injection."""
@@ -22,6 +42,423 @@ def escape_html(text: str) -> str:
     return html.escape(str(text))
 
 
+# --- Templates (compiled once at import) ---
+
+_BASE_STYLE = """
+        body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; }
+        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+        .content { background: #f8fafc; padding: 20px; border-radius: 0 0 8px 8px; }
+        .cta { background: #2563eb; color: white; padding: 12px 24px; border-radius: 6px; text-decoration: none; display: inline-block; margin: 15px 0; }"""
+
+CARBON_ALERT_TEMPLATE = Template("""
+<!DOCTYPE html>
+<html>
+<head>
+    <style>""" + _BASE_STYLE + """
+        .header { background: #0f172a; color: white; padding: 20px; border-radius: 8px 8px 0 0; }
+        .status { color: $status_color; font-size: 24px; font-weight: bold; }
+        .metric { background: white; padding: 15px; border-radius: 8px; margin: 10px 0; }
+        .progress { background: #e5e7eb; height: 20px; border-radius: 10px; overflow: hidden; }
+        .progress-bar { background: $status_color; height: 100%; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>🌱 Valdrix Carbon Alert</h1>
+        </div>
+        <div class="content">
+            <p class="status">$status_text</p>
+
+            <div class="metric">
+                <h3>Monthly Carbon Usage</h3>
+                <p><strong>$current_usage_kg kg</strong> of $budget_kg kg budget</p>
+                <div class="progress">
+                    <div class="progress-bar" style="width: $progress_width%"></div>
+                </div>
+                <p>$usage_percent% used</p>
+            </div>
+
+            <div class="metric">
+                <h3>💡 Recommendations</h3>
+                <ul>$recommendations</ul>
+            </div>
+
+            <p style="color: #64748b; font-size: 12px;">
+                Sent by Valdrix GreenOps Dashboard<br>
+                <a href="https://valdrix.io/greenops">View Dashboard</a>
+            </p>
+        </div>
+    </div>
+</body>
+</html>
+""")
+
+DUNNING_TEMPLATE = Template("""
+<!DOCTYPE html>
+<html>
+<head>
+    <style>""" + _BASE_STYLE + """
+        .header { background: #dc2626; color: white; padding: 20px; border-radius: 8px 8px 0 0; }
+        .warning { color: #dc2626; font-weight: bold; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>💳 Payment Failed</h1>
+        </div>
+        <div class="content">
+            <p>We were unable to process your subscription payment for the <strong>$tier</strong> plan.</p>
+
+            <p class="warning">Attempt $attempt of $max_attempts</p>
+
+            <p>We will automatically retry your payment on <strong>$next_retry_date</strong>.</p>
+
+            <p>To avoid service interruption, please ensure your payment method is updated:</p>
+
+            <a href="https://app.valdrix.io/settings/billing" class="cta">Update Payment Method</a>
+
+            <p>If you have any questions, contact our support team.</p>
+
+            <p style="color: #64748b; font-size: 12px;">
+                Sent by Valdrix Billing
+            </p>
+        </div>
+    </div>
+</body>
+</html>
+""")
+
+# Static bodies have no per-recipient fields, so they are rendered once
+PAYMENT_RECOVERED_HTML = """
+<!DOCTYPE html>
+<html>
+<head>
+    <style>""" + _BASE_STYLE + """
+        .header { background: #16a34a; color: white; padding: 20px; border-radius: 8px 8px 0 0; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>✅ Payment Successful</h1>
+        </div>
+        <div class="content">
+            <p>Great news! Your payment has been processed successfully.</p>
+
+            <p>Your Valdrix subscription is now active and you have full access to all features.</p>
+
+            <p>Thank you for your continued trust in Valdrix.</p>
+
+            <p style="color: #64748b; font-size: 12px;">
+                Sent by Valdrix Billing
+            </p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+ACCOUNT_DOWNGRADED_HTML = """
+<!DOCTYPE html>
+<html>
+<head>
+    <style>""" + _BASE_STYLE + """
+        .header { background: #f59e0b; color: white; padding: 20px; border-radius: 8px 8px 0 0; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>🔻 Account Downgraded</h1>
+        </div>
+        <div class="content">
+            <p>We were unable to process your payment after multiple attempts.</p>
+
+            <p>Your account has been downgraded to the <strong>Free Tier</strong>.</p>
+
+            <p>You can resubscribe at any time to regain full access to premium features:</p>
+
+            <a href="https://app.valdrix.io/settings/billing" class="cta">Resubscribe Now</a>
+
+            <p>Your data is safe and will remain accessible on the Free Tier.</p>
+
+            <p style="color: #64748b; font-size: 12px;">
+                Sent by Valdrix Billing
+            </p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+
+# --- Transport ---
+
+def _is_transient(error: Exception) -> bool:
+    """Connection drops, timeouts and 4xx replies are worth retrying; 5xx are not."""
+    if isinstance(error, aiosmtplib.SMTPRecipientsRefused):
+        return all(400 <= r.code < 500 for r in error.recipients)
+    if isinstance(error, aiosmtplib.SMTPResponseException):
+        return 400 <= error.code < 500
+    return isinstance(error, (aiosmtplib.SMTPException, OSError, asyncio.TimeoutError))
+
+
+class SMTPConnectionPool:
+    """
+    Small pool of authenticated SMTP sessions.
+
+    Sessions are reused across messages (one TCP+TLS+AUTH handshake per
+    session instead of per email) and discarded after errors or once they
+    have been idle longer than the server is likely to keep them open.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str],
+        password: Optional[str],
+        size: int = SMTP_POOL_SIZE,
+        timeout: float = SMTP_TIMEOUT_SECONDS,
+        idle_timeout: float = SMTP_IDLE_TIMEOUT_SECONDS,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self._semaphore = asyncio.Semaphore(size)
+        self._idle: List[Tuple[aiosmtplib.SMTP, float]] = []
+        self.connections_opened = 0
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        client = aiosmtplib.SMTP(
+            hostname=self.host,
+            port=self.port,
+            timeout=self.timeout,
+            use_tls=self.port == 465,
+        )
+        # start_tls=None upgrades automatically when the server offers STARTTLS
+        await client.connect()
+        if self.username and self.password:
+            await client.login(self.username, self.password)
+        self.connections_opened += 1
+        return client
+
+    async def _discard(self, client: aiosmtplib.SMTP) -> None:
+        try:
+            if client.is_connected:
+                await client.quit()
+        except Exception:
+            client.close()
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[aiosmtplib.SMTP]:
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            client = None
+            while self._idle:
+                candidate, last_used = self._idle.pop()
+                if candidate.is_connected and loop.time() - last_used < self.idle_timeout:
+                    client = candidate
+                    break
+                await self._discard(candidate)
+            if client is None:
+                client = await self._connect()
+
+            try:
+                yield client
+            except BaseException:
+                await self._discard(client)
+                raise
+            else:
+                if client.is_connected:
+                    self._idle.append((client, loop.time()))
+
+    async def close(self) -> None:
+        while self._idle:
+            client, _ = self._idle.pop()
+            await self._discard(client)
+
+
+@dataclass(eq=False)
+class OutboundEmail:
+    message: MIMEMultipart
+    sender: str
+    recipients: List[str]
+    result: "asyncio.Future[bool]"
+    attempts: int = 0
+    last_error: Optional[str] = field(default=None)
+
+
+class EmailOutbox:
+    """
+    Bounded outbound queue drained by background workers.
+
+    Each worker takes up to `batch_size` queued messages and sends them over
+    one pooled session. Transient failures are retried with exponential
+    backoff on a fresh session; callers await the final delivery result.
+    """
+
+    def __init__(
+        self,
+        pool: SMTPConnectionPool,
+        max_size: int = EMAIL_QUEUE_MAX_SIZE,
+        batch_size: int = EMAIL_BATCH_SIZE,
+        max_retries: int = EMAIL_MAX_RETRIES,
+        retry_base_delay: float = EMAIL_RETRY_BASE_DELAY,
+        workers: int = SMTP_POOL_SIZE,
+    ):
+        self.pool = pool
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self._worker_count = workers
+        self._queue: "asyncio.Queue[OutboundEmail]" = asyncio.Queue(maxsize=max_size)
+        self._workers: List[asyncio.Task] = []
+
+    def _ensure_workers(self) -> None:
+        self._workers = [w for w in self._workers if not w.done()]
+        while len(self._workers) < self._worker_count:
+            self._workers.append(asyncio.create_task(self._run()))
+
+    async def submit(self, message: MIMEMultipart, sender: str, recipients: List[str]) -> bool:
+        """Queue a message and wait for its delivery outcome."""
+        item = OutboundEmail(
+            message=message,
+            sender=sender,
+            recipients=recipients,
+            result=asyncio.get_running_loop().create_future(),
+        )
+        self._ensure_workers()
+        # Bounded: a full queue applies backpressure to the producer
+        await self._queue.put(item)
+        return await item.result
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self._deliver_batch(batch)
+            except Exception as e:  # Never let a worker die with callers waiting
+                logger.error("email_outbox_worker_error", error=str(e))
+                for item in batch:
+                    if not item.result.done():
+                        item.result.set_result(False)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _deliver_batch(self, batch: List[OutboundEmail]) -> None:
+        pending = batch
+        while pending:
+            retry: List[OutboundEmail] = []
+            try:
+                async with self.pool.acquire() as client:
+                    for index, item in enumerate(pending):
+                        try:
+                            item.attempts += 1
+                            await client.send_message(
+                                item.message, sender=item.sender, recipients=item.recipients
+                            )
+                            EMAIL_DELIVERIES.labels(result="sent").inc()
+                            item.result.set_result(True)
+                        except Exception as e:
+                            item.last_error = str(e)
+                            if _is_transient(e) and item.attempts <= self.max_retries:
+                                retry.append(item)
+                            else:
+                                self._fail(item)
+                            if not client.is_connected:
+                                # Session dropped: everything after this needs a new one
+                                retry.extend(pending[index + 1:])
+                                raise
+            except Exception as e:
+                # Connect/login failure or dropped session
+                for item in pending:
+                    if item.result.done() or item in retry:
+                        continue
+                    item.attempts += 1
+                    item.last_error = str(e)
+                    retry.append(item)
+
+            pending = []
+            for item in retry:
+                if item.attempts > self.max_retries:
+                    self._fail(item)
+                else:
+                    pending.append(item)
+            if pending:
+                EMAIL_DELIVERIES.labels(result="retried").inc(len(pending))
+                attempt = max(item.attempts for item in pending)
+                await asyncio.sleep(self.retry_base_delay * (2 ** (attempt - 1)))
+
+    def _fail(self, item: OutboundEmail) -> None:
+        EMAIL_DELIVERIES.labels(result="failed").inc()
+        logger.error(
+            "email_delivery_failed",
+            recipients=item.recipients,
+            attempts=item.attempts,
+            error=item.last_error,
+        )
+        if not item.result.done():
+            item.result.set_result(False)
+
+    async def flush(self) -> None:
+        """Wait until every queued message has been delivered or failed."""
+        await self._queue.join()
+
+    async def close(self) -> None:
+        if self._workers:
+            await self.flush()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        await self.pool.close()
+
+
+_outboxes: Dict[Tuple[str, int, Optional[str]], EmailOutbox] = {}
+_outbox_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_email_outbox(
+    host: str, port: int, username: Optional[str], password: Optional[str]
+) -> EmailOutbox:
+    """Get or create the process-wide outbox for an SMTP server/account."""
+    global _outbox_loop
+    # Queues, workers and sockets are bound to the loop that created them
+    loop = asyncio.get_running_loop()
+    if loop is not _outbox_loop:
+        _outboxes.clear()
+        _outbox_loop = loop
+    key = (host, port, username)
+    outbox = _outboxes.get(key)
+    if outbox is None:
+        outbox = EmailOutbox(SMTPConnectionPool(host, port, username, password))
+        _outboxes[key] = outbox
+    return outbox
+
+
+async def shutdown_email_outboxes() -> None:
+    """Drain queued email and close pooled SMTP sessions (app shutdown)."""
+    if _outbox_loop is not asyncio.get_running_loop():
+        _outboxes.clear()
+        return
+    outboxes = list(_outboxes.values())
+    _outboxes.clear()
+    for outbox in outboxes:
+        try:
+            await outbox.close()
+        except Exception as e:
+            logger.warning("email_outbox_close_failed", error=str(e))
+
+
 class EmailService:
     """
     Email notification service for carbon alerts.
@@ -44,6 +481,22 @@ class EmailService:
         self.smtp_password = smtp_password
         self.from_email = from_email
 
+    def _build_message(self, subject: str, recipients: List[str], html_body: str) -> MIMEMultipart:
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = subject
+        msg["From"] = self.from_email
+        msg["To"] = ", ".join(recipients)
+        msg.attach(MIMEText(html_body, "html"))
+        return msg
+
+    async def _send(self, subject: str, recipients: List[str], html_body: str) -> bool:
+        """Queue a message on the shared outbox and wait for delivery."""
+        outbox = get_email_outbox(
+            self.smtp_host, self.smtp_port, self.smtp_user, self.smtp_password
+        )
+        msg = self._build_message(subject, recipients, html_body)
+        return await outbox.submit(msg, self.from_email, recipients)
+
     async def send_carbon_alert(
         self,
         recipients: List[str],
@@ -69,17 +522,8 @@ class EmailService:
 
             html_body = self._build_email_html(budget_status)
 
-            msg = MIMEMultipart("alternative")
-            msg["Subject"] = subject
-            msg["From"] = self.from_email
-            msg["To"] = ", ".join(recipients)
-
-            msg.attach(MIMEText(html_body, "html"))
-
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_user, self.smtp_password)
-                server.sendmail(self.from_email, recipients, msg.as_string())
+            if not await self._send(subject, recipients, html_body):
+                return False
 
             logger.info(
                 "carbon_email_sent",
@@ -95,59 +539,21 @@ class EmailService:
     def _build_email_html(self, budget_status: Dict[str, Any]) -> str:
         """Build HTML email body."""
         status = budget_status.get("alert_status", "unknown")
-        status_color = "#dc2626" if status == "exceeded" else "#f59e0b"
-        status_text = "🚨 EXCEEDED" if status == "exceeded" else "⚠️ WARNING"
+        usage_percent = budget_status.get("usage_percent", 0)
 
         recommendations = budget_status.get("recommendations", [])
         # BE-NOTIF-1: Escape user-provided content
         recs_html = "".join(f"<li>{escape_html(rec)}</li>" for rec in recommendations[:3])
 
-        return f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <style>
-        body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; }}
-        .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-        .header {{ background: #0f172a; color: white; padding: 20px; border-radius: 8px 8px 0 0; }}
-        .content {{ background: #f8fafc; padding: 20px; border-radius: 0 0 8px 8px; }}
-        .status {{ color: {status_color}; font-size: 24px; font-weight: bold; }}
-        .metric {{ background: white; padding: 15px; border-radius: 8px; margin: 10px 0; }}
-        .progress {{ background: #e5e7eb; height: 20px; border-radius: 10px; overflow: hidden; }}
-        .progress-bar {{ background: {status_color}; height: 100%; }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🌱 Valdrix Carbon Alert</h1>
-        </div>
-        <div class="content">
-            <p class="status">{status_text}</p>
-
-            <div class="metric">
-                <h3>Monthly Carbon Usage</h3>
-                <p><strong>{budget_status.get('current_usage_kg', 0):.2f} kg</strong> of {budget_status.get('budget_kg', 100):.0f} kg budget</p>
-                <div class="progress">
-                    <div class="progress-bar" style="width: {min(budget_status.get('usage_percent', 0), 100)}%"></div>
-                </div>
-                <p>{budget_status.get('usage_percent', 0):.1f}% used</p>
-            </div>
-
-            <div class="metric">
-                <h3>💡 Recommendations</h3>
-                <ul>{recs_html}</ul>
-            </div>
-
-            <p style="color: #64748b; font-size: 12px;">
-                Sent by Valdrix GreenOps Dashboard<br>
-                <a href="https://valdrix.io/greenops">View Dashboard</a>
-            </p>
-        </div>
-    </div>
-</body>
-</html>
-"""
+        return CARBON_ALERT_TEMPLATE.substitute(
+            status_color="#dc2626" if status == "exceeded" else "#f59e0b",
+            status_text="🚨 EXCEEDED" if status == "exceeded" else "⚠️ WARNING",
+            current_usage_kg=f"{budget_status.get('current_usage_kg', 0):.2f}",
+            budget_kg=f"{budget_status.get('budget_kg', 100):.0f}",
+            progress_width=min(usage_percent, 100),
+            usage_percent=f"{usage_percent:.1f}",
+            recommendations=recs_html,
+        )
 
     async def send_dunning_notification(
         self,
@@ -160,61 +566,19 @@ class EmailService:
         """
         Send payment failed notification for dunning workflow.
         """
-        
+
         try:
             subject = f"⚠️ Valdrix: Payment Failed ({attempt}/{max_attempts})"
-            
-            html_body = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <style>
-        body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; }}
-        .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-        .header {{ background: #dc2626; color: white; padding: 20px; border-radius: 8px 8px 0 0; }}
-        .content {{ background: #f8fafc; padding: 20px; border-radius: 0 0 8px 8px; }}
-        .warning {{ color: #dc2626; font-weight: bold; }}
-        .cta {{ background: #2563eb; color: white; padding: 12px 24px; border-radius: 6px; text-decoration: none; display: inline-block; margin: 15px 0; }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>💳 Payment Failed</h1>
-        </div>
-        <div class="content">
-            <p>We were unable to process your subscription payment for the <strong>{escape_html(tier)}</strong> plan.</p>
-            
-            <p class="warning">Attempt {attempt} of {max_attempts}</p>
-            
-            <p>We will automatically retry your payment on <strong>{next_retry_date.strftime('%B %d, %Y')}</strong>.</p>
-            
-            <p>To avoid service interruption, please ensure your payment method is updated:</p>
-            
-            <a href="https://app.valdrix.io/settings/billing" class="cta">Update Payment Method</a>
-            
-            <p>If you have any questions, contact our support team.</p>
-            
-            <p style="color: #64748b; font-size: 12px;">
-                Sent by Valdrix Billing
-            </p>
-        </div>
-    </div>
-</body>
-</html>
-"""
-
-            msg = MIMEMultipart("alternative")
-            msg["Subject"] = subject
-            msg["From"] = self.from_email
-            msg["To"] = to_email
 
-            msg.attach(MIMEText(html_body, "html"))
+            html_body = DUNNING_TEMPLATE.substitute(
+                tier=escape_html(tier),
+                attempt=attempt,
+                max_attempts=max_attempts,
+                next_retry_date=next_retry_date.strftime('%B %d, %Y'),
+            )
 
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_user, self.smtp_password)
-                server.sendmail(self.from_email, [to_email], msg.as_string())
+            if not await self._send(subject, [to_email], html_body):
+                return False
 
             logger.info("dunning_email_sent", to_email=to_email, attempt=attempt)
             return True
@@ -227,50 +591,9 @@ class EmailService:
         """Send payment recovered confirmation."""
         try:
             subject = "✅ Valdrix: Payment Successful - Account Reactivated"
-            
-            html_body = """
-<!DOCTYPE html>
-<html>
-<head>
-    <style>
-        body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; }
-        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
-        .header { background: #16a34a; color: white; padding: 20px; border-radius: 8px 8px 0 0; }
-        .content { background: #f8fafc; padding: 20px; border-radius: 0 0 8px 8px; }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>✅ Payment Successful</h1>
-        </div>
-        <div class="content">
-            <p>Great news! Your payment has been processed successfully.</p>
-            
-            <p>Your Valdrix subscription is now active and you have full access to all features.</p>
-            
-            <p>Thank you for your continued trust in Valdrix.</p>
-            
-            <p style="color: #64748b; font-size: 12px;">
-                Sent by Valdrix Billing
-            </p>
-        </div>
-    </div>
-</body>
-</html>
-"""
-
-            msg = MIMEMultipart("alternative")
-            msg["Subject"] = subject
-            msg["From"] = self.from_email
-            msg["To"] = to_email
-
-            msg.attach(MIMEText(html_body, "html"))
 
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_user, self.smtp_password)
-                server.sendmail(self.from_email, [to_email], msg.as_string())
+            if not await self._send(subject, [to_email], PAYMENT_RECOVERED_HTML):
+                return False
 
             logger.info("payment_recovered_email_sent", to_email=to_email)
             return True
@@ -283,55 +606,9 @@ class EmailService:
         """Send account downgraded notice."""
         try:
             subject = "🔻 Valdrix: Account Downgraded to Free Tier"
-            
-            html_body = """
-<!DOCTYPE html>
-<html>
-<head>
-    <style>
-        body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; }
-        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
-        .header { background: #f59e0b; color: white; padding: 20px; border-radius: 8px 8px 0 0; }
-        .content { background: #f8fafc; padding: 20px; border-radius: 0 0 8px 8px; }
-        .cta { background: #2563eb; color: white; padding: 12px 24px; border-radius: 6px; text-decoration: none; display: inline-block; margin: 15px 0; }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🔻 Account Downgraded</h1>
-        </div>
-        <div class="content">
-            <p>We were unable to process your payment after multiple attempts.</p>
-            
-            <p>Your account has been downgraded to the <strong>Free Tier</strong>.</p>
-            
-            <p>You can resubscribe at any time to regain full access to premium features:</p>
-            
-            <a href="https://app.valdrix.io/settings/billing" class="cta">Resubscribe Now</a>
-            
-            <p>Your data is safe and will remain accessible on the Free Tier.</p>
-            
-            <p style="color: #64748b; font-size: 12px;">
-                Sent by Valdrix Billing
-            </p>
-        </div>
-    </div>
-</body>
-</html>
-"""
-
-            msg = MIMEMultipart("alternative")
-            msg["Subject"] = subject
-            msg["From"] = self.from_email
-            msg["To"] = to_email
-
-            msg.attach(MIMEText(html_body, "html"))
 
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_user, self.smtp_password)
-                server.sendmail(self.from_email, [to_email], msg.as_string())
+            if not await self._send(subject, [to_email], ACCOUNT_DOWNGRADED_HTML):
+                return False
 
             logger.info("account_downgraded_email_sent", to_email=to_email)
             return True
@@ -1,18 +1,180 @@
 """
 Slack notification service for Valdrix.
 Sends alerts and daily digests to configured Slack channel.
+
+All SlackService instances share one process-wide delivery layer:
+- One AsyncWebClient per bot token with a reused HTTP session
+- Per-channel token bucket (shared across workers via Redis when configured)
+- Alert deduplication with TTL in Redis, falling back to in-process
 """
 import logging
-from typing import Any
+from typing import Any, Dict, List, Optional
 import asyncio
 import hashlib
 import time
 
+import aiohttp
 from slack_sdk.web.async_client import AsyncWebClient
 from slack_sdk.errors import SlackApiError
 
 logger = logging.getLogger(__name__)
 
+# BE-NOTIF-4: Alert deduplication window
+DEDUP_WINDOW_SECONDS = 3600
+DEDUP_KEY_PREFIX = "slack_dedup"
+SLACK_RATE_LIMIT_API = "slack_chat_post"
+MAX_RETRIES = 3
+
+
+class SlackDelivery:
+    """
+    Process-wide Slack transport shared by every SlackService.
+
+    Clients are cached per bot token and bound to one aiohttp session per
+    event loop, so messages reuse keep-alive connections instead of opening
+    a new session per API call.
+    """
+
+    def __init__(self, redis_client: Any = None, dedup_window_seconds: int = DEDUP_WINDOW_SECONDS):
+        self._redis = redis_client
+        self.dedup_window_seconds = dedup_window_seconds
+        self._clients: Dict[str, AsyncWebClient] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._local_dedup: Dict[str, float] = {}
+        self._blocked_until: Dict[str, float] = {}
+
+    def get_client(self, bot_token: str) -> AsyncWebClient:
+        client = self._clients.get(bot_token)
+        if client is None:
+            client = AsyncWebClient(token=bot_token)
+            self._clients[bot_token] = client
+        return client
+
+    def _bind_session(self, client: AsyncWebClient) -> None:
+        # aiohttp sessions are bound to the loop that created them
+        current = getattr(client, "session", None)
+        if current is not None and not isinstance(current, aiohttp.ClientSession):
+            return  # Caller supplied its own transport
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop or self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30))
+            self._loop = loop
+        client.session = self._session
+
+    def _get_redis(self) -> Any:
+        if self._redis is not None:
+            return self._redis
+        from app.shared.core.rate_limit import get_redis_client
+        return get_redis_client()
+
+    @staticmethod
+    def dedup_key(channel: str, title: str, severity: str) -> str:
+        digest = hashlib.sha256(f"{channel}:{title}:{severity}".encode()).hexdigest()[:32]
+        return f"{DEDUP_KEY_PREFIX}:{digest}"
+
+    async def claim(self, key: str) -> bool:
+        """Atomically claim an alert key; False means it was sent within the window."""
+        redis = self._get_redis()
+        if redis is not None:
+            try:
+                return bool(await redis.set(key, "1", nx=True, ex=self.dedup_window_seconds))
+            except Exception as e:
+                logger.warning("Slack dedup store unavailable, using local window: %s", e)
+
+        now = time.time()
+        expires_at = self._local_dedup.get(key)
+        if expires_at is not None and expires_at > now:
+            return False
+        if len(self._local_dedup) > 1000:
+            self._local_dedup = {k: v for k, v in self._local_dedup.items() if v > now}
+        self._local_dedup[key] = now + self.dedup_window_seconds
+        return True
+
+    async def release(self, key: str) -> None:
+        """Drop a dedup claim so a failed alert can be retried."""
+        self._local_dedup.pop(key, None)
+        redis = self._get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.delete(key)
+        except Exception as e:
+            logger.warning("Slack dedup release failed: %s", e)
+
+    async def call(self, client: AsyncWebClient, channel: str, method: str, **kwargs: Any) -> bool:
+        """Call a Slack API method under the channel's token bucket, honoring Retry-After."""
+        from app.shared.adapters.rate_limiter import get_rate_limiter
+
+        self._bind_session(client)
+        limiter = get_rate_limiter(SLACK_RATE_LIMIT_API, channel)
+        for attempt in range(MAX_RETRIES + 1):
+            # Another sender on this channel was told to back off
+            blocked = self._blocked_until.get(channel, 0) - time.monotonic()
+            if blocked > 0:
+                await asyncio.sleep(blocked)
+            await limiter.acquire()
+            try:
+                await getattr(client, method)(channel=channel, **kwargs)
+                return True
+            except SlackApiError as e:
+                error_code = e.response.get('error', '')
+                if error_code == 'ratelimited' and attempt < MAX_RETRIES:
+                    headers = getattr(e.response, "headers", None) or {}
+                    retry_after = int(headers.get('Retry-After', 2 ** attempt))
+                    self._blocked_until[channel] = time.monotonic() + retry_after
+                    logger.warning("Slack rate limited on %s, retrying in %ss (attempt %s)", channel, retry_after, attempt)
+                    continue
+                logger.error(f"Slack API error in {method}: {error_code}")
+                return False
+            except Exception as e:
+                logger.error(f"Slack {method} fail: {e}")
+                return False
+        return False
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed and self._loop is asyncio.get_running_loop():
+            await self._session.close()
+        self._session = None
+
+    def clear(self) -> None:
+        self._clients.clear()
+        self._local_dedup.clear()
+        self._blocked_until.clear()
+        if self._session is not None and not self._session.closed:
+            self._session.detach()
+        self._session = None
+        self._loop = None
+
+
+_delivery: Optional[SlackDelivery] = None
+
+
+def get_slack_delivery() -> SlackDelivery:
+    """Get or create the process-wide Slack delivery layer."""
+    global _delivery
+    if _delivery is None:
+        _delivery = SlackDelivery()
+    return _delivery
+
+
+def coalesce_digests(digests: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge per-connection digest stats into a single tenant digest."""
+    merged: Dict[str, Any] = {
+        "total_cost": 0.0,
+        "carbon_kg": 0.0,
+        "zombie_count": 0,
+        "connection_count": len(digests),
+    }
+    for stats in digests:
+        merged["total_cost"] += float(stats.get("total_cost", 0) or 0)
+        merged["carbon_kg"] += float(stats.get("carbon_kg", 0) or 0)
+        merged["zombie_count"] += int(stats.get("zombie_count", 0) or 0)
+        for key in ("tenant_name", "period"):
+            if key in stats and key not in merged:
+                merged[key] = stats[key]
+    return merged
+
 
 class SlackService:
     """Service for sending notifications to Slack."""
@@ -39,37 +201,16 @@ class SlackService:
             .replace(">", "&gt;")
         )
 
-    def __init__(self, bot_token: str, channel_id: str):
+    def __init__(self, bot_token: str, channel_id: str, delivery: Optional[SlackDelivery] = None):
         """Initialize with bot token and target channel."""
-        self.client = AsyncWebClient(token=bot_token)
+        self.delivery = delivery or get_slack_delivery()
+        self.client = self.delivery.get_client(bot_token)
         self.channel_id = channel_id
-        
-        # BE-NOTIF-4: Alert deduplication cache (stores alert hashes with timestamps)
-        self._sent_alerts: dict[str, float] = {}
-        self._dedup_window_seconds = 3600  # 1 hour deduplication window
 
     async def _send_with_retry(self, method: str, **kwargs) -> bool:
-        """Generic Slack API call with exponential backoff for rate limiting."""
-        max_retries = 3
-        for attempt in range(max_retries + 1):
-            try:
-                # Use getattr to call the method (e.g., chat_postMessage)
-                func = getattr(self.client, method)
-                await func(**kwargs)
-                return True
-            except SlackApiError as e:
-                error_code = e.response.get('error', '')
-                if error_code == 'ratelimited' and attempt < max_retries:
-                    retry_after = int(e.response.headers.get('Retry-After', 2 ** attempt))
-                    logger.warning(f"Slack rate limited, retrying in {retry_after}s", attempt=attempt)
-                    await asyncio.sleep(retry_after)
-                    continue
-                logger.error(f"Slack API error in {method}: {error_code}")
-                return False
-            except Exception as e:
-                logger.error(f"Slack {method} fail: {e}")
-                return False
-        return False
+        """Slack API call via the shared, rate-limited delivery layer."""
+        kwargs.pop("channel", None)
+        return await self.delivery.call(self.client, self.channel_id, method, **kwargs)
 
     async def send_alert(
         self,
@@ -79,27 +220,14 @@ class SlackService:
     ) -> bool:
         """Send an alert message to Slack with retry logic and deduplication."""
         
-        # BE-NOTIF-4: Check for duplicate alerts within dedup window
-        alert_hash = hashlib.md5(f"{title}:{severity}".encode()).hexdigest()
-        current_time = time.time()
-        
-        if alert_hash in self._sent_alerts:
-            last_sent = self._sent_alerts[alert_hash]
-            if current_time - last_sent < self._dedup_window_seconds:
-                logger.info(f"Duplicate alert suppressed: {title}")
-                return True  # Suppress duplicate
-        
-        # Record this alert
-        self._sent_alerts[alert_hash] = current_time
-        
-        # Cleanup old entries (simple garbage collection)
-        self._sent_alerts = {
-            k: v for k, v in self._sent_alerts.items()
-            if current_time - v < self._dedup_window_seconds
-        }
+        # BE-NOTIF-4: Check for duplicate alerts within dedup window (shared across workers)
+        dedup_key = self.delivery.dedup_key(self.channel_id, title, severity)
+        if not await self.delivery.claim(dedup_key):
+            logger.info(f"Duplicate alert suppressed: {title}")
+            return True  # Suppress duplicate
         
         color = self.SEVERITY_COLORS.get(severity, self.SEVERITY_COLORS["warning"])
-        return await self._send_with_retry(
+        sent = await self._send_with_retry(
             "chat_postMessage",
             channel=self.channel_id,
             attachments=[
@@ -118,9 +246,15 @@ class SlackService:
                 }
             ]
         )
+        if not sent:
+            await self.delivery.release(dedup_key)
+        return sent
 
     async def send_digest(self, stats: dict[str, Any]) -> bool:
         """Send daily cost digest to Slack with retry logic."""
+        footer = "Powered by Valdrix"
+        if stats.get("connection_count", 1) > 1:
+            footer = f"{stats['connection_count']} cloud accounts • {footer}"
         return await self._send_with_retry(
             "chat_postMessage",
             channel=self.channel_id,
@@ -141,7 +275,7 @@ class SlackService:
                 {
                     "type": "context",
                     "elements": [
-                        {"type": "mrkdwn", "text": "Powered by Valdrix"}
+                        {"type": "mrkdwn", "text": footer}
                     ]
                 }
             ]
@@ -5,11 +5,12 @@ from botocore.exceptions import ClientError
 import structlog
 from app.modules.optimization.domain.plugin import ZombiePlugin
 from app.modules.optimization.domain.registry import registry
-from app.shared.adapters.rate_limiter import RateLimiter
+from app.shared.adapters.rate_limiter import get_rate_limiter
 from app.modules.reporting.domain.pricing.service import PricingService
 
 logger = structlog.get_logger()
-cloudwatch_limiter = RateLimiter(rate_per_second=1.0) # Conservative limit for CloudWatch
+# Shared across workers via Redis; the plugin has no account context, so one conservative bucket
+cloudwatch_limiter = get_rate_limiter("aws_cloudwatch")
 
 @registry.register("aws")
 class UnusedElasticIpsPlugin(ZombiePlugin):
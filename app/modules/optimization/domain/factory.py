@@ -1,8 +1,8 @@
 from typing import Any
 from app.modules.optimization.domain.ports import BaseZombieDetector
-from app.modules.optimization.adapters.aws.detector import AWSZombieDetector
-from app.modules.optimization.adapters.azure.detector import AzureZombieDetector
-from app.modules.optimization.adapters.gcp.detector import GCPZombieDetector
+
+# Detectors pull in their provider SDKs (azure-mgmt, google-cloud-compute),
+# so each is imported on first use rather than with the factory.
 
 class ZombieDetectorFactory:
     """
@@ -14,12 +14,15 @@ class ZombieDetectorFactory:
         type_name = type(connection).__name__
         
         if "AWSConnection" in type_name:
+            from app.modules.optimization.adapters.aws.detector import AWSZombieDetector
             return AWSZombieDetector(region=region, connection=connection, db=db)
             
         elif "AzureConnection" in type_name:
+            from app.modules.optimization.adapters.azure.detector import AzureZombieDetector
             return AzureZombieDetector(region="global", connection=connection, db=db)
             
         elif "GCPConnection" in type_name:
+            from app.modules.optimization.adapters.gcp.detector import GCPZombieDetector
             return GCPZombieDetector(region="global", connection=connection, db=db)
             
         raise ValueError(f"Unsupported connection type: {type_name}")
@@ -28,6 +28,9 @@ from app.shared.adapters.aws_utils import map_aws_credentials
 from app.shared.core.safety_service import SafetyGuardrailService
 from app.shared.core.config import get_settings
 
+if TYPE_CHECKING:
+    from app.shared.core.pricing import Entitlements
+
 logger = structlog.get_logger()
 
 
@@ -644,7 +647,9 @@ class RemediationService:
                 
         return executed_ids
 
-    async def generate_iac_plan(self, request: RemediationRequest, tenant_id: UUID) -> str:
+    async def generate_iac_plan(
+        self, request: RemediationRequest, tenant_id: UUID, entitlements: Optional["Entitlements"] = None
+    ) -> str:
         """
         Generates a Terraform decommissioning plan for the resource.
         Supports 'state rm' and 'removed' blocks for GitOps workflows.
@@ -652,7 +657,7 @@ class RemediationService:
         Phase 8: Gated by Pro tier.
         """
         from app.shared.core.pricing import get_tenant_tier, FeatureFlag, is_feature_enabled
-        tier = await get_tenant_tier(tenant_id, self.db)
+        tier = entitlements.tier if entitlements else await get_tenant_tier(tenant_id, self.db)
         
         if not is_feature_enabled(tier, FeatureFlag.GITOPS_REMEDIATION):
             return "# GitOps Remediation is a Pro-tier feature. Please upgrade to unlock IaC plans."
@@ -731,6 +736,8 @@ class RemediationService:
 
     async def bulk_generate_iac_plan(self, requests: List[RemediationRequest], tenant_id: UUID) -> str:
         """Generates a combined IaC plan for multiple resources."""
-        plans = [await self.generate_iac_plan(req, tenant_id) for req in requests]
+        from app.shared.core.pricing import resolve_entitlements
+        entitlements = await resolve_entitlements(tenant_id, self.db)
+        plans = [await self.generate_iac_plan(req, tenant_id, entitlements) for req in requests]
         header = f"# Valdrix Bulk IaC Remediation Plan\n# Generated: {datetime.now(timezone.utc).isoformat()}\n\n"
         return header + "\n\n" + "\n" + "-"*40 + "\n".join(plans)
@@ -1,23 +1,37 @@
+import json
 from fastapi import APIRouter, Depends, Query, HTTPException
+from sse_starlette.sse import EventSourceResponse
+import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date, timedelta
 from typing import Optional, Dict, Any, List
 from app.shared.db.session import get_db
+from app.shared.db.replica import ReadConsistency
+from app.shared.core.dependencies import read_db
 from app.shared.core.auth import get_current_user
 from app.modules.reporting.domain.aggregator import CostAggregator
 from app.models.tenant import User
 from app.shared.llm.analyzer import FinOpsAnalyzer
 from app.shared.llm.factory import LLMFactory
 from app.shared.core.pricing import PricingTier, requires_tier
+from app.shared.core.exceptions import BudgetExceededError
 
+logger = structlog.get_logger()
 router = APIRouter(tags=["Costs"])
 
+EMPTY_ANALYSIS: Dict[str, Any] = {
+    "summary": "No cost data available for analysis.",
+    "anomalies": [],
+    "recommendations": [],
+    "estimated_total_savings": 0.0
+}
+
 @router.get("")
 async def get_costs(
     start_date: date = Query(...),
     end_date: date = Query(...),
     provider: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(read_db(ReadConsistency.READ_YOUR_WRITES)),
     current_user: User = Depends(get_current_user)
 ) -> Dict[str, Any]:
     """
@@ -33,7 +47,7 @@ async def get_cost_breakdown(
     start_date: date = Query(...),
     end_date: date = Query(...),
     provider: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(read_db(ReadConsistency.READ_YOUR_WRITES)),
     current_user: User = Depends(get_current_user)
 ) -> Dict[str, Any]:
     """Provides a service-level cost breakdown."""
@@ -89,12 +103,7 @@ async def analyze_costs(
     )
     
     if not summary.records:
-        return {
-            "summary": "No cost data available for analysis.",
-            "anomalies": [],
-            "recommendations": [],
-            "estimated_total_savings": 0.0
-        }
+        return EMPTY_ANALYSIS
 
     # 2. Initialize LLM
     llm = LLMFactory.create()
@@ -110,6 +119,49 @@ async def analyze_costs(
     
     return result
 
+@router.post("/analyze/stream")
+@requires_tier(PricingTier.GROWTH, PricingTier.PRO, PricingTier.ENTERPRISE)
+async def analyze_costs_stream(
+    start_date: date = Query(default_factory=lambda: date.today() - timedelta(days=30)),
+    end_date: date = Query(default_factory=date.today),
+    provider: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_user)
+) -> EventSourceResponse:
+    """
+    Streams an AI-powered analysis of the cost data as Server-Sent Events.
+
+    Events: `token` (generated text), `insight` / `recommendation` /
+    `anomaly` / `forecast` (each validated item as it completes), `result`
+    (the final analysis, same shape as /analyze) and `error`.
+    Requires Growth tier or higher.
+    """
+    summary = await CostAggregator.get_summary(
+        db, user.tenant_id, start_date, end_date, provider
+    )
+
+    async def event_generator():
+        if not summary.records:
+            yield {"event": "result", "data": json.dumps(EMPTY_ANALYSIS)}
+            return
+
+        analyzer = FinOpsAnalyzer(LLMFactory.create(), db)
+        try:
+            async for event, data in analyzer.analyze_stream(
+                usage_summary=summary,
+                tenant_id=user.tenant_id,
+                db=db,
+                provider=provider
+            ):
+                yield {"event": event, "data": json.dumps(data, default=str)}
+        except BudgetExceededError as e:
+            yield {"event": "error", "data": json.dumps({"error": "budget_exceeded", "detail": str(e)})}
+        except Exception as e:
+            logger.error("cost_analysis_stream_failed", tenant_id=str(user.tenant_id), error=str(e))
+            yield {"event": "error", "data": json.dumps({"error": "Analysis interrupted"})}
+
+    return EventSourceResponse(event_generator())
+
 @router.post("/ingest")
 async def trigger_ingest(
     db: AsyncSession = Depends(get_db),
@@ -11,7 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 import structlog
 
 from app.shared.core.auth import CurrentUser, get_current_user
-from app.shared.db.session import get_db
+from app.shared.core.dependencies import read_db
 from app.models.remediation import RemediationRequest
 from app.shared.core.pricing import PricingTier, requires_tier
 
@@ -47,7 +47,7 @@ class LeaderboardResponse(BaseModel):
 async def get_leaderboard(
     period: str = Query("30d", pattern="^(7d|30d|90d|all)$"),
     current_user: CurrentUser = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(read_db()),
 ):
     """
     Get the savings leaderboard for the current tenant.
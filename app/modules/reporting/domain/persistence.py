@@ -16,6 +16,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 import structlog
 from app.models.cloud import CostRecord
 from app.schemas.costs import CloudUsageSummary
+from app.shared.db.replica import note_tenant_write
 
 logger = structlog.get_logger()
 
@@ -136,6 +137,8 @@ class CostPersistenceService:
         """Helper for PostgreSQL ON CONFLICT DO UPDATE bulk insert."""
         if not values:
             return
+        # Read-your-writes replica routing sees the tenant as written once this commits
+        note_tenant_write(self.db, values[0]["tenant_id"])
         bind_url = str(self.db.bind.url if self.db.bind else "")
         if "postgresql" in bind_url:
             stmt = pg_insert(CostRecord).values(values)
@@ -264,36 +267,6 @@ class CostPersistenceService:
         )
         await self.db.execute(stmt)
 
-    async def cleanup_old_records(self, days_retention: int = 365) -> Dict[str, int]:
-        """
-        Deletes cost records older than the specified retention period in small batches.
-        Optimized for space reclamation without long-running database locks.
-        """
-        from datetime import timezone
-        cutoff_date = datetime.combine(
-            date.today() - timedelta(days=days_retention), 
-            datetime.min.time()
-        ).replace(tzinfo=timezone.utc)
-        total_deleted = 0
-        batch_size = 5000 # Configurable batch size
-        while True:
-            # 1. Fetch a batch of IDs to delete
-            stmt = select(CostRecord.id).where(CostRecord.timestamp < cutoff_date).limit(batch_size)
-            result = await self.db.execute(stmt)
-            ids = result.scalars().all()
-            
-            if not ids:
-                break
-                
-            # 2. Delete this batch
-            stmt = delete(CostRecord).where(CostRecord.id.in_(ids))
-            await self.db.execute(stmt)
-            
-            total_deleted += len(ids)
-            await self.db.commit() # Commit each batch to free locks and logs
-        
-        logger.info("cost_retention_cleanup_complete", cutoff_date=str(cutoff_date), total_deleted=total_deleted)
-        return {"deleted_count": total_deleted}
     async def finalize_batch(self, days_ago: int = 2) -> Dict[str, int]:
         """
         Transition cost records from PRELIMINARY to FINAL after the restatement window.
@@ -20,6 +20,8 @@ from app.shared.core.config import get_settings
 import tenacity
 from botocore.exceptions import ClientError, ConnectTimeoutError, ReadTimeoutError, EndpointConnectionError
 from app.shared.core.exceptions import AdapterError
+from app.shared.adapters.rate_limiter import get_rate_limiter
+from app.shared.adapters.credential_broker import get_sts_credential_broker, REFRESH_AHEAD
 
 if TYPE_CHECKING:
     pass
@@ -107,11 +109,26 @@ class MultiTenantAWSAdapter(BaseAdapter):
 
     @with_aws_retry
     async def get_credentials(self) -> Dict:
-        """Get temporary credentials via STS AssumeRole (Native Async)."""
+        """
+        Get temporary credentials via STS AssumeRole (Native Async).
+
+        Served from the process-wide credential broker, so adapters built
+        per job or per request share a single AssumeRole per role per hour.
+        """
         if self._credentials and self._credentials_expire_at:
-            if datetime.now(timezone.utc) < self._credentials_expire_at:
+            if datetime.now(timezone.utc) < self._credentials_expire_at - REFRESH_AHEAD:
                 return self._credentials
 
+        self._credentials = await get_sts_credential_broker().get_credentials(
+            self.connection.role_arn,
+            self.connection.external_id,
+            self._assume_role,
+        )
+        self._credentials_expire_at = self._credentials["Expiration"]
+        return self._credentials
+
+    async def _assume_role(self) -> Dict:
+        """Call STS AssumeRole for the connection's role."""
         STS_CONFIG = BotoConfig(
             read_timeout=10,
             connect_timeout=5,
@@ -126,15 +143,14 @@ class MultiTenantAWSAdapter(BaseAdapter):
                     DurationSeconds=3600,
                 )
 
-                self._credentials = response["Credentials"]
-                self._credentials_expire_at = self._credentials["Expiration"]
+                credentials = response["Credentials"]
 
                 logger.info(
                     "sts_assume_role_success",
-                    expires_at=str(self._credentials_expire_at),
+                    expires_at=str(credentials["Expiration"]),
                 )
 
-                return self._credentials
+                return credentials
 
             except ClientError as e:
                 error_code = e.response.get("Error", {}).get("Code", "Unknown")
@@ -262,8 +278,12 @@ class MultiTenantAWSAdapter(BaseAdapter):
                     "GroupBy": [{"Type": "DIMENSION", "Key": "SERVICE"}],
                 }
 
+                # Cost Explorer limits are per account; share the bucket across workers
+                ce_limiter = get_rate_limiter("aws_cost_explorer", self.connection.aws_account_id)
+
                 pages_fetched = 0
                 while pages_fetched < MAX_COST_EXPLORER_PAGES:
+                    await ce_limiter.acquire()
                     response = await client.get_cost_and_usage(**request_params)
                     
                     results_by_time = response.get("ResultsByTime", [])
@@ -0,0 +1,198 @@
+"""
+STS Credential Broker - Process-wide AssumeRole cache
+
+Every adapter, detector and remediation path that needs customer AWS
+credentials goes through one broker per process:
+- In-memory tier keyed by (role_arn, external_id)
+- Refresh-ahead: credentials are renewed before `Expiration`, not after
+- Single-flight: concurrent callers for the same role share one STS call
+- Optional encrypted Redis tier so all workers share one AssumeRole per hour
+
+This keeps STS calls per tenant cycle at ~1/hour instead of one per adapter.
+"""
+
+import asyncio
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import structlog
+
+from app.shared.core.config import get_settings
+from app.shared.core.ops_metrics import STS_CREDENTIAL_REQUESTS
+
+logger = structlog.get_logger()
+
+# Renew credentials this long before they expire
+REFRESH_AHEAD = timedelta(minutes=5)
+
+REDIS_KEY_PREFIX = "sts_creds"
+
+CredentialFetcher = Callable[[], Awaitable[Dict[str, Any]]]
+
+
+def _expiration_of(credentials: Dict[str, Any]) -> datetime:
+    expiration = credentials["Expiration"]
+    if isinstance(expiration, str):
+        expiration = datetime.fromisoformat(expiration)
+    if expiration.tzinfo is None:
+        expiration = expiration.replace(tzinfo=timezone.utc)
+    return expiration
+
+
+class STSCredentialBroker:
+    """
+    Shares assumed-role credentials across every consumer in the process
+    (and optionally across workers via Redis).
+    """
+
+    def __init__(
+        self,
+        refresh_ahead: timedelta = REFRESH_AHEAD,
+        redis_client: Any = None,
+        use_redis: Optional[bool] = None,
+    ):
+        self.refresh_ahead = refresh_ahead
+        self._redis = redis_client
+        self._use_redis = use_redis
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @staticmethod
+    def cache_key(role_arn: str, external_id: Optional[str]) -> str:
+        digest = hashlib.sha256(f"{role_arn}:{external_id or ''}".encode()).hexdigest()[:32]
+        return f"{REDIS_KEY_PREFIX}:{digest}"
+
+    def _is_fresh(self, credentials: Optional[Dict[str, Any]]) -> bool:
+        if not credentials or "Expiration" not in credentials:
+            return False
+        return datetime.now(timezone.utc) < _expiration_of(credentials) - self.refresh_ahead
+
+    def _get_lock(self, key: str) -> asyncio.Lock:
+        # Celery tasks run each job on a fresh event loop; locks must not leak across loops
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._locks = {}
+            self._loop = loop
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[key] = lock
+        return lock
+
+    def _get_redis(self) -> Any:
+        if self._redis is not None:
+            return self._redis
+        use_redis = self._use_redis
+        if use_redis is None:
+            use_redis = get_settings().STS_CREDENTIAL_CACHE_REDIS
+        if not use_redis:
+            return None
+        from app.shared.core.rate_limit import get_redis_client
+        return get_redis_client()
+
+    async def _read_shared(self, key: str) -> Optional[Dict[str, Any]]:
+        redis = self._get_redis()
+        if redis is None:
+            return None
+        try:
+            payload = await redis.get(key)
+            if not payload:
+                return None
+            from app.shared.core.security import decrypt_string
+            decrypted = decrypt_string(payload)
+            if not decrypted:
+                return None
+            credentials = json.loads(decrypted)
+            credentials["Expiration"] = _expiration_of(credentials)
+            return credentials
+        except Exception as e:
+            logger.warning("sts_broker_redis_read_failed", error=str(e))
+            return None
+
+    async def _write_shared(self, key: str, credentials: Dict[str, Any]) -> None:
+        redis = self._get_redis()
+        if redis is None:
+            return
+        ttl = _expiration_of(credentials) - datetime.now(timezone.utc) - self.refresh_ahead
+        if ttl.total_seconds() < 1:
+            return
+        try:
+            from app.shared.core.security import encrypt_string
+            payload = encrypt_string(json.dumps(credentials, default=str))
+            await redis.set(key, payload, ex=int(ttl.total_seconds()))
+        except Exception as e:
+            logger.warning("sts_broker_redis_write_failed", error=str(e))
+
+    async def get_credentials(
+        self,
+        role_arn: str,
+        external_id: Optional[str],
+        fetch: CredentialFetcher,
+    ) -> Dict[str, Any]:
+        """
+        Return cached credentials for the role, calling `fetch` (STS AssumeRole)
+        only when no fresh copy exists in memory or Redis.
+        """
+        key = self.cache_key(role_arn, external_id)
+
+        cached = self._cache.get(key)
+        if self._is_fresh(cached):
+            STS_CREDENTIAL_REQUESTS.labels(result="memory_hit").inc()
+            return cached
+
+        async with self._get_lock(key):
+            # Another waiter may have refreshed while we queued (single-flight)
+            cached = self._cache.get(key)
+            if self._is_fresh(cached):
+                STS_CREDENTIAL_REQUESTS.labels(result="memory_hit").inc()
+                return cached
+
+            shared = await self._read_shared(key)
+            if self._is_fresh(shared):
+                self._cache[key] = shared
+                STS_CREDENTIAL_REQUESTS.labels(result="redis_hit").inc()
+                return shared
+
+            STS_CREDENTIAL_REQUESTS.labels(result="miss").inc()
+            try:
+                credentials = await fetch()
+            except Exception:
+                # Refresh-ahead failed but the old credentials are still valid
+                if cached and datetime.now(timezone.utc) < _expiration_of(cached):
+                    logger.warning("sts_broker_refresh_failed_using_cached", role_arn=role_arn)
+                    return cached
+                raise
+
+            self._cache[key] = credentials
+            await self._write_shared(key, credentials)
+            return credentials
+
+    async def invalidate(self, role_arn: str, external_id: Optional[str]) -> None:
+        """Drop cached credentials for a role (e.g. after a connection is deleted)."""
+        key = self.cache_key(role_arn, external_id)
+        self._cache.pop(key, None)
+        redis = self._get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.delete(key)
+        except Exception as e:
+            logger.warning("sts_broker_redis_invalidate_failed", error=str(e))
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self._locks.clear()
+
+
+_broker: Optional[STSCredentialBroker] = None
+
+
+def get_sts_credential_broker() -> STSCredentialBroker:
+    """Get or create the process-wide STS credential broker."""
+    global _broker
+    if _broker is None:
+        _broker = STSCredentialBroker()
+    return _broker
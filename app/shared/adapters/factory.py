@@ -7,14 +7,13 @@ for AWS, Azure, and GCP.
 
 from typing import Any
 from app.shared.adapters.base import BaseAdapter
-from app.shared.adapters.aws_multitenant import MultiTenantAWSAdapter
-from app.shared.adapters.aws_cur import AWSCURAdapter
-from app.shared.adapters.azure import AzureAdapter
-from app.shared.adapters.gcp import GCPAdapter
 from app.models.aws_connection import AWSConnection
 from app.models.azure_connection import AzureConnection
 from app.models.gcp_connection import GCPConnection
 
+# Adapters import their cloud SDKs (aioboto3, pandas, azure-mgmt, google-cloud)
+# at module level, so each is imported on first use rather than with the factory.
+
 class AdapterFactory:
     @staticmethod
     def get_adapter(connection: Any) -> BaseAdapter:
@@ -24,13 +23,17 @@ class AdapterFactory:
         if isinstance(connection, AWSConnection):
             # Prefer CUR adapter for enterprise accounts if configured
             if connection.cur_bucket_name and connection.cur_status == "active":
+                from app.shared.adapters.aws_cur import AWSCURAdapter
                 return AWSCURAdapter(connection)
+            from app.shared.adapters.aws_multitenant import MultiTenantAWSAdapter
             return MultiTenantAWSAdapter(connection)
         
         elif isinstance(connection, AzureConnection):
+            from app.shared.adapters.azure import AzureAdapter
             return AzureAdapter(connection)
             
         elif isinstance(connection, GCPConnection):
+            from app.shared.adapters.gcp import GCPAdapter
             return GCPAdapter(connection)
 
         # Fallback for dynamic types or older code paths
@@ -39,8 +42,10 @@ class AdapterFactory:
         if provider == "azure":
             # Assuming connection has necessary fields or casts
             # This path might need to be removed if strictly typed
+            from app.shared.adapters.azure import AzureAdapter
             return AzureAdapter(connection) 
         elif provider == "gcp":
+            from app.shared.adapters.gcp import GCPAdapter
             return GCPAdapter(connection)
             
         raise ValueError(f"Unsupported connection type or provider: {type(connection)}")
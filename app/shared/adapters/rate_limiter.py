@@ -3,6 +3,8 @@ AWS Rate Limiting Helper - Infrastructure Optimization (Phase 7: 10K Scale)
 
 Provides rate limiting and exponential backoff for AWS API calls:
 - 5 requests per second default (AWS Cost Explorer limit)
+- Distributed token bucket in Redis so the limit holds across all workers
+- Local token bucket fallback when Redis is not configured or unavailable
 - Exponential backoff on ThrottlingException
 - Automatic retry with jitter
 
@@ -11,10 +13,13 @@ This prevents rate limit errors at scale (10K tenants = 10K API calls).
 
 import asyncio
 import random
-from typing import TypeVar, Callable, Any
+import time
+from typing import TypeVar, Callable, Any, Optional, Dict, Tuple
 from functools import wraps
 import structlog
 
+from app.shared.core.ops_metrics import RATE_LIMIT_WAIT_SECONDS, RATE_LIMIT_FALLBACKS
+
 logger = structlog.get_logger()
 
 # Rate limiting constants
@@ -24,6 +29,48 @@ MAX_BACKOFF_SECONDS = 60.0
 MAX_RETRIES = 5
 JITTER_FACTOR = 0.1  # 10% jitter
 
+# Known provider API limits (requests per second, per customer account)
+API_RATE_LIMITS: Dict[str, float] = {
+    "aws_cost_explorer": 5.0,
+    "aws_cloudwatch": 1.0,
+    "slack_chat_post": 1.0,  # Slack: ~1 message/second per channel
+}
+
+# Bucket capacity where the provider tolerates short bursts (defaults to the rate)
+API_BURST_LIMITS: Dict[str, float] = {
+    "slack_chat_post": 5.0,
+}
+
+RATE_LIMIT_KEY_PREFIX = "ratelimit"
+
+# Atomic token bucket reservation.
+# Refills from the Redis server clock (no cross-worker clock skew), takes one
+# token and returns how long the caller must wait for it. Tokens may go
+# negative: each caller reserves the next free slot, which gives FIFO ordering
+# across workers without anyone holding a lock while sleeping.
+TOKEN_BUCKET_LUA = """
+local key = KEYS[1]
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', key, 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+  tokens = capacity
+  ts = now
+end
+local elapsed = now - ts
+if elapsed < 0 then elapsed = 0 end
+tokens = math.min(capacity, tokens + elapsed * rate) - 1
+local wait = 0
+if tokens < 0 then wait = -tokens / rate end
+redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', key, math.ceil((capacity / rate + wait) * 1000) + 1000)
+return tostring(wait)
+"""
+
 T = TypeVar('T')
 
 
@@ -31,19 +78,21 @@ class RateLimiter:
     """
     Token bucket rate limiter for AWS API calls.
     
-    Ensures we don't exceed AWS service limits across all tenants.
+    In-process only; used directly for single-process tools and as the
+    fallback for DistributedRateLimiter. Tokens are reserved under the lock
+    and the wait happens outside it, so waiters are served in FIFO order
+    without serializing their sleeps.
     """
     
-    def __init__(self, rate_per_second: float = DEFAULT_RATE_LIMIT):
+    def __init__(self, rate_per_second: float = DEFAULT_RATE_LIMIT, capacity: Optional[float] = None):
         self.rate = rate_per_second
-        self.tokens = rate_per_second
-        import time
+        self.capacity = capacity or rate_per_second
+        self.tokens = self.capacity
         self.last_update = time.monotonic()
         self._lock = asyncio.Lock()
     
-    async def acquire(self) -> None:
-        """Wait until a token is available."""
-        import time
+    async def reserve(self) -> float:
+        """Reserve the next token and return the seconds to wait for it."""
         async with self._lock:
             now = time.monotonic()
             elapsed = now - self.last_update
@@ -52,37 +101,125 @@ class RateLimiter:
             # or if it's been a long time, just reset tokens to max
             if elapsed < 0:
                 elapsed = 0
-                self.tokens = self.rate
+                self.tokens = self.capacity
             
             # Refill tokens based on elapsed time
             self.tokens = min(
-                self.rate,
+                self.capacity,
                 self.tokens + elapsed * self.rate
             )
             self.last_update = now
             
-            if self.tokens < 1:
-                # Wait for next token
-                wait_time = (1 - self.tokens) / self.rate
-                logger.debug(
-                    "rate_limit_waiting",
-                    wait_seconds=round(wait_time, 3)
-                )
-                await asyncio.sleep(wait_time)
-                self.tokens = 0
-            else:
-                self.tokens -= 1
+            # Take the token now; a negative balance is a queue of reservations
+            self.tokens -= 1
+            if self.tokens < 0:
+                return -self.tokens / self.rate
+            return 0.0
+
+    async def acquire(self) -> None:
+        """Wait until a token is available."""
+        wait_time = await self.reserve()
+        if wait_time > 0:
+            logger.debug(
+                "rate_limit_waiting",
+                wait_seconds=round(wait_time, 3)
+            )
+            await asyncio.sleep(wait_time)
+
+
+class DistributedRateLimiter:
+    """
+    Redis-backed token bucket shared by every API replica and Celery worker.
+
+    Buckets are keyed per provider API and (optionally) per customer account,
+    e.g. ``ratelimit:aws_cost_explorer:123456789012``. The reservation runs as
+    a single Lua script so concurrent workers never over-issue tokens.
+    Falls back to an in-process RateLimiter if Redis is unavailable.
+    """
+
+    def __init__(
+        self,
+        api: str,
+        rate_per_second: Optional[float] = None,
+        scope: Optional[str] = None,
+        redis_client: Any = None,
+    ):
+        self.api = api
+        self.rate = rate_per_second or API_RATE_LIMITS.get(api, DEFAULT_RATE_LIMIT)
+        self.capacity = API_BURST_LIMITS.get(api, self.rate)
+        self.scope = scope
+        self.key = f"{RATE_LIMIT_KEY_PREFIX}:{api}:{scope or 'global'}"
+        self._redis = redis_client
+        self._script = None
+        self._local = RateLimiter(rate_per_second=self.rate, capacity=self.capacity)
+
+    def _get_redis(self) -> Any:
+        if self._redis is not None:
+            return self._redis
+        from app.shared.core.rate_limit import get_redis_client
+        return get_redis_client()
+
+    async def _reserve_distributed(self, redis: Any) -> float:
+        if self._script is None or getattr(self._script, "registered_client", None) is not redis:
+            self._script = redis.register_script(TOKEN_BUCKET_LUA)
+        wait = await self._script(keys=[self.key], args=[self.rate, self.capacity])
+        return float(wait)
+
+    async def reserve(self) -> Tuple[float, str]:
+        """Reserve a token and return ``(wait_seconds, backend)``."""
+        redis = self._get_redis()
+        if redis is not None:
+            try:
+                return await self._reserve_distributed(redis), "redis"
+            except Exception as e:
+                logger.warning("rate_limit_redis_error", api=self.api, error=str(e))
+                RATE_LIMIT_FALLBACKS.labels(api=self.api).inc()
+        return await self._local.reserve(), "local"
+
+    async def acquire(self) -> None:
+        """Wait until a token is available in the shared bucket."""
+        wait_time, backend = await self.reserve()
+        RATE_LIMIT_WAIT_SECONDS.labels(api=self.api, backend=backend).observe(wait_time)
+        if wait_time > 0:
+            logger.debug(
+                "rate_limit_waiting",
+                api=self.api,
+                scope=self.scope,
+                backend=backend,
+                wait_seconds=round(wait_time, 3)
+            )
+            await asyncio.sleep(wait_time)
+
+
+_distributed_limiters: Dict[Tuple[str, Optional[str]], DistributedRateLimiter] = {}
+
+
+def get_rate_limiter(api: str, scope: Optional[str] = None) -> DistributedRateLimiter:
+    """
+    Get the shared limiter for a provider API and customer account.
+
+    Usage:
+        await get_rate_limiter("aws_cost_explorer", account_id).acquire()
+    """
+    key = (api, scope)
+    limiter = _distributed_limiters.get(key)
+    if limiter is None:
+        limiter = DistributedRateLimiter(api, scope=scope)
+        _distributed_limiters[key] = limiter
+    return limiter
 
 
 # Global rate limiter for AWS Cost Explorer
-_aws_rate_limiter: RateLimiter | None = None
+_aws_rate_limiter: DistributedRateLimiter | None = None
 
 
-def get_aws_rate_limiter() -> RateLimiter:
-    """Get or create the global AWS rate limiter."""
+def get_aws_rate_limiter() -> DistributedRateLimiter:
+    """Get or create the global (cross-worker) AWS Cost Explorer rate limiter."""
     global _aws_rate_limiter
     if _aws_rate_limiter is None:
-        _aws_rate_limiter = RateLimiter(rate_per_second=DEFAULT_RATE_LIMIT)
+        _aws_rate_limiter = DistributedRateLimiter(
+            "aws_cost_explorer", rate_per_second=DEFAULT_RATE_LIMIT
+        )
     return _aws_rate_limiter
 
 
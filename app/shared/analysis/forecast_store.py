@@ -0,0 +1,208 @@
+"""
+Grounding Forecast Store
+
+Symbolic forecasts used to ground LLM analysis, keyed by tenant and a
+version hash of the cost history they were fitted on. A stored forecast
+serves any horizon up to the one it was fitted for (it is cut down to the
+requested days). The LLM path only reads the store:
+- a stored forecast is attached as-is
+- on request paths a missing one is returned as a "pending" placeholder and
+  fitted in the background (once per version, however many requests ask);
+  when done it is stored and back-filled into the tenant's cached analysis
+  (only cached with Redis; without it the next analysis finds the stored fit)
+- worker paths pass wait=True and get the fit inline: each Celery task runs
+  its own short-lived event loop, which would cancel a background fit
+- histories too short to fit are forecast inline (no model is fitted)
+
+The cost forecast job writes its results here too, so an analysis over
+the same data reuses the job's fit. Storage is the shared CacheService
+when Redis is configured, else a bounded per-process map.
+"""
+
+import asyncio
+import hashlib
+from collections import OrderedDict
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+import structlog
+
+from app.shared.analysis.forecaster import MIN_HISTORY_DAYS, SymbolicForecaster
+from app.shared.core.cache import get_cache_service
+
+logger = structlog.get_logger()
+
+DEFAULT_DAYS = 30
+MAX_LOCAL_ENTRIES = 256
+
+
+def data_version(records: List[Any]) -> str:
+    """Stable hash of the (date, amount) series a forecast is fitted on."""
+    digest = hashlib.sha256()
+    for r in records:
+        d = r.date.date() if isinstance(r.date, datetime) else r.date
+        digest.update(f"|{d.isoformat()}:{r.amount}".encode())
+    return digest.hexdigest()[:24]
+
+
+def pending_forecast(version: str) -> Dict[str, Any]:
+    return {"status": "pending", "data_version": version, "forecast": []}
+
+
+def for_horizon(forecast: Dict[str, Any], days: int) -> Optional[Dict[str, Any]]:
+    """The stored forecast cut to `days`, or None if it was fitted for a shorter horizon."""
+    horizon = forecast.get("horizon_days")
+    if horizon is None or horizon < days:
+        return None
+    if horizon == days:
+        return forecast
+    entries = list(forecast.get("forecast") or [])[:days]
+    return {
+        **forecast,
+        "forecast": entries,
+        "total_forecasted_cost": sum((Decimal(str(e["amount"])) for e in entries), Decimal("0")),
+        "horizon_days": days,
+    }
+
+
+class ForecastStore:
+    def __init__(self) -> None:
+        self._local: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def _key(tenant_id: Any, version: str) -> str:
+        return f"{tenant_id}:{version}"
+
+    async def get(self, tenant_id: Any, version: str) -> Optional[Dict[str, Any]]:
+        cache = get_cache_service()
+        if cache.enabled:
+            return await cache.get_forecast(tenant_id, version)
+        key = self._key(tenant_id, version)
+        value = self._local.get(key)
+        if value is not None:
+            self._local.move_to_end(key)
+        return value
+
+    async def lookup(self, tenant_id: Any, version: str, days: int) -> Optional[Dict[str, Any]]:
+        """A stored forecast covering `days`, if any."""
+        stored = await self.get(tenant_id, version)
+        return for_horizon(stored, days) if stored is not None else None
+
+    async def put(self, tenant_id: Any, version: str, forecast: Dict[str, Any], days: int) -> None:
+        """Store a forecast fitted for `days`, unless one with a longer horizon is already stored."""
+        existing = await self.get(tenant_id, version)
+        if existing is not None and (existing.get("horizon_days") or 0) > days:
+            return
+        forecast = {**forecast, "data_version": version, "horizon_days": days}
+        cache = get_cache_service()
+        if cache.enabled:
+            await cache.set_forecast(tenant_id, version, forecast)
+            return
+        key = self._key(tenant_id, version)
+        self._local[key] = forecast
+        self._local.move_to_end(key)
+        while len(self._local) > MAX_LOCAL_ENTRIES:
+            self._local.popitem(last=False)
+
+    async def grounding_forecast(
+        self, tenant_id: Any, records: List[Any], days: int = DEFAULT_DAYS, wait: bool = False
+    ) -> Dict[str, Any]:
+        """
+        The stored forecast, or a pending placeholder while one is fitted in the
+        background. With wait=True a missing forecast is fitted before returning.
+        """
+        if not records or len(records) < MIN_HISTORY_DAYS:
+            return await SymbolicForecaster.forecast(records, days=days)
+
+        version = data_version(records)
+        try:
+            stored = await self.lookup(tenant_id, version, days)
+        except Exception as e:
+            logger.warning("forecast_store_get_failed", error=str(e))
+            stored = None
+        if stored is not None:
+            return stored
+
+        if wait:
+            try:
+                return await self.fit(tenant_id, records, version, days)
+            except Exception as e:
+                logger.error("grounding_forecast_failed", tenant_id=str(tenant_id), data_version=version, error=str(e))
+                return pending_forecast(version)
+        self.schedule(tenant_id, records, version, days)
+        return pending_forecast(version)
+
+    def schedule(self, tenant_id: Any, records: List[Any], version: str, days: int = DEFAULT_DAYS) -> None:
+        key = self._key(tenant_id, version)
+        if key in self._inflight:
+            return
+        task = asyncio.create_task(self._fit_and_backfill(tenant_id, list(records), version, days))
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._inflight.pop(key, None))
+        logger.info("grounding_forecast_scheduled", tenant_id=str(tenant_id), data_version=version)
+
+    async def fit(self, tenant_id: Any, records: List[Any], version: str, days: int) -> Dict[str, Any]:
+        """Fit and store a forecast now, joining a background fit of this loop if one is running."""
+        task = self._inflight.get(self._key(tenant_id, version))
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            await asyncio.shield(task)
+            stored = await self.lookup(tenant_id, version, days)
+            if stored is not None:
+                return stored
+        forecast = await self._fit(tenant_id, records, days)
+        await self.put(tenant_id, version, forecast, days)
+        return {**forecast, "data_version": version, "horizon_days": days}
+
+    async def _fit(self, tenant_id: Any, records: List[Any], days: int) -> Dict[str, Any]:
+        from app.shared.db.session import async_session_maker
+        async with async_session_maker() as session:
+            return await SymbolicForecaster.forecast(records, days=days, db=session, tenant_id=tenant_id)
+
+    async def _fit_and_backfill(self, tenant_id: Any, records: List[Any], version: str, days: int) -> None:
+        try:
+            forecast = await self._fit(tenant_id, records, days)
+            await self.put(tenant_id, version, forecast, days)
+            await self._backfill_analysis(tenant_id, version, days)
+        except Exception as e:
+            logger.error("grounding_forecast_failed", tenant_id=str(tenant_id), data_version=version, error=str(e))
+
+    async def _backfill_analysis(self, tenant_id: Any, version: str, days: int) -> None:
+        """Replace the pending placeholder in the tenant's cached analysis, if it is still for this version."""
+        if tenant_id is None:
+            return
+        cache = get_cache_service()
+        analysis = await cache.get_analysis(tenant_id)
+        if not isinstance(analysis, dict):
+            return
+        current = analysis.get("symbolic_forecast") or {}
+        if current.get("status") != "pending" or current.get("data_version") != version:
+            return
+        stored = await self.lookup(tenant_id, version, days)
+        if stored is None:
+            return
+        analysis["symbolic_forecast"] = stored
+        await cache.set_analysis(tenant_id, analysis)
+        logger.info("grounding_forecast_backfilled", tenant_id=str(tenant_id), data_version=version)
+
+    async def drain(self) -> None:
+        """Wait for in-flight fits (shutdown and tests)."""
+        while self._inflight:
+            await asyncio.gather(*list(self._inflight.values()), return_exceptions=True)
+
+
+_store: Optional[ForecastStore] = None
+
+
+def get_forecast_store() -> ForecastStore:
+    """Get the process-wide forecast store."""
+    global _store
+    if _store is None:
+        _store = ForecastStore()
+    return _store
+
+
+def reset_forecast_store() -> None:
+    global _store
+    _store = None
@@ -1,20 +1,37 @@
-import pandas as pd
-import numpy as np
+from __future__ import annotations
+
+import importlib.util
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import List, Dict, Any, Optional
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
 import structlog
 from app.shared.analysis.carbon_data import REGION_CARBON_INTENSITY, DEFAULT_CARBON_INTENSITY
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 logger = structlog.get_logger()
 
+# pandas, numpy and Prophet are imported on the first forecast, not with the
+# module: they dominate API and worker import time.
+
 # Optional dependency: Prophet (Requires pystan/holidays)
-try:
-    from prophet import Prophet
-    PROPHET_AVAILABLE = True
-except ImportError:
-    PROPHET_AVAILABLE = False
+PROPHET_AVAILABLE = importlib.util.find_spec("prophet") is not None
+if not PROPHET_AVAILABLE:
     logger.warning("prophet_not_installed_forecasting_degraded")
+Prophet = None
+
+
+def _prophet_class():
+    global Prophet
+    if Prophet is None:
+        from prophet import Prophet as _Prophet
+        Prophet = _Prophet
+    return Prophet
+
+# Below this many data points forecast() returns a constant "low confidence" result without fitting
+MIN_HISTORY_DAYS = 7
+
 
 class SymbolicForecaster:
     """
@@ -57,7 +74,7 @@ class SymbolicForecaster:
         """
         Main entry point for cost forecasting.
         """
-        if not history or len(history) < 7:
+        if not history or len(history) < MIN_HISTORY_DAYS:
             return {
                 "confidence": "low",
                 "reason": "Need at least 7 days of data for reliable forecasting.",
@@ -96,6 +113,7 @@ class SymbolicForecaster:
     @staticmethod
     async def _run_prophet(df: pd.DataFrame, days: int, db: Optional[Any], tenant_id: Optional[Any]) -> Dict[str, Any]:
         """Runs Facebook Prophet with holiday/anomaly markers."""
+        import numpy as np
         holidays_df = None
         if db and tenant_id:
             from sqlalchemy import select
@@ -108,7 +126,7 @@ class SymbolicForecaster:
             except Exception as e:
                 logger.warning("failed_to_load_anomaly_markers", error=str(e))
 
-        m = Prophet(holidays=holidays_df, daily_seasonality=False, weekly_seasonality=True, yearly_seasonality=False)
+        m = _prophet_class()(holidays=holidays_df, daily_seasonality=False, weekly_seasonality=True, yearly_seasonality=False)
         m.fit(df[~df['is_outlier']])
         
         future = m.make_future_dataframe(periods=days)
@@ -194,6 +212,7 @@ class SymbolicForecaster:
     @staticmethod
     def _prepare_dataframe(history: List[Any]) -> pd.DataFrame:
         """Converts raw history objects to normalized DataFrame."""
+        import pandas as pd
         data = []
         for r in history:
             d = r.date
@@ -208,6 +227,7 @@ class SymbolicForecaster:
     @staticmethod
     def _build_holidays_df(markers: List[Any]) -> pd.DataFrame:
         """Expands multi-day anomaly markers into Prophet holiday format."""
+        import pandas as pd
         holidays_list = []
         for m in markers:
             current_date = m.start_date
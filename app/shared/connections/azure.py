@@ -2,7 +2,6 @@ from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.models.azure_connection import AzureConnection
-from app.shared.adapters.azure import AzureAdapter
 from app.shared.core.exceptions import ResourceNotFoundError
 
 class AzureConnectionService:
@@ -26,6 +25,8 @@ class AzureConnectionService:
         if not connection:
             raise ResourceNotFoundError(f"Azure Connection {connection_id} not found")
 
+        # Imported on use: the adapter pulls in the Azure SDK
+        from app.shared.adapters.azure import AzureAdapter
         adapter = AzureAdapter(connection)
         success = await adapter.verify_connection()
         if success:
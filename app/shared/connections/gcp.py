@@ -2,7 +2,6 @@ from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.models.gcp_connection import GCPConnection
-from app.shared.adapters.gcp import GCPAdapter
 from app.shared.core.exceptions import ResourceNotFoundError
 
 class GCPConnectionService:
@@ -20,6 +19,8 @@ class GCPConnectionService:
         if not connection:
             raise ResourceNotFoundError(f"GCP Connection {connection_id} not found")
 
+        # Imported on use: the adapter pulls in the Google Cloud SDK
+        from app.shared.adapters.gcp import GCPAdapter
         adapter = GCPAdapter(connection)
         success = await adapter.verify_connection()
         if success:
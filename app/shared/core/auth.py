@@ -1,4 +1,5 @@
 import jwt
+import time
 from typing import Optional, Any, Callable
 from uuid import UUID
 from fastapi import HTTPException, Depends, status, Request
@@ -11,7 +12,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta, timezone
 from app.shared.db.session import get_db, set_session_tenant_id
 from app.models.tenant import User, UserRole, Tenant
-from app.shared.core.pricing import PricingTier
+from app.shared.core.pricing import PricingTier, remember_entitlements
+from app.shared.core.ops_metrics import AUTH_LATENCY_SECONDS
+from app.shared.core.principal_cache import get_principal_cache
 
 logger = structlog.get_logger()
 
@@ -122,7 +125,7 @@ async def get_current_user(
     db: AsyncSession = Depends(get_db)
 ) -> CurrentUser:
     """
-    JWT + DB lookup. For protected routes
+    JWT + DB lookup (via the principal cache). For protected routes
     """
     if credentials is None:
         raise HTTPException(
@@ -140,7 +143,7 @@ async def get_current_user(
             detail="Invalid token payload",
         )
 
-    try:
+    async def load_principal() -> Optional[dict]:
         # Fetch user and tenant from DB
         result = await db.execute(
             select(User, Tenant.plan)
@@ -148,31 +151,49 @@ async def get_current_user(
             .where(User.id == UUID(user_id))
         )
         row = result.one_or_none()
+        if row is None:
+            return None
+        user, plan = row
+        return {
+            "id": str(user.id),
+            "email": user.email,
+            "tenant_id": str(user.tenant_id),
+            "role": user.role,
+            "tier": plan,
+        }
+
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        principal = await get_principal_cache().get(user_id, load_principal)
 
         # Handle not found
-        if row is None:
+        if principal is None:
+            outcome = "denied"
             logger.error("auth_user_not_found_in_db", user_id=user_id)
             raise HTTPException(403, "User not found. Complete Onboarding first.")
 
-        user, plan = row
+        current_user = CurrentUser(**principal)
 
         # Store in request state for downstream rate limiting and RLS
-        request.state.tenant_id = user.tenant_id
-        request.state.user_id = user.id
-        request.state.tier = plan # BE-LLM-4: Enable tier-aware rate limiting
+        request.state.tenant_id = current_user.tenant_id
+        request.state.user_id = current_user.id
+        request.state.tier = principal["tier"] # BE-LLM-4: Enable tier-aware rate limiting
 
         # Propagate RLS context to the database session
-        await set_session_tenant_id(db, user.tenant_id)
-
-        logger.info("user_authenticated", user_id=str(user.id), email=user.email, role=user.role, tier=plan)
-
-        return CurrentUser(
-            id=user.id,
-            email=user.email,
-            tenant_id=user.tenant_id,
-            role=user.role,
-            tier=plan
+        await set_session_tenant_id(db, current_user.tenant_id)
+        # Downstream tier checks on this session reuse the plan loaded here
+        remember_entitlements(db, current_user.tenant_id, principal["tier"])
+
+        logger.info(
+            "user_authenticated",
+            user_id=principal["id"],
+            email=principal["email"],
+            role=principal["role"],
+            tier=principal["tier"],
         )
+        outcome = "ok"
+        return current_user
     except HTTPException:
         # Re-raise known HTTP exceptions (like 403 User not found)
         raise
@@ -182,6 +203,8 @@ async def get_current_user(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Authentication failed due to an internal server error"
         )
+    finally:
+        AUTH_LATENCY_SECONDS.labels(outcome=outcome).observe(time.perf_counter() - started)
 
 
 
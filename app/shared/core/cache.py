@@ -4,7 +4,9 @@ Redis Cache Service using Upstash Redis
 Provides async caching for:
 - LLM analysis results (24h TTL)
 - Cost data (6h TTL)
+- Grounding forecasts by cost data version (24h TTL)
 - Tenant metadata (1h TTL)
+- Last ingestion write per tenant, for read-your-writes replica routing
 
 Uses Upstash free tier (10K commands/day) which is sufficient for:
 - 100 tenants × 10 cache ops/day = 1000 ops
@@ -28,10 +30,13 @@ logger = structlog.get_logger()
 ANALYSIS_TTL = timedelta(hours=24)
 COST_DATA_TTL = timedelta(hours=6)
 METADATA_TTL = timedelta(hours=1)
+FORECAST_TTL = timedelta(hours=24)
 
 # Key Prefixes
 PREFIX_ANALYSIS = "analysis"
 PREFIX_COSTS = "costs"
+PREFIX_FORECAST = "forecast"
+PREFIX_LAST_WRITE = "last_write"
 
 # Singleton instances
 _sync_client: Optional[Redis] = None
@@ -107,6 +112,25 @@ class CacheService:
         key = f"{PREFIX_COSTS}:{tenant_id}:{date_range}"
         return await self._set(key, costs, COST_DATA_TTL)
     
+    async def get_forecast(self, tenant_id: Optional[UUID], version: str) -> Optional[dict]:
+        """Get a stored grounding forecast for a tenant's cost data version."""
+        key = f"{PREFIX_FORECAST}:{tenant_id}:{version}"
+        return await self._get(key)
+
+    async def set_forecast(self, tenant_id: Optional[UUID], version: str, forecast: dict) -> bool:
+        """Store a grounding forecast with 24h TTL."""
+        key = f"{PREFIX_FORECAST}:{tenant_id}:{version}"
+        return await self._set(key, forecast, FORECAST_TTL)
+
+    async def get_last_write(self, tenant_id: UUID) -> Optional[float]:
+        """Unix time of the tenant's last committed ingestion write, if recent."""
+        value = await self._get(f"{PREFIX_LAST_WRITE}:{tenant_id}")
+        return float(value) if value is not None else None
+
+    async def set_last_write(self, tenant_id: UUID, written_at: float, ttl: timedelta) -> bool:
+        """Remember the tenant's last committed ingestion write for `ttl`."""
+        return await self._set(f"{PREFIX_LAST_WRITE}:{tenant_id}", written_at, ttl)
+
     async def invalidate_tenant(self, tenant_id: UUID) -> bool:
         """Invalidate all cache entries for a tenant."""
         if not self.enabled:
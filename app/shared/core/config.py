@@ -20,6 +20,7 @@ class Settings(BaseSettings):
     CSRF_SECRET_KEY: Optional[str] = None # SEC-01: CSRF
     TESTING: bool = False
     RATELIMIT_ENABLED: bool = True
+    EMISSIONS_TRACKER_ENABLED: bool = False  # Opt-in codecarbon tracking of the API's own footprint (started in the background)
 
     @model_validator(mode='after')
     def validate_security_config(self) -> 'Settings':
@@ -132,6 +133,13 @@ class Settings(BaseSettings):
     LLM_PROVIDER: str = "groq" # Options: openai, claude, google, groq
     ENABLE_DELTA_ANALYSIS: bool = True # Innovation 1: Reduce token usage by 90%
     DELTA_ANALYSIS_DAYS: int = 3
+    LLM_PROMPT_TOKEN_BUDGET: int = 6000 # Cost data is compacted to fit this many tokens
+    LLM_BATCH_CONCURRENCY_PER_PROVIDER: int = 4  # Concurrent LLM calls per provider in scheduled batch analysis
+    # Provider circuit breaker (shared across workers via REDIS_URL)
+    LLM_CIRCUIT_WINDOW_SECONDS: int = 60  # Rolling error-rate / latency window
+    LLM_CIRCUIT_ERROR_RATE: float = 0.5  # Open the circuit at this error rate...
+    LLM_CIRCUIT_MIN_REQUESTS: int = 5  # ...once the window has at least this many calls
+    LLM_CIRCUIT_RECOVERY_SECONDS: int = 30  # Open circuits admit one probe after this
 
     # Scheduler
     SCHEDULER_HOUR: int = 8
@@ -146,6 +154,12 @@ class Settings(BaseSettings):
     DB_SSL_CA_CERT_PATH: Optional[str] = None  # Path to CA cert for verify-ca/verify-full modes
     DB_POOL_SIZE: int = 20  # Standard for Supabase/Neon free tiers
     DB_MAX_OVERFLOW: int = 10
+    # Read replica for reporting/analytics reads (unset: everything runs on the primary)
+    DATABASE_READ_REPLICA_URL: Optional[str] = None
+    DB_REPLICA_POOL_SIZE: int = 10
+    DB_REPLICA_MAX_LAG_SECONDS: float = 30.0  # Above this, replica reads fall back to the primary
+    DB_REPLICA_LAG_CHECK_SECONDS: float = 5.0  # How long a replica lag probe is reused
+    DB_READ_YOUR_WRITES_WINDOW_SECONDS: int = 900  # How long a tenant's ingestion write is remembered
 
     # Supabase Auth
     SUPABASE_URL: Optional[str] = None
@@ -180,6 +194,25 @@ class Settings(BaseSettings):
     # Cache (Redis for production, in-memory for dev)
     REDIS_URL: Optional[str] = None  # e.g., redis://localhost:6379
     
+    STS_CREDENTIAL_CACHE_REDIS: bool = False  # Share encrypted STS credentials across workers via REDIS_URL
+    AUTH_PRINCIPAL_CACHE_BACKEND: str = "auto"  # auto (redis tier if REDIS_URL), memory, off
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: int = 60  # Shared (Redis) tier for user/tenant lookups in get_current_user
+    AUTH_PRINCIPAL_CACHE_L1_TTL_SECONDS: int = 5  # Per-process tier; bounds staleness on other workers after invalidation
+    ENTITLEMENTS_CACHE_TTL_SECONDS: int = 60  # Per-process tenant tier cache behind get_tenant_tier
+    HEALTH_SNAPSHOT_INTERVAL_MINUTES: int = 5  # Scheduled capture of the admin health dashboard
+    HEALTH_SNAPSHOT_RETENTION_DAYS: int = 90  # Snapshot history kept for trend charts
+    PARTITION_PRECREATE_MONTHS: int = 3  # Monthly partitions created ahead of the current month
+    PARTITION_EXPIRED_ACTION: str = "archive"  # archive (detach + rename to <table>_archive_YYYY_MM) or drop
+    PARTITION_ARCHIVE_RETENTION_DAYS: int = 365  # Archived partitions are dropped this long after leaving retention
+    PARTITION_LIFECYCLE_DRY_RUN: bool = False  # Scheduled run only logs and counts the planned actions
+    COST_RECORDS_MIN_RETENTION_DAYS: int = 365  # Floor under the per-tier retention for cost_records partitions
+    AUDIT_LOGS_MIN_RETENTION_DAYS: int = 730  # Floor under the per-tier retention for audit_logs partitions
+    LLM_RESPONSE_CACHE_BACKEND: str = "auto"  # auto (redis if REDIS_URL, else memory), redis, memory, off
+    LLM_RESPONSE_CACHE_TTL_SECONDS: int = 86400
+    LLM_RESPONSE_CACHE_MAX_ENTRIES: int = 200  # Per tenant; oldest entries are evicted first
+    LLM_ADMISSION_SNAPSHOT_TTL_SECONDS: int = 60  # Per-process budget/tier snapshot used for LLM admission
+    LLM_ADMISSION_MAX_CLIENTS: int = 64  # Per-process cache of BYOK LLM clients
+
     # Upstash Redis (Serverless - Free tier: 10K commands/day)
     UPSTASH_REDIS_URL: Optional[str] = None  # e.g., https://xxx.upstash.io
     UPSTASH_REDIS_TOKEN: Optional[str] = None
@@ -1,11 +1,16 @@
-from fastapi import Depends, HTTPException
-from typing import Annotated
+import inspect
+from contextlib import asynccontextmanager
+from fastapi import Depends, HTTPException, Request
+from typing import Annotated, AsyncIterator
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.shared.core.config import get_settings
 from app.shared.llm.factory import LLMFactory
 from app.shared.llm.analyzer import FinOpsAnalyzer
-from app.shared.core.auth import CurrentUser, requires_role
+from app.shared.core.auth import CurrentUser, get_current_user, requires_role
 from app.shared.core.pricing import PricingTier, is_feature_enabled, FeatureFlag
+from app.shared.db.replica import ReadConsistency, get_replica_router, stronger
+from app.shared.db.session import get_db
 
 def get_llm_provider() -> str:
     settings = get_settings()
@@ -32,3 +37,44 @@ def requires_feature(feature_name: str | FeatureFlag):
             )
         return user
     return feature_checker
+
+@asynccontextmanager
+async def _primary_session(request: Request) -> AsyncIterator[AsyncSession]:
+    """A get_db session for the request, honouring app.dependency_overrides[get_db]."""
+    provider = request.app.dependency_overrides.get(get_db, get_db)
+    result = provider(request) if inspect.signature(provider).parameters else provider()
+    if inspect.isasyncgen(result):
+        try:
+            yield await result.__anext__()
+        finally:
+            await result.aclose()
+        return
+    yield await result if inspect.isawaitable(result) else result
+
+def read_db(consistency: ReadConsistency = ReadConsistency.BOUNDED_STALENESS):
+    """
+    Dependency for read-only reporting queries: a session on the read replica
+    when `consistency` allows it, otherwise a primary session opened only then.
+    Clients can ask for a stronger mode with the X-Read-Consistency header
+    (e.g. `primary` right after triggering an ingestion), never a weaker one.
+    """
+    async def read_session(
+        request: Request,
+        user: Annotated[CurrentUser, Depends(get_current_user)],
+    ) -> AsyncIterator[AsyncSession]:
+        try:
+            requested = ReadConsistency(request.headers.get("X-Read-Consistency", "").lower())
+        except ValueError:
+            requested = None
+        mode = stronger(consistency, requested)
+
+        replica = await get_replica_router().open_replica_session(mode, user.tenant_id)
+        if replica is None:
+            async with _primary_session(request) as db:
+                yield db
+            return
+        try:
+            yield replica
+        finally:
+            await replica.close()
+    return read_session
@@ -1,68 +1,136 @@
-from starlette.middleware.base import BaseHTTPMiddleware
-from fastapi import Request
+"""
+Security headers and request-ID middleware.
+
+Both are pure ASGI: they only touch the http.response.start message, so
+response bodies, including streaming and SSE responses, pass through
+untouched and no extra task is spawned per request. Header blocks are
+built once when the middleware stack is created.
+"""
+
 import uuid
+from contextvars import ContextVar
+from typing import Iterable, List, Optional, Tuple
+
 import structlog
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
 from app.shared.core.config import get_settings
 from app.shared.core.tracing import set_correlation_id
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        settings = get_settings()
+Header = Tuple[bytes, bytes]
+
+# Request ID of the request being served, for code outside the request object
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+def get_request_id() -> Optional[str]:
+    return _request_id.get()
 
-        response = await call_next(request)
+
+def _set_headers(headers: Iterable[Header], extra: List[Header], names: frozenset) -> List[Header]:
+    """Headers with `extra` set, replacing any existing values of the same names."""
+    return [h for h in headers if h[0].lower() not in names] + extra
+
+
+class SecurityHeadersMiddleware:
+    # Swagger UI needs inline scripts, so these skip the strict CSP block
+    DOCS_PATHS = frozenset({"/docs", "/redoc", "/openapi.json"})
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        settings = get_settings()
 
         # HSTS: Disable in debug mode for local development
         if settings.DEBUG:
-            response.headers["Strict-Transport-Security"] = "max-age=0"
+            hsts = "max-age=0"
         else:
-            response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains; preload"
-
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-
-        # Skip strict CSP for Swagger UI (requires inline scripts)
-        if request.url.path in ["/docs", "/redoc", "/openapi.json"]:
-            return response
+            hsts = "max-age=31536000; includeSubDomains; preload"
 
         # CSP connect-src: Restrict based on allowed origins from config
-        # Convert CORS_ORIGINS list to a space-separated string for CSP
         allowed_origins = " ".join(settings.CORS_ORIGINS)
-        connect_src = f"'self' {allowed_origins}"
-
         csp_policy = (
             "default-src 'self'; "
             "img-src 'self' data: https:; "
             "script-src 'self'; "
             "style-src 'self' 'unsafe-inline'; "  # Allow inline styles for Svelte/shadcn
-            f"connect-src {connect_src}; "
+            f"connect-src 'self' {allowed_origins}; "
             "frame-ancestors 'none'; "
             "form-action 'self'; "
             "base-uri 'self';"
         )
-        response.headers["Content-Security-Policy"] = csp_policy
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Permissions-Policy"] = "camera=(), microphone=(), geolocation=(), interest-cohort=()"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
 
-        return response
+        base = [
+            (b"strict-transport-security", hsts.encode("latin-1")),
+            (b"x-content-type-options", b"nosniff"),
+            (b"x-frame-options", b"DENY"),
+        ]
+        self._docs_headers = base
+        self._headers = base + [
+            (b"content-security-policy", csp_policy.encode("latin-1")),
+            (b"referrer-policy", b"strict-origin-when-cross-origin"),
+            (b"permissions-policy", b"camera=(), microphone=(), geolocation=(), interest-cohort=()"),
+            (b"x-xss-protection", b"1; mode=block"),
+        ]
+        self._docs_names = frozenset(name for name, _ in self._docs_headers)
+        self._names = frozenset(name for name, _ in self._headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if scope["path"] in self.DOCS_PATHS:
+            extra, names = self._docs_headers, self._docs_names
+        else:
+            extra, names = self._headers, self._names
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = _set_headers(message.get("headers", []), extra, names)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
+class RequestIDMiddleware:
     """
     Injects a unique X-Request-ID into the logs and response.
     Integrates with app.shared.core.tracing for cross-process correlation.
     NOTE: This middleware trusts the X-Request-ID header if provided by the client.
     This is intended for correlation and debugging, not as a security principal.
     """
-    async def dispatch(self, request: Request, call_next):
-        request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
-        
+
+    _NAMES = frozenset({b"x-request-id"})
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = next(
+            (value.decode("latin-1") for name, value in scope["headers"] if name == b"x-request-id"),
+            None,
+        ) or str(uuid.uuid4())
+
         # Set unified tracing context
         set_correlation_id(request_id)
 
         # Log injection via contextvars (supported by structlog)
         structlog.contextvars.clear_contextvars()
         structlog.contextvars.bind_contextvars(request_id=request_id)
+        token = _request_id.set(request_id)
+
+        header = [(b"x-request-id", request_id.encode("latin-1"))]
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = _set_headers(message.get("headers", []), header, self._NAMES)
+            await send(message)
 
-        response = await call_next(request)
-        response.headers["X-Request-ID"] = request_id
-        return response
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            _request_id.reset(token)
@@ -34,6 +34,54 @@ SCAN_TIMEOUTS = Counter(
     ["level"] # 'plugin', 'region', 'overall'
 )
 
+# --- Cloud API Rate Limiting ---
+RATE_LIMIT_WAIT_SECONDS = Histogram(
+    "valdrix_ops_rate_limit_wait_seconds",
+    "Time spent waiting for a cloud API rate limit token",
+    ["api", "backend"], # backend: 'redis' or 'local'
+    buckets=(0, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30)
+)
+
+RATE_LIMIT_FALLBACKS = Counter(
+    "valdrix_ops_rate_limit_fallbacks_total",
+    "Total number of rate limit reservations that fell back to the local bucket",
+    ["api"]
+)
+
+# --- Cloud Credential Caching ---
+STS_CREDENTIAL_REQUESTS = Counter(
+    "valdrix_ops_sts_credential_requests_total",
+    "STS credential lookups by cache result",
+    ["result"] # 'memory_hit', 'redis_hit', 'miss' (miss = AssumeRole call)
+)
+
+# --- Authentication ---
+AUTH_PRINCIPAL_CACHE_REQUESTS = Counter(
+    "valdrix_ops_auth_principal_cache_requests_total",
+    "Principal lookups during authentication by cache result",
+    ["result"] # 'memory_hit', 'redis_hit', 'miss' (miss = DB query), 'invalidate'
+)
+
+AUTH_LATENCY_SECONDS = Histogram(
+    "valdrix_ops_auth_latency_seconds",
+    "Time spent resolving the authenticated user for a request",
+    ["outcome"], # 'ok', 'denied', 'error'
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+)
+
+ENTITLEMENT_LOOKUPS = Counter(
+    "valdrix_ops_entitlement_lookups_total",
+    "Tenant tier/entitlement resolutions by source",
+    ["result"] # 'request_hit', 'cache_hit', 'miss' (miss = DB query)
+)
+
+# --- Notifications ---
+EMAIL_DELIVERIES = Counter(
+    "valdrix_ops_email_deliveries_total",
+    "Outbound email delivery attempts by outcome",
+    ["result"] # 'sent', 'retried', 'failed'
+)
+
 # --- API & Remediation Metrics ---
 API_ERRORS_TOTAL = Counter(
     "valdrix_ops_api_errors_total",
@@ -61,9 +109,98 @@ LLM_PRE_AUTH_DENIALS = Counter(
     ["reason", "tenant_tier"]
 )
 
+LLM_PROVIDER_CIRCUIT_STATE = Gauge(
+    "valdrix_ops_llm_provider_circuit_state",
+    "LLM provider circuit state (0 = closed, 1 = half-open, 2 = open)",
+    ["provider"]
+)
+
+LLM_PROVIDER_ERROR_RATE = Gauge(
+    "valdrix_ops_llm_provider_error_rate",
+    "LLM provider error rate over the rolling circuit window",
+    ["provider"]
+)
+
+LLM_PROVIDER_LATENCY_SECONDS = Gauge(
+    "valdrix_ops_llm_provider_latency_seconds",
+    "LLM provider mean call latency over the rolling circuit window",
+    ["provider"]
+)
+
+LLM_RESPONSE_CACHE_REQUESTS = Counter(
+    "valdrix_ops_llm_response_cache_requests_total",
+    "LLM response cache lookups and writes by outcome",
+    ["result"] # 'hit', 'miss', 'store', 'evict', 'error'
+)
+
+LLM_GUARDRAIL_HITS = Counter(
+    "valdrix_ops_llm_guardrail_hits_total",
+    "Total number of LLM input strings redacted by guardrail rule",
+    ["rule"]
+)
+
+# --- Cost Ingestion ---
+COST_INGESTION_CONNECTIONS = Counter(
+    "valdrix_ops_cost_ingestion_connections_total",
+    "Connections handled by cost ingestion jobs, by provider and outcome",
+    ["provider", "outcome"] # outcome: 'ingested', 'failed', 'deferred'
+)
+
+# --- Database Read Routing ---
+DB_READ_ROUTING = Counter(
+    "valdrix_ops_db_read_routing_total",
+    "Read sessions by target engine and routing reason",
+    ["target", "reason"]
+)
+
+DB_REPLICA_LAG_SECONDS = Gauge(
+    "valdrix_ops_db_replica_lag_seconds",
+    "Replication lag of the read replica at the last probe"
+)
+
+# --- Partition Lifecycle ---
+PARTITION_LIFECYCLE_ACTIONS = Counter(
+    "valdrix_ops_partition_lifecycle_actions_total",
+    "Partition lifecycle actions by table, action and outcome",
+    ["table", "action", "outcome"]  # action: create, archive, drop, drop_archive; outcome: planned, applied, failed, blocked
+)
+
+DEFAULT_PARTITION_ROWS = Gauge(
+    "valdrix_ops_default_partition_rows",
+    "Rows found in a partitioned table's DEFAULT partition (should be 0)",
+    ["table"]
+)
+
+# --- Startup Ops ---
+STARTUP_PHASE_SECONDS = Gauge(
+    "valdrix_ops_startup_phase_seconds",
+    "Wall time of each process startup phase (imports, routers, scheduler, ...)",
+    ["phase"]
+)
+
+# --- Audit Ops ---
+AUDIT_ENTRIES_WRITTEN = Counter(
+    "valdrix_ops_audit_entries_written_total",
+    "Audit entries written, by write path and outcome",
+    ["path", "outcome"] # path: 'unit_of_work'; outcome: 'written', 'discarded'
+)
+
+AUDIT_BATCH_SIZE = Histogram(
+    "valdrix_ops_audit_batch_size",
+    "Audit entries per multi-row insert",
+    ["path"],
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+)
+
 # --- RLS & Security Ops ---
 RLS_CONTEXT_MISSING = Counter(
     "valdrix_ops_rls_context_missing_total",
     "Total number of database queries executed without RLS context in request lifecycle",
     ["statement_type"]
 )
+
+RLS_ENFORCEMENT_DECISIONS = Counter(
+    "valdrix_ops_rls_enforcement_decisions_total",
+    "RLS listener decisions per executed statement",
+    ["decision"] # 'exempt', 'allowed', 'system' (no request context), 'denied'
+)
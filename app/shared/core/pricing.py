@@ -1,7 +1,10 @@
+import time
 import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
 from enum import Enum
 from functools import wraps
-from typing import Optional, Callable, Dict, TYPE_CHECKING, List, Union, Set, Any, Awaitable
+from typing import Optional, Callable, Dict, TYPE_CHECKING, List, Union, Set, Any, Awaitable, Tuple
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
     from app.modules.governance.domain.security.auth import CurrentUser
@@ -10,6 +13,8 @@ from fastapi import HTTPException, status
 
 import structlog
 
+from app.shared.core.ops_metrics import ENTITLEMENT_LOOKUPS
+
 logger = structlog.get_logger()
 
 
@@ -324,29 +329,171 @@ def requires_feature(feature_name: Union[str, FeatureFlag]) -> Callable[[Callabl
     return decorator
 
 
-async def get_tenant_tier(tenant_id: Union[str, uuid.UUID], db: "AsyncSession") -> PricingTier:
-    """Get the pricing tier for a tenant."""
+ENTITLEMENTS_SESSION_KEY = "entitlements"
+MAX_CACHED_ENTITLEMENTS = 4096
+
+
+@dataclass(frozen=True)
+class Entitlements:
+    """A tenant's resolved tier with its features and limits."""
+    tenant_id: Optional[uuid.UUID]
+    tier: PricingTier
+
+    def has(self, feature: Union[str, FeatureFlag]) -> bool:
+        return is_feature_enabled(self.tier, feature)
+
+    def limit(self, limit_name: str) -> Optional[int]:
+        return get_tier_limit(self.tier, limit_name)
+
+    @property
+    def features(self) -> Set[FeatureFlag]:
+        return set(get_tier_config(self.tier).get("features", set()))
+
+
+class EntitlementCache:
+    """
+    Bounded per-process tenant -> tier map shared across requests.
+    Entries expire after a TTL and are dropped as soon as Tenant.plan is
+    written (see the listener in app.models.tenant).
+    """
+
+    def __init__(self, ttl_seconds: Optional[int] = None, max_entries: int = MAX_CACHED_ENTITLEMENTS,
+                 clock: Callable[[], float] = time.monotonic):
+        from app.shared.core.config import get_settings
+        self.ttl_seconds = int(ttl_seconds if ttl_seconds is not None else get_settings().ENTITLEMENTS_CACHE_TTL_SECONDS)
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[uuid.UUID, Tuple[float, PricingTier]]" = OrderedDict()
+
+    def get(self, tenant_id: uuid.UUID) -> Optional[PricingTier]:
+        entry = self._entries.get(tenant_id)
+        if entry is None:
+            return None
+        expires_at, tier = entry
+        if self._clock() >= expires_at:
+            self._entries.pop(tenant_id, None)
+            return None
+        self._entries.move_to_end(tenant_id)
+        return tier
+
+    def put(self, tenant_id: uuid.UUID, tier: PricingTier) -> None:
+        self._entries[tenant_id] = (self._clock() + self.ttl_seconds, tier)
+        self._entries.move_to_end(tenant_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, tenant_id: Optional[uuid.UUID] = None) -> None:
+        if tenant_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(tenant_id, None)
+
+
+_entitlement_cache: Optional[EntitlementCache] = None
+
+
+def get_entitlement_cache() -> EntitlementCache:
+    """Get the process-wide entitlement cache."""
+    global _entitlement_cache
+    if _entitlement_cache is None:
+        _entitlement_cache = EntitlementCache()
+    return _entitlement_cache
+
+
+def reset_entitlement_cache() -> None:
+    global _entitlement_cache
+    _entitlement_cache = None
+
+
+def _session_entitlements(db: Any) -> Optional[Dict[uuid.UUID, Entitlements]]:
+    """Request-scoped entitlements, kept on the request's DB session."""
+    info = getattr(db, "info", None)
+    if not isinstance(info, dict):
+        return None
+    return info.setdefault(ENTITLEMENTS_SESSION_KEY, {})
+
+
+def remember_entitlements(db: Any, tenant_id: Union[str, uuid.UUID], tier: Union[str, PricingTier]) -> Entitlements:
+    """Seed the request scope with a tier that is already known (e.g. from authentication)."""
+    if isinstance(tenant_id, str):
+        tenant_id = uuid.UUID(tenant_id)
+    try:
+        tier = PricingTier(tier)
+    except ValueError:
+        tier = PricingTier.FREE
+    entitlements = Entitlements(tenant_id, tier)
+    scoped = _session_entitlements(db)
+    if scoped is not None:
+        scoped[tenant_id] = entitlements
+    return entitlements
+
+
+def forget_entitlements(db: Any, tenant_id: Optional[uuid.UUID] = None) -> None:
+    info = getattr(db, "info", None)
+    if not isinstance(info, dict):
+        return
+    if tenant_id is None:
+        info.pop(ENTITLEMENTS_SESSION_KEY, None)
+    else:
+        info.get(ENTITLEMENTS_SESSION_KEY, {}).pop(tenant_id, None)
+
+
+async def resolve_entitlements(tenant_id: Union[str, uuid.UUID], db: "AsyncSession") -> Entitlements:
+    """
+    A tenant's entitlements, loaded at most once per request (DB session)
+    and shared across requests through the entitlement cache.
+    """
     from sqlalchemy import select
     from app.models.tenant import Tenant
-    
+
     if isinstance(tenant_id, str):
         try:
             tenant_id = uuid.UUID(tenant_id)
         except (ValueError, AttributeError):
             # If not a valid UUID string, we can't look it up, so return Free/Trial
-            return PricingTier.FREE
-    
-    try:
-        result = await db.execute(select(Tenant).where(Tenant.id == tenant_id))
-        tenant = result.scalar_one_or_none()
-        
-        if not tenant:
-            return PricingTier.FREE
-        
-        return PricingTier(tenant.plan)
-    except Exception as e:
-        logger.error("get_tenant_tier_failed", tenant_id=str(tenant_id), error=str(e))
-        return PricingTier.FREE
+            return Entitlements(None, PricingTier.FREE)
+
+    scoped = _session_entitlements(db)
+    if scoped is not None and tenant_id in scoped:
+        ENTITLEMENT_LOOKUPS.labels(result="request_hit").inc()
+        return scoped[tenant_id]
+
+    cache = get_entitlement_cache()
+    tier = cache.get(tenant_id)
+    if tier is not None:
+        ENTITLEMENT_LOOKUPS.labels(result="cache_hit").inc()
+    else:
+        ENTITLEMENT_LOOKUPS.labels(result="miss").inc()
+        try:
+            result = await db.execute(select(Tenant.plan).where(Tenant.id == tenant_id))
+            plan = result.scalar_one_or_none()
+        except Exception as e:
+            logger.error("get_tenant_tier_failed", tenant_id=str(tenant_id), error=str(e))
+            return Entitlements(tenant_id, PricingTier.FREE)
+
+        if not plan:
+            # Unknown tenants are not cached; onboarding may create them next
+            return Entitlements(tenant_id, PricingTier.FREE)
+        try:
+            tier = PricingTier(plan)
+        except ValueError:
+            tier = PricingTier.FREE
+        cache.put(tenant_id, tier)
+
+    entitlements = Entitlements(tenant_id, tier)
+    if scoped is not None:
+        scoped[tenant_id] = entitlements
+    return entitlements
+
+
+def invalidate_entitlements(tenant_id: Optional[uuid.UUID] = None) -> None:
+    """Drop cached entitlements for a tenant (or all) after a plan change."""
+    get_entitlement_cache().invalidate(tenant_id)
+
+
+async def get_tenant_tier(tenant_id: Union[str, uuid.UUID], db: "AsyncSession") -> PricingTier:
+    """Get the pricing tier for a tenant."""
+    return (await resolve_entitlements(tenant_id, db)).tier
 
 
 class TierGuard:
@@ -358,14 +505,16 @@ class TierGuard:
             if guard.has(FeatureFlag.AI_INSIGHTS):
                 ...
     """
-    def __init__(self, user: "CurrentUser", db: "AsyncSession"):
+    def __init__(self, user: "CurrentUser", db: "AsyncSession", entitlements: Optional[Entitlements] = None):
         self.user = user
         self.db = db
-        self.tier = PricingTier.FREE
+        self.entitlements = entitlements
+        self.tier = entitlements.tier if entitlements else PricingTier.FREE
 
     async def __aenter__(self) -> "TierGuard":
-        if self.user and self.user.tenant_id:
-            self.tier = await get_tenant_tier(self.user.tenant_id, self.db)
+        if self.entitlements is None and self.user and self.user.tenant_id:
+            self.entitlements = await resolve_entitlements(self.user.tenant_id, self.db)
+            self.tier = self.entitlements.tier
         return self
 
     async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
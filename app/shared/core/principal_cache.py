@@ -0,0 +1,225 @@
+"""
+Principal Cache - Verified user/tenant lookups for request authentication
+
+`get_current_user` verifies the JWT on every request, but the user row and
+tenant plan behind it change rarely. This cache keeps that lookup off the
+database:
+- Per-process L1 keyed by token subject, with a short TTL
+- Optional encrypted Redis tier shared by all workers, with a longer TTL
+- Single-flight: concurrent requests for the same subject share one query
+- Explicit invalidation per user or per tenant (role, plan or status
+  changes); other workers' L1 copies expire within the L1 TTL
+
+Only the DB row is cached; the token itself is still verified every time.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import structlog
+
+from app.shared.core.config import get_settings
+from app.shared.core.ops_metrics import AUTH_PRINCIPAL_CACHE_REQUESTS
+
+logger = structlog.get_logger()
+
+REDIS_KEY_PREFIX = "principal"
+TENANT_INDEX_PREFIX = "principal_tenant"
+MAX_LOCAL_ENTRIES = 10_000
+
+PrincipalLoader = Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+
+
+class PrincipalCache:
+    """
+    Usage:
+        principal = await get_principal_cache().get(sub, load_from_db)
+        await get_principal_cache().invalidate_tenant(tenant_id)  # after a plan change
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[int] = None,
+        local_ttl_seconds: Optional[int] = None,
+        backend: Optional[str] = None,
+        redis_client: Any = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        settings = get_settings()
+        self.ttl_seconds = int(ttl_seconds if ttl_seconds is not None else settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS)
+        self.local_ttl_seconds = int(
+            local_ttl_seconds if local_ttl_seconds is not None else settings.AUTH_PRINCIPAL_CACHE_L1_TTL_SECONDS
+        )
+        self.backend = (backend or settings.AUTH_PRINCIPAL_CACHE_BACKEND).lower()
+        self._redis = redis_client
+        self._clock = clock
+        self._local: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend != "off"
+
+    @staticmethod
+    def cache_key(subject: str) -> str:
+        digest = hashlib.sha256(str(subject).encode()).hexdigest()[:32]
+        return f"{REDIS_KEY_PREFIX}:{digest}"
+
+    @staticmethod
+    def tenant_index_key(tenant_id: Any) -> str:
+        return f"{TENANT_INDEX_PREFIX}:{tenant_id}"
+
+    def _get_lock(self, key: str) -> asyncio.Lock:
+        # Celery tasks run each job on a fresh event loop; locks must not leak across loops
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._locks = {}
+            self._loop = loop
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[key] = lock
+        return lock
+
+    def _get_redis(self) -> Any:
+        if self._redis is not None:
+            return self._redis
+        if self.backend not in ("auto", "redis"):
+            return None
+        from app.shared.core.rate_limit import get_redis_client
+        return get_redis_client()
+
+    def _read_local(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        expires_at, principal = entry
+        if self._clock() >= expires_at:
+            self._local.pop(key, None)
+            return None
+        return principal
+
+    def _write_local(self, key: str, principal: Dict[str, Any]) -> None:
+        self._local[key] = (self._clock() + self.local_ttl_seconds, principal)
+        self._local.move_to_end(key)
+        while len(self._local) > MAX_LOCAL_ENTRIES:
+            self._local.popitem(last=False)
+
+    async def _read_shared(self, key: str) -> Optional[Dict[str, Any]]:
+        redis = self._get_redis()
+        if redis is None:
+            return None
+        try:
+            payload = await redis.get(key)
+            if not payload:
+                return None
+            from app.shared.core.security import decrypt_string
+            decrypted = decrypt_string(payload, context="pii")
+            return json.loads(decrypted) if decrypted else None
+        except Exception as e:
+            logger.warning("principal_cache_redis_read_failed", error=str(e))
+            return None
+
+    async def _write_shared(self, key: str, principal: Dict[str, Any]) -> None:
+        redis = self._get_redis()
+        if redis is None:
+            return
+        try:
+            from app.shared.core.security import encrypt_string
+            payload = encrypt_string(json.dumps(principal, default=str), context="pii")
+            await redis.set(key, payload, ex=self.ttl_seconds)
+            if principal.get("tenant_id"):
+                index = self.tenant_index_key(principal["tenant_id"])
+                await redis.sadd(index, key)
+                await redis.expire(index, self.ttl_seconds)
+        except Exception as e:
+            logger.warning("principal_cache_redis_write_failed", error=str(e))
+
+    async def get(self, subject: str, load: PrincipalLoader) -> Optional[Dict[str, Any]]:
+        """
+        The principal for a verified token subject, calling `load` (the DB
+        lookup) only when no copy exists in memory or Redis. A None from
+        `load` (user not onboarded) is not cached.
+        """
+        if not self.enabled:
+            return await load()
+
+        key = self.cache_key(subject)
+        principal = self._read_local(key)
+        if principal is not None:
+            AUTH_PRINCIPAL_CACHE_REQUESTS.labels(result="memory_hit").inc()
+            return principal
+
+        async with self._get_lock(key):
+            # Another waiter may have loaded it while we queued (single-flight)
+            principal = self._read_local(key)
+            if principal is not None:
+                AUTH_PRINCIPAL_CACHE_REQUESTS.labels(result="memory_hit").inc()
+                return principal
+
+            principal = await self._read_shared(key)
+            if principal is not None:
+                self._write_local(key, principal)
+                AUTH_PRINCIPAL_CACHE_REQUESTS.labels(result="redis_hit").inc()
+                return principal
+
+            AUTH_PRINCIPAL_CACHE_REQUESTS.labels(result="miss").inc()
+            principal = await load()
+            if principal is None:
+                return None
+            self._write_local(key, principal)
+            await self._write_shared(key, principal)
+            return principal
+
+    async def invalidate_user(self, user_id: Any) -> None:
+        """Drop a user's principal (e.g. after a role change or removal)."""
+        key = self.cache_key(str(user_id))
+        self._local.pop(key, None)
+        AUTH_PRINCIPAL_CACHE_REQUESTS.labels(result="invalidate").inc()
+        redis = self._get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.delete(key)
+        except Exception as e:
+            logger.warning("principal_cache_redis_invalidate_failed", error=str(e))
+
+    async def invalidate_tenant(self, tenant_id: Any) -> None:
+        """Drop every principal in a tenant (e.g. after a plan or status change)."""
+        for key in [k for k, (_, p) in self._local.items() if str(p.get("tenant_id")) == str(tenant_id)]:
+            self._local.pop(key, None)
+        AUTH_PRINCIPAL_CACHE_REQUESTS.labels(result="invalidate").inc()
+        redis = self._get_redis()
+        if redis is None:
+            return
+        try:
+            index = self.tenant_index_key(tenant_id)
+            keys = await redis.smembers(index)
+            await redis.delete(index, *keys)
+        except Exception as e:
+            logger.warning("principal_cache_redis_invalidate_failed", tenant_id=str(tenant_id), error=str(e))
+
+    def clear(self) -> None:
+        self._local.clear()
+        self._locks.clear()
+
+
+_cache: Optional[PrincipalCache] = None
+
+
+def get_principal_cache() -> PrincipalCache:
+    """Get or create the process-wide principal cache."""
+    global _cache
+    if _cache is None:
+        _cache = PrincipalCache()
+    return _cache
+
+
+def reset_principal_cache() -> None:
+    global _cache
+    _cache = None
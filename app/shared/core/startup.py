@@ -0,0 +1,74 @@
+"""
+Startup timing and router registration.
+
+API and worker processes are started and stopped by the autoscaler, so
+import and startup cost matter. This module provides:
+- StartupTimer: per-phase wall time (imports, routers, scheduler, ...),
+  logged once at startup and exported as valdrix_ops_startup_phase_seconds
+- RouterSpec / include_routers(): routers are registered from a manifest
+  (module path + prefix) and imported one by one, each under its own phase
+
+IMPORT_STARTED is taken when this module is first imported. It only
+depends on the standard library and structlog, so app.main imports it
+before anything else and the "imports" phase covers the rest of the app.
+
+Heavy optional dependencies (cloud SDK adapters, pandas/Prophet, langchain,
+codecarbon) are imported where they are first used, not at module level;
+tests/core/test_startup.py enforces that and an import-time budget.
+"""
+
+import importlib
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, NamedTuple, Optional
+
+import structlog
+
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+
+IMPORT_STARTED = time.perf_counter()
+
+logger = structlog.get_logger()
+
+
+class StartupTimer:
+    def __init__(self, started_at: Optional[float] = None):
+        self.started_at = started_at if started_at is not None else time.perf_counter()
+        self.phases: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def record(self, name: str, seconds: float) -> None:
+        from app.shared.core.ops_metrics import STARTUP_PHASE_SECONDS
+
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+        STARTUP_PHASE_SECONDS.labels(phase=name).set(self.phases[name])
+
+    def report(self, event: str = "startup_timing") -> Dict[str, float]:
+        """Log every phase and the total since the timer started (milliseconds)."""
+        timings = {name: round(seconds * 1000, 1) for name, seconds in self.phases.items()}
+        total = round((time.perf_counter() - self.started_at) * 1000, 1)
+        logger.info(event, total_ms=total, phases_ms=timings)
+        return timings
+
+
+class RouterSpec(NamedTuple):
+    module: str
+    prefix: str = ""
+    attr: str = "router"
+
+
+def include_routers(app: "FastAPI", manifest: Iterable[RouterSpec], timer: Optional[StartupTimer] = None) -> None:
+    """Import and mount each router in the manifest, in order."""
+    timer = timer or StartupTimer()
+    for spec in manifest:
+        with timer.phase(f"router:{spec.module.rsplit('.', 1)[-1]}"):
+            router = getattr(importlib.import_module(spec.module), spec.attr)
+            app.include_router(router, prefix=spec.prefix)
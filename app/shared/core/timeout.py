@@ -5,9 +5,8 @@ Enforces maximum request duration to prevent zombie scans from blocking workers.
 """
 
 import asyncio
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import structlog
 
 
@@ -18,36 +17,54 @@ logger = structlog.get_logger()
 DEFAULT_TIMEOUT_SECONDS = 300  # 5 minutes
 
 
-class TimeoutMiddleware(BaseHTTPMiddleware):
+class TimeoutMiddleware:
     """
     Middleware to enforce request timeouts.
 
     Cancels requests that exceed the configured timeout to prevent
     resource exhaustion from long-running operations.
+
+    The deadline covers the time until the response starts; once headers
+    are sent the body (e.g. a streaming export or SSE feed) runs unbounded.
     """
 
-    def __init__(self, app, timeout_seconds: int | None = None):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, timeout_seconds: int | None = None):
+        self.app = app
         settings = get_settings()
         self.timeout_seconds = timeout_seconds or getattr(settings, "REQUEST_TIMEOUT", DEFAULT_TIMEOUT_SECONDS)
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+        deadline = asyncio.timeout(self.timeout_seconds)
         try:
-            return await asyncio.wait_for(
-                call_next(request),
-                timeout=self.timeout_seconds
-            )
-        except asyncio.TimeoutError:
+            async with deadline:
+                async def send_and_clear_deadline(message: Message) -> None:
+                    nonlocal response_started
+                    if message["type"] == "http.response.start":
+                        response_started = True
+                        deadline.reschedule(None)
+                    await send(message)
+
+                await self.app(scope, receive, send_and_clear_deadline)
+        except TimeoutError:
+            # Not ours to answer: the app raised it, or headers are already out
+            if response_started or not deadline.expired():
+                raise
             logger.warning(
                 "request_timeout",
-                path=request.url.path,
-                method=request.method,
+                path=scope["path"],
+                method=scope["method"],
                 timeout_seconds=self.timeout_seconds
             )
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=504,
                 content={
                     "detail": f"Request timed out after {self.timeout_seconds} seconds",
                     "error": "gateway_timeout"
                 }
             )
+            await response(scope, receive, send)
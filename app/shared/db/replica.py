@@ -0,0 +1,331 @@
+"""
+Read-replica routing for reporting and analytics reads.
+
+When DATABASE_READ_REPLICA_URL is set, read-only, staleness-tolerant
+queries (cost dashboards, leaderboards, audit exports) can run on a replica
+engine instead of competing with ingestion writes on the primary. Each read
+picks a consistency mode:
+
+- PRIMARY: always the primary.
+- BOUNDED_STALENESS: the replica while its lag is within
+  DB_REPLICA_MAX_LAG_SECONDS.
+- READ_YOUR_WRITES: as above, and the replica must also have replayed the
+  tenant's last committed ingestion write. Ingestion marks tenants on the
+  session (note_tenant_write); on commit the marker is kept in-process and
+  shared through Redis so API processes see worker writes. Without Redis a
+  replica that is not fully caught up is not trusted for these reads.
+
+Replica sessions get the same RLS context as primary ones. If the probe or
+the connection fails, or the replica lags, reads fall back to the primary.
+Without a replica URL everything runs on the primary, as before.
+"""
+
+import asyncio
+import time
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import AsyncIterator, Dict, Optional, Set, Tuple
+
+import structlog
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.shared.core.cache import get_cache_service
+from app.shared.core.config import get_settings
+from app.shared.core.ops_metrics import DB_READ_ROUTING, DB_REPLICA_LAG_SECONDS
+from app.shared.db.session import (
+    after_cursor_execute,
+    async_session_maker,
+    before_cursor_execute,
+    connect_args,
+    pool_args,
+    set_session_tenant_id,
+)
+
+logger = structlog.get_logger()
+
+PRIMARY = "primary"
+REPLICA = "replica"
+
+TENANT_WRITES_KEY = "replica_tenant_writes"
+
+# NULLs on a server that is not replaying WAL (e.g. the replica URL points at a primary)
+REPLICA_LAG_QUERY = text(
+    "SELECT pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() AS caught_up, "
+    "pg_last_xact_replay_timestamp() AS replayed_at, "
+    "EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) AS lag"
+)
+
+
+class ReadConsistency(str, Enum):
+    PRIMARY = "primary"
+    READ_YOUR_WRITES = "read_your_writes"
+    BOUNDED_STALENESS = "bounded_staleness"
+
+
+# Strongest first; a request may ask for a stronger mode than its endpoint's default
+CONSISTENCY_STRENGTH = {
+    ReadConsistency.PRIMARY: 2,
+    ReadConsistency.READ_YOUR_WRITES: 1,
+    ReadConsistency.BOUNDED_STALENESS: 0,
+}
+
+
+def stronger(a: ReadConsistency, b: Optional[ReadConsistency]) -> ReadConsistency:
+    if b is None or CONSISTENCY_STRENGTH[a] >= CONSISTENCY_STRENGTH[b]:
+        return a
+    return b
+
+
+@dataclass(frozen=True)
+class ReplicaStatus:
+    healthy: bool
+    lag_seconds: float
+    caught_up: bool
+    replayed_at: Optional[datetime]
+    checked_at: float
+
+
+def _create_replica_engine() -> Optional[AsyncEngine]:
+    settings = get_settings()
+    url = settings.DATABASE_READ_REPLICA_URL
+    # Tests run on in-memory SQLite; a Postgres replica URL there is ignored
+    if not url or (settings.TESTING and "sqlite" not in url):
+        return None
+    replica_pool_args = dict(pool_args)
+    if "pool_size" in replica_pool_args:
+        replica_pool_args["pool_size"] = settings.DB_REPLICA_POOL_SIZE
+    replica = create_async_engine(
+        url,
+        echo=settings.DEBUG,
+        pool_pre_ping=True,
+        pool_recycle=300,
+        connect_args=connect_args,
+        **replica_pool_args
+    )
+    event.listen(replica.sync_engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(replica.sync_engine, "after_cursor_execute", after_cursor_execute)
+    logger.info("db_read_replica_configured")
+    return replica
+
+
+replica_engine = _create_replica_engine()
+
+
+async def prepare_read_session(session: AsyncSession, tenant_id: Optional[uuid.UUID]) -> None:
+    """
+    Apply RLS context exactly as request sessions on the primary get it. The
+    connection is checked out here, so an unreachable replica fails now.
+    """
+    if tenant_id is not None:
+        await set_session_tenant_id(session, tenant_id)
+    else:
+        # System-level read, same as get_db without a request
+        session.info["rls_context_set"] = True
+    await session.connection()
+
+
+class ReplicaRouter:
+    """Decides per read whether the replica is fresh enough, and opens sessions on it."""
+
+    def __init__(
+        self,
+        session_maker: Optional[async_sessionmaker] = None,
+        max_lag_seconds: float = 30.0,
+        check_interval_seconds: float = 5.0,
+        write_window_seconds: float = 900.0,
+    ):
+        self.session_maker = session_maker
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self.write_window_seconds = write_window_seconds
+        self._status: Optional[ReplicaStatus] = None
+        self._writes: Dict[str, float] = {}
+        self._publishing: Set[asyncio.Task] = set()
+        self._probe_lock: Optional[asyncio.Lock] = None
+        self._probe_lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.session_maker is not None
+
+    def _is_stale(self, now: float) -> bool:
+        return self._status is None or now - self._status.checked_at >= self.check_interval_seconds
+
+    def _lock(self) -> asyncio.Lock:
+        # Celery tasks each run their own event loop; a lock is only valid within one
+        loop = asyncio.get_running_loop()
+        if self._probe_lock_loop is not loop:
+            self._probe_lock, self._probe_lock_loop = asyncio.Lock(), loop
+        return self._probe_lock
+
+    async def status(self) -> ReplicaStatus:
+        """Replica health and lag, probed at most once per check interval (one probe at a time)."""
+        if not self._is_stale(time.monotonic()):
+            return self._status
+        async with self._lock():
+            now = time.monotonic()
+            if self._is_stale(now):
+                self._status = await self._probe(now)
+        return self._status
+
+    async def _probe(self, now: float) -> ReplicaStatus:
+        try:
+            async with self.session_maker() as session:
+                if session.bind.dialect.name != "postgresql":
+                    await session.execute(text("SELECT 1"))
+                    return ReplicaStatus(True, 0.0, True, None, now)
+                row = (await session.execute(REPLICA_LAG_QUERY)).one()
+        except Exception as e:
+            logger.warning("db_replica_probe_failed", error=str(e))
+            return ReplicaStatus(False, 0.0, False, None, now)
+
+        lag = max(float(row.lag or 0.0), 0.0)
+        caught_up = row.caught_up is None or bool(row.caught_up)
+        if caught_up:
+            lag = 0.0
+        DB_REPLICA_LAG_SECONDS.set(lag)
+        return ReplicaStatus(True, lag, caught_up, row.replayed_at, now)
+
+    def mark_unavailable(self, error: Exception) -> None:
+        """Route to the primary until the next probe is due."""
+        logger.warning("db_replica_unavailable", error=str(error))
+        self._status = ReplicaStatus(False, 0.0, False, None, time.monotonic())
+
+    def record_write(self, tenant_id: str, written_at: Optional[float] = None) -> None:
+        """Remember a committed write for the tenant here and, best effort, in Redis."""
+        written_at = written_at or time.time()
+        self._writes[tenant_id] = max(written_at, self._writes.get(tenant_id, 0.0))
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self._publish_write(tenant_id, written_at))
+        self._publishing.add(task)
+        task.add_done_callback(self._publishing.discard)
+
+    async def _publish_write(self, tenant_id: str, written_at: float) -> None:
+        await get_cache_service().set_last_write(
+            tenant_id, written_at, timedelta(seconds=self.write_window_seconds)
+        )
+
+    async def last_write(self, tenant_id: uuid.UUID) -> Optional[float]:
+        """Latest known write for the tenant within the window, from this process or Redis."""
+        local = self._writes.get(str(tenant_id))
+        if local is not None and time.time() - local > self.write_window_seconds:
+            self._writes.pop(str(tenant_id), None)
+            local = None
+        shared = await get_cache_service().get_last_write(tenant_id)
+        known = [t for t in (local, shared) if t is not None]
+        return max(known) if known else None
+
+    async def route(self, consistency: ReadConsistency, tenant_id: Optional[uuid.UUID]) -> Tuple[str, str]:
+        """(target, reason) for a read with the given consistency."""
+        if not self.enabled:
+            return PRIMARY, "no_replica"
+        if consistency is ReadConsistency.PRIMARY:
+            return PRIMARY, "requested"
+
+        status = await self.status()
+        if not status.healthy:
+            return PRIMARY, "replica_unavailable"
+        if status.lag_seconds > self.max_lag_seconds:
+            return PRIMARY, "replica_lag"
+
+        if consistency is ReadConsistency.READ_YOUR_WRITES and not status.caught_up and tenant_id is not None:
+            written_at = await self.last_write(tenant_id)
+            if written_at is None:
+                # No marker: either no recent write, or no shared store to have seen it in
+                if not get_cache_service().enabled:
+                    return PRIMARY, "write_unknown"
+            elif status.replayed_at is None or status.replayed_at.timestamp() < written_at:
+                return PRIMARY, "behind_write"
+
+        return REPLICA, "ok"
+
+    async def open_replica_session(
+        self, consistency: ReadConsistency, tenant_id: Optional[uuid.UUID]
+    ) -> Optional[AsyncSession]:
+        """A prepared replica session, or None when the read belongs on the primary."""
+        target, reason = await self.route(consistency, tenant_id)
+        if target == REPLICA:
+            session = self.session_maker()
+            try:
+                await prepare_read_session(session, tenant_id)
+            except Exception as e:
+                await session.close()
+                self.mark_unavailable(e)
+                target, reason = PRIMARY, "replica_unavailable"
+            else:
+                session.info["read_target"] = REPLICA
+                DB_READ_ROUTING.labels(target=REPLICA, reason=reason).inc()
+                return session
+        DB_READ_ROUTING.labels(target=PRIMARY, reason=reason).inc()
+        return None
+
+
+_replica_router: Optional[ReplicaRouter] = None
+
+
+def get_replica_router() -> ReplicaRouter:
+    global _replica_router
+    if _replica_router is None:
+        settings = get_settings()
+        _replica_router = ReplicaRouter(
+            session_maker=async_sessionmaker(
+                replica_engine, class_=AsyncSession, expire_on_commit=False
+            ) if replica_engine is not None else None,
+            max_lag_seconds=float(settings.DB_REPLICA_MAX_LAG_SECONDS),
+            check_interval_seconds=float(settings.DB_REPLICA_LAG_CHECK_SECONDS),
+            write_window_seconds=float(settings.DB_READ_YOUR_WRITES_WINDOW_SECONDS),
+        )
+    return _replica_router
+
+
+def reset_replica_router() -> None:
+    global _replica_router
+    _replica_router = None
+
+
+@asynccontextmanager
+async def read_session(
+    consistency: ReadConsistency = ReadConsistency.BOUNDED_STALENESS,
+    tenant_id: Optional[uuid.UUID] = None,
+) -> AsyncIterator[AsyncSession]:
+    """Read-only session outside a request: the replica when allowed, else a new primary session."""
+    session = await get_replica_router().open_replica_session(consistency, tenant_id)
+    if session is None:
+        session = async_session_maker()
+        await prepare_read_session(session, tenant_id)
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+def note_tenant_write(session: AsyncSession, tenant_id: object) -> None:
+    """Mark the session's unit of work as writing tenant data (recorded on commit)."""
+    session.info.setdefault(TENANT_WRITES_KEY, set()).add(str(tenant_id))
+
+
+@event.listens_for(Session, "after_commit")
+def _record_committed_tenant_writes(session: Session) -> None:
+    tenants = session.info.pop(TENANT_WRITES_KEY, None)
+    if not tenants:
+        return
+    router = get_replica_router()
+    if not router.enabled:
+        return
+    written_at = time.time()
+    for tenant_id in tenants:
+        router.record_write(tenant_id, written_at)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_tenant_writes(session: Session, previous_transaction) -> None:
+    if not previous_transaction.nested:
+        session.info.pop(TENANT_WRITES_KEY, None)
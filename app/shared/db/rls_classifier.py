@@ -0,0 +1,141 @@
+"""
+RLS Statement Classification
+
+Decides once per distinct SQL statement whether the RLS listener has to
+enforce tenant context for it, instead of re-scanning the SQL text on every
+cursor execution:
+- Statements compiled from Core/ORM constructs resolve their tables from
+  SQLAlchemy metadata (the Table objects in the statement)
+- Raw text() statements fall back to a single scan of their table
+  references, ignoring string literals and the arguments of function calls
+  (EXTRACT(epoch FROM ...), substring(x FROM y)); parenthesised subqueries
+  are still scanned
+- A statement is enforced if it touches any table outside the explicit
+  exemption allow-list; statements that touch no table (SELECT 1,
+  set_config, version()) are not
+
+Compiled SQL strings are cached and reused by SQLAlchemy, so after the
+first execution a classification costs one dict lookup.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, Optional
+
+from sqlalchemy.sql.elements import ClauseElement, TextClause
+from sqlalchemy.sql.expression import TableClause
+from sqlalchemy.sql.util import find_tables
+
+# Tables readable without tenant context: identity/auth lookups that run
+# before the tenant is known, global reference data, and migrations.
+RLS_EXEMPT_TABLES: FrozenSet[str] = frozenset({
+    "users",
+    "tenants",
+    "tenant_subscriptions",
+    "pricing_plans",
+    "exchange_rates",
+    "alembic_version",
+})
+
+MAX_CLASSIFIED_STATEMENTS = 4096
+
+_TABLE_REFERENCE = re.compile(
+    r'\b(?:from|join|into|update|table)\s+(?:only\s+)?((?:"[^"]+"|[\w$]+)(?:\.(?:"[^"]+"|[\w$]+))?)',
+    re.IGNORECASE,
+)
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_SUBQUERY_START = re.compile(r"\s*(?:select|with|values)\b", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class StatementClass:
+    statement_type: str
+    tables: FrozenSet[str]
+    enforced: bool
+
+
+def _statement_type(statement: str) -> str:
+    parts = statement.split(None, 1)
+    return parts[0].upper() if parts else "UNKNOWN"
+
+
+def _compiled_tables(context: Any) -> Optional[FrozenSet[str]]:
+    """Table names from the compiled Core/ORM construct, or None for raw SQL."""
+    compiled = getattr(context, "compiled", None)
+    construct = getattr(compiled, "statement", None)
+    if not isinstance(construct, ClauseElement) or isinstance(construct, TextClause):
+        return None
+    tables = find_tables(construct, include_crud=True)
+    return frozenset(t.name.lower() for t in tables if isinstance(t, TableClause))
+
+
+def _table_context(statement: str) -> str:
+    """The statement with literals and non-subquery parentheses blanked out."""
+    statement = _STRING_LITERAL.sub("''", statement)
+    visible = []
+    # One entry per open parenthesis: does its content hold table references?
+    stack = []
+    for i, char in enumerate(statement):
+        if char == "(":
+            stack.append(bool(_SUBQUERY_START.match(statement, i + 1)))
+            visible.append(" ")
+        elif char == ")":
+            if stack:
+                stack.pop()
+            visible.append(" ")
+        else:
+            visible.append(char if not stack or stack[-1] else " ")
+    return "".join(visible)
+
+
+def _text_tables(statement: str) -> FrozenSet[str]:
+    names = set()
+    for match in _TABLE_REFERENCE.finditer(_table_context(statement)):
+        name = match.group(1).rsplit(".", 1)[-1].strip('"')
+        names.add(name.lower())
+    return frozenset(names)
+
+
+class StatementClassifier:
+    def __init__(
+        self,
+        exempt_tables: Iterable[str] = RLS_EXEMPT_TABLES,
+        max_entries: int = MAX_CLASSIFIED_STATEMENTS,
+    ):
+        self.exempt_tables = frozenset(t.lower() for t in exempt_tables)
+        self.max_entries = max_entries
+        self._cache: Dict[str, StatementClass] = {}
+
+    def classify(self, statement: str, context: Any = None) -> StatementClass:
+        cached = self._cache.get(statement)
+        if cached is not None:
+            return cached
+
+        tables = _compiled_tables(context)
+        if tables is None:
+            tables = _text_tables(statement)
+        result = StatementClass(
+            statement_type=_statement_type(statement),
+            tables=tables,
+            enforced=bool(tables - self.exempt_tables),
+        )
+
+        if len(self._cache) >= self.max_entries:
+            # Evict the oldest classification (dicts keep insertion order)
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[statement] = result
+        return result
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+_classifier: Optional[StatementClassifier] = None
+
+
+def get_statement_classifier() -> StatementClassifier:
+    """Get the process-wide RLS statement classifier."""
+    global _classifier
+    if _classifier is None:
+        _classifier = StatementClassifier()
+    return _classifier
@@ -4,6 +4,7 @@ from typing import Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy import event, text
 from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
 from app.shared.core.config import get_settings
 import structlog
 import sys
@@ -11,11 +12,15 @@ import time
 from fastapi import Request
 from sqlalchemy.pool import StaticPool, NullPool
 from app.shared.core.exceptions import ValdrixException
-from app.shared.core.ops_metrics import RLS_CONTEXT_MISSING
+from app.shared.core.ops_metrics import RLS_CONTEXT_MISSING, RLS_ENFORCEMENT_DECISIONS
+from app.shared.db.rls_classifier import get_statement_classifier
 
 logger = structlog.get_logger()
 settings = get_settings()
 
+# session.info key: tenant whose RLS context is applied when the session begins a transaction
+RLS_TENANT_KEY = "rls_tenant_id"
+
 # Item 6: Critical Startup Error Handling
 if not settings.DATABASE_URL:
     logger.critical("startup_failed_missing_db_url", 
@@ -130,10 +135,15 @@ async_session_maker = async_sessionmaker(
 async def get_db(request: Request = None) -> AsyncSession:
     """
     FastAPI dependency that provides a database session with RLS context.
+
+    No connection is checked out until the session is first used; the RLS
+    context is applied to the connection then (see _apply_rls_context), so a
+    request whose reads all go to the replica never holds a primary connection.
     """
     async with async_session_maker() as session:
         rls_context_set = False
-        
+        connected = False
+
         if request is not None:
             tenant_id = getattr(request.state, "tenant_id", None)
             if tenant_id:
@@ -143,8 +153,10 @@ async def get_db(request: Request = None) -> AsyncSession:
                         {"tid": str(tenant_id)}
                     )
                     rls_context_set = True
+                    session.info[RLS_TENANT_KEY] = tenant_id
                 except Exception as e:
                     logger.warning("rls_context_set_failed", error=str(e))
+                connected = True
         else:
             # For system tasks or background jobs not triggered by a request,
             # we assume the handler will set its own context if needed,
@@ -154,9 +166,9 @@ async def get_db(request: Request = None) -> AsyncSession:
         # PROPAGATION: Ensure the listener can see the RLS status on the connection
         # and satisfy session-level checks in existing tests.
         session.info["rls_context_set"] = rls_context_set
-        
-        conn = await session.connection()
-        conn.info["rls_context_set"] = rls_context_set
+        if connected:
+            conn = await session.connection()
+            conn.info["rls_context_set"] = rls_context_set
         
         try:
             yield session
@@ -168,8 +180,14 @@ async def set_session_tenant_id(session: AsyncSession, tenant_id: uuid.UUID) ->
     """
     Sets the RLS tenant context for the given session.
     Must be called after the tenant_id is known (e.g., in auth dependency).
+
+    On a session that has not checked out a connection yet the context is
+    only recorded, and applied when it does.
     """
     session.info["rls_context_set"] = True
+    session.info[RLS_TENANT_KEY] = tenant_id
+    if not session.in_transaction():
+        return
     
     # We must ensure the connection itself has the info, as listeners look there
     conn = await session.connection()
@@ -185,32 +203,48 @@ async def set_session_tenant_id(session: AsyncSession, tenant_id: uuid.UUID) ->
         except Exception as e:
             logger.warning("failed_to_set_rls_config_in_session", error=str(e))
 
+
+@event.listens_for(Session, "after_begin")
+def _apply_rls_context(session: Session, _transaction, connection) -> None:
+    """Carry the session's RLS context onto each connection/transaction it begins."""
+    if "rls_context_set" not in session.info:
+        return
+    connection.info["rls_context_set"] = session.info["rls_context_set"]
+    tenant_id = session.info.get(RLS_TENANT_KEY)
+    if tenant_id is not None and connection.dialect.name == "postgresql":
+        try:
+            connection.execute(
+                text("SELECT set_config('app.current_tenant_id', :tid, true)"),
+                {"tid": str(tenant_id)}
+            )
+        except Exception as e:
+            logger.warning("failed_to_set_rls_config_in_session", error=str(e))
+
+# Bound once: resolving labels per query costs more than the check itself
+_RLS_DECISIONS = {
+    decision: RLS_ENFORCEMENT_DECISIONS.labels(decision=decision)
+    for decision in ("exempt", "allowed", "system", "denied")
+}
+
 @event.listens_for(Engine, "before_cursor_execute", retval=True)
-def check_rls_policy(conn, _cursor, statement, parameters, _context, _executemany):
+def check_rls_policy(conn, _cursor, statement, parameters, context, _executemany):
     """
     PRODUCTION: Hardened Multi-Tenancy RLS Enforcement
     
     This listener ENFORCES Row-Level Security by raising an exception if a query runs 
     without proper tenant context. This prevents accidental data leaks across tenants.
+
+    Whether a statement needs tenant context is decided once per distinct
+    statement from the tables it references (see rls_classifier); tables on
+    the RLS_EXEMPT_TABLES allow-list and table-less statements are exempt.
     """
     # Skip enforcement in tests to avoid dialect-specific transaction issues (e.g. prepare)
     if settings.TESTING:
         return statement, parameters
-        
-    # Skip internal/system queries or migrations
-    stmt_lower = statement.lower()
-    if (
-        "ix_skipped_table" in stmt_lower or 
-        "alembic" in stmt_lower or
-        "select 1" in stmt_lower or
-        "select version()" in stmt_lower or
-        "select pg_is_in_recovery()" in stmt_lower or
-        "from users" in stmt_lower or
-        "from tenants" in stmt_lower or
-        "from tenant_subscriptions" in stmt_lower or
-        "from pricing_plans" in stmt_lower or
-        "from exchange_rates" in stmt_lower
-    ):
+
+    classification = get_statement_classifier().classify(statement, context)
+    if not classification.enforced:
+        _RLS_DECISIONS["exempt"].inc()
         return statement, parameters
 
     # Identify the state from the connection info
@@ -220,15 +254,13 @@ def check_rls_policy(conn, _cursor, statement, parameters, _context, _executeman
     # Note: None is allowed for system/internal connections that don't go through get_db
     # but for all request-bound sessions, it will be True or False.
     if rls_status is False:
-        try:
-            if statement.split():
-                RLS_CONTEXT_MISSING.labels(statement_type=statement.split()[0].upper()).inc()
-        except Exception as e:
-            logger.debug("rls_metric_increment_failed", error=str(e))
+        _RLS_DECISIONS["denied"].inc()
+        RLS_CONTEXT_MISSING.labels(statement_type=classification.statement_type).inc()
         
         logger.critical(
             "rls_enforcement_violation_detected",
             statement=statement[:200],
+            tables=sorted(classification.tables),
             error="Query executed WITHOUT tenant insulation set. RLS policy violated!"
         )
         
@@ -242,6 +274,6 @@ def check_rls_policy(conn, _cursor, statement, parameters, _context, _executeman
                 "action": "This is a critical security error. Check that all DB sessions are initialized with tenant context."
             }
         )
-    
-    return statement, parameters
 
+    _RLS_DECISIONS["allowed" if rls_status else "system"].inc()
+    return statement, parameters
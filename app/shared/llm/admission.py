@@ -0,0 +1,207 @@
+"""
+LLM Admission Snapshots
+
+Per-tenant, per-process snapshot of everything LLM admission and routing
+read on each request: budget limits and thresholds, preferred
+provider/model, BYOK keys, pricing tier and month-to-date spend. It is
+loaded with one joined query plus one ledger read, then reused until:
+- the TTL expires (LLM_ADMISSION_SNAPSHOT_TTL_SECONDS), which bounds how
+  stale another worker's settings change can be
+- the tenant's LLM settings are updated or deleted in this process
+- recorded spend moves the tenant across a budget threshold
+
+The ledger reservation in LLMBudgetManager.check_and_reserve stays the
+authoritative spend check; the snapshot only decides status (soft/hard
+limit) and routing ahead of it.
+
+BYOK clients are also cached here, keyed by provider, model and a hash of
+the key, so a tenant's requests stop constructing a new client each time.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional, Tuple, TYPE_CHECKING
+from uuid import UUID
+
+import structlog
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.shared.core.config import get_settings
+
+if TYPE_CHECKING:
+    from langchain_core.language_models.chat_models import BaseChatModel
+
+logger = structlog.get_logger()
+
+
+@dataclass(frozen=True)
+class BudgetSettings:
+    """Read-only copy of a tenant's LLMBudget row; usable wherever a loaded budget is accepted."""
+    monthly_limit_usd: Decimal
+    alert_threshold_percent: int
+    hard_limit: bool
+    preferred_provider: str
+    preferred_model: str
+    openai_api_key: Optional[str] = field(default=None, repr=False)
+    claude_api_key: Optional[str] = field(default=None, repr=False)
+    google_api_key: Optional[str] = field(default=None, repr=False)
+    groq_api_key: Optional[str] = field(default=None, repr=False)
+
+    @classmethod
+    def from_budget(cls, budget: Any) -> "BudgetSettings":
+        return cls(
+            monthly_limit_usd=Decimal(str(budget.monthly_limit_usd)),
+            alert_threshold_percent=budget.alert_threshold_percent,
+            hard_limit=bool(budget.hard_limit),
+            preferred_provider=budget.preferred_provider,
+            preferred_model=budget.preferred_model,
+            openai_api_key=budget.openai_api_key,
+            claude_api_key=budget.claude_api_key,
+            google_api_key=budget.google_api_key,
+            groq_api_key=budget.groq_api_key,
+        )
+
+    @property
+    def byok_providers(self) -> Tuple[str, ...]:
+        keys = {
+            "openai": self.openai_api_key,
+            "anthropic": self.claude_api_key,
+            "google": self.google_api_key,
+            "groq": self.groq_api_key,
+        }
+        return tuple(provider for provider, key in keys.items() if key)
+
+
+@dataclass(frozen=True)
+class AdmissionSnapshot:
+    tenant_id: UUID
+    budget: Optional[BudgetSettings]
+    tier: str
+    spent: Decimal
+    expires_at: float
+
+    @property
+    def status(self) -> Any:
+        from app.shared.llm.budget_manager import LLMBudgetManager
+        return LLMBudgetManager.classify_budget(self.budget, self.spent)
+
+
+class AdmissionCache:
+    """Per-process admission snapshots and BYOK clients."""
+
+    def __init__(
+        self,
+        ttl_seconds: int,
+        max_clients: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_clients = max_clients
+        self._clock = clock
+        self._snapshots: Dict[UUID, AdmissionSnapshot] = {}
+        self._clients: "OrderedDict[Tuple[str, str, str], BaseChatModel]" = OrderedDict()
+
+    async def get(self, db: AsyncSession, tenant_id: UUID) -> AdmissionSnapshot:
+        snapshot = self.peek(tenant_id)
+        if snapshot is None:
+            snapshot = await self._load(db, tenant_id)
+            self._snapshots[tenant_id] = snapshot
+        return snapshot
+
+    def peek(self, tenant_id: UUID) -> Optional[AdmissionSnapshot]:
+        """The cached snapshot, if still fresh (no I/O)."""
+        snapshot = self._snapshots.get(tenant_id)
+        if snapshot is not None and snapshot.expires_at <= self._clock():
+            self._snapshots.pop(tenant_id, None)
+            return None
+        return snapshot
+
+    async def _load(self, db: AsyncSession, tenant_id: UUID) -> AdmissionSnapshot:
+        from app.models.llm import LLMBudget
+        from app.models.tenant import Tenant
+        from app.shared.core.pricing import PricingTier
+        from app.shared.llm.spend_ledger import SpendLedger
+
+        result = await db.execute(
+            select(Tenant.plan, LLMBudget)
+            .select_from(Tenant)
+            .outerjoin(LLMBudget, LLMBudget.tenant_id == Tenant.id)
+            .where(Tenant.id == tenant_id)
+        )
+        row = result.first()
+        plan, budget = (row[0], row[1]) if row else (None, None)
+        try:
+            tier = PricingTier(plan).value if plan else PricingTier.FREE.value
+        except ValueError:
+            tier = PricingTier.FREE.value
+
+        spent = (await SpendLedger.get_balance(db, tenant_id)).spent
+        return AdmissionSnapshot(
+            tenant_id=tenant_id,
+            budget=BudgetSettings.from_budget(budget) if budget is not None else None,
+            tier=tier,
+            spent=spent,
+            expires_at=self._clock() + self.ttl_seconds,
+        )
+
+    def note_spend(self, tenant_id: UUID, spent: Decimal) -> None:
+        """
+        Update the cached spend after usage is recorded. Crossing a threshold
+        drops the snapshot so the next request reloads budget state.
+        """
+        snapshot = self.peek(tenant_id)
+        if snapshot is None:
+            return
+        updated = replace(snapshot, spent=spent)
+        if updated.status != snapshot.status:
+            self.invalidate(tenant_id)
+            logger.info("llm_admission_threshold_crossed", tenant_id=str(tenant_id), status=updated.status.value)
+        else:
+            self._snapshots[tenant_id] = updated
+
+    def invalidate(self, tenant_id: Optional[UUID] = None) -> None:
+        if tenant_id is None:
+            self._snapshots.clear()
+            self._clients.clear()
+        else:
+            self._snapshots.pop(tenant_id, None)
+
+    def client(self, provider: str, model: str, api_key: Optional[str]) -> "BaseChatModel":
+        """A reused LLM client for a provider/model/key (keys are only held as hashes in the index)."""
+        from app.shared.llm.factory import LLMFactory
+
+        key_hash = hashlib.sha256(api_key.encode()).hexdigest() if api_key else ""
+        cache_key = (provider, model, key_hash)
+        client = self._clients.get(cache_key)
+        if client is not None:
+            self._clients.move_to_end(cache_key)
+            return client
+        client = LLMFactory.create(provider, model=model, api_key=api_key)
+        self._clients[cache_key] = client
+        while len(self._clients) > self.max_clients:
+            self._clients.popitem(last=False)
+        return client
+
+
+_admission_cache: Optional[AdmissionCache] = None
+
+
+def get_admission_cache() -> AdmissionCache:
+    """Get the process-wide admission cache."""
+    global _admission_cache
+    if _admission_cache is None:
+        settings = get_settings()
+        _admission_cache = AdmissionCache(
+            ttl_seconds=int(settings.LLM_ADMISSION_SNAPSHOT_TTL_SECONDS),
+            max_clients=int(settings.LLM_ADMISSION_MAX_CLIENTS),
+        )
+    return _admission_cache
+
+
+def reset_admission_cache() -> None:
+    global _admission_cache
+    _admission_cache = None
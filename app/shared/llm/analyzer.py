@@ -1,37 +1,36 @@
 import yaml
 import os
 import uuid
-from typing import Dict, Any, Optional, TYPE_CHECKING
+from typing import Any, AsyncIterator, Dict, Optional, TYPE_CHECKING
 import json
 import re
 import copy
+import time
 import structlog
 from uuid import UUID
 
-from langchain_core.language_models.chat_models import BaseChatModel
-from langchain_core.prompts import ChatPromptTemplate
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from tenacity import (
-    retry,
-    stop_after_attempt,
-    wait_exponential,
-    retry_if_exception_type,
-)
 
 from app.shared.core.config import get_settings
 from app.shared.llm.usage_tracker import UsageTracker
 from app.modules.notifications.domain import SlackService
 from app.shared.core.cache import get_cache_service
 from app.shared.llm.guardrails import LLMGuardrails, FinOpsAnalysisResult
-from app.shared.analysis.forecaster import SymbolicForecaster
-from app.shared.llm.factory import LLMFactory
+from app.shared.analysis.forecast_store import get_forecast_store
+from app.shared.llm.admission import AdmissionSnapshot, get_admission_cache
+from app.shared.llm.prompt_compaction import PromptCompactor, render as render_prompt_data
+from app.shared.llm.provider_health import get_provider_health
+from app.shared.llm.response_cache import get_llm_response_cache, prompt_version
+from app.shared.llm.stream_parser import IncrementalAnalysisParser
+from app.shared.llm.tokenizer import count_tokens
 from app.shared.core.exceptions import AIAnalysisError, BudgetExceededError
 from app.shared.llm.budget_manager import LLMBudgetManager
 from app.shared.core.constants import LLMProvider
 from opentelemetry import trace
 
 if TYPE_CHECKING:
+    from langchain_core.language_models.chat_models import BaseChatModel
     from app.schemas.costs import CloudUsageSummary
 
 tracer = trace.get_tracer(__name__)
@@ -46,16 +45,21 @@ class FinOpsAnalyzer:
     This class wraps a LangChain ChatModel and orchestrates the analysis of cost data.
     It uses a specialized System Prompt to enforce strict JSON output for programmatic use.
     """
-    def __init__(self, llm: BaseChatModel, db: Optional[AsyncSession] = None):
+    def __init__(self, llm: "BaseChatModel", db: Optional[AsyncSession] = None):
         self.llm = llm
         self.db = db
         
         system_prompt = self._load_system_prompt()
+        user_prompt = "Analyze this cloud cost data:\n{cost_data}"
             
+        # langchain is imported with the first analyzer, not with the package
+        from langchain_core.prompts import ChatPromptTemplate
         self.prompt = ChatPromptTemplate.from_messages([
             ("system", system_prompt),
-            ("user", "Analyze this cloud cost data:\n{cost_data}")
+            ("user", user_prompt)
         ])
+        # Response cache keys change whenever a template changes
+        self.prompt_version = prompt_version(str(system_prompt), user_prompt)
 
     def _load_system_prompt(self) -> str:
         """Loads the system prompt from yaml or returns fallback."""
@@ -80,6 +84,14 @@ class FinOpsAnalyzer:
             "and 'estimated_total_savings'."
         )
 
+    def _is_json_response(self, content: Any) -> bool:
+        """Only well-formed responses are worth replaying from the response cache."""
+        try:
+            json.loads(self._strip_markdown(content))
+            return True
+        except Exception:
+            return False
+
     def _strip_markdown(self, text: str) -> str:
         """
         Removes markdown code block wrappers from LLM responses.
@@ -109,7 +121,7 @@ class FinOpsAnalyzer:
         2. Pre-authorize LLM budget (HARD BLOCK if exceeded)
         3. Call LLM with authorized reservation
         4. Record actual usage on success
-        5. Release reservation on failure (optional, handled by lack of record_usage)
+        5. Release reservation on failure (unreleased reservations also expire)
         """
         operation_id = str(uuid.uuid4())
         effective_db = db or self.db
@@ -132,52 +144,10 @@ class FinOpsAnalyzer:
                         mode="delta" if is_delta else "full",
                         operation_id=operation_id)
 
-            # 2. PRODUCTION: PRE-AUTHORIZE LLM BUDGET (HARD BLOCK)
-            reserved_amount = None
-            
-            # Safely get model name from LLM object, handling mocks in tests
-            llm_model = getattr(self.llm, "model_name", getattr(self.llm, "model", "llama-3.3-70b-versatile"))
-            effective_model = model or llm_model
-            
-            try:
-                if tenant_id and effective_db:
-                    # Estimate tokens: 1 record ≈ 20 tokens, min 500
-                    prompt_tokens = max(500, len(usage_summary.records) * 20)
-                    completion_tokens = 500
-                    
-                    reserved_amount = await LLMBudgetManager.check_and_reserve(
-                        tenant_id=tenant_id,
-                        db=effective_db,
-                        model=effective_model,
-                        prompt_tokens=prompt_tokens,
-                        completion_tokens=completion_tokens,
-                        operation_id=operation_id
-                    )
-                    
-                    logger.info("llm_budget_authorized", 
-                                tenant_id=str(tenant_id), 
-                                reserved_amount=float(reserved_amount),
-                                operation_id=operation_id)
-            except BudgetExceededError:
-                raise
-            except Exception as e:
-                logger.error("budget_check_failed_unexpected", error=str(e), operation_id=operation_id)
-                # Fail open or closed? PRODUCTION: Fail closed if it's a known tenant
-                if tenant_id:
-                    raise AIAnalysisError(f"Budget verification failed: {str(e)}") from e
-
-            # 3. Prepare Data
-            try:
-                sanitized_data = await LLMGuardrails.sanitize_input(usage_summary.model_dump())
-                sanitized_data["symbolic_forecast"] = await SymbolicForecaster.forecast(
-                    usage_summary.records,
-                    db=effective_db,
-                    tenant_id=tenant_id
-                )
-                formatted_data = json.dumps(sanitized_data, default=str)
-            except Exception as e:
-                logger.error("data_preparation_failed", error=str(e), operation_id=operation_id)
-                raise AIAnalysisError(f"Failed to prepare data: {str(e)}")
+            # 2-3. PRODUCTION: Pre-authorize LLM budget (hard block) and prepare data
+            formatted_data, reserved_amount, effective_model, symbolic_forecast = await self._prepare_prompt(
+                usage_summary, tenant_id, effective_db, model, operation_id, span
+            )
 
             # 4. Invoke LLM
             try:
@@ -185,34 +155,252 @@ class FinOpsAnalyzer:
                 usage_tracker, effective_provider, final_model, byok_key = \
                     await self._setup_client_and_usage(tenant_id, effective_db, provider, effective_model, input_text=formatted_data)
                 
-                response_content, response_metadata = await self._invoke_llm(
-                    formatted_data, effective_provider, final_model, byok_key
-                )
+                # Identical prompt/provider/model/template already answered for this tenant?
+                response_cache = get_llm_response_cache() if tenant_id else None
+                cache_key = None
+                cached_response = None
+                if response_cache is not None:
+                    cache_key = response_cache.key(formatted_data, effective_provider, final_model, self.prompt_version)
+                    if not force_refresh:
+                        cached_response = await response_cache.get(tenant_id, cache_key)
+
+                if cached_response is not None:
+                    logger.info("llm_response_cache_hit", tenant_id=str(tenant_id), operation_id=operation_id)
+                    response_content, response_metadata = cached_response["content"], {}
+                    span.set_attribute("llm.response_cache_hit", True)
+                else:
+                    response_content, response_metadata = await self._invoke_llm(
+                        formatted_data, effective_provider, final_model, byok_key
+                    )
+                    if response_cache is not None and self._is_json_response(response_content):
+                        await response_cache.set(tenant_id, cache_key, {"content": response_content})
             except Exception as e:
                 logger.error("llm_invocation_failed", error=str(e), operation_id=operation_id)
+                if reserved_amount and effective_db:
+                    await LLMBudgetManager.release_reservation(tenant_id, effective_db, operation_id)
                 raise
 
-            # 5. PRODUCTION: Record Usage
-            if reserved_amount and effective_db:
-                try:
-                    # In production, we'd parse actual tokens from response_metadata
-                    token_usage = response_metadata.get("token_usage", {})
-                    await LLMBudgetManager.record_usage(
-                        tenant_id=tenant_id,
-                        db=effective_db,
-                        model=final_model,
-                        prompt_tokens=token_usage.get("prompt_tokens", 500),
-                        completion_tokens=token_usage.get("completion_tokens", 500),
-                        operation_id=operation_id
-                    )
-                except Exception as e:
-                    logger.warning("usage_recording_failed", error=str(e), operation_id=operation_id)
+            # 5. PRODUCTION: Record Usage (a cache hit spent nothing)
+            if cached_response is not None and reserved_amount and effective_db:
+                await LLMBudgetManager.release_reservation(tenant_id, effective_db, operation_id)
+            elif reserved_amount and effective_db:
+                await self._record_usage(tenant_id, effective_db, final_model, response_metadata, operation_id)
 
             # 6. Post-Process
             return await self._process_analysis_results(
-                response_content, tenant_id, usage_summary
+                response_content, tenant_id, usage_summary, symbolic_forecast=symbolic_forecast
+            )
+
+
+    async def _prepare_prompt(
+        self,
+        usage_summary: "CloudUsageSummary",
+        tenant_id: Optional[UUID],
+        effective_db: Optional[AsyncSession],
+        model: Optional[str],
+        operation_id: str,
+        span: Any,
+    ) -> tuple[str, Optional[Any], str, Dict[str, Any]]:
+        """
+        Pre-authorizes the budget and renders the prompt data:
+        (formatted_data, reserved_amount, effective_model, symbolic_forecast).
+        The grounding forecast in the prompt is returned so the result attaches the same one.
+        """
+        # 2. PRODUCTION: PRE-AUTHORIZE LLM BUDGET (HARD BLOCK)
+        reserved_amount = None
+
+        # Safely get model name from LLM object, handling mocks in tests
+        llm_model = getattr(self.llm, "model_name", getattr(self.llm, "model", "llama-3.3-70b-versatile"))
+        effective_model = model or llm_model
+
+        # Compact cost data to the prompt token budget (exact counts feed the reservation)
+        try:
+            compacted_data, compaction = PromptCompactor(
+                get_settings().LLM_PROMPT_TOKEN_BUDGET, model=effective_model
+            ).compact(usage_summary)
+            span.set_attribute("llm.prompt_tokens", compaction.final_tokens)
+        except Exception as e:
+            logger.error("data_preparation_failed", error=str(e), operation_id=operation_id)
+            raise AIAnalysisError(f"Failed to prepare data: {str(e)}")
+
+        try:
+            if tenant_id and effective_db:
+                prompt_tokens = max(500, compaction.final_tokens)
+                completion_tokens = 500
+
+                admission = await self._admission_snapshot(tenant_id, effective_db)
+                reserved_amount = await LLMBudgetManager.check_and_reserve(
+                    tenant_id=tenant_id,
+                    db=effective_db,
+                    model=effective_model,
+                    prompt_tokens=prompt_tokens,
+                    completion_tokens=completion_tokens,
+                    operation_id=operation_id,
+                    budget=admission.budget if admission else None,
+                )
+
+                logger.info("llm_budget_authorized", 
+                            tenant_id=str(tenant_id), 
+                            reserved_amount=float(reserved_amount),
+                            operation_id=operation_id)
+        except BudgetExceededError:
+            raise
+        except Exception as e:
+            logger.error("budget_check_failed_unexpected", error=str(e), operation_id=operation_id)
+            # Fail open or closed? PRODUCTION: Fail closed if it's a known tenant
+            if tenant_id:
+                raise AIAnalysisError(f"Budget verification failed: {str(e)}") from e
+
+        # 3. Prepare Data
+        try:
+            sanitized_data = await LLMGuardrails.sanitize_input(compacted_data)
+            symbolic_forecast = await get_forecast_store().grounding_forecast(
+                tenant_id or usage_summary.tenant_id, usage_summary.records
+            )
+            sanitized_data["symbolic_forecast"] = symbolic_forecast
+            formatted_data = render_prompt_data(sanitized_data)
+        except Exception as e:
+            logger.error("data_preparation_failed", error=str(e), operation_id=operation_id)
+            if reserved_amount and effective_db:
+                await LLMBudgetManager.release_reservation(tenant_id, effective_db, operation_id)
+            raise AIAnalysisError(f"Failed to prepare data: {str(e)}")
+
+        return formatted_data, reserved_amount, effective_model, symbolic_forecast
+
+    @staticmethod
+    def _token_usage(metadata: Dict[str, Any]) -> tuple[int, int]:
+        """(prompt, completion) tokens from response metadata; streamed responses report usage_metadata."""
+        token_usage = metadata.get("token_usage") or {}
+        usage = metadata.get("usage_metadata") or {}
+        return (
+            token_usage.get("prompt_tokens", usage.get("input_tokens", 500)),
+            token_usage.get("completion_tokens", usage.get("output_tokens", 500)),
+        )
+
+    async def _record_usage(
+        self,
+        tenant_id: UUID,
+        db: AsyncSession,
+        model: str,
+        metadata: Dict[str, Any],
+        operation_id: str,
+        provider: Optional[str] = None,
+    ) -> None:
+        try:
+            prompt_tokens, completion_tokens = self._token_usage(metadata)
+            provider = metadata.get("served_provider", provider)
+            kwargs = {"provider": provider} if provider else {}
+            await LLMBudgetManager.record_usage(
+                tenant_id=tenant_id,
+                db=db,
+                model=metadata.get("served_model", model),
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                operation_id=operation_id,
+                **kwargs,
+            )
+        except Exception as e:
+            logger.warning("usage_recording_failed", error=str(e), operation_id=operation_id)
+
+    async def analyze_stream(
+        self,
+        usage_summary: "CloudUsageSummary",
+        tenant_id: Optional[UUID] = None,
+        db: Optional[AsyncSession] = None,
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> AsyncIterator[tuple[str, Any]]:
+        """
+        Streaming variant of analyze(). Yields (event, data) pairs:
+        - ("token", {"text": ...}) for each generated chunk
+        - ("insight" | "recommendation" | "anomaly" | "forecast", item) as each
+          item of the structured output completes and validates
+        - ("result", final_result) once, at the end
+
+        Budget pre-authorization, provider routing and caching match analyze();
+        usage is recorded from the final stream metadata. A stream that ends
+        early (client disconnect, provider failure) after generating tokens is
+        still billed, from a token count of what was sent and generated; only
+        a stream that generated nothing returns its reservation. If the full
+        output fails validation, the result keeps every item that validated.
+        """
+        operation_id = str(uuid.uuid4())
+        effective_db = db or self.db
+
+        cached_analysis, is_delta = await self._check_cache_and_delta(tenant_id, False, usage_summary)
+        if cached_analysis and not is_delta:
+            logger.info("analysis_cache_hit", tenant_id=str(tenant_id), operation_id=operation_id)
+            yield "result", cached_analysis
+            return
+
+        formatted_data, reserved_amount, effective_model, symbolic_forecast = await self._prepare_prompt(
+            usage_summary, tenant_id, effective_db, model, operation_id, trace.get_current_span()
+        )
+        reservation_open = bool(reserved_amount and effective_db)
+        parser = IncrementalAnalysisParser()
+        metadata: Dict[str, Any] = {}
+        generated = False
+        try:
+            _, effective_provider, final_model, byok_key = await self._setup_client_and_usage(
+                tenant_id, effective_db, provider, effective_model, input_text=formatted_data
             )
 
+            response_cache = get_llm_response_cache() if tenant_id else None
+            cache_key = None
+            cached_response = None
+            if response_cache is not None:
+                cache_key = response_cache.key(formatted_data, effective_provider, final_model, self.prompt_version)
+                cached_response = await response_cache.get(tenant_id, cache_key)
+
+            if cached_response is not None:
+                logger.info("llm_response_cache_hit", tenant_id=str(tenant_id), operation_id=operation_id)
+                for event in parser.feed(cached_response["content"]):
+                    yield event
+            else:
+                async for kind, value in self._stream_llm(formatted_data, effective_provider, final_model, byok_key):
+                    if kind == "metadata":
+                        metadata.update(value)
+                        continue
+                    generated = True
+                    # Fed before forwarding, so a disconnect at this yield still counts the chunk
+                    events = parser.feed(value)
+                    yield "token", {"text": value}
+                    for event in events:
+                        yield event
+                if response_cache is not None and self._is_json_response(parser.text):
+                    await response_cache.set(tenant_id, cache_key, {"content": parser.text})
+
+            # Usage from the final stream metadata (a cache hit spent nothing)
+            if reservation_open and cached_response is None:
+                await self._record_usage(
+                    tenant_id, effective_db, final_model, metadata, operation_id, provider=effective_provider
+                )
+                reservation_open = False
+        except Exception as e:
+            logger.error("llm_stream_failed", error=str(e), operation_id=operation_id)
+            raise
+        finally:
+            if reservation_open and generated:
+                # Ended early after tokens were spent: bill what was sent and generated so far
+                if not (metadata.get("token_usage") or metadata.get("usage_metadata")):
+                    metadata["token_usage"] = {
+                        "prompt_tokens": count_tokens(formatted_data, final_model),
+                        "completion_tokens": count_tokens(parser.text, final_model),
+                    }
+                await self._record_usage(
+                    tenant_id, effective_db, final_model, metadata, operation_id, provider=effective_provider
+                )
+            elif reservation_open:
+                # Failed before generating anything, or answered from cache: nothing was spent
+                await LLMBudgetManager.release_reservation(tenant_id, effective_db, operation_id)
+
+        yield "result", await self._process_analysis_results(
+            parser.text,
+            tenant_id,
+            usage_summary,
+            partial=parser.result() if parser.has_items() else None,
+            symbolic_forecast=symbolic_forecast,
+        )
 
     async def _check_cache_and_delta(
         self, tenant_id: Optional[UUID], force_refresh: bool, usage_summary: Any
@@ -262,30 +450,59 @@ class FinOpsAnalyzer:
     ) -> tuple[Optional[UsageTracker], str, str, Optional[str]]:
         """Handles budget checks and determines the effective LLM provider/model."""
         usage_tracker = None
-        byok_key = None
         budget = None
+        budget_status = None
         
         if tenant_id and db:
             usage_tracker = UsageTracker(db)
             from app.shared.llm.usage_tracker import BudgetStatus
-            budget_status = await usage_tracker.check_budget(tenant_id)
-            
+            admission = await self._admission_snapshot(tenant_id, db)
+            if admission is not None:
+                budget_status, budget = admission.status, admission.budget
+            else:
+                budget_status = await usage_tracker.check_budget(tenant_id)
+
             if budget_status == BudgetStatus.HARD_LIMIT:
                 from app.shared.core.exceptions import BudgetExceededError
                 raise BudgetExceededError("Monthly LLM budget exceeded (Hard Limit).")
 
-            from app.models.llm import LLMBudget
-            result = await db.execute(select(LLMBudget).where(LLMBudget.tenant_id == tenant_id))
-            budget = result.scalar_one_or_none()
-            if budget:
-                keys = {
-                    LLMProvider.OPENAI: budget.openai_api_key,
-                    LLMProvider.ANTHROPIC: budget.claude_api_key, # unified
-                    LLMProvider.GOOGLE: budget.google_api_key,
-                    LLMProvider.GROQ: budget.groq_api_key,
-                    LLMProvider.AZURE: budget.azure_api_key
-                }
-                byok_key = keys.get(provider or budget.preferred_provider)
+            if admission is None:
+                from app.models.llm import LLMBudget
+                result = await db.execute(select(LLMBudget).where(LLMBudget.tenant_id == tenant_id))
+                budget = result.scalar_one_or_none()
+
+        effective_provider, effective_model, byok_key = self._resolve_provider_and_model(
+            budget, budget_status, provider, model, tenant_id=tenant_id
+        )
+        return usage_tracker, effective_provider, effective_model, byok_key
+
+    async def _admission_snapshot(self, tenant_id: UUID, db: AsyncSession) -> Optional[AdmissionSnapshot]:
+        """Cached budget/tier/spend snapshot; None falls back to reading budget state directly."""
+        try:
+            return await get_admission_cache().get(db, tenant_id)
+        except Exception as e:
+            logger.warning("llm_admission_snapshot_failed", tenant_id=str(tenant_id), error=str(e))
+            return None
+
+    def _resolve_provider_and_model(
+        self,
+        budget: Any,
+        budget_status: Any,
+        provider: Optional[str],
+        model: Optional[str],
+        tenant_id: Optional[UUID] = None,
+    ) -> tuple[str, str, Optional[str]]:
+        """Effective provider, model and BYOK key from an already-loaded budget (no I/O)."""
+        from app.shared.llm.usage_tracker import BudgetStatus
+        byok_key = None
+        if budget:
+            keys = {
+                LLMProvider.OPENAI: budget.openai_api_key,
+                LLMProvider.ANTHROPIC: budget.claude_api_key, # unified
+                LLMProvider.GOOGLE: budget.google_api_key,
+                LLMProvider.GROQ: budget.groq_api_key,
+            }
+            byok_key = keys.get(provider or budget.preferred_provider)
 
         # Provider & Model Validation
         VALID_MODELS = {
@@ -300,7 +517,7 @@ class FinOpsAnalyzer:
         effective_model = model or (budget.preferred_model if budget else "llama-3.3-70b-versatile")
 
         # Handle Graceful Degradation (Soft Limit)
-        if tenant_id and db and budget_status == BudgetStatus.SOFT_LIMIT:
+        if budget_status == BudgetStatus.SOFT_LIMIT:
             logger.warning("llm_budget_soft_limit_degradation", tenant_id=str(tenant_id))
             # Switch to cheapest model for the effective provider
             if effective_provider == LLMProvider.GROQ:
@@ -326,70 +543,154 @@ class FinOpsAnalyzer:
                 logger.warning("unsupported_model_fallback", provider=effective_provider, model=effective_model)
                 effective_model = allowed_models[0] if allowed_models else "llama-3.3-70b-versatile"
         
-        return usage_tracker, effective_provider, effective_model, byok_key
+        return effective_provider, effective_model, byok_key
 
     async def _invoke_llm(
-        self, formatted_data: str, provider: str, model: str, byok_key: Optional[str]
+        self,
+        formatted_data: str,
+        provider: str,
+        model: str,
+        byok_key: Optional[str],
+        llm: Optional["BaseChatModel"] = None,
     ) -> tuple[str, Dict]:
-        """Orchestrates the LangChain invocation."""
-        current_llm = self.llm
-        if provider != get_settings().LLM_PROVIDER or byok_key:
-            current_llm = LLMFactory.create(provider, model=model, api_key=byok_key)
-
-        chain = self.prompt | current_llm
-
-        @retry(
-            stop=stop_after_attempt(3),
-            wait=wait_exponential(multiplier=1, min=4, max=10),
-            retry=retry_if_exception_type(Exception),
-            reraise=True,
-        )
-        async def _invoke_with_retry():
-            logger.info("invoking_llm", provider=provider, model=model)
-            response = await chain.ainvoke({"cost_data": formatted_data})
-            return response.content, getattr(response, "response_metadata", {})
-
-        # BE-LLM-7: Fallback model selection on primary failure
-        FALLBACK_PROVIDERS = [
-            ("groq", "llama-3.3-70b-versatile"),
-            ("openai", "gpt-4o-mini"),
-            ("anthropic", "claude-3-5-haiku"),
-        ]
+        """
+        Orchestrates the LangChain invocation (`llm` reuses an existing client for the primary).
+        The returned metadata names the provider and model that served the call
+        (`served_provider`/`served_model`), which differ from the request after a fallback.
+        """
+        health = get_provider_health()
+        last_error: Optional[Exception] = None
 
         with tracer.start_as_current_span("llm_invocation") as span:
             span.set_attribute("llm.provider", provider)
             span.set_attribute("llm.model", model)
+
+            async for candidate, candidate_model, candidate_llm, error in self._route_candidates(
+                provider, model, byok_key, llm
+            ):
+                if error is not None:
+                    last_error = last_error or error
+                    continue
+                is_primary = candidate == provider
+
+                chain = self.prompt | candidate_llm
+                logger.info("invoking_llm", provider=candidate, model=candidate_model, fallback=not is_primary)
+                started = time.monotonic()
+                try:
+                    response = await chain.ainvoke({"cost_data": formatted_data})
+                except Exception as e:
+                    await health.record(candidate, ok=False, latency=time.monotonic() - started)
+                    logger.warning("llm_provider_failed", provider=candidate, fallback=not is_primary, error=str(e))
+                    last_error = e
+                    continue
+
+                await health.record(candidate, ok=True, latency=time.monotonic() - started)
+                if not is_primary:
+                    span.set_attribute("llm.fallback_used", True)
+                    span.set_attribute("llm.fallback_provider", candidate)
+                metadata = getattr(response, "response_metadata", None)
+                metadata = dict(metadata) if isinstance(metadata, dict) else {}
+                metadata.update(served_provider=candidate, served_model=candidate_model)
+                return response.content, metadata
+
+            # All providers failed or were skipped
+            logger.error("llm_all_providers_failed", primary_provider=provider)
+            raise AIAnalysisError(f"All LLM providers failed. Primary: {provider}, Error: {str(last_error)}")
+
+    async def _route_candidates(
+        self, provider: str, model: str, byok_key: Optional[str], llm: Optional["BaseChatModel"] = None
+    ) -> AsyncIterator[tuple[str, str, Optional["BaseChatModel"], Optional[Exception]]]:
+        """
+        BE-LLM-7: Primary first, then fallbacks by latency and price; open circuits are skipped.
+        Yields (provider, model, client, error); a fallback that cannot be built here is
+        yielded with its error and is not a provider health signal.
+        """
+        current_llm = llm or self.llm
+        if llm is None and (provider != get_settings().LLM_PROVIDER or byok_key):
+            current_llm = get_admission_cache().client(provider, model, byok_key)
+
+        health = get_provider_health()
+        for candidate, candidate_model in health.route(provider, model):
+            if not await health.allow(candidate):
+                logger.info("llm_provider_skipped_circuit_open", provider=candidate)
+                continue
+            if candidate == provider:
+                yield candidate, candidate_model, current_llm, None
+                continue
             try:
-                return await _invoke_with_retry()
-            except Exception as primary_error:
-                logger.warning("llm_primary_failed_trying_fallbacks", provider=provider, error=str(primary_error))
-                
-                # Try fallback providers
-                for fallback_provider, fallback_model in FALLBACK_PROVIDERS:
-                    if fallback_provider == provider:
-                        continue  # Skip the one that just failed
-                    try:
-                        fallback_llm = LLMFactory.create(fallback_provider)
-                        fallback_chain = self.prompt | fallback_llm
-                        logger.info("trying_fallback_llm", provider=fallback_provider, model=fallback_model)
-                        response = await fallback_chain.ainvoke({"cost_data": formatted_data})
-                        span.set_attribute("llm.fallback_used", True)
-                        span.set_attribute("llm.fallback_provider", fallback_provider)
-                        return response.content, getattr(response, "response_metadata", {})
-                    except Exception as fallback_error:
-                        logger.warning("llm_fallback_failed", provider=fallback_provider, error=str(fallback_error))
-                        continue
-                
-                # All fallbacks failed
-                logger.error("llm_all_providers_failed", primary_provider=provider)
-                from app.shared.core.exceptions import AIAnalysisError
-                raise AIAnalysisError(f"All LLM providers failed. Primary: {provider}, Error: {str(primary_error)}")
+                candidate_llm = get_admission_cache().client(candidate, candidate_model, None)
+            except Exception as e:
+                logger.warning("llm_fallback_unavailable", provider=candidate, error=str(e))
+                yield candidate, candidate_model, None, e
+                continue
+            yield candidate, candidate_model, candidate_llm, None
 
+    async def _stream_llm(
+        self, formatted_data: str, provider: str, model: str, byok_key: Optional[str]
+    ) -> AsyncIterator[tuple[str, Any]]:
+        """
+        Streams the LangChain invocation: yields ("metadata", {served_provider,
+        served_model}) when a provider starts answering, ("token", text) chunks,
+        then ("metadata", response_metadata) with the same served_* keys and
+        the usage. Fails over to the next provider only until the first token
+        has been sent.
+        """
+        health = get_provider_health()
+        last_error: Optional[Exception] = None
+
+        async for candidate, candidate_model, candidate_llm, error in self._route_candidates(
+            provider, model, byok_key
+        ):
+            if error is not None:
+                last_error = last_error or error
+                continue
+
+            chain = self.prompt | candidate_llm
+            logger.info("streaming_llm", provider=candidate, model=candidate_model, fallback=candidate != provider)
+            started = time.monotonic()
+            served = {"served_provider": candidate, "served_model": candidate_model}
+            final = None
+            try:
+                async for chunk in chain.astream({"cost_data": formatted_data}):
+                    if final is None:
+                        yield "metadata", served
+                    final = chunk if final is None else final + chunk
+                    text = chunk.content if isinstance(chunk.content, str) else ""
+                    if text:
+                        yield "token", text
+            except Exception as e:
+                await health.record(candidate, ok=False, latency=time.monotonic() - started)
+                if final is not None:
+                    raise AIAnalysisError(f"LLM stream interrupted: {str(e)}") from e
+                logger.warning("llm_provider_failed", provider=candidate, fallback=candidate != provider, error=str(e))
+                last_error = e
+                continue
+
+            await health.record(candidate, ok=True, latency=time.monotonic() - started)
+            metadata = {**(getattr(final, "response_metadata", None) or {}), **served}
+            usage = getattr(final, "usage_metadata", None)
+            if usage:
+                metadata["usage_metadata"] = dict(usage)
+            yield "metadata", metadata
+            return
+
+        logger.error("llm_all_providers_failed", primary_provider=provider)
+        raise AIAnalysisError(f"All LLM providers failed. Primary: {provider}, Error: {str(last_error)}")
 
     async def _process_analysis_results(
-        self, content: str, tenant_id: Optional[UUID], usage_summary: Any
+        self,
+        content: str,
+        tenant_id: Optional[UUID],
+        usage_summary: Any,
+        partial: Optional[Dict[str, Any]] = None,
+        symbolic_forecast: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
-        """Validates output, handles alerts, and caches results."""
+        """
+        Validates output, handles alerts, and caches results. `partial` (items
+        already validated while streaming) is used if the full output is invalid.
+        `symbolic_forecast` is the grounding forecast the prompt was built with;
+        it is only looked up here when the caller has none.
+        """
         cache = get_cache_service()
         
         try:
@@ -401,23 +702,26 @@ class FinOpsAnalyzer:
             await self._check_and_alert_anomalies(llm_result)
         except Exception as e:
             logger.warning("llm_validation_failed", error=str(e))
-            # Fallback: try raw parsing if validation fails but it's still JSON
-            try:
-                llm_result = json.loads(self._strip_markdown(content))
-            except json.JSONDecodeError as jde:
-                logger.error("llm_fallback_json_parse_failed", error=str(jde), content_snippet=content[:100])
-                llm_result = {"error": "AI analysis format invalid", "raw_content": content}
-            except Exception as ex:
-                logger.error("llm_fallback_failed_unexpectedly", error=str(ex))
-                llm_result = {"error": "AI analysis processing failed", "raw_content": content}
-
-        # Grounding: What does the deterministic math say?
-        effective_db = self.db # In process_analysis_results we only have self.db
-        symbolic_forecast = await SymbolicForecaster.forecast(
-            usage_summary.records,
-            db=effective_db,
-            tenant_id=usage_summary.tenant_id
-        )
+            if partial is not None:
+                # Streamed: keep every item that validated before the output went bad
+                logger.info("llm_stream_partial_result_used", items=sum(len(v) for v in partial.values()))
+                llm_result = {**partial, "partial": True}
+            else:
+                # Fallback: try raw parsing if validation fails but it's still JSON
+                try:
+                    llm_result = json.loads(self._strip_markdown(content))
+                except json.JSONDecodeError as jde:
+                    logger.error("llm_fallback_json_parse_failed", error=str(jde), content_snippet=content[:100])
+                    llm_result = {"error": "AI analysis format invalid", "raw_content": content}
+                except Exception as ex:
+                    logger.error("llm_fallback_failed_unexpectedly", error=str(ex))
+                    llm_result = {"error": "AI analysis processing failed", "raw_content": content}
+
+        # Grounding: What does the deterministic math say? (from the forecast store; never fitted inline)
+        if symbolic_forecast is None:
+            symbolic_forecast = await get_forecast_store().grounding_forecast(
+                tenant_id or usage_summary.tenant_id, usage_summary.records
+            )
         
         final_result = {
             "insights": llm_result.get("insights", []),
@@ -0,0 +1,280 @@
+"""
+Batch LLM Analysis Pipeline
+
+Runs FinOps analysis for a cohort of tenants in one pass, for scheduled jobs:
+- Budgets (limits + BYOK keys) and ledger balances are read once per tenant,
+  not once per item
+- LLM clients are built once per provider/model/key and reused
+- Invocations run concurrently, bounded per provider
+- Usage is recorded with one bulk write per tenant at the end
+
+Database work stays sequential on the caller's session, one tenant at a time
+under that tenant's RLS context; only the LLM calls run concurrently. Each
+item succeeds or fails on its own, as if FinOpsAnalyzer.analyze had been
+called for it.
+"""
+
+import asyncio
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+from uuid import UUID
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.shared.analysis.forecast_store import get_forecast_store
+from app.shared.core.config import get_settings
+from app.shared.core.exceptions import BudgetExceededError
+from app.shared.llm.analyzer import FinOpsAnalyzer
+from app.shared.llm.budget_manager import BudgetStatus, LLMBudgetManager, UsageEntry
+from app.shared.llm.factory import LLMFactory
+from app.shared.llm.guardrails import LLMGuardrails
+from app.shared.llm.prompt_compaction import PromptCompactor, render as render_prompt_data
+from app.shared.llm.response_cache import get_llm_response_cache
+from app.shared.llm.spend_ledger import SpendLedger
+
+if TYPE_CHECKING:
+    from langchain_core.language_models.chat_models import BaseChatModel
+
+logger = structlog.get_logger()
+
+DEFAULT_COMPLETION_TOKENS = 500
+
+
+@dataclass
+class BatchItem:
+    tenant_id: UUID
+    usage_summary: Any
+    key: Any = None  # Caller's identifier, e.g. a connection id (defaults to tenant_id)
+
+
+@dataclass
+class BatchOutcome:
+    tenant_id: UUID
+    key: Any
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class _Call:
+    """A prepared LLM call for one item."""
+    item: BatchItem
+    outcome: BatchOutcome
+    operation_id: str
+    provider: str
+    model: str
+    byok_key: Optional[str]
+    formatted_data: str
+    reserved: bool
+    symbolic_forecast: Optional[Dict[str, Any]] = None
+    cache_key: Optional[str] = None
+    content: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = None
+    from_cache: bool = False
+
+
+class BatchAnalysisPipeline:
+    """
+    Usage:
+        pipeline = BatchAnalysisPipeline(FinOpsAnalyzer(llm), db)
+        outcomes = await pipeline.run([BatchItem(tenant.id, summary, key=conn.id), ...])
+    """
+
+    def __init__(
+        self,
+        analyzer: FinOpsAnalyzer,
+        db: AsyncSession,
+        concurrency_per_provider: Optional[int] = None,
+    ):
+        self.analyzer = analyzer
+        self.db = db
+        self.concurrency = int(concurrency_per_provider or get_settings().LLM_BATCH_CONCURRENCY_PER_PROVIDER)
+        self._clients: Dict[Tuple[str, str, Optional[str]], "BaseChatModel"] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    async def run(self, items: Sequence[BatchItem]) -> List[BatchOutcome]:
+        outcomes = [
+            BatchOutcome(item.tenant_id, item.key if item.key is not None else item.tenant_id)
+            for item in items
+        ]
+        if not items:
+            return outcomes
+
+        from app.shared.db.session import RLS_TENANT_KEY, set_session_tenant_id
+
+        by_tenant: Dict[UUID, List[Tuple[BatchItem, BatchOutcome]]] = {}
+        for item, outcome in zip(items, outcomes):
+            by_tenant.setdefault(item.tenant_id, []).append((item, outcome))
+
+        calls: Dict[UUID, List[_Call]] = {}
+        budgets: Dict[UUID, Any] = {}
+        try:
+            # 1. Sequential prep per tenant (budget, cache, compaction, reservation, sanitization)
+            for tenant_id, tenant_items in by_tenant.items():
+                await set_session_tenant_id(self.db, tenant_id)
+                try:
+                    budgets.update(await LLMBudgetManager.get_budgets(self.db, [tenant_id]))
+                    balance = (await SpendLedger.get_balances(self.db, [tenant_id]))[tenant_id]
+                except Exception as e:
+                    logger.warning("batch_analysis_prepare_failed", tenant_id=str(tenant_id), error=str(e))
+                    for _, outcome in tenant_items:
+                        outcome.error = e
+                    continue
+                for item, outcome in tenant_items:
+                    try:
+                        call = await self._prepare(item, outcome, budgets.get(tenant_id), balance)
+                    except Exception as e:
+                        logger.warning("batch_analysis_prepare_failed", tenant_id=str(tenant_id), error=str(e))
+                        outcome.error = e
+                        continue
+                    if call is not None:
+                        calls.setdefault(tenant_id, []).append(call)
+
+            # 2. Concurrent invocations across the cohort, bounded per provider
+            await asyncio.gather(*(
+                self._invoke(call) for tenant_calls in calls.values() for call in tenant_calls if not call.from_cache
+            ))
+
+            # 3. Per tenant: one bulk usage write, then post-process (validation, grounding, analysis cache)
+            for tenant_id, tenant_calls in calls.items():
+                await set_session_tenant_id(self.db, tenant_id)
+                await self._settle(tenant_calls, budgets)
+                for call in tenant_calls:
+                    if not call.outcome.ok:
+                        continue
+                    try:
+                        call.outcome.result = await self.analyzer._process_analysis_results(
+                            call.content, tenant_id, call.item.usage_summary,
+                            symbolic_forecast=call.symbolic_forecast,
+                        )
+                    except Exception as e:
+                        call.outcome.error = e
+        finally:
+            # Later transactions on this session must not inherit the last tenant's context
+            self.db.info.pop(RLS_TENANT_KEY, None)
+
+        failed = sum(1 for o in outcomes if not o.ok)
+        logger.info(
+            "batch_analysis_complete",
+            items=len(items),
+            tenants=len(by_tenant),
+            invoked=sum(1 for tenant_calls in calls.values() for c in tenant_calls if not c.from_cache),
+            failed=failed,
+        )
+        return outcomes
+
+    async def _prepare(self, item: BatchItem, outcome: BatchOutcome, budget: Any, balance: Any) -> Optional[_Call]:
+        analyzer = self.analyzer
+        tenant_id = item.tenant_id
+
+        cached_analysis, is_delta = await analyzer._check_cache_and_delta(tenant_id, False, item.usage_summary)
+        if cached_analysis and not is_delta:
+            outcome.result = cached_analysis
+            return None
+
+        status = LLMBudgetManager.classify_budget(budget, balance.spent)
+        if status == BudgetStatus.HARD_LIMIT:
+            raise BudgetExceededError("Monthly LLM budget exceeded (Hard Limit).")
+
+        llm_model = getattr(analyzer.llm, "model_name", getattr(analyzer.llm, "model", "llama-3.3-70b-versatile"))
+        provider, model, byok_key = analyzer._resolve_provider_and_model(
+            budget, status, None, llm_model, tenant_id=tenant_id
+        )
+
+        compacted, compaction = PromptCompactor(get_settings().LLM_PROMPT_TOKEN_BUDGET, model=model).compact(
+            item.usage_summary
+        )
+        operation_id = str(uuid.uuid4())
+        await LLMBudgetManager.check_and_reserve(
+            tenant_id=tenant_id,
+            db=self.db,
+            provider=provider,
+            model=model,
+            prompt_tokens=max(DEFAULT_COMPLETION_TOKENS, compaction.final_tokens),
+            completion_tokens=DEFAULT_COMPLETION_TOKENS,
+            operation_id=operation_id,
+            budget=budget,
+        )
+
+        try:
+            sanitized = await LLMGuardrails.sanitize_input(compacted)
+            # Fitted inline: batches run in worker tasks whose event loop closes when they return
+            sanitized["symbolic_forecast"] = await get_forecast_store().grounding_forecast(
+                tenant_id, item.usage_summary.records, wait=True
+            )
+            call = _Call(
+                item=item,
+                outcome=outcome,
+                operation_id=operation_id,
+                provider=provider,
+                model=model,
+                byok_key=byok_key,
+                formatted_data=render_prompt_data(sanitized),
+                reserved=True,
+                symbolic_forecast=sanitized["symbolic_forecast"],
+            )
+
+            response_cache = get_llm_response_cache()
+            if response_cache is not None:
+                call.cache_key = response_cache.key(call.formatted_data, provider, model, analyzer.prompt_version)
+                cached = await response_cache.get(tenant_id, call.cache_key)
+                if cached is not None:
+                    call.content, call.metadata, call.from_cache = cached["content"], {}, True
+            return call
+        except Exception:
+            await LLMBudgetManager.release_reservation(tenant_id, self.db, operation_id)
+            raise
+
+    async def _settle(self, calls: List[_Call], budgets: Dict[UUID, Any]) -> None:
+        """Record usage for one tenant's spent reservations; return the ones that were not spent."""
+        entries = []
+        for call in calls:
+            if call.reserved and (call.from_cache or not call.outcome.ok):
+                await LLMBudgetManager.release_reservation(call.item.tenant_id, self.db, call.operation_id)
+            elif call.reserved:
+                metadata = call.metadata or {}
+                token_usage = metadata.get("token_usage", {})
+                entries.append(UsageEntry(
+                    tenant_id=call.item.tenant_id,
+                    # A fallback provider may have served the call
+                    provider=metadata.get("served_provider", call.provider),
+                    model=metadata.get("served_model", call.model),
+                    prompt_tokens=token_usage.get("prompt_tokens", DEFAULT_COMPLETION_TOKENS),
+                    completion_tokens=token_usage.get("completion_tokens", DEFAULT_COMPLETION_TOKENS),
+                    operation_id=call.operation_id,
+                    request_type="scheduled_analysis",
+                ))
+        await LLMBudgetManager.record_usage_bulk(self.db, entries, budgets)
+
+    def _client(self, provider: str, model: str, byok_key: Optional[str]) -> "BaseChatModel":
+        if provider == get_settings().LLM_PROVIDER and not byok_key:
+            return self.analyzer.llm
+        key = (provider, model, byok_key)
+        client = self._clients.get(key)
+        if client is None:
+            client = LLMFactory.create(provider, model=model, api_key=byok_key)
+            self._clients[key] = client
+        return client
+
+    async def _invoke(self, call: _Call) -> None:
+        semaphore = self._semaphores.setdefault(call.provider, asyncio.Semaphore(self.concurrency))
+        async with semaphore:
+            try:
+                llm = self._client(call.provider, call.model, call.byok_key)
+                call.content, call.metadata = await self.analyzer._invoke_llm(
+                    call.formatted_data, call.provider, call.model, call.byok_key, llm=llm
+                )
+            except Exception as e:
+                logger.warning("batch_analysis_invoke_failed", tenant_id=str(call.item.tenant_id), error=str(e))
+                call.outcome.error = e
+                return
+
+        response_cache = get_llm_response_cache()
+        if response_cache is not None and call.cache_key and self.analyzer._is_json_response(call.content):
+            await response_cache.set(call.item.tenant_id, call.cache_key, {"content": call.content})
@@ -3,18 +3,23 @@ LLM Budget Management Service
 
 PRODUCTION: Ensures LLM requests are pre-authorized and within budget limits.
 Implements atomic budget reservation/debit pattern to prevent cost overages.
+Spend is read from the per-tenant monthly ledger (see spend_ledger.py).
 """
 
 import structlog
+from dataclasses import dataclass
 from decimal import Decimal
 from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
 from uuid import UUID
 from enum import Enum
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.llm import LLMBudget, LLMUsage
 from app.shared.core.exceptions import BudgetExceededError, ResourceNotFoundError
 from app.shared.llm.pricing_data import LLM_PRICING
+from app.shared.llm.admission import get_admission_cache
+from app.shared.llm.spend_ledger import SpendLedger
 from app.shared.core.cache import get_cache_service
 # Moved BudgetStatus here
 from app.shared.core.ops_metrics import LLM_PRE_AUTH_DENIALS, LLM_SPEND_USD
@@ -29,6 +34,18 @@ class BudgetStatus(str, Enum):
     HARD_LIMIT = "hard_limit"
 
 
+@dataclass
+class UsageEntry:
+    """One LLM call's usage, for bulk recording."""
+    tenant_id: UUID
+    provider: str
+    model: str
+    prompt_tokens: int
+    completion_tokens: int
+    operation_id: Optional[str] = None
+    request_type: str = "unknown"
+
+
 class LLMBudgetManager:
     """
     Thread-safe budget management with atomic operations.
@@ -71,20 +88,23 @@ class LLMBudgetManager:
         prompt_tokens: int = AVG_PROMPT_TOKENS,
         completion_tokens: int = AVG_RESPONSE_TOKENS,
         operation_id: str = None,
+        budget: Optional[LLMBudget] = None,
     ) -> Decimal:
         """
         PRODUCTION: Check budget and atomically reserve funds.
+        Pass `budget` if the caller already loaded it (see get_budgets).
         """
         estimated_cost = LLMBudgetManager.estimate_cost(
             prompt_tokens, completion_tokens, model, provider
         )
         
         try:
-            # 1. Fetch current budget state (with FOR UPDATE lock)
-            result = await db.execute(
-                select(LLMBudget).where(LLMBudget.tenant_id == tenant_id).with_for_update()
-            )
-            budget = result.scalar_one_or_none()
+            # 1. Fetch budget configuration (no row lock: the ledger update is the atomic step)
+            if budget is None:
+                result = await db.execute(
+                    select(LLMBudget).where(LLMBudget.tenant_id == tenant_id)
+                )
+                budget = result.scalar_one_or_none()
             
             if not budget:
                 logger.error(
@@ -97,30 +117,23 @@ class LLMBudgetManager:
                     code="budget_not_found"
                 )
             
-            # 2. Calculate current month usage
-            now = datetime.now(timezone.utc)
-            month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            
-            result_usage = await db.execute(
-                select(func.coalesce(func.sum(LLMUsage.cost_usd), Decimal("0")))
-                .where(
-                    (LLMUsage.tenant_id == tenant_id) &
-                    (LLMUsage.created_at >= month_start)
-                )
+            # 2. Reserve against the monthly ledger (conditional single-row UPDATE)
+            limit = Decimal(str(budget.monthly_limit_usd))
+            reservation = await SpendLedger.reserve(
+                db, tenant_id, estimated_cost, limit, operation_id=operation_id
             )
-            current_usage = result_usage.scalar()
-            
-            remaining_budget = budget.monthly_limit_usd - current_usage
+            current_usage = reservation.balance.committed
+            remaining_budget = limit - current_usage
             
             # 3. Enforce hard limit
-            if estimated_cost > remaining_budget:
+            if not reservation.granted:
                 logger.warning(
                     "llm_budget_exceeded",
                     tenant_id=str(tenant_id),
                     model=model,
                     requested_amount=float(estimated_cost),
                     remaining_budget=float(remaining_budget),
-                    monthly_limit=float(budget.monthly_limit_usd),
+                    monthly_limit=float(limit),
                     current_usage=float(current_usage)
                 )
                 
@@ -133,7 +146,7 @@ class LLMBudgetManager:
                 raise BudgetExceededError(
                     f"LLM budget exceeded. Required: ${float(estimated_cost):.4f}, Available: ${float(remaining_budget):.4f}",
                     details={
-                        "monthly_limit": float(budget.monthly_limit_usd),
+                        "monthly_limit": float(limit),
                         "current_usage": float(current_usage),
                         "requested_amount": float(estimated_cost),
                         "remaining_budget": float(remaining_budget),
@@ -148,7 +161,7 @@ class LLMBudgetManager:
                 tenant_id=str(tenant_id),
                 model=model,
                 reserved_amount=float(estimated_cost),
-                remaining_after_reservation=float(remaining_budget - estimated_cost),
+                remaining_after_reservation=float(remaining_budget),
                 operation_id=operation_id
             )
             
@@ -199,16 +212,14 @@ class LLMBudgetManager:
                 output_tokens=completion_tokens,
                 total_tokens=prompt_tokens + completion_tokens,
                 cost_usd=actual_cost_usd,
-                operation_id=operation_id,
                 request_type=request_type
             )
             db.add(usage)
             
-            # Metrics
+            # Metrics (tier from the admission snapshot when this request loaded one)
             try:
-                tier = await get_tenant_tier(tenant_id, db)
                 LLM_SPEND_USD.labels(
-                    tenant_tier=tier.value,
+                    tenant_tier=await LLMBudgetManager._tier_label(tenant_id, db),
                     provider=provider,
                     model=model
                 ).inc(float(actual_cost_usd))
@@ -216,9 +227,17 @@ class LLMBudgetManager:
                 pass
 
             await db.flush()
+
+            # Move the reservation into spent on the ledger
+            balance = await SpendLedger.settle(
+                db, tenant_id, Decimal(str(actual_cost_usd)), operation_id=operation_id
+            )
+            get_admission_cache().note_spend(tenant_id, balance.spent)
             
             # Handle alerts
-            await LLMBudgetManager._check_budget_and_alert(tenant_id, db, actual_cost_usd)
+            await LLMBudgetManager._check_budget_and_alert(
+                tenant_id, db, actual_cost_usd, current_usage=balance.spent
+            )
             
             logger.info(
                 "llm_usage_recorded",
@@ -240,6 +259,120 @@ class LLMBudgetManager:
             # Don't fail the request if we can't record usage
             # (the usage is what matters, not the audit log)
 
+    @staticmethod
+    async def record_usage_bulk(
+        db: AsyncSession,
+        entries: List[UsageEntry],
+        budgets: Optional[Dict[UUID, LLMBudget]] = None,
+    ) -> None:
+        """
+        Record many LLM calls at once: one insert for the usage rows, one
+        reservation delete, and one ledger update and alert check per tenant.
+        """
+        if not entries:
+            return
+        budgets = budgets or {}
+        try:
+            costs = [
+                LLMBudgetManager.estimate_cost(e.prompt_tokens, e.completion_tokens, e.model, e.provider)
+                for e in entries
+            ]
+            db.add_all([
+                LLMUsage(
+                    tenant_id=e.tenant_id,
+                    provider=e.provider,
+                    model=e.model,
+                    input_tokens=e.prompt_tokens,
+                    output_tokens=e.completion_tokens,
+                    total_tokens=e.prompt_tokens + e.completion_tokens,
+                    cost_usd=cost,
+                    request_type=e.request_type,
+                )
+                for e, cost in zip(entries, costs)
+            ])
+            await db.flush()
+
+            balances = await SpendLedger.settle_many(
+                db, [(e.tenant_id, cost, e.operation_id) for e, cost in zip(entries, costs)]
+            )
+
+            for tenant_id, balance in balances.items():
+                get_admission_cache().note_spend(tenant_id, balance.spent)
+
+            tenant_costs: Dict[UUID, Decimal] = {}
+            for e, cost in zip(entries, costs):
+                tenant_costs[e.tenant_id] = tenant_costs.get(e.tenant_id, Decimal("0")) + cost
+            for tenant_id, cost in tenant_costs.items():
+                await LLMBudgetManager._check_budget_and_alert(
+                    tenant_id, db, cost,
+                    current_usage=balances[tenant_id].spent,
+                    budget=budgets.get(tenant_id),
+                )
+
+            try:
+                tiers = {tid: await LLMBudgetManager._tier_label(tid, db) for tid in tenant_costs}
+                for e, cost in zip(entries, costs):
+                    LLM_SPEND_USD.labels(
+                        tenant_tier=tiers[e.tenant_id], provider=e.provider, model=e.model
+                    ).inc(float(cost))
+            except Exception:
+                pass
+
+            logger.info(
+                "llm_usage_recorded_bulk",
+                entries=len(entries),
+                tenants=len(tenant_costs),
+                cost=float(sum(costs, Decimal("0"))),
+            )
+        except Exception as e:
+            logger.error("usage_bulk_recording_failed", entries=len(entries), error=str(e), error_type=type(e).__name__)
+
+    @staticmethod
+    async def _tier_label(tenant_id: UUID, db: AsyncSession) -> str:
+        snapshot = get_admission_cache().peek(tenant_id)
+        if snapshot is not None:
+            return snapshot.tier
+        return (await get_tenant_tier(tenant_id, db)).value
+
+    @staticmethod
+    async def get_budgets(db: AsyncSession, tenant_ids: Iterable[UUID]) -> Dict[UUID, LLMBudget]:
+        """Budgets (limits and BYOK settings) for many tenants in one query."""
+        ids = list(set(tenant_ids))
+        if not ids:
+            return {}
+        result = await db.execute(select(LLMBudget).where(LLMBudget.tenant_id.in_(ids)))
+        return {budget.tenant_id: budget for budget in result.scalars().all()}
+
+    @staticmethod
+    def classify_budget(budget: Optional[LLMBudget], current_usage: Decimal) -> BudgetStatus:
+        """Budget status from an already-loaded budget and month-to-date spend (no I/O)."""
+        if not budget:
+            return BudgetStatus.OK
+        limit = Decimal(str(budget.monthly_limit_usd))
+        threshold = Decimal(str(budget.alert_threshold_percent)) / 100
+        if current_usage >= limit:
+            return BudgetStatus.HARD_LIMIT if budget.hard_limit else BudgetStatus.SOFT_LIMIT
+        if current_usage >= limit * threshold:
+            return BudgetStatus.SOFT_LIMIT
+        return BudgetStatus.OK
+
+    @staticmethod
+    async def release_reservation(tenant_id: UUID, db: AsyncSession, operation_id: str) -> None:
+        """
+        Return a reservation to the budget when the LLM call did not happen.
+        Best effort: unreleased reservations expire on their own.
+        """
+        try:
+            await SpendLedger.release(db, tenant_id, operation_id)
+            logger.info("llm_budget_released", tenant_id=str(tenant_id), operation_id=operation_id)
+        except Exception as e:
+            logger.warning(
+                "llm_budget_release_failed",
+                tenant_id=str(tenant_id),
+                operation_id=operation_id,
+                error=str(e)
+            )
+
     @staticmethod
     async def check_budget(tenant_id: UUID, db: AsyncSession):
         """
@@ -264,16 +397,9 @@ class LLMBudgetManager:
         if not budget:
             return BudgetStatus.OK
 
-        # Calculate usage
-        now = datetime.now(timezone.utc)
-        month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        result_usage = await db.execute(
-            select(func.coalesce(func.sum(LLMUsage.cost_usd), Decimal("0")))
-            .where((LLMUsage.tenant_id == tenant_id) & (LLMUsage.created_at >= month_start))
-        )
-        current_usage = result_usage.scalar()
+        current_usage = (await SpendLedger.get_balance(db, tenant_id)).spent
         
-        limit = budget.monthly_limit_usd
+        limit = Decimal(str(budget.monthly_limit_usd))
         threshold = Decimal(str(budget.alert_threshold_percent)) / 100
 
         if current_usage >= limit:
@@ -294,25 +420,28 @@ class LLMBudgetManager:
         return BudgetStatus.OK
 
     @staticmethod
-    async def _check_budget_and_alert(tenant_id: UUID, db: AsyncSession, last_cost: Decimal) -> None:
+    async def _check_budget_and_alert(
+        tenant_id: UUID,
+        db: AsyncSession,
+        last_cost: Decimal,
+        current_usage: Decimal | None = None,
+        budget: Optional[LLMBudget] = None,
+    ) -> None:
         """
         Checks budget threshold and sends Slack alerts if needed.
+        `current_usage` and `budget` skip their reads if the caller already has them.
         """
-        result = await db.execute(select(LLMBudget).where(LLMBudget.tenant_id == tenant_id))
-        budget = result.scalar_one_or_none()
+        if budget is None:
+            result = await db.execute(select(LLMBudget).where(LLMBudget.tenant_id == tenant_id))
+            budget = result.scalar_one_or_none()
         if not budget:
             return
 
-        # Simplified usage check for alerting (could use cached value or sum)
         now = datetime.now(timezone.utc)
-        month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        result_usage = await db.execute(
-            select(func.coalesce(func.sum(LLMUsage.cost_usd), Decimal("0")))
-            .where((LLMUsage.tenant_id == tenant_id) & (LLMUsage.created_at >= month_start))
-        )
-        current_usage = result_usage.scalar()
+        if current_usage is None:
+            current_usage = (await SpendLedger.get_balance(db, tenant_id)).spent
         
-        limit = budget.monthly_limit_usd
+        limit = Decimal(str(budget.monthly_limit_usd))
         threshold_percent = budget.alert_threshold_percent
         usage_percent = (current_usage / limit * 100) if limit > 0 else Decimal("0")
 
@@ -1,12 +1,18 @@
-from typing import Optional, Tuple
+from typing import Optional, Tuple, TYPE_CHECKING
 from enum import Enum
-from langchain_core.language_models.chat_models import BaseChatModel
 import structlog
 from app.shared.core.config import get_settings
 from .pricing_data import PROVIDER_COSTS
+from . import tokenizer
+from .tokenizer import estimate_tokens
+
+if TYPE_CHECKING:
+    from langchain_core.language_models.chat_models import BaseChatModel
 
 logger = structlog.get_logger()
 
+COMPLEX_THRESHOLD_TOKENS = 4000
+
 class AnalysisComplexity(str, Enum):
     """Analysis complexity levels for provider selection."""
     SIMPLE = "simple"    # < 1000 tokens, use Groq (free)
@@ -39,14 +45,14 @@ class LLMFactory:
         Rough token estimation (4 chars per token).
         Good enough for provider selection.
         """
-        return len(text) // 4
+        return estimate_tokens(text)
     
     @staticmethod
     def classify_complexity(token_count: int) -> AnalysisComplexity:
         """Classify analysis complexity based on token count."""
         if token_count < 1000:
             return AnalysisComplexity.SIMPLE
-        elif token_count < 4000:
+        elif token_count < COMPLEX_THRESHOLD_TOKENS:
             return AnalysisComplexity.MEDIUM
         else:
             return AnalysisComplexity.COMPLEX
@@ -76,8 +82,8 @@ class LLMFactory:
             )
             return tenant_byok_provider, AnalysisComplexity.MEDIUM
         
-        # Estimate tokens
-        token_estimate = LLMFactory.estimate_tokens(input_text)
+        # Exact token count (tiktoken), stopping once past the COMPLEX threshold
+        token_estimate = tokenizer.count_tokens(input_text, limit=COMPLEX_THRESHOLD_TOKENS)
         complexity = LLMFactory.classify_complexity(token_estimate)
         
         # Waterfall selection
@@ -140,7 +146,7 @@ class LLMFactory:
 
 
     @staticmethod
-    def create(provider: str = None, model: str = None, api_key: str = None) -> BaseChatModel:
+    def create(provider: str = None, model: str = None, api_key: str = None) -> "BaseChatModel":
         """
         Create an LLM client for the specified provider and model.
         DELEGATION: Now uses modular provider classes for model creation.
@@ -175,7 +181,7 @@ class LLMFactory:
         input_text: str,
         tenant_byok_provider: Optional[str] = None,
         tenant_byok_key: Optional[str] = None
-    ) -> Tuple[BaseChatModel, str, AnalysisComplexity]:
+    ) -> Tuple["BaseChatModel", str, AnalysisComplexity]:
         """
         Create an LLM client with smart provider selection.
         
@@ -5,10 +5,109 @@ from typing import Dict, Any, List, Type, TypeVar, Optional
 from pydantic import BaseModel, Field, ValidationError
 import structlog
 
+from app.shared.core.ops_metrics import LLM_GUARDRAIL_HITS
+
 logger = structlog.get_logger()
 
 T = TypeVar("T", bound=BaseModel)
 
+REDACTED = "[REDACTED]"
+
+# Lookalike folding, built once. Small caps and full-width letters are folded
+# before NFKC; Cyrillic homoglyphs after lowercasing.
+_SMALL_CAPS = "\u1d00\u0299\u1d04\u1d05\u1d07\ua730\u0262\u029c\u026a\u1d0a\u1d0b\u029f\u1d0d\u0274\u1d0f\u1d18\ua7af\u0280\ua731\u1d1b\u1d1c\u1d20\u1d21\u1d22\u028f\u1d22"
+_FULL_WIDTH = "".join(chr(i) for i in range(0xff41, 0xff5b))
+_PRE_NORMALIZE_TABLE = {
+    **str.maketrans(_SMALL_CAPS, "abcdefghijklmnopqrstuvwxyz"),
+    **str.maketrans(_FULL_WIDTH, "abcdefghijklmnopqrstuvwxyz"),
+}
+_HOMOGLYPH_TABLE = str.maketrans({
+    '\u0430': 'a', '\u0432': 'v', '\u0433': 'g', '\u0434': 'd', '\u0435': 'e',
+    '\u0437': 'z', '\u0456': 'i', '\u0458': 'j', '\u043a': 'k', '\u04cf': 'i',
+    '\u043c': 'm', '\u043d': 'n', '\u043f': 'p', '\u043e': 'o', '\u0440': 'p',
+    '\u0441': 's', '\u0442': 't', '\u0443': 'y', '\u0445': 'x', '\u0446': 'c',
+    '\u0447': 'c', '\u0448': 's', '\u0449': 's', '\u044b': 'y', '\u044c': 'b',
+    '\u044d': 'e', '\u044e': 'a', '\u044f': 'i', '\u0438': 'i'
+})
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_NON_ALPHA = re.compile(r"[^a-z]+")
+
+
+def _to_plain_ascii(s: str) -> str:
+    """Fold small caps, full-width and Cyrillic lookalikes to lowercase ASCII."""
+    s = unicodedata.normalize('NFKC', s.translate(_PRE_NORMALIZE_TABLE)).lower()
+    return s.translate(_HOMOGLYPH_TABLE)
+
+
+class GuardrailEngine:
+    """
+    Compiled matcher for LLM input sanitization.
+
+    All injection patterns are collapsed to their alphanumeric form and
+    compiled into one alternation, so each string costs one regex search
+    per normalized form. Verdicts are memoized per payload, which matters
+    for cost summaries where the same service/region strings repeat.
+    """
+
+    def __init__(self, patterns: List[str], trigger_keywords: List[str]):
+        self._rule_for: Dict[str, str] = {}
+        for pattern in patterns:
+            collapsed = _NON_ALNUM.sub('', pattern.lower())
+            if collapsed:
+                self._rule_for.setdefault(collapsed, pattern)
+        # Longest first so the most specific rule is the one counted
+        alternation = "|".join(re.escape(k) for k in sorted(self._rule_for, key=len, reverse=True))
+        self._matcher = re.compile(alternation)
+        self._trigger = re.compile("|".join(re.escape(k) for k in trigger_keywords))
+        self.hits: Dict[str, int] = {}
+
+    def _forms(self, text: str) -> List[str]:
+        lowered = text.lower()
+        if text.isascii():
+            # Every normalization is the identity on ASCII
+            return [lowered]
+        return [_to_plain_ascii(text), unicodedata.normalize('NFKD', text).lower(), lowered]
+
+    def scan(self, text: str) -> Optional[str]:
+        """
+        Returns the matched rule, "arbiter" if the string needs the
+        adversarial arbiter, or None if it is clean.
+        """
+        forms = self._forms(text)
+        for form in forms:
+            match = self._matcher.search(_NON_ALNUM.sub('', form))
+            if match:
+                return self._rule_for[match.group(0)]
+        if self._trigger.search(forms[0]):
+            return "arbiter"
+        return None
+
+    def record_hit(self, rule: str) -> None:
+        self.hits[rule] = self.hits.get(rule, 0) + 1
+        try:
+            LLM_GUARDRAIL_HITS.labels(rule=rule).inc()
+        except Exception:
+            pass
+
+    def sanitize(self, data: Any, verdicts: Dict[str, Optional[str]]) -> Any:
+        """
+        Single pass over a payload. Strings that matched a rule are replaced;
+        strings awaiting the arbiter are left as-is and recorded in `verdicts`.
+        """
+        if isinstance(data, str):
+            verdict = verdicts.get(data, "")
+            if verdict == "":
+                verdict = verdicts[data] = self.scan(data)
+            if verdict is None or verdict == "arbiter":
+                return data
+            return REDACTED
+        if isinstance(data, dict):
+            return {self.sanitize(k, verdicts): self.sanitize(v, verdicts) for k, v in data.items()}
+        if isinstance(data, list):
+            return [self.sanitize(item, verdicts) for item in data]
+        return data
+
+
 class LLMGuardrails:
     """
     Security guardrails for LLM interactions.
@@ -36,72 +135,54 @@ class LLMGuardrails:
         r"previous",
     ]
 
+    # Cheap pre-filter deciding whether the AdversarialArbiter runs
+    ARBITER_TRIGGERS = ["prompt", "ignore", "system", "mode", "unfilter", "jailbreak", "dan", "output"]
+
+    _engine: Optional[GuardrailEngine] = None
+
+    @classmethod
+    def engine(cls) -> GuardrailEngine:
+        if cls._engine is None:
+            cls._engine = GuardrailEngine(cls.INJECTION_PATTERNS, cls.ARBITER_TRIGGERS)
+        return cls._engine
+
+    @classmethod
+    def rule_hits(cls) -> Dict[str, int]:
+        """Redactions per rule since process start."""
+        return dict(cls.engine().hits)
+
     @classmethod
     async def sanitize_input(cls, data: Any, db: Any = None, tenant_id: Any = None) -> Any:
         """
-        Recursively sanitizes input data to strip prompt injection attempts.
+        Sanitizes input data (strings, nested dicts and lists) to strip prompt injection attempts.
         """
-        if isinstance(data, str):
-            def _to_plain_ascii(s: str) -> str:
-                # 1. Full-width and Small-caps handling
-                src_sc = "\u1d00\u0299\u1d04\u1d05\u1d07\ua730\u0262\u029c\u026a\u1d0a\u1d0b\u029f\u1d0d\u0274\u1d0f\u1d18\ua7af\u0280\ua731\u1d1b\u1d1c\u1d20\u1d21\u1d22\u028f\u1d22"
-                dst_sc = "abcdefghijklmnopqrstuvwxyz"
-                s = s.translate(str.maketrans(src_sc, dst_sc))
-                
-                src_fw = "".join(chr(i) for i in range(0xff41, 0xff5b))
-                dst_fw = "abcdefghijklmnopqrstuvwxyz"
-                s = s.translate(str.maketrans(src_fw, dst_fw))
-
-                # 2. General Normalization & Lowercase
-                s = unicodedata.normalize('NFKC', s).lower()
-                
-                # 3. Robust Homoglyph Mapping via Dictionary (To avoid alignment errors)
-                homoglyph_map = {
-                    '\u0430': 'a', '\u0432': 'v', '\u0433': 'g', '\u0434': 'd', '\u0435': 'e',
-                    '\u0437': 'z', '\u0456': 'i', '\u0458': 'j', '\u043a': 'k', '\u04cf': 'i',
-                    '\u043c': 'm', '\u043d': 'n', '\u043f': 'p', '\u043e': 'o', '\u0440': 'p',
-                    '\u0441': 's', '\u0442': 't', '\u0443': 'y', '\u0445': 'x', '\u0446': 'c',
-                    '\u0447': 'c', '\u0448': 's', '\u0449': 's', '\u044b': 'y', '\u044c': 'b',
-                    '\u044d': 'e', '\u044e': 'a', '\u044f': 'i', '\u0438': 'i'
-                }
-                return "".join(homoglyph_map.get(c, c) for c in s)
-
-            # Generate multiple checkable forms
-            forms = [
-                _to_plain_ascii(data),
-                unicodedata.normalize('NFKD', data).lower(),
-                data.lower()
-            ]
-            
-            # Layer 3: Check all forms (normalized and collapsed)
-            for form in set(forms):
-                collapsed = re.sub(r'[^a-z0-9]', '', form)
-                
-                for pattern in cls.INJECTION_PATTERNS:
-                    clean_pattern = re.sub(r'[^a-z0-9]', '', pattern).lower()
-                    if clean_pattern and clean_pattern in collapsed:
-                        logger.critical("prompt_injection_detected", 
-                                        pattern=pattern, 
-                                        form_detected=collapsed[:50],
-                                        tenant_id=str(tenant_id))
-                        return "[REDACTED]"
-            
-            # Layer 4: Advanced Adversarial Arbiter
-            trigger_keywords = ["prompt", "ignore", "system", "mode", "unfilter", "jailbreak", "dan", "output"]
-            if any(kw in forms[0] for kw in trigger_keywords):
-                arbiter = AdversarialArbiter()
-                if await arbiter.is_adversarial(data):
+        engine = cls.engine()
+        verdicts: Dict[str, Optional[str]] = {}
+        sanitized = engine.sanitize(data, verdicts)
+
+        blocked = False
+        arbiter = None
+        for text, verdict in verdicts.items():
+            if verdict == "arbiter":
+                # Layer 4: Advanced Adversarial Arbiter
+                arbiter = arbiter or AdversarialArbiter()
+                if await arbiter.is_adversarial(text):
                     logger.critical("prompt_injection_blocked_by_arbiter", tenant_id=str(tenant_id))
-                    return "[REDACTED]"
-
-            return data
-        
-        elif isinstance(data, list):
-            return [await cls.sanitize_input(item, db, tenant_id) for item in data]
-        elif isinstance(data, dict):
-            return {await cls.sanitize_input(k, db, tenant_id): await cls.sanitize_input(v, db, tenant_id) for k, v in data.items()}
-        
-        return data
+                    engine.record_hit("arbiter")
+                    blocked = True
+                    continue
+                verdicts[text] = None
+            elif verdict is not None:
+                logger.critical("prompt_injection_detected",
+                                pattern=verdict,
+                                form_detected=_NON_ALNUM.sub('', text.lower())[:50],
+                                tenant_id=str(tenant_id))
+                engine.record_hit(verdict)
+
+        if blocked:
+            # Rare: rewrite with arbiter verdicts now settled
+            sanitized = engine.sanitize(data, {k: (REDACTED if v else None) for k, v in verdicts.items()})
+        return sanitized
     
     @classmethod
     def validate_output(cls, raw_content: str, schema_class: Type[T]) -> T:
@@ -175,26 +256,11 @@ class AdversarialArbiter:
         if not text:
             return False
             
-        def _to_plain_ascii(s: str) -> str:
-            src_sc = "\u1d00\u0299\u1d04\u1d05\u1d07\ua730\u0262\u029c\u026a\u1d0a\u1d0b\u029f\u1d0d\u0274\u1d0f\u1d18\ua7af\u0280\ua731\u1d1b\u1d1c\u1d20\u1d21\u1d22\u028f\u1d22"
-            dst_sc = "abcdefghijklmnopqrstuvwxyz"
-            s = s.translate(str.maketrans(src_sc, dst_sc))
-            s = unicodedata.normalize('NFKC', s).lower()
-            homoglyph_map = {
-                '\u0430': 'a', '\u0432': 'v', '\u0433': 'g', '\u0434': 'd', '\u0435': 'e',
-                '\u0437': 'z', '\u0456': 'i', '\u0458': 'j', '\u043a': 'k', '\u04cf': 'i',
-                '\u043c': 'm', '\u043d': 'n', '\u043f': 'p', '\u043e': 'o', '\u0440': 'p',
-                '\u0441': 's', '\u0442': 't', '\u0443': 'y', '\u0445': 'x', '\u0446': 'c',
-                '\u0447': 'c', '\u0448': 's', '\u0449': 's', '\u044b': 'y', '\u044c': 'b',
-                '\u044d': 'e', '\u044e': 'a', '\u044f': 'i', '\u0438': 'i'
-            }
-            return "".join(homoglyph_map.get(c, c) for c in s)
-
         processed_text = _to_plain_ascii(text)
         jailbreak_keywords = ["dan", "jailbreak", "unfiltered", "developer mode", "ignore previous", "system prompt", "output only"]
-        collapsed = re.sub(r'[^a-z]', '', processed_text)
+        collapsed = _NON_ALPHA.sub('', processed_text)
         for kw in jailbreak_keywords:
-            clean_kw = re.sub(r'[^a-z]', '', kw)
+            clean_kw = _NON_ALPHA.sub('', kw)
             if clean_kw in collapsed:
                 return True
             
@@ -0,0 +1,231 @@
+"""
+Prompt Compaction for Cost Summaries
+
+Reduces a CloudUsageSummary to a token budget before it is sent to an LLM:
+- Daily totals are always kept (cheap, and what trend analysis needs)
+- Top-N services and line items (service/region/usage type) by cost
+- Everything else is aggregated into a long-tail bucket
+- Statistical change highlights flag services whose latest day departs
+  from their trailing baseline
+
+Ordering is fully deterministic (cost descending, then name) so identical
+summaries always render to identical prompts.
+"""
+
+import json
+import statistics
+from dataclasses import asdict, dataclass
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+# Progressively smaller (services, line items, highlights) until the budget fits
+COMPACTION_LEVELS: Tuple[Tuple[int, int, int], ...] = (
+    (25, 60, 10),
+    (15, 30, 8),
+    (10, 15, 5),
+    (5, 8, 3),
+    (3, 0, 2),
+)
+TOP_TAG_VALUES = 5
+HIGHLIGHT_Z_SCORE = 2.0
+HIGHLIGHT_PCT_CHANGE = 0.5
+HIGHLIGHT_MIN_DELTA_USD = 1.0
+UNKNOWN = "unknown"
+
+
+@dataclass
+class CompactionReport:
+    token_budget: int
+    original_tokens: int
+    final_tokens: int
+    records_in: int
+    services_total: int
+    services_kept: int
+    line_items_total: int
+    line_items_kept: int
+    aggregated_cost: float
+    aggregated_cost_share: float
+
+    @property
+    def within_budget(self) -> bool:
+        return self.final_tokens <= self.token_budget
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "within_budget": self.within_budget}
+
+
+def render(payload: Dict[str, Any]) -> str:
+    """Canonical JSON used for both token counting and the prompt itself."""
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _money(value: Decimal) -> float:
+    return round(float(value), 4)
+
+
+def _ranked(totals: Dict[Any, Decimal]) -> List[Tuple[Any, Decimal]]:
+    return sorted(totals.items(), key=lambda kv: (-kv[1], str(kv[0])))
+
+
+class PromptCompactor:
+    """Builds the smallest faithful view of a cost summary that fits the budget."""
+
+    def __init__(
+        self,
+        token_budget: int,
+        model: str = "gpt-4",
+        count_tokens: Optional[Callable[[str, str], int]] = None,
+    ):
+        if count_tokens is None:
+            from app.shared.llm.tokenizer import count_tokens
+        self.token_budget = int(token_budget)
+        self.model = model
+        self._count = count_tokens
+
+    def count(self, text: str) -> int:
+        return self._count(text, self.model)
+
+    def compact(self, summary: Any) -> Tuple[Dict[str, Any], CompactionReport]:
+        records = list(summary.records)
+        total = sum((Decimal(str(r.amount)) for r in records), Decimal("0"))
+
+        daily: Dict[str, Decimal] = {}
+        by_service: Dict[str, Decimal] = {}
+        by_line_item: Dict[Tuple[str, str, str], Decimal] = {}
+        service_days: Dict[str, Dict[str, Decimal]] = {}
+        for r in records:
+            amount = Decimal(str(r.amount))
+            day = r.date.date().isoformat() if hasattr(r.date, "date") else str(r.date)
+            service = r.service or UNKNOWN
+            key = (service, r.region or UNKNOWN, r.usage_type or UNKNOWN)
+            daily[day] = daily.get(day, Decimal("0")) + amount
+            by_service[service] = by_service.get(service, Decimal("0")) + amount
+            by_line_item[key] = by_line_item.get(key, Decimal("0")) + amount
+            series = service_days.setdefault(service, {})
+            series[day] = series.get(day, Decimal("0")) + amount
+
+        ranked_services = _ranked(by_service)
+        ranked_items = _ranked(by_line_item)
+        highlights = self._change_highlights(service_days, sorted(daily))
+
+        base = {
+            "tenant_id": str(summary.tenant_id),
+            "provider": summary.provider,
+            "start_date": str(summary.start_date),
+            "end_date": str(summary.end_date),
+            "total_cost": _money(Decimal(str(summary.total_cost))),
+            "daily_totals": [{"date": d, "cost": _money(daily[d])} for d in sorted(daily)],
+            "by_region": [
+                {"region": k, "cost": _money(v)}
+                for k, v in _ranked({k: Decimal(str(v)) for k, v in summary.by_region.items()})
+            ],
+            "by_tag": {
+                tag: [
+                    {"value": k, "cost": _money(v)}
+                    for k, v in _ranked({k: Decimal(str(v)) for k, v in values.items()})[:TOP_TAG_VALUES]
+                ]
+                for tag, values in sorted(summary.by_tag.items())
+            },
+        }
+
+        original_tokens = self.count(render(summary.model_dump(mode="json")))
+        payload: Dict[str, Any] = {}
+        kept = (0, 0)
+        for n_services, n_items, n_highlights in COMPACTION_LEVELS:
+            payload, kept = self._build(base, ranked_services, ranked_items, highlights, total,
+                                        n_services, n_items, n_highlights)
+            final_tokens = self.count(render(payload))
+            if final_tokens <= self.token_budget:
+                break
+
+        aggregated = total - sum((v for _, v in ranked_services[:kept[0]]), Decimal("0"))
+        report = CompactionReport(
+            token_budget=self.token_budget,
+            original_tokens=original_tokens,
+            final_tokens=final_tokens,
+            records_in=len(records),
+            services_total=len(ranked_services),
+            services_kept=kept[0],
+            line_items_total=len(ranked_items),
+            line_items_kept=kept[1],
+            aggregated_cost=_money(aggregated),
+            aggregated_cost_share=round(float(aggregated / total), 4) if total else 0.0,
+        )
+        payload["compaction"] = {
+            "services_aggregated": report.services_total - report.services_kept,
+            "line_items_aggregated": report.line_items_total - report.line_items_kept,
+            "aggregated_cost": report.aggregated_cost,
+        }
+        if not report.within_budget:
+            logger.warning("prompt_compaction_over_budget", **report.to_dict())
+        else:
+            logger.info("prompt_compacted", **report.to_dict())
+        return payload, report
+
+    @staticmethod
+    def _build(
+        base: Dict[str, Any],
+        ranked_services: List[Tuple[str, Decimal]],
+        ranked_items: List[Tuple[Tuple[str, str, str], Decimal]],
+        highlights: List[Dict[str, Any]],
+        total: Decimal,
+        n_services: int,
+        n_items: int,
+        n_highlights: int,
+    ) -> Tuple[Dict[str, Any], Tuple[int, int]]:
+        top_services = ranked_services[:n_services]
+        top_items = ranked_items[:n_items]
+        tail_services = ranked_services[n_services:]
+        tail_items = ranked_items[n_items:]
+        payload = {
+            **base,
+            "top_services": [
+                {"service": s, "cost": _money(v), "share": round(float(v / total), 4) if total else 0.0}
+                for s, v in top_services
+            ],
+            "top_line_items": [
+                {"service": s, "region": r, "usage_type": u, "cost": _money(v)}
+                for (s, r, u), v in top_items
+            ],
+            "change_highlights": highlights[:n_highlights],
+            "long_tail": {
+                "services": len(tail_services),
+                "services_cost": _money(sum((v for _, v in tail_services), Decimal("0"))),
+                "line_items": len(tail_items),
+                "line_items_cost": _money(sum((v for _, v in tail_items), Decimal("0"))),
+            },
+        }
+        return payload, (len(top_services), len(top_items))
+
+    @staticmethod
+    def _change_highlights(service_days: Dict[str, Dict[str, Decimal]], days: List[str]) -> List[Dict[str, Any]]:
+        """Services whose latest day deviates from their trailing daily baseline."""
+        if len(days) < 3:
+            return []
+        latest_day, baseline_days = days[-1], days[:-1]
+        highlights = []
+        for service, series in service_days.items():
+            baseline = [float(series.get(d, 0)) for d in baseline_days]
+            latest = float(series.get(latest_day, 0))
+            mean = statistics.fmean(baseline)
+            delta = latest - mean
+            if abs(delta) < HIGHLIGHT_MIN_DELTA_USD:
+                continue
+            stdev = statistics.pstdev(baseline)
+            z = delta / stdev if stdev > 0 else None
+            pct = delta / mean if mean > 0 else None
+            if (z is not None and abs(z) >= HIGHLIGHT_Z_SCORE) or pct is None or abs(pct) >= HIGHLIGHT_PCT_CHANGE:
+                highlights.append({
+                    "service": service,
+                    "date": latest_day,
+                    "cost": round(latest, 4),
+                    "baseline_daily_mean": round(mean, 4),
+                    "change_pct": round(pct * 100, 1) if pct is not None else None,
+                    "z_score": round(z, 2) if z is not None else None,
+                })
+        highlights.sort(key=lambda h: (-abs(h["cost"] - h["baseline_daily_mean"]), h["service"]))
+        return highlights
@@ -0,0 +1,344 @@
+"""
+LLM Provider Health - Cross-Worker Circuit Breaker and Routing
+
+Provider health is kept in a shared store so that every API replica and
+Celery worker sees the same circuit state:
+- Rolling error-rate and latency windows (time-bucketed counters)
+- CLOSED -> OPEN when the window error rate crosses the threshold
+- OPEN circuits are skipped without a call until the recovery timeout
+- HALF-OPEN admits a single probe across all workers (SET NX lock); the
+  probe's result closes or re-opens the circuit
+- Fallbacks are ordered by observed latency and price
+
+Redis (REDIS_URL) is the shared store; an in-process store is used when it
+is not configured or unavailable. The in-process LLMCircuitBreaker remains
+for callers that only need per-process isolation.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import structlog
+
+from app.shared.core.config import get_settings
+from app.shared.core.ops_metrics import (
+    LLM_PROVIDER_CIRCUIT_STATE,
+    LLM_PROVIDER_ERROR_RATE,
+    LLM_PROVIDER_LATENCY_SECONDS,
+)
+from app.shared.llm.circuit_breaker import CircuitState
+from app.shared.llm.pricing_data import LLM_PRICING
+
+logger = structlog.get_logger()
+
+KEY_PREFIX = "llm_health"
+WINDOW_BUCKETS = 6  # The rolling window is split into this many buckets
+STATE_TTL_SECONDS = 86400
+
+# Tried after the primary provider, in health/latency/price order
+DEFAULT_FALLBACKS: Tuple[Tuple[str, str], ...] = (
+    ("groq", "llama-3.3-70b-versatile"),
+    ("openai", "gpt-4o-mini"),
+    ("anthropic", "claude-3-5-haiku"),
+)
+
+_STATE_GAUGE_VALUES = {CircuitState.CLOSED: 0, CircuitState.HALF_OPEN: 1, CircuitState.OPEN: 2}
+
+
+@dataclass
+class ProviderStats:
+    provider: str
+    state: CircuitState
+    requests: int
+    errors: int
+    mean_latency: Optional[float]
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0.0
+
+
+def blended_price(provider: str, model: Optional[str] = None) -> float:
+    """Input + output USD per 1M tokens, from the pricing table."""
+    prices = LLM_PRICING.get(provider, {})
+    cost = prices.get(model) or prices.get("default")
+    return float(cost["input"] + cost["output"]) if cost else float("inf")
+
+
+class InMemoryHealthStore:
+    """Per-process store; used without Redis and as the Redis fallback."""
+
+    def __init__(self) -> None:
+        self._buckets: Dict[Tuple[str, int], List[float]] = {}
+        self._states: Dict[str, Tuple[CircuitState, float]] = {}
+        self._probes: Dict[str, float] = {}
+
+    async def add(self, provider: str, bucket: int, ok: bool, latency: float, ttl: int) -> None:
+        counts = self._buckets.setdefault((provider, bucket), [0, 0, 0.0])
+        counts[0 if ok else 1] += 1
+        counts[2] += latency
+        # Drop buckets that have left the window
+        for key in [k for k in self._buckets if k[1] <= bucket - WINDOW_BUCKETS]:
+            del self._buckets[key]
+
+    async def window(self, provider: str, buckets: Sequence[int]) -> Tuple[int, int, float]:
+        ok = err = 0
+        latency = 0.0
+        for bucket in buckets:
+            counts = self._buckets.get((provider, bucket))
+            if counts:
+                ok, err, latency = ok + int(counts[0]), err + int(counts[1]), latency + counts[2]
+        return ok, err, latency
+
+    async def clear_window(self, provider: str, buckets: Sequence[int]) -> None:
+        for bucket in buckets:
+            self._buckets.pop((provider, bucket), None)
+
+    async def get_state(self, provider: str) -> Tuple[CircuitState, float]:
+        return self._states.get(provider, (CircuitState.CLOSED, 0.0))
+
+    async def set_state(self, provider: str, state: CircuitState, opened_at: float) -> None:
+        self._states[provider] = (state, opened_at)
+
+    async def try_probe(self, provider: str, ttl: int) -> bool:
+        now = time.monotonic()
+        if self._probes.get(provider, 0.0) > now:
+            return False
+        self._probes[provider] = now + ttl
+        return True
+
+    async def end_probe(self, provider: str) -> None:
+        self._probes.pop(provider, None)
+
+
+class RedisHealthStore:
+    """Shared store: one hash per window bucket, one state hash and a probe lock per provider."""
+
+    def __init__(self, redis: Any):
+        self._redis = redis
+
+    @staticmethod
+    def _bucket_key(provider: str, bucket: int) -> str:
+        return f"{KEY_PREFIX}:{provider}:{bucket}"
+
+    @staticmethod
+    def _state_key(provider: str) -> str:
+        return f"{KEY_PREFIX}_state:{provider}"
+
+    @staticmethod
+    def _probe_key(provider: str) -> str:
+        return f"{KEY_PREFIX}_probe:{provider}"
+
+    async def add(self, provider: str, bucket: int, ok: bool, latency: float, ttl: int) -> None:
+        key = self._bucket_key(provider, bucket)
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.hincrby(key, "ok" if ok else "err", 1)
+            pipe.hincrbyfloat(key, "latency", latency)
+            pipe.expire(key, ttl)
+            await pipe.execute()
+
+    async def window(self, provider: str, buckets: Sequence[int]) -> Tuple[int, int, float]:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for bucket in buckets:
+                pipe.hgetall(self._bucket_key(provider, bucket))
+            rows = await pipe.execute()
+        ok = sum(int(r.get("ok", 0)) for r in rows)
+        err = sum(int(r.get("err", 0)) for r in rows)
+        latency = sum(float(r.get("latency", 0)) for r in rows)
+        return ok, err, latency
+
+    async def clear_window(self, provider: str, buckets: Sequence[int]) -> None:
+        await self._redis.delete(*[self._bucket_key(provider, b) for b in buckets])
+
+    async def get_state(self, provider: str) -> Tuple[CircuitState, float]:
+        row = await self._redis.hgetall(self._state_key(provider))
+        if not row:
+            return CircuitState.CLOSED, 0.0
+        return CircuitState(row["state"]), float(row.get("opened_at", 0))
+
+    async def set_state(self, provider: str, state: CircuitState, opened_at: float) -> None:
+        key = self._state_key(provider)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={"state": state.value, "opened_at": repr(opened_at)})
+            pipe.expire(key, STATE_TTL_SECONDS)
+            await pipe.execute()
+
+    async def try_probe(self, provider: str, ttl: int) -> bool:
+        return bool(await self._redis.set(self._probe_key(provider), "1", nx=True, ex=ttl))
+
+    async def end_probe(self, provider: str) -> None:
+        await self._redis.delete(self._probe_key(provider))
+
+
+class ProviderHealth:
+    """
+    Shared circuit breaker and health-aware routing for LLM providers.
+
+    Usage:
+        health = get_provider_health()
+        for provider, model in health.route("groq", "llama-3.3-70b-versatile"):
+            if not await health.allow(provider):
+                continue  # circuit open, or another worker holds the probe
+            ...
+            await health.record(provider, ok=True, latency=elapsed)
+    """
+
+    def __init__(
+        self,
+        window_seconds: int = 60,
+        error_rate_threshold: float = 0.5,
+        min_requests: int = 5,
+        recovery_seconds: int = 30,
+        redis: Any = None,
+        clock: Any = time.time,
+    ):
+        self.window_seconds = max(int(window_seconds), WINDOW_BUCKETS)
+        self.bucket_seconds = self.window_seconds // WINDOW_BUCKETS
+        self.error_rate_threshold = float(error_rate_threshold)
+        self.min_requests = int(min_requests)
+        self.recovery_seconds = int(recovery_seconds)
+        self._redis = redis
+        self._clock = clock
+        self._local = InMemoryHealthStore()
+        # Last seen mean latency per provider, used for routing without a store round trip
+        self._latency: Dict[str, float] = {}
+
+    def _store(self) -> Any:
+        redis = self._redis
+        if redis is None:
+            from app.shared.core.rate_limit import get_redis_client
+            redis = get_redis_client()
+        return RedisHealthStore(redis) if redis is not None else self._local
+
+    async def _call(self, method: str, *args: Any) -> Any:
+        store = self._store()
+        try:
+            return await getattr(store, method)(*args)
+        except Exception as e:
+            if store is self._local:
+                raise
+            logger.warning("llm_health_store_error", operation=method, error=str(e))
+            return await getattr(self._local, method)(*args)
+
+    def _window_buckets(self, now: float) -> List[int]:
+        current = int(now) // self.bucket_seconds
+        return list(range(current - WINDOW_BUCKETS + 1, current + 1))
+
+    async def stats(self, provider: str) -> ProviderStats:
+        now = self._clock()
+        state, _ = await self._call("get_state", provider)
+        ok, err, latency = await self._call("window", provider, self._window_buckets(now))
+        requests = ok + err
+        return ProviderStats(provider, state, requests, err, latency / requests if requests else None)
+
+    async def allow(self, provider: str) -> bool:
+        """True if a call to the provider may proceed (closed, or this caller holds the probe)."""
+        state, opened_at = await self._call("get_state", provider)
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.OPEN and self._clock() - opened_at < self.recovery_seconds:
+            return False
+        # Recovery window elapsed (or a probe is in flight): one probe across all workers
+        if not await self._call("try_probe", provider, max(1, self.recovery_seconds)):
+            return False
+        if state != CircuitState.HALF_OPEN:
+            await self._call("set_state", provider, CircuitState.HALF_OPEN, opened_at)
+            logger.info("circuit_half_open", provider=provider, message="Testing recovery")
+        self._publish_state(provider, CircuitState.HALF_OPEN)
+        return True
+
+    async def record(self, provider: str, ok: bool, latency: float) -> None:
+        """Record a call outcome and apply circuit transitions."""
+        now = self._clock()
+        buckets = self._window_buckets(now)
+        await self._call("add", provider, buckets[-1], ok, latency, self.window_seconds + self.bucket_seconds)
+        state, _ = await self._call("get_state", provider)
+
+        if state == CircuitState.HALF_OPEN:
+            if ok:
+                state = CircuitState.CLOSED
+                await self._call("clear_window", provider, buckets)
+                logger.info("circuit_closed", provider=provider, message="Provider recovered")
+            else:
+                state = CircuitState.OPEN
+                logger.warning("circuit_reopened", provider=provider, message="Recovery failed")
+            await self._call("set_state", provider, state, now)
+            await self._call("end_probe", provider)
+            self._publish_state(provider, state)
+            return
+
+        stats = await self.stats(provider)
+        if stats.mean_latency is not None:
+            self._latency[provider] = stats.mean_latency
+            LLM_PROVIDER_LATENCY_SECONDS.labels(provider=provider).set(stats.mean_latency)
+        LLM_PROVIDER_ERROR_RATE.labels(provider=provider).set(stats.error_rate)
+
+        if (
+            state == CircuitState.CLOSED
+            and not ok
+            and stats.requests >= self.min_requests
+            and stats.error_rate >= self.error_rate_threshold
+        ):
+            await self._call("set_state", provider, CircuitState.OPEN, now)
+            logger.error(
+                "circuit_opened",
+                provider=provider,
+                error_rate=round(stats.error_rate, 3),
+                requests=stats.requests,
+                message="Provider marked unavailable",
+            )
+            state = CircuitState.OPEN
+        self._publish_state(provider, state)
+
+    def route(
+        self,
+        provider: str,
+        model: str,
+        fallbacks: Iterable[Tuple[str, str]] = DEFAULT_FALLBACKS,
+    ) -> List[Tuple[str, str]]:
+        """
+        Primary first, then fallbacks by rank of observed mean latency plus
+        rank of price (ties go to the cheaper provider). Providers without
+        latency samples rank at the median so they still get tried.
+        """
+        candidates = [(p, m) for p, m in fallbacks if p != provider]
+        known = sorted(self._latency[p] for p, _ in candidates if p in self._latency)
+        median = known[len(known) // 2] if known else 0.0
+
+        def latency(c: Tuple[str, str]) -> float:
+            return self._latency.get(c[0], median)
+
+        by_latency = sorted(candidates, key=latency)
+        by_price = sorted(candidates, key=lambda c: blended_price(*c))
+        ordered = sorted(
+            candidates,
+            key=lambda c: (by_latency.index(c) + by_price.index(c), blended_price(*c)),
+        )
+        return [(provider, model)] + ordered
+
+    @staticmethod
+    def _publish_state(provider: str, state: CircuitState) -> None:
+        LLM_PROVIDER_CIRCUIT_STATE.labels(provider=provider).set(_STATE_GAUGE_VALUES[state])
+
+
+_provider_health: Optional[ProviderHealth] = None
+
+
+def get_provider_health() -> ProviderHealth:
+    """Get the process-wide provider health registry."""
+    global _provider_health
+    if _provider_health is None:
+        settings = get_settings()
+        _provider_health = ProviderHealth(
+            window_seconds=settings.LLM_CIRCUIT_WINDOW_SECONDS,
+            error_rate_threshold=settings.LLM_CIRCUIT_ERROR_RATE,
+            min_requests=settings.LLM_CIRCUIT_MIN_REQUESTS,
+            recovery_seconds=settings.LLM_CIRCUIT_RECOVERY_SECONDS,
+        )
+    return _provider_health
+
+
+def reset_provider_health() -> None:
+    global _provider_health
+    _provider_health = None
@@ -0,0 +1,226 @@
+"""
+LLM Response Cache
+
+Content-addressed cache for LLM responses. The key is a hash of the
+normalized prompt, provider, model and prompt-template version, so a
+re-run over identical (sanitized, compacted) data reuses the previous
+response instead of paying for another invocation. Changing a prompt
+template changes its version and therefore every key.
+
+Entries are stored per tenant (a tenant can only read its own responses)
+with a TTL and a per-tenant entry cap; the oldest entries are evicted
+first. Backends:
+- RedisResponseBackend: shared across workers (REDIS_URL)
+- InMemoryResponseBackend: per-process LRU
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Protocol
+
+import structlog
+
+from app.shared.core.config import get_settings
+from app.shared.core.ops_metrics import LLM_RESPONSE_CACHE_REQUESTS
+
+logger = structlog.get_logger()
+
+KEY_PREFIX = "llm_response"
+
+
+class ResponseCacheBackend(Protocol):
+    async def get(self, scope: str, key: str) -> Optional[Dict[str, Any]]: ...
+
+    async def set(self, scope: str, key: str, value: Dict[str, Any], ttl_seconds: int, max_entries: int) -> int:
+        """Store a value; returns the number of entries evicted."""
+        ...
+
+    async def invalidate(self, scope: Optional[str] = None) -> int: ...
+
+
+class InMemoryResponseBackend:
+    """Per-process LRU, bounded per tenant."""
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, "OrderedDict[str, tuple[float, Dict[str, Any]]]"] = {}
+
+    async def get(self, scope: str, key: str) -> Optional[Dict[str, Any]]:
+        entries = self._entries.get(scope)
+        if not entries or key not in entries:
+            return None
+        expires_at, value = entries[key]
+        if expires_at <= time.monotonic():
+            del entries[key]
+            return None
+        entries.move_to_end(key)
+        return value
+
+    async def set(self, scope: str, key: str, value: Dict[str, Any], ttl_seconds: int, max_entries: int) -> int:
+        entries = self._entries.setdefault(scope, OrderedDict())
+        entries[key] = (time.monotonic() + ttl_seconds, value)
+        entries.move_to_end(key)
+        evicted = 0
+        while len(entries) > max_entries:
+            entries.popitem(last=False)
+            evicted += 1
+        return evicted
+
+    async def invalidate(self, scope: Optional[str] = None) -> int:
+        if scope is None:
+            count = sum(len(e) for e in self._entries.values())
+            self._entries.clear()
+            return count
+        return len(self._entries.pop(scope, {}))
+
+
+class RedisResponseBackend:
+    """
+    Shared across workers. Each tenant has a sorted-set index of its keys
+    (scored by write time) used for oldest-first eviction and invalidation.
+    """
+
+    def __init__(self, redis: Any = None) -> None:
+        self._redis = redis
+
+    def _client(self) -> Any:
+        if self._redis is not None:
+            return self._redis
+        from app.shared.core.rate_limit import get_redis_client
+        client = get_redis_client()
+        if client is None:
+            raise RuntimeError("REDIS_URL is not configured")
+        return client
+
+    @staticmethod
+    def _entry_key(scope: str, key: str) -> str:
+        return f"{KEY_PREFIX}:{scope}:{key}"
+
+    @staticmethod
+    def _index_key(scope: str) -> str:
+        return f"{KEY_PREFIX}_index:{scope}"
+
+    async def get(self, scope: str, key: str) -> Optional[Dict[str, Any]]:
+        raw = await self._client().get(self._entry_key(scope, key))
+        return json.loads(raw) if raw else None
+
+    async def set(self, scope: str, key: str, value: Dict[str, Any], ttl_seconds: int, max_entries: int) -> int:
+        redis = self._client()
+        index = self._index_key(scope)
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.set(self._entry_key(scope, key), json.dumps(value, default=str), ex=ttl_seconds)
+            pipe.zadd(index, {key: time.time()})
+            pipe.expire(index, ttl_seconds)
+            pipe.zcard(index)
+            results = await pipe.execute()
+        excess = int(results[-1]) - max_entries
+        if excess <= 0:
+            return 0
+        oldest = await redis.zpopmin(index, excess)
+        stale = [self._entry_key(scope, member) for member, _ in oldest]
+        if stale:
+            await redis.delete(*stale)
+        return len(stale)
+
+    async def invalidate(self, scope: Optional[str] = None) -> int:
+        redis = self._client()
+        scopes: List[str] = [scope] if scope is not None else [
+            index.split(":", 1)[1] async for index in redis.scan_iter(match=f"{KEY_PREFIX}_index:*")
+        ]
+        count = 0
+        for s in scopes:
+            members = await redis.zrange(self._index_key(s), 0, -1)
+            if members:
+                count += await redis.delete(*[self._entry_key(s, m) for m in members])
+            await redis.delete(self._index_key(s))
+        return count
+
+
+def prompt_version(*templates: str) -> str:
+    """Stable version id for a set of prompt templates."""
+    digest = hashlib.sha256("\x1f".join(templates).encode()).hexdigest()
+    return digest[:16]
+
+
+class LLMResponseCache:
+    """Tenant-scoped, content-addressed LLM response cache."""
+
+    def __init__(self, backend: ResponseCacheBackend, ttl_seconds: int, max_entries: int):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+    @staticmethod
+    def key(prompt: str, provider: str, model: str, version: str) -> str:
+        normalized = " ".join(prompt.split())
+        material = "\x1f".join((provider.lower(), model, version, normalized))
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    @staticmethod
+    def _record(result: str) -> None:
+        try:
+            LLM_RESPONSE_CACHE_REQUESTS.labels(result=result).inc()
+        except Exception:
+            pass
+
+    async def get(self, tenant_id: Any, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            value = await self.backend.get(str(tenant_id), key)
+        except Exception as e:
+            logger.warning("llm_response_cache_get_failed", error=str(e))
+            self._record("error")
+            return None
+        self._record("hit" if value is not None else "miss")
+        return value
+
+    async def set(self, tenant_id: Any, key: str, value: Dict[str, Any]) -> bool:
+        try:
+            evicted = await self.backend.set(str(tenant_id), key, value, self.ttl_seconds, self.max_entries)
+        except Exception as e:
+            logger.warning("llm_response_cache_set_failed", error=str(e))
+            self._record("error")
+            return False
+        self._record("store")
+        if evicted:
+            try:
+                LLM_RESPONSE_CACHE_REQUESTS.labels(result="evict").inc(evicted)
+            except Exception:
+                pass
+        return True
+
+    async def invalidate(self, tenant_id: Any = None) -> int:
+        """Drop cached responses for one tenant, or for all tenants (e.g. after a prompt change)."""
+        try:
+            count = await self.backend.invalidate(str(tenant_id) if tenant_id is not None else None)
+        except Exception as e:
+            logger.warning("llm_response_cache_invalidate_failed", error=str(e))
+            return 0
+        logger.info("llm_response_cache_invalidated", tenant_id=str(tenant_id) if tenant_id else "all", entries=count)
+        return count
+
+
+_response_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_response_cache() -> Optional[LLMResponseCache]:
+    """Get the process-wide response cache, or None if disabled."""
+    global _response_cache
+    settings = get_settings()
+    backend_name = settings.LLM_RESPONSE_CACHE_BACKEND.lower()
+    if backend_name == "off":
+        return None
+    if _response_cache is None:
+        use_redis = backend_name == "redis" or (backend_name == "auto" and settings.REDIS_URL)
+        backend: ResponseCacheBackend = RedisResponseBackend() if use_redis else InMemoryResponseBackend()
+        _response_cache = LLMResponseCache(
+            backend,
+            ttl_seconds=settings.LLM_RESPONSE_CACHE_TTL_SECONDS,
+            max_entries=settings.LLM_RESPONSE_CACHE_MAX_ENTRIES,
+        )
+    return _response_cache
+
+
+def reset_llm_response_cache() -> None:
+    global _response_cache
+    _response_cache = None
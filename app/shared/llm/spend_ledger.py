@@ -0,0 +1,423 @@
+"""
+LLM Spend Ledger
+
+Running per-tenant, per-month LLM spend so budget checks are O(1):
+- `reserve`: one conditional UPDATE that only succeeds if the reservation
+  fits under the limit (no SUM over llm_usage, no FOR UPDATE on the budget)
+- `settle`: moves a reservation into spent when usage is recorded
+- Expired reservations (failed or abandoned calls) are released lazily per
+  tenant and swept by `reconcile`, which rebuilds the ledger from llm_usage
+  one tenant at a time under that tenant's RLS context.
+
+A missing ledger row (first call of the month, or a month never seen since
+deploy) is seeded once from llm_usage.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+import structlog
+from sqlalchemy import and_, case, delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.llm import LLMBudgetReservation, LLMSpendLedger, LLMUsage
+from app.models.tenant import Tenant
+
+logger = structlog.get_logger()
+
+# Reservations not settled within this window are released back to the budget
+RESERVATION_TTL = timedelta(minutes=15)
+
+ZERO = Decimal("0")
+
+
+@dataclass(frozen=True)
+class LedgerBalance:
+    spent: Decimal
+    reserved: Decimal
+
+    @property
+    def committed(self) -> Decimal:
+        """Spend plus in-flight reservations."""
+        return self.spent + self.reserved
+
+
+@dataclass(frozen=True)
+class Reservation:
+    granted: bool
+    balance: LedgerBalance
+
+
+def period_start(now: Optional[datetime] = None) -> date:
+    """First day of the (UTC) month containing `now`."""
+    now = now or datetime.now(timezone.utc)
+    return now.date().replace(day=1)
+
+
+def _period_bounds(period: date) -> tuple[datetime, datetime]:
+    start = datetime(period.year, period.month, 1, tzinfo=timezone.utc)
+    if period.month == 12:
+        end = datetime(period.year + 1, 1, 1, tzinfo=timezone.utc)
+    else:
+        end = datetime(period.year, period.month + 1, 1, tzinfo=timezone.utc)
+    return start, end
+
+
+def _insert(db: AsyncSession) -> Any:
+    if db.bind is not None and db.bind.dialect.name == "sqlite":
+        return sqlite_insert
+    return pg_insert
+
+
+def _decimal(value: Any) -> Decimal:
+    return Decimal(str(value)) if value is not None else ZERO
+
+
+class SpendLedger:
+    """Atomic operations on llm_spend_ledger rows."""
+
+    @staticmethod
+    async def _sum_usage(db: AsyncSession, tenant_id: UUID, period: date) -> Decimal:
+        start, end = _period_bounds(period)
+        # Range predicate on created_at so the (tenant_id, created_at) indexes apply
+        result = await db.execute(
+            select(func.coalesce(func.sum(LLMUsage.cost_usd), ZERO))
+            .where(LLMUsage.tenant_id == tenant_id)
+            .where(LLMUsage.created_at >= start)
+            .where(LLMUsage.created_at < end)
+        )
+        return _decimal(result.scalar())
+
+    @staticmethod
+    async def _seed(db: AsyncSession, tenant_id: UUID, period: date) -> None:
+        spent = await SpendLedger._sum_usage(db, tenant_id, period)
+        stmt = _insert(db)(LLMSpendLedger).values(
+            tenant_id=tenant_id,
+            period_start=period,
+            spent_usd=spent,
+            reserved_usd=ZERO,
+        ).on_conflict_do_nothing(index_elements=["tenant_id", "period_start"])
+        await db.execute(stmt)
+        logger.info("llm_spend_ledger_seeded", tenant_id=str(tenant_id), period=period.isoformat(), spent=float(spent))
+
+    @staticmethod
+    async def get_balance(db: AsyncSession, tenant_id: UUID, period: Optional[date] = None) -> LedgerBalance:
+        """Current month's spend for a tenant (single-row read)."""
+        period = period or period_start()
+        query = select(LLMSpendLedger.spent_usd, LLMSpendLedger.reserved_usd).where(
+            LLMSpendLedger.tenant_id == tenant_id,
+            LLMSpendLedger.period_start == period,
+        )
+        row = (await db.execute(query)).first()
+        if row is None:
+            await SpendLedger._seed(db, tenant_id, period)
+            row = (await db.execute(query)).first()
+            if row is None:
+                return LedgerBalance(ZERO, ZERO)
+        return LedgerBalance(_decimal(row[0]), _decimal(row[1]))
+
+    @staticmethod
+    async def get_balances(db: AsyncSession, tenant_ids: Iterable[UUID]) -> Dict[UUID, LedgerBalance]:
+        """Current month's balances for many tenants in one read (missing rows are seeded)."""
+        period = period_start()
+        ids = list(set(tenant_ids))
+        if not ids:
+            return {}
+        result = await db.execute(
+            select(LLMSpendLedger.tenant_id, LLMSpendLedger.spent_usd, LLMSpendLedger.reserved_usd).where(
+                LLMSpendLedger.tenant_id.in_(ids),
+                LLMSpendLedger.period_start == period,
+            )
+        )
+        balances = {tid: LedgerBalance(_decimal(s), _decimal(r)) for tid, s, r in result.all()}
+        for tid in ids:
+            if tid not in balances:
+                balances[tid] = await SpendLedger.get_balance(db, tid, period)
+        return balances
+
+    @staticmethod
+    async def release_expired(db: AsyncSession, tenant_id: UUID, now: Optional[datetime] = None) -> Decimal:
+        """Return expired reservations for one tenant to the ledger."""
+        now = now or datetime.now(timezone.utc)
+        result = await db.execute(
+            delete(LLMBudgetReservation)
+            .where(LLMBudgetReservation.tenant_id == tenant_id)
+            .where(LLMBudgetReservation.expires_at <= now)
+            .returning(LLMBudgetReservation.period_start, LLMBudgetReservation.amount_usd)
+        )
+        released: Dict[date, Decimal] = {}
+        for period, amount in result.all():
+            released[period] = released.get(period, ZERO) + _decimal(amount)
+        for period, amount in released.items():
+            await SpendLedger._adjust(db, tenant_id, period, spent_delta=ZERO, reserved_delta=-amount)
+        total = sum(released.values(), ZERO)
+        if total:
+            logger.info("llm_reservations_expired", tenant_id=str(tenant_id), released=float(total))
+        return total
+
+    @staticmethod
+    async def _adjust(
+        db: AsyncSession,
+        tenant_id: UUID,
+        period: date,
+        spent_delta: Decimal,
+        reserved_delta: Decimal,
+    ) -> Optional[LedgerBalance]:
+        new_reserved = LLMSpendLedger.reserved_usd + reserved_delta
+        result = await db.execute(
+            update(LLMSpendLedger)
+            .where(LLMSpendLedger.tenant_id == tenant_id, LLMSpendLedger.period_start == period)
+            .values(
+                spent_usd=LLMSpendLedger.spent_usd + spent_delta,
+                # Never below zero, even if a reservation was already swept
+                reserved_usd=case((new_reserved < 0, ZERO), else_=new_reserved),
+                updated_at=func.now(),
+            )
+            .returning(LLMSpendLedger.spent_usd, LLMSpendLedger.reserved_usd)
+        )
+        row = result.first()
+        if row is None:
+            return None
+        return LedgerBalance(_decimal(row[0]), _decimal(row[1]))
+
+    @staticmethod
+    async def reserve(
+        db: AsyncSession,
+        tenant_id: UUID,
+        amount: Decimal,
+        limit: Decimal,
+        operation_id: Optional[str] = None,
+        ttl: timedelta = RESERVATION_TTL,
+    ) -> Reservation:
+        """
+        Atomically reserve `amount` if spent + reserved + amount <= limit.
+
+        The check and the increment are one UPDATE statement, so concurrent
+        reservations for the same tenant can never over-commit the budget.
+        """
+        period = period_start()
+        now = datetime.now(timezone.utc)
+        await SpendLedger.release_expired(db, tenant_id, now)
+
+        stmt = (
+            update(LLMSpendLedger)
+            .where(
+                and_(
+                    LLMSpendLedger.tenant_id == tenant_id,
+                    LLMSpendLedger.period_start == period,
+                    LLMSpendLedger.spent_usd + LLMSpendLedger.reserved_usd + amount <= limit,
+                )
+            )
+            .values(reserved_usd=LLMSpendLedger.reserved_usd + amount, updated_at=func.now())
+            .returning(LLMSpendLedger.spent_usd, LLMSpendLedger.reserved_usd)
+        )
+        row = (await db.execute(stmt)).first()
+        if row is None:
+            # Either over budget or no row yet this month; get_balance seeds it
+            balance = await SpendLedger.get_balance(db, tenant_id, period)
+            if balance.committed + amount > limit:
+                return Reservation(granted=False, balance=balance)
+            row = (await db.execute(stmt)).first()
+            if row is None:
+                return Reservation(granted=False, balance=await SpendLedger.get_balance(db, tenant_id, period))
+
+        db.add(LLMBudgetReservation(
+            tenant_id=tenant_id,
+            period_start=period,
+            amount_usd=amount,
+            operation_id=operation_id,
+            expires_at=now + ttl,
+        ))
+        return Reservation(granted=True, balance=LedgerBalance(_decimal(row[0]), _decimal(row[1])))
+
+    @staticmethod
+    async def _pop_reservation(db: AsyncSession, tenant_id: UUID, operation_id: Optional[str]) -> Dict[date, Decimal]:
+        if not operation_id:
+            return {}
+        result = await db.execute(
+            delete(LLMBudgetReservation)
+            .where(LLMBudgetReservation.tenant_id == tenant_id)
+            .where(LLMBudgetReservation.operation_id == operation_id)
+            .returning(LLMBudgetReservation.period_start, LLMBudgetReservation.amount_usd)
+        )
+        released: Dict[date, Decimal] = {}
+        for period, amount in result.all():
+            released[period] = released.get(period, ZERO) + _decimal(amount)
+        return released
+
+    @staticmethod
+    async def settle(
+        db: AsyncSession,
+        tenant_id: UUID,
+        cost: Decimal,
+        operation_id: Optional[str] = None,
+    ) -> LedgerBalance:
+        """
+        Record actual spend and release the matching reservation.
+
+        Call after the LLMUsage row has been flushed: if this is the first
+        ledger write of the month the row is seeded from llm_usage, which
+        already includes this cost.
+        """
+        period = period_start()
+        released = await SpendLedger._pop_reservation(db, tenant_id, operation_id)
+        # Reservations made last month are released against last month's row
+        for other_period, amount in released.items():
+            if other_period != period:
+                await SpendLedger._adjust(db, tenant_id, other_period, ZERO, -amount)
+
+        balance = await SpendLedger._adjust(
+            db, tenant_id, period, spent_delta=cost, reserved_delta=-released.get(period, ZERO)
+        )
+        if balance is None:
+            balance = await SpendLedger.get_balance(db, tenant_id, period)
+        return balance
+
+    @staticmethod
+    async def settle_many(
+        db: AsyncSession,
+        settlements: List[Tuple[UUID, Decimal, Optional[str]]],
+    ) -> Dict[UUID, LedgerBalance]:
+        """
+        Settle many `(tenant_id, cost, operation_id)` entries: one DELETE for
+        all their reservations and one ledger UPDATE per tenant. Same
+        preconditions as `settle`.
+        """
+        if not settlements:
+            return {}
+        period = period_start()
+        operation_ids = [op for _, _, op in settlements if op]
+        released: Dict[Tuple[UUID, date], Decimal] = {}
+        if operation_ids:
+            result = await db.execute(
+                delete(LLMBudgetReservation)
+                .where(LLMBudgetReservation.operation_id.in_(operation_ids))
+                .returning(
+                    LLMBudgetReservation.tenant_id,
+                    LLMBudgetReservation.period_start,
+                    LLMBudgetReservation.amount_usd,
+                )
+            )
+            for tid, reserved_period, amount in result.all():
+                key = (tid, reserved_period)
+                released[key] = released.get(key, ZERO) + _decimal(amount)
+
+        costs: Dict[UUID, Decimal] = {}
+        for tid, cost, _ in settlements:
+            costs[tid] = costs.get(tid, ZERO) + Decimal(str(cost))
+
+        for (tid, reserved_period), amount in released.items():
+            if reserved_period != period:
+                await SpendLedger._adjust(db, tid, reserved_period, ZERO, -amount)
+
+        balances: Dict[UUID, LedgerBalance] = {}
+        for tid, cost in costs.items():
+            balance = await SpendLedger._adjust(
+                db, tid, period, spent_delta=cost, reserved_delta=-released.get((tid, period), ZERO)
+            )
+            balances[tid] = balance or await SpendLedger.get_balance(db, tid, period)
+        return balances
+
+    @staticmethod
+    async def release(db: AsyncSession, tenant_id: UUID, operation_id: Optional[str]) -> None:
+        """Cancel a reservation whose LLM call did not happen."""
+        for period, amount in (await SpendLedger._pop_reservation(db, tenant_id, operation_id)).items():
+            await SpendLedger._adjust(db, tenant_id, period, ZERO, -amount)
+
+    @staticmethod
+    async def reconcile(
+        db: AsyncSession,
+        period: Optional[date] = None,
+        tenant_id: Optional[UUID] = None,
+    ) -> Dict[str, Any]:
+        """
+        Rebuild ledger rows for a month from llm_usage and live reservations.
+
+        Expired reservations are dropped first. Returns the number of rows
+        rebuilt and the total absolute drift that was corrected.
+
+        llm_usage and the ledger tables have RLS policies, so without a
+        tenant_id every tenant is rebuilt in turn under its own tenant
+        context; one unscoped pass would see no usage (unless the role
+        bypasses RLS) and reset every tenant's spend to zero.
+        """
+        period = period or period_start()
+        if tenant_id is None:
+            return await SpendLedger._reconcile_each_tenant(db, period)
+        start, end = _period_bounds(period)
+        now = datetime.now(timezone.utc)
+
+        await db.execute(
+            delete(LLMBudgetReservation).where(
+                LLMBudgetReservation.expires_at <= now, LLMBudgetReservation.tenant_id == tenant_id
+            )
+        )
+
+        usage_query = (
+            select(LLMUsage.tenant_id, func.coalesce(func.sum(LLMUsage.cost_usd), ZERO))
+            .where(LLMUsage.tenant_id == tenant_id, LLMUsage.created_at >= start, LLMUsage.created_at < end)
+            .group_by(LLMUsage.tenant_id)
+        )
+        reserved_query = (
+            select(LLMBudgetReservation.tenant_id, func.coalesce(func.sum(LLMBudgetReservation.amount_usd), ZERO))
+            .where(LLMBudgetReservation.tenant_id == tenant_id, LLMBudgetReservation.period_start == period)
+            .group_by(LLMBudgetReservation.tenant_id)
+        )
+        ledger_query = select(LLMSpendLedger.tenant_id, LLMSpendLedger.spent_usd, LLMSpendLedger.reserved_usd).where(
+            LLMSpendLedger.tenant_id == tenant_id, LLMSpendLedger.period_start == period
+        )
+
+        spent = {t: _decimal(v) for t, v in (await db.execute(usage_query)).all()}
+        reserved = {t: _decimal(v) for t, v in (await db.execute(reserved_query)).all()}
+        current = {t: (_decimal(s), _decimal(r)) for t, s, r in (await db.execute(ledger_query)).all()}
+
+        drift = ZERO
+        rows = 0
+        insert = _insert(db)
+        for tid in set(spent) | set(reserved) | set(current):
+            target = (spent.get(tid, ZERO), reserved.get(tid, ZERO))
+            existing = current.get(tid)
+            rows += 1
+            if existing == target:
+                continue
+            if existing is not None:
+                drift += abs(existing[0] - target[0]) + abs(existing[1] - target[1])
+            stmt = insert(LLMSpendLedger).values(
+                tenant_id=tid, period_start=period, spent_usd=target[0], reserved_usd=target[1]
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["tenant_id", "period_start"],
+                set_={"spent_usd": stmt.excluded.spent_usd, "reserved_usd": stmt.excluded.reserved_usd, "updated_at": func.now()},
+            )
+            await db.execute(stmt)
+
+        if drift:
+            logger.warning(
+                "llm_spend_ledger_drift_corrected",
+                tenant_id=str(tenant_id), period=period.isoformat(), drift=float(drift),
+            )
+        return {"period": period.isoformat(), "rows": rows, "drift_usd": float(drift)}
+
+    @staticmethod
+    async def _reconcile_each_tenant(db: AsyncSession, period: date) -> Dict[str, Any]:
+        from app.shared.db.session import RLS_TENANT_KEY, set_session_tenant_id
+
+        # tenants is RLS-exempt, so this sees every tenant without a context
+        tenant_ids = (await db.execute(select(Tenant.id).order_by(Tenant.id))).scalars().all()
+        rows = 0
+        drift = 0.0
+        try:
+            for tid in tenant_ids:
+                await set_session_tenant_id(db, tid)
+                result = await SpendLedger.reconcile(db, period, tenant_id=tid)
+                rows += result["rows"]
+                drift += result["drift_usd"]
+        finally:
+            # Later transactions on this session must not inherit the last tenant's context
+            db.info.pop(RLS_TENANT_KEY, None)
+        return {"period": period.isoformat(), "rows": rows, "drift_usd": drift, "tenants": len(tenant_ids)}
@@ -0,0 +1,175 @@
+"""
+Incremental Analysis Parser
+
+Parses a streamed FinOps analysis (the JSON object described by
+FinOpsAnalysisResult) as tokens arrive. Each element of `insights`,
+`recommendations` and `anomalies`, and the `forecast` object, is validated
+and emitted as soon as its closing token is seen, so a client sees results
+during generation and keeps every complete item even if the tail of the
+output is malformed.
+
+Text before the first `{` (e.g. a markdown fence) and after the closing
+`}` is ignored.
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+import structlog
+from pydantic import ValidationError
+
+from app.shared.llm.guardrails import FinOpsRecommendation
+
+logger = structlog.get_logger()
+
+# Top-level array key -> event name for each element
+ARRAY_EVENTS = {
+    "insights": "insight",
+    "recommendations": "recommendation",
+    "anomalies": "anomaly",
+}
+OBJECT_EVENTS = {"forecast": "forecast"}
+
+
+def _validate(key: str, value: Any) -> Any:
+    """Validated element for a top-level key; raises ValueError/ValidationError if invalid."""
+    if key == "insights":
+        if not isinstance(value, str):
+            raise ValueError("insight must be a string")
+        return value
+    if key == "recommendations":
+        return FinOpsRecommendation(**value).model_dump()
+    if not isinstance(value, dict):
+        raise ValueError(f"{key} item must be an object")
+    return value
+
+
+class IncrementalAnalysisParser:
+    """
+    Usage:
+        parser = IncrementalAnalysisParser()
+        for chunk in stream:
+            for event, data in parser.feed(chunk):
+                ...
+        partial = parser.result()
+    """
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._pos = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_key_string: Optional[str] = None
+        self._key: Optional[str] = None
+        self._element_start: Optional[int] = None
+        self._object_start: Optional[int] = None
+        self._done = False
+        self.items: Dict[str, List[Any]] = {key: [] for key in ARRAY_EVENTS}
+        self.forecast: Dict[str, Any] = {}
+        self.invalid_items = 0
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Consume a chunk; returns (event, data) for every element it completed."""
+        self._buffer += chunk
+        events: List[Tuple[str, Any]] = []
+        buf = self._buffer
+        while self._pos < len(buf) and not self._done:
+            i = self._pos
+            ch = buf[i]
+            self._pos += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if len(self._stack) == 1:
+                        self._last_key_string = buf[self._string_start + 1:i]
+                    elif self._in_tracked_array() and len(self._stack) == 2:
+                        self._complete_element(i + 1, events)
+                continue
+
+            if not self._stack:
+                if ch == "{":
+                    self._stack.append("{")
+                continue
+
+            depth = len(self._stack)
+            if depth == 2 and self._in_tracked_array() and self._element_start is None and ch not in " \t\r\n,]":
+                self._element_start = i
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+            elif ch == ":" and depth == 1:
+                self._key = self._last_key_string
+            elif ch in "{[":
+                if depth == 1 and ch == "{" and self._key in OBJECT_EVENTS:
+                    self._object_start = i
+                self._stack.append(ch)
+            elif ch in "}]":
+                self._stack.pop()
+                depth = len(self._stack)
+                if depth == 0:
+                    self._done = True
+                elif depth == 1 and self._object_start is not None:
+                    self._complete_object(i + 1, events)
+                elif depth == 1:
+                    # A tracked array closed; a trailing scalar element ends here
+                    self._complete_element(i, events)
+                elif depth == 2 and self._in_tracked_array():
+                    self._complete_element(i + 1, events)
+            elif ch == "," and depth == 2 and self._in_tracked_array():
+                self._complete_element(i, events)
+            elif ch == "," and depth == 1:
+                self._key = None
+        return events
+
+    def _in_tracked_array(self) -> bool:
+        return len(self._stack) >= 2 and self._stack[1] == "[" and self._key in ARRAY_EVENTS
+
+    def _complete_element(self, end: int, events: List[Tuple[str, Any]]) -> None:
+        start, self._element_start = self._element_start, None
+        if start is None or self._key not in ARRAY_EVENTS:
+            return
+        raw = self._buffer[start:end].strip()
+        if not raw:
+            return
+        try:
+            item = _validate(self._key, json.loads(raw))
+        except (ValueError, TypeError, ValidationError) as e:
+            self.invalid_items += 1
+            logger.warning("llm_stream_item_invalid", key=self._key, error=str(e)[:200])
+            return
+        self.items[self._key].append(item)
+        events.append((ARRAY_EVENTS[self._key], item))
+
+    def _complete_object(self, end: int, events: List[Tuple[str, Any]]) -> None:
+        start, self._object_start = self._object_start, None
+        try:
+            value = json.loads(self._buffer[start:end])
+        except ValueError:
+            self.invalid_items += 1
+            return
+        self.forecast = value
+        events.append((OBJECT_EVENTS[self._key], value))
+
+    @property
+    def complete(self) -> bool:
+        """True once the top-level object has closed."""
+        return self._done
+
+    @property
+    def text(self) -> str:
+        return self._buffer
+
+    def result(self) -> Dict[str, Any]:
+        """Everything validated so far, in FinOpsAnalysisResult shape."""
+        return {**self.items, "forecast": self.forecast}
+
+    def has_items(self) -> bool:
+        return any(self.items.values()) or bool(self.forecast)
@@ -0,0 +1,198 @@
+"""
+Tokenizer Registry
+
+Process-wide token counting for every supported LLM provider:
+- tiktoken encodings are loaded once per process and reused (a failed load
+  is remembered too, so an offline worker does not retry on every call)
+- Each model maps to an encoding, or to a calibrated chars-per-token
+  estimator for providers whose tokenizers are not available locally
+- Bounded counting stops encoding once a limit is exceeded, so "is this
+  at most N tokens?" costs O(N) rather than O(len(text))
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Protocol, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+DEFAULT_MODEL = "gpt-4"
+DEFAULT_ENCODING = "cl100k_base"
+DEFAULT_CHARS_PER_TOKEN = 4.0
+# Text is encoded in chunks of this many characters when counting against a limit
+CHUNK_CHARS = 4096
+# A token is at least one UTF-8 byte, and a character at most four bytes
+MAX_BYTES_PER_CHAR = 4
+
+
+@dataclass(frozen=True)
+class ModelTokenizerSpec:
+    prefix: str
+    encoding: Optional[str] = None  # tiktoken encoding; None = use the estimator
+    chars_per_token: float = DEFAULT_CHARS_PER_TOKEN
+    context_window: Optional[int] = None
+
+
+# Matched by longest model-name prefix
+MODEL_TOKENIZERS: Tuple[ModelTokenizerSpec, ...] = (
+    # OpenAI
+    ModelTokenizerSpec("gpt-4o", encoding="o200k_base", context_window=128_000),
+    ModelTokenizerSpec("gpt-4.1", encoding="o200k_base", context_window=1_047_576),
+    ModelTokenizerSpec("o1", encoding="o200k_base", context_window=200_000),
+    ModelTokenizerSpec("o3", encoding="o200k_base", context_window=200_000),
+    ModelTokenizerSpec("gpt-4", encoding="cl100k_base", context_window=8_192),
+    ModelTokenizerSpec("gpt-3.5", encoding="cl100k_base", context_window=16_385),
+    # Groq: Llama 3 uses a 128k-vocab BPE close to cl100k; Mixtral a 32k SentencePiece vocab
+    ModelTokenizerSpec("llama-3", encoding="cl100k_base", context_window=131_072),
+    ModelTokenizerSpec("mixtral", chars_per_token=3.5, context_window=32_768),
+    # Anthropic and Google tokenizers are not published; use calibrated ratios
+    ModelTokenizerSpec("claude", chars_per_token=3.5, context_window=200_000),
+    ModelTokenizerSpec("gemini", chars_per_token=4.0, context_window=1_048_576),
+)
+DEFAULT_SPEC = ModelTokenizerSpec("", encoding=DEFAULT_ENCODING)
+
+
+def estimate_tokens(text: str, chars_per_token: float = DEFAULT_CHARS_PER_TOKEN) -> int:
+    """Rough character-based token estimate (4 chars per token by default)."""
+    return int(len(text) / chars_per_token)
+
+
+class Tokenizer(Protocol):
+    exact: bool
+
+    def count(self, text: str, limit: Optional[int] = None) -> int:
+        """Token count; with a limit, any value above it may be returned once exceeded."""
+        ...
+
+
+class CharRatioEstimator:
+    """Constant-time estimate from a calibrated characters-per-token ratio."""
+
+    exact = False
+
+    def __init__(self, chars_per_token: float = DEFAULT_CHARS_PER_TOKEN):
+        self.chars_per_token = chars_per_token
+
+    def count(self, text: str, limit: Optional[int] = None) -> int:
+        return estimate_tokens(text, self.chars_per_token)
+
+
+class EncodingTokenizer:
+    """Exact counts from a loaded tiktoken encoding."""
+
+    exact = True
+
+    def __init__(self, name: str, encoding: Any):
+        self.name = name
+        self._encoding = encoding
+
+    def _encode_len(self, text: str) -> int:
+        # Special-token markers in user data are counted as plain text, not rejected
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+    def count(self, text: str, limit: Optional[int] = None) -> int:
+        if limit is None or len(text) * MAX_BYTES_PER_CHAR <= limit:
+            return self._encode_len(text)
+
+        # Encode chunk by chunk and stop as soon as the limit is exceeded. Chunks
+        # end before a space so " word" pieces stay whole; merges lost at a
+        # boundary can only add tokens, so the check errs towards "too long".
+        total, start, n = 0, 0, len(text)
+        while start < n:
+            end = min(start + CHUNK_CHARS, n)
+            if end < n:
+                cut = text.rfind(" ", start + 1, end)
+                if cut > start:
+                    end = cut
+            total += self._encode_len(text[start:end])
+            if total > limit:
+                return total
+            start = end
+        return total
+
+
+class TokenizerRegistry:
+    """Resolves models to tokenizers, loading each tiktoken encoding at most once."""
+
+    def __init__(self) -> None:
+        self._encodings: Dict[str, Optional[Any]] = {}
+        self._tokenizers: Dict[str, Tokenizer] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def spec_for(model: str) -> ModelTokenizerSpec:
+        name = (model or "").lower()
+        matches = [spec for spec in MODEL_TOKENIZERS if name.startswith(spec.prefix)]
+        return max(matches, key=lambda spec: len(spec.prefix)) if matches else DEFAULT_SPEC
+
+    def context_window(self, model: str) -> Optional[int]:
+        return self.spec_for(model).context_window
+
+    def _load_encoding(self, name: str) -> Optional[Any]:
+        if name in self._encodings:
+            return self._encodings[name]
+        with self._lock:
+            if name not in self._encodings:
+                try:
+                    import tiktoken
+                    self._encodings[name] = tiktoken.get_encoding(name)
+                except ImportError:
+                    logger.warning("tiktoken_not_installed_using_fallback")
+                    self._encodings[name] = None
+                except Exception as e:
+                    logger.error("tiktoken_encoding_load_failed", encoding=name, error=str(e))
+                    self._encodings[name] = None
+        return self._encodings[name]
+
+    def tokenizer_for(self, model: str = DEFAULT_MODEL) -> Tokenizer:
+        tokenizer = self._tokenizers.get(model)
+        if tokenizer is None:
+            spec = self.spec_for(model)
+            encoding = self._load_encoding(spec.encoding) if spec.encoding else None
+            if encoding is not None:
+                tokenizer = EncodingTokenizer(spec.encoding, encoding)
+            else:
+                tokenizer = CharRatioEstimator(spec.chars_per_token)
+            self._tokenizers[model] = tokenizer
+        return tokenizer
+
+    def count(self, text: str, model: str = DEFAULT_MODEL, limit: Optional[int] = None) -> int:
+        try:
+            return self.tokenizer_for(model).count(text, limit)
+        except Exception as e:
+            logger.error("tiktoken_error", model=model, error=str(e))
+            return estimate_tokens(text)
+
+    def at_most(self, text: str, limit: int, model: str = DEFAULT_MODEL) -> bool:
+        """True if text is at most `limit` tokens, without counting past the limit."""
+        if limit < 0:
+            return False
+        if len(text) * MAX_BYTES_PER_CHAR <= limit:
+            return True
+        return self.count(text, model, limit=limit) <= limit
+
+    def clear(self) -> None:
+        with self._lock:
+            self._encodings.clear()
+            self._tokenizers.clear()
+
+
+_registry: Optional[TokenizerRegistry] = None
+
+
+def get_tokenizer_registry() -> TokenizerRegistry:
+    """Get the process-wide tokenizer registry."""
+    global _registry
+    if _registry is None:
+        _registry = TokenizerRegistry()
+    return _registry
+
+
+def count_tokens(text: str, model: str = DEFAULT_MODEL, limit: Optional[int] = None) -> int:
+    """
+    Token count for a model; falls back to the character estimate when its
+    encoding is unavailable. With a limit, counting stops once it is exceeded.
+    """
+    return get_tokenizer_registry().count(text, model, limit=limit)
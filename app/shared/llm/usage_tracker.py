@@ -8,13 +8,12 @@ Called after every LLM API call to track token usage.
 from uuid import UUID
 from decimal import Decimal
 from sqlalchemy.ext.asyncio import AsyncSession
-from datetime import datetime, timezone
 import structlog
 
-from app.models.llm import LLMUsage
 from app.shared.core.cache import get_cache_service
 from app.shared.llm.pricing_data import LLM_PRICING
 from app.shared.llm.budget_manager import LLMBudgetManager, BudgetStatus
+from app.shared.llm.tokenizer import count_tokens, get_tokenizer_registry  # noqa: F401 - count_tokens re-exported
 
 
 
@@ -22,35 +21,6 @@ from app.shared.llm.budget_manager import LLMBudgetManager, BudgetStatus
 logger = structlog.get_logger()
 
 
-def count_tokens(text: str, model: str = "gpt-4") -> int:
-    """
-    BE-LLM-5: Accurate token counting using tiktoken.
-    Falls back to character-based estimation if tiktoken unavailable.
-    """
-    try:
-        import tiktoken
-        # Map model names to tiktoken encodings
-        encoding_map = {
-            "gpt-4": "cl100k_base",
-            "gpt-4o": "cl100k_base",
-            "gpt-4o-mini": "cl100k_base",
-            "gpt-3.5-turbo": "cl100k_base",
-            "claude-3-5-sonnet": "cl100k_base",  # Claude uses similar encoding
-            "claude-3-opus": "cl100k_base",
-            "llama-3.3-70b-versatile": "cl100k_base",  # Approximate
-        }
-        encoding_name = encoding_map.get(model, "cl100k_base")
-        encoding = tiktoken.get_encoding(encoding_name)
-        return len(encoding.encode(text))
-    except ImportError:
-        logger.warning("tiktoken_not_installed_using_fallback")
-        # Fallback: ~4 chars per token (rough estimate)
-        return len(text) // 4
-    except Exception as e:
-        logger.error("tiktoken_error", error=str(e))
-        return len(text) // 4
-
-
 class UsageTracker:
     """
     Tracks LLM API usage for cost analytics.
@@ -118,8 +88,9 @@ class UsageTracker:
         """
         DELEGATED: Use LLMBudgetManager.check_and_reserve
         """
-        from .usage_tracker import count_tokens
-        input_tokens = count_tokens(input_text, model)
+        # Only an upper bound is needed: input past the context window is rejected by the provider
+        context_window = get_tokenizer_registry().context_window(model)
+        input_tokens = count_tokens(input_text, model, limit=context_window)
         await LLMBudgetManager.check_and_reserve(
             tenant_id=tenant_id,
             db=self.db,
@@ -137,19 +108,10 @@ class UsageTracker:
         Returns:
             Total cost in USD for current month
         """
-        from sqlalchemy import select, func, extract
-
-        now = datetime.now(timezone.utc)
-
-        result = await self.db.execute(
-            select(func.sum(LLMUsage.cost_usd))
-            .where(LLMUsage.tenant_id == tenant_id)
-            .where(extract('year', LLMUsage.created_at) == now.year)
-            .where(extract('month', LLMUsage.created_at) == now.month)
-        )
+        from app.shared.llm.spend_ledger import SpendLedger
 
-        total = result.scalar() or Decimal("0")
-        return Decimal(str(total))
+        balance = await SpendLedger.get_balance(self.db, tenant_id)
+        return balance.spent
 
     async def check_budget(self, tenant_id: UUID) -> BudgetStatus:
         """
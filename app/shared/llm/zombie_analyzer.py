@@ -8,14 +8,12 @@ Uses LLM to provide:
 - Estimated savings breakdown
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, TYPE_CHECKING
 from uuid import UUID
 import json
 import re
 import structlog
 
-from langchain_core.language_models.chat_models import BaseChatModel
-from langchain_core.prompts import ChatPromptTemplate
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
@@ -23,6 +21,9 @@ from app.shared.core.config import get_settings
 from app.shared.llm.usage_tracker import UsageTracker
 from app.shared.llm.guardrails import LLMGuardrails, ZombieAnalysisResult
 
+if TYPE_CHECKING:
+    from langchain_core.language_models.chat_models import BaseChatModel
+
 logger = structlog.get_logger()
 
 ZOMBIE_ANALYSIS_PROMPT = """You are a Cloud FinOps expert analyzing zombie (unused/underutilized) AWS resources.
@@ -79,8 +80,10 @@ class ZombieAnalyzer:
     Takes rule-based detection results and enriches them with LLM explanations.
     """
 
-    def __init__(self, llm: BaseChatModel):
+    def __init__(self, llm: "BaseChatModel"):
         self.llm = llm
+        # langchain is imported with the first analyzer, not with the package
+        from langchain_core.prompts import ChatPromptTemplate
         self.prompt = ChatPromptTemplate.from_messages([
             ("system", ZOMBIE_ANALYSIS_PROMPT),
             ("user", "Analyze these detected zombie resources:\n{zombie_data}")
@@ -6,6 +6,7 @@ from app.models.aws_connection import AWSConnection
 from app.models.tenant import Tenant
 from app.shared.adapters.aws_multitenant import MultiTenantAWSAdapter
 from app.shared.core.config import get_settings
+from app.shared.core.principal_cache import get_principal_cache
 
 logger = structlog.get_logger()
 
@@ -39,4 +40,5 @@ class BudgetHardCapService:
         )
         
         await self.db.commit()
+        await get_principal_cache().invalidate_tenant(tenant_id)
         logger.info("hard_cap_enforcement_complete", tenant_id=str(tenant_id))
@@ -257,7 +257,6 @@ def run_maintenance_sweep() -> None:
 async def _maintenance_sweep_logic() -> None:
     from app.modules.reporting.domain.aggregator import CostAggregator
     from app.modules.reporting.domain.persistence import CostPersistenceService
-    from sqlalchemy import text
     
     async with async_session_maker() as db:
         # 0. Finalize cost records
@@ -271,9 +270,47 @@ async def _maintenance_sweep_logic() -> None:
         # 1. Refresh View
         await CostAggregator.refresh_materialized_view(db)
         
-        # 2. Archive
+        # 2. Reconcile LLM spend ledger with llm_usage (drops expired reservations)
         try:
-            await db.execute(text("SELECT archive_old_cost_partitions();"))
+            from app.shared.llm.spend_ledger import SpendLedger
+            result = await SpendLedger.reconcile(db)
             await db.commit()
-        except Exception:
-            pass
+            logger.info("maintenance_llm_ledger_reconciled", rows=result["rows"], drift_usd=result["drift_usd"])
+        except Exception as e:
+            await db.rollback()
+            logger.warning("maintenance_llm_ledger_reconcile_failed", error=str(e))
+
+
+@shared_task(name="scheduler.health_snapshot")
+def run_health_snapshot() -> None:
+    run_async(_health_snapshot_logic())
+
+async def _health_snapshot_logic() -> None:
+    from app.modules.governance.domain.health_snapshot import HealthSnapshotService
+    from app.shared.core.config import get_settings
+
+    async with async_session_maker() as db:
+        service = HealthSnapshotService(db)
+        await service.capture()
+        pruned = await service.prune(get_settings().HEALTH_SNAPSHOT_RETENTION_DAYS)
+        await db.commit()
+        if pruned:
+            logger.info("health_snapshots_pruned", count=pruned)
+
+
+@shared_task(name="scheduler.partition_lifecycle")
+def run_partition_lifecycle() -> None:
+    run_async(_partition_lifecycle_logic())
+
+async def _partition_lifecycle_logic() -> None:
+    from app.modules.governance.domain.partition_lifecycle import PartitionLifecycleService
+    from app.shared.core.config import get_settings
+
+    async with async_session_maker() as db:
+        report = await PartitionLifecycleService(db).run(dry_run=get_settings().PARTITION_LIFECYCLE_DRY_RUN)
+    logger.info(
+        "partition_lifecycle_complete",
+        dry_run=report["dry_run"],
+        actions=len(report["actions"]),
+        default_rows=report["default_rows"],
+    )
@@ -9,7 +9,7 @@ import ssl
 
 from app.shared.db.base import Base
 # Import all models so Base knows about them!
-from app.models.llm import LLMUsage, LLMBudget  # noqa: F401 # pylint: disable=unused-import
+from app.models.llm import LLMUsage, LLMBudget, LLMSpendLedger, LLMBudgetReservation  # noqa: F401 # pylint: disable=unused-import
 from app.models.carbon_settings import CarbonSettings  # noqa: F401 # pylint: disable=unused-import
 from app.models.aws_connection import AWSConnection  # noqa: F401 # pylint: disable=unused-import
 from app.models.discovered_account import DiscoveredAccount  # noqa: F401 # pylint: disable=unused-import
@@ -26,6 +26,7 @@ from app.services.billing.paystack_billing import TenantSubscription  # noqa: F4
 from app.services.security.audit_log import AuditLog  # noqa: F401 # pylint: disable=unused-import
 from app.models.attribution import AttributionRule, CostAllocation  # noqa: F401 # pylint: disable=unused-import
 from app.models.anomaly_marker import AnomalyMarker  # noqa: F401 # pylint: disable=unused-import
+from app.models.health_snapshot import HealthSnapshot  # noqa: F401 # pylint: disable=unused-import
 
 from app.shared.core.config import get_settings
 from sqlalchemy.ext.asyncio import create_async_engine
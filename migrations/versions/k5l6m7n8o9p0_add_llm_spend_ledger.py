@@ -0,0 +1,69 @@
+"""Add LLM spend ledger and budget reservations
+
+Replaces per-request SUM(llm_usage.cost_usd) budget checks with a running
+per-tenant, per-month ledger. The ledger is seeded from llm_usage for the
+current month; older months are rebuilt on demand by the reconcile job.
+
+Revision ID: k5l6m7n8o9p0
+Revises: 016_add_dunning_columns
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'k5l6m7n8o9p0'
+down_revision: Union[str, None] = '016_add_dunning_columns'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'llm_spend_ledger',
+        sa.Column('tenant_id', UUID(as_uuid=True), sa.ForeignKey('tenants.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('period_start', sa.Date(), primary_key=True),
+        sa.Column('spent_usd', sa.Numeric(18, 8), nullable=False, server_default='0'),
+        sa.Column('reserved_usd', sa.Numeric(18, 8), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_table(
+        'llm_budget_reservations',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('tenant_id', UUID(as_uuid=True), sa.ForeignKey('tenants.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('period_start', sa.Date(), nullable=False),
+        sa.Column('amount_usd', sa.Numeric(18, 8), nullable=False),
+        sa.Column('operation_id', sa.String(64), nullable=True),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index('ix_llm_budget_reservations_operation_id', 'llm_budget_reservations', ['operation_id'])
+    op.create_index('ix_llm_budget_reservations_tenant_expiry', 'llm_budget_reservations', ['tenant_id', 'expires_at'])
+
+    for table in ('llm_spend_ledger', 'llm_budget_reservations'):
+        op.execute(f"ALTER TABLE {table} ENABLE ROW LEVEL SECURITY")
+        op.execute(f"""
+            CREATE POLICY {table}_isolation_policy ON {table}
+            USING (tenant_id = current_setting('app.current_tenant_id', TRUE)::uuid);
+        """)
+
+    # Seed the current month so budget checks see existing spend immediately
+    op.execute("""
+        INSERT INTO llm_spend_ledger (tenant_id, period_start, spent_usd, reserved_usd)
+        SELECT tenant_id, date_trunc('month', now() AT TIME ZONE 'UTC')::date, SUM(cost_usd), 0
+        FROM llm_usage
+        WHERE created_at >= date_trunc('month', now() AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'
+        GROUP BY tenant_id
+    """)
+
+
+def downgrade() -> None:
+    for table in ('llm_spend_ledger', 'llm_budget_reservations'):
+        op.execute(f"DROP POLICY IF EXISTS {table}_isolation_policy ON {table}")
+    op.drop_index('ix_llm_budget_reservations_tenant_expiry', table_name='llm_budget_reservations')
+    op.drop_index('ix_llm_budget_reservations_operation_id', table_name='llm_budget_reservations')
+    op.drop_table('llm_budget_reservations')
+    op.drop_table('llm_spend_ledger')
@@ -0,0 +1,36 @@
+"""Add health snapshots
+
+Periodic captures of the admin health dashboard; the dashboard is served
+from the latest row and the history feeds trend charts.
+
+Revision ID: l6m7n8o9p0q1
+Revises: k5l6m7n8o9p0
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'l6m7n8o9p0q1'
+down_revision: Union[str, None] = 'k5l6m7n8o9p0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'health_snapshots',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('captured_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('metrics', JSONB(), nullable=False),
+        sa.Column('duration_ms', sa.Float(), nullable=False, server_default='0'),
+    )
+    op.create_index('ix_health_snapshots_captured_at', 'health_snapshots', ['captured_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_health_snapshots_captured_at', table_name='health_snapshots')
+    op.drop_table('health_snapshots')
@@ -0,0 +1,27 @@
+"""Index background_jobs.completed_at
+
+The health snapshot's job-queue aggregate is bounded to active jobs and
+jobs completed in the last 24h; the index keeps the second half of that
+predicate from scanning the whole table.
+
+Revision ID: m7n8o9p0q1r2
+Revises: l6m7n8o9p0q1
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'm7n8o9p0q1r2'
+down_revision: Union[str, None] = 'l6m7n8o9p0q1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_background_jobs_completed_at', 'background_jobs', ['completed_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_background_jobs_completed_at', table_name='background_jobs')
@@ -0,0 +1,131 @@
+"""
+Auth latency and DB queries per request under concurrent load.
+
+Compares get_current_user with the principal cache off (the previous
+behaviour: one user/tenant query per request) and on (per-process tier).
+Requests go through httpx's in-process ASGI transport against a temporary
+SQLite database, so no server or network is involved; --db-rtt-ms adds a
+simulated round trip to every query to approximate a remote database.
+
+Usage:
+    python scripts/benchmark_auth.py [requests] [--concurrency N] [--users N] [--db-rtt-ms MS]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+import httpx
+import structlog
+from fastapi import Depends, FastAPI
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app.main  # noqa: F401  (configures all mappers)
+from app.models.tenant import Tenant, User
+from app.shared.core import principal_cache
+from app.shared.core.auth import CurrentUser, create_access_token, get_current_user
+from app.shared.db.session import get_db
+
+
+async def build_database(path: str, users: int):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda c: Tenant.metadata.create_all(c, tables=[Tenant.__table__, User.__table__]))
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    subjects = []
+    async with sessions() as db:
+        for i in range(users):
+            tenant = Tenant(id=uuid.uuid4(), name=f"Tenant {i}", plan="growth")
+            user = User(id=uuid.uuid4(), tenant_id=tenant.id, email=f"user{i}@example.com")
+            db.add_all([tenant, user])
+            subjects.append(str(user.id))
+        await db.commit()
+    return engine, sessions, subjects
+
+
+def build_app(sessions) -> FastAPI:
+    api = FastAPI()
+
+    async def bench_db():
+        async with sessions() as session:
+            session.info["rls_context_set"] = True
+            yield session
+
+    @api.get("/me")
+    async def me(user: CurrentUser = Depends(get_current_user)):
+        return {"tenant_id": str(user.tenant_id)}
+
+    api.dependency_overrides[get_db] = bench_db
+    return api
+
+
+async def run(api: FastAPI, tokens, requests: int, concurrency: int):
+    latencies = []
+    transport = httpx.ASGITransport(app=api)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker(offset: int) -> None:
+            for i in range(offset, requests, concurrency):
+                token = tokens[i % len(tokens)]
+                started = time.perf_counter()
+                response = await client.get("/me", headers={"Authorization": f"Bearer {token}"})
+                latencies.append(time.perf_counter() - started)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(n) for n in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return latencies, elapsed
+
+
+async def main(requests: int, concurrency: int, users: int, db_rtt_ms: float) -> None:
+    # Per-request auth logging would dominate the measurement
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, sessions, subjects = await build_database(os.path.join(tmp, "auth.db"), users)
+        queries = []
+
+        def count_query(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                queries.append(statement)
+                if db_rtt_ms:
+                    time.sleep(db_rtt_ms / 1000)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", count_query)
+        tokens = [create_access_token({"sub": sub, "email": f"{sub}@example.com"}) for sub in subjects]
+        api = build_app(sessions)
+
+        print(f"{requests} requests, concurrency {concurrency}, {users} users, simulated db rtt {db_rtt_ms}ms")
+        print(f"{'principal cache':<18}{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}{'req/s':>10}{'queries/req':>13}")
+        for label, backend in (("off (before)", "off"), ("memory (after)", "memory")):
+            principal_cache._cache = principal_cache.PrincipalCache(backend=backend)
+            await run(api, tokens, min(200, requests), concurrency)  # warm-up
+            queries.clear()
+            latencies, elapsed = await run(api, tokens, requests, concurrency)
+            cuts = statistics.quantiles(latencies, n=100)
+            print(
+                f"{label:<18}{cuts[49] * 1e3:>10.2f}{cuts[94] * 1e3:>10.2f}{cuts[98] * 1e3:>10.2f}"
+                f"{requests / elapsed:>10.0f}{len(queries) / requests:>13.3f}"
+            )
+        principal_cache.reset_principal_cache()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark get_current_user with and without the principal cache")
+    parser.add_argument("requests", nargs="?", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--db-rtt-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.users, args.db_rtt_ms))
@@ -0,0 +1,73 @@
+"""
+Per-query overhead of the RLS enforcement listener.
+
+Compares the previous substring-scan check with check_rls_policy (cached
+statement classification) on representative statements. No database is
+needed; the listener is called directly.
+
+Usage:
+    python scripts/benchmark_rls_policy.py [iterations]
+"""
+
+import os
+import sys
+import timeit
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app.main  # noqa: F401  (configures all mappers)
+from app.models.cloud import CostRecord
+from app.models.tenant import Tenant, User
+from app.shared.db import session as db_session
+
+
+def legacy_check(conn, statement):
+    stmt_lower = statement.lower()
+    if (
+        "ix_skipped_table" in stmt_lower or
+        "alembic" in stmt_lower or
+        "select 1" in stmt_lower or
+        "select version()" in stmt_lower or
+        "select pg_is_in_recovery()" in stmt_lower or
+        "from users" in stmt_lower or
+        "from tenants" in stmt_lower or
+        "from tenant_subscriptions" in stmt_lower or
+        "from pricing_plans" in stmt_lower or
+        "from exchange_rates" in stmt_lower
+    ):
+        return
+    conn.info.get("rls_context_set")
+
+
+def _compiled(stmt):
+    compiled = stmt.compile(dialect=postgresql.dialect())
+    return str(compiled), SimpleNamespace(compiled=compiled)
+
+
+def main(iterations: int) -> None:
+    statements = {
+        "auth_lookup": _compiled(select(User, Tenant.plan).join(Tenant, User.tenant_id == Tenant.id)),
+        "tenant_select": _compiled(select(CostRecord).where(CostRecord.tenant_id == None)),  # noqa: E711
+        "bulk_insert": _compiled(insert(CostRecord)),
+        "raw_text": ("SELECT * FROM audit_logs WHERE tenant_id = $1 LIMIT 50", None),
+    }
+    conn = SimpleNamespace(info={"rls_context_set": True})
+
+    with patch.object(db_session, "settings", SimpleNamespace(TESTING=False)):
+        print(f"{'statement':<16}{'legacy (us)':>14}{'classified (us)':>18}")
+        for name, (sql, context) in statements.items():
+            legacy = timeit.timeit(lambda sql=sql: legacy_check(conn, sql), number=iterations)
+            current = timeit.timeit(
+                lambda sql=sql, context=context: db_session.check_rls_policy(conn, None, sql, None, context, False),
+                number=iterations,
+            )
+            print(f"{name:<16}{legacy / iterations * 1e6:>14.2f}{current / iterations * 1e6:>18.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -22,7 +22,7 @@ async def test_azure_verify_connection_success():
     result_mock.scalar_one_or_none.return_value = mock_connection
     db.execute.return_value = result_mock
 
-    with patch("app.shared.connections.azure.AzureAdapter") as MockAdapter:
+    with patch("app.shared.adapters.azure.AzureAdapter") as MockAdapter:
         mock_adapter_instance = MockAdapter.return_value
         mock_adapter_instance.verify_connection = AsyncMock(return_value=True)
 
@@ -50,7 +50,7 @@ async def test_azure_verify_connection_failure():
     result_mock.scalar_one_or_none.return_value = mock_connection
     db.execute.return_value = result_mock
 
-    with patch("app.shared.connections.azure.AzureAdapter") as MockAdapter:
+    with patch("app.shared.adapters.azure.AzureAdapter") as MockAdapter:
         mock_adapter_instance = MockAdapter.return_value
         mock_adapter_instance.verify_connection = AsyncMock(return_value=False)
 
@@ -21,7 +21,7 @@ async def test_gcp_verify_sa_success():
     result_mock.scalar_one_or_none.return_value = mock_connection
     db.execute.return_value = result_mock
 
-    with patch("app.shared.connections.gcp.GCPAdapter") as MockAdapter:
+    with patch("app.shared.adapters.gcp.GCPAdapter") as MockAdapter:
         mock_adapter_instance = MockAdapter.return_value
         mock_adapter_instance.verify_connection = AsyncMock(return_value=True)
 
@@ -54,7 +54,7 @@ class TestAnalyze:
         patch_paths = [
             "app.shared.llm.analyzer.LLMBudgetManager.check_and_reserve",
             "app.shared.llm.analyzer.LLMBudgetManager.record_usage",
-            "app.shared.llm.analyzer.SymbolicForecaster.forecast",
+            "app.shared.analysis.forecast_store.SymbolicForecaster.forecast",
             "app.shared.llm.analyzer.get_cache_service",
             "app.shared.llm.analyzer.SlackService",
             "app.shared.llm.analyzer.LLMGuardrails.sanitize_input",
@@ -105,7 +105,7 @@ class TestAnalyze:
         
         with patch("app.shared.llm.analyzer.LLMBudgetManager.check_and_reserve", AsyncMock(return_value=Decimal("0.05"))), \
              patch("app.shared.llm.analyzer.LLMBudgetManager.record_usage", AsyncMock()), \
-             patch("app.shared.llm.analyzer.SymbolicForecaster.forecast", AsyncMock(return_value={"total_forecasted_cost": 120})), \
+             patch("app.shared.analysis.forecast_store.SymbolicForecaster.forecast", AsyncMock(return_value={"total_forecasted_cost": 120})), \
              patch("app.shared.llm.analyzer.get_cache_service") as m_cache:
             
             m_cache.return_value.get_analysis = AsyncMock(return_value=None)
@@ -125,7 +125,7 @@ class TestAnalyze:
         
         with patch("app.shared.llm.analyzer.LLMBudgetManager.check_and_reserve", AsyncMock(return_value=Decimal("0"))), \
              patch("app.shared.llm.analyzer.LLMBudgetManager.record_usage", AsyncMock()), \
-             patch("app.shared.llm.analyzer.SymbolicForecaster.forecast", AsyncMock(return_value={})), \
+             patch("app.shared.analysis.forecast_store.SymbolicForecaster.forecast", AsyncMock(return_value={})), \
              patch("app.shared.llm.analyzer.get_cache_service") as m_cache:
             
             m_cache.return_value.get_analysis = AsyncMock(return_value=None)
@@ -142,7 +142,7 @@ class TestAnalyze:
         
         with patch("app.shared.llm.analyzer.LLMBudgetManager.check_and_reserve", AsyncMock(return_value=Decimal("0"))), \
              patch("app.shared.llm.analyzer.LLMBudgetManager.record_usage", AsyncMock()), \
-             patch("app.shared.llm.analyzer.SymbolicForecaster.forecast", AsyncMock(return_value={})), \
+             patch("app.shared.analysis.forecast_store.SymbolicForecaster.forecast", AsyncMock(return_value={})), \
              patch("app.shared.llm.analyzer.get_cache_service") as m_cache:
             
             m_cache.return_value.get_analysis = AsyncMock(return_value=None)
@@ -161,7 +161,7 @@ class TestAnalyze:
         
         with patch("app.shared.llm.analyzer.LLMBudgetManager.check_and_reserve", AsyncMock(return_value=Decimal("0"))), \
              patch("app.shared.llm.analyzer.LLMBudgetManager.record_usage", AsyncMock()), \
-             patch("app.shared.llm.analyzer.SymbolicForecaster.forecast", AsyncMock(return_value={})), \
+             patch("app.shared.analysis.forecast_store.SymbolicForecaster.forecast", AsyncMock(return_value={})), \
              patch("app.shared.llm.analyzer.get_cache_service") as m_cache:
             
             m_cache.return_value.get_analysis = AsyncMock(return_value=None)
@@ -0,0 +1,168 @@
+"""
+Tests for the grounding forecast store - version keys, background fits and analysis back-fill.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.schemas.costs import CostRecord
+from app.shared.analysis.forecast_store import ForecastStore, data_version
+
+FORECAST = {"confidence": "medium", "forecast": [], "total_forecasted_cost": Decimal("300"), "model": "Prophet"}
+
+
+def _history(days=20, amount="10.0"):
+    start = datetime(2026, 1, 1)
+    return [CostRecord(date=start + timedelta(days=i), amount=Decimal(amount), service="ec2") for i in range(days)]
+
+
+def _fitted(days):
+    entries = [{"date": f"2026-02-{i + 1:02d}", "amount": "10.00"} for i in range(days)]
+    return {**FORECAST, "forecast": entries, "total_forecasted_cost": Decimal(10 * days)}
+
+
+def test_data_version_tracks_series():
+    assert data_version(_history()) == data_version(_history())
+    assert data_version(_history()) != data_version(_history(amount="11.0"))
+
+
+@pytest.mark.asyncio
+async def test_longer_horizon_forecast_serves_shorter_requests():
+    store = ForecastStore()
+    tenant_id = uuid4()
+    version = data_version(_history())
+    await store.put(tenant_id, version, _fitted(60), days=60)
+    # A shorter fit never replaces the longer one
+    await store.put(tenant_id, version, _fitted(7), days=7)
+
+    with patch("app.shared.analysis.forecaster.SymbolicForecaster.forecast", AsyncMock()) as fit:
+        result = await store.grounding_forecast(tenant_id, _history(), days=30)
+
+    fit.assert_not_awaited()
+    assert len(result["forecast"]) == 30
+    assert result["total_forecasted_cost"] == Decimal("300")
+    assert await store.lookup(tenant_id, version, days=90) is None
+
+
+@pytest.mark.asyncio
+async def test_missing_forecast_is_pending_then_fitted_once_in_background():
+    store = ForecastStore()
+    tenant_id = uuid4()
+    fit_started = asyncio.Event()
+    release_fit = asyncio.Event()
+
+    async def slow_fit(*args, **kwargs):
+        fit_started.set()
+        await release_fit.wait()
+        return FORECAST
+
+    with patch("app.shared.analysis.forecaster.SymbolicForecaster.forecast", side_effect=slow_fit) as fit:
+        first = await store.grounding_forecast(tenant_id, _history())
+        second = await store.grounding_forecast(tenant_id, _history())
+        assert first["status"] == "pending" and second == first
+
+        await fit_started.wait()
+        release_fit.set()
+        await store.drain()
+
+        assert fit.call_count == 1
+        stored = await store.grounding_forecast(tenant_id, _history())
+    assert stored["model"] == "Prophet"
+    assert stored["data_version"] == first["data_version"]
+
+
+@pytest.mark.asyncio
+async def test_short_history_is_forecast_inline():
+    store = ForecastStore()
+    result = await store.grounding_forecast(uuid4(), _history(days=3))
+    assert result["confidence"] == "low"
+    assert not store._inflight
+
+
+@pytest.mark.asyncio
+async def test_fit_backfills_pending_cached_analysis():
+    store = ForecastStore()
+    tenant_id = uuid4()
+    version = data_version(_history())
+    cached = {"insights": ["x"], "symbolic_forecast": {"status": "pending", "data_version": version}}
+    cache = MagicMock(enabled=False, get_analysis=AsyncMock(return_value=cached), set_analysis=AsyncMock())
+
+    with patch("app.shared.analysis.forecast_store.get_cache_service", return_value=cache), \
+         patch("app.shared.analysis.forecaster.SymbolicForecaster.forecast", AsyncMock(return_value=FORECAST)):
+        await store.grounding_forecast(tenant_id, _history())
+        await store.drain()
+
+    saved = cache.set_analysis.await_args.args[1]
+    assert saved["insights"] == ["x"]
+    assert saved["symbolic_forecast"]["model"] == "Prophet"
+
+
+@pytest.mark.asyncio
+async def test_analysis_result_attaches_stored_forecast_without_fitting():
+    from app.shared.analysis.forecast_store import get_forecast_store
+    from app.shared.llm.analyzer import FinOpsAnalyzer
+
+    tenant_id = uuid4()
+    history = _history()
+    await get_forecast_store().put(tenant_id, data_version(history), FORECAST, days=30)
+    analyzer = FinOpsAnalyzer(MagicMock())
+    cache = MagicMock(set_analysis=AsyncMock())
+
+    with patch("app.shared.llm.analyzer.get_cache_service", return_value=cache), \
+         patch("app.shared.analysis.forecaster.SymbolicForecaster.forecast", AsyncMock()) as fit:
+        result = await analyzer._process_analysis_results(
+            '{"insights": [], "recommendations": [], "anomalies": []}', tenant_id, MagicMock(records=history)
+        )
+
+    fit.assert_not_awaited()
+    assert result["symbolic_forecast"]["total_forecasted_cost"] == Decimal("300")
+
+
+@pytest.mark.asyncio
+async def test_analysis_attaches_the_forecast_its_prompt_was_grounded_on():
+    from app.schemas.costs import CloudUsageSummary
+    from app.shared.llm.analyzer import FinOpsAnalyzer
+
+    tenant_id = uuid4()
+    summary = CloudUsageSummary(
+        tenant_id=str(tenant_id), provider="aws", start_date=datetime(2026, 1, 1).date(),
+        end_date=datetime(2026, 1, 20).date(), total_cost=Decimal("200"), records=_history(),
+    )
+    pending = {"status": "pending", "data_version": data_version(summary.records)}
+    store = MagicMock(grounding_forecast=AsyncMock(return_value=pending))
+    analyzer = FinOpsAnalyzer(MagicMock(model_name="llama-3.3-70b-versatile"))
+    analyzer._check_cache_and_delta = AsyncMock(return_value=(None, False))
+    analyzer._setup_client_and_usage = AsyncMock(return_value=(None, "groq", "llama-3.3-70b-versatile", None))
+    analyzer._invoke_llm = AsyncMock(return_value=('{"insights": [], "recommendations": [], "anomalies": []}', {}))
+
+    with patch("app.shared.llm.analyzer.get_forecast_store", return_value=store), \
+         patch("app.shared.llm.analyzer.get_cache_service", return_value=MagicMock(set_analysis=AsyncMock())), \
+         patch("app.shared.llm.analyzer.get_llm_response_cache", return_value=None), \
+         patch("app.shared.llm.analyzer.LLMGuardrails.sanitize_input", AsyncMock(side_effect=lambda d: dict(d))):
+        result = await analyzer.analyze(summary)
+
+    store.grounding_forecast.assert_awaited_once()
+    assert result["symbolic_forecast"] is pending
+    assert "pending" in analyzer._invoke_llm.await_args.args[0]
+
+
+def test_worker_fit_completes_under_a_per_task_event_loop():
+    """Celery tasks run each coroutine under its own asyncio.run; the fit must finish inside it."""
+    store = ForecastStore()
+    tenant_id = uuid4()
+
+    async def slow_fit(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return FORECAST
+
+    with patch("app.shared.analysis.forecaster.SymbolicForecaster.forecast", side_effect=slow_fit):
+        result = asyncio.run(store.grounding_forecast(tenant_id, _history(), wait=True))
+        stored = asyncio.run(store.grounding_forecast(tenant_id, _history()))
+
+    assert result["model"] == "Prophet"
+    assert stored["data_version"] == result["data_version"]
+    assert not store._inflight
@@ -0,0 +1,81 @@
+"""
+Tests for request-scoped entitlement resolution and the cross-request tier cache.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from app.models.tenant import Tenant
+from app.shared.core.pricing import (
+    Entitlements,
+    FeatureFlag,
+    PricingTier,
+    TierGuard,
+    get_entitlement_cache,
+    get_tenant_tier,
+    remember_entitlements,
+    resolve_entitlements,
+)
+
+
+def _session(plan):
+    db = AsyncMock()
+    db.info = {}
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = plan
+    db.execute.return_value = result
+    return db
+
+
+@pytest.mark.asyncio
+async def test_resolves_once_per_request_and_shares_across_requests():
+    tenant_id = uuid4()
+    first = _session("pro")
+    for _ in range(3):
+        entitlements = await resolve_entitlements(tenant_id, first)
+    assert entitlements.tier == PricingTier.PRO
+    assert entitlements.has(FeatureFlag.GITOPS_REMEDIATION)
+    assert first.execute.await_count == 1
+
+    second = _session("pro")
+    assert await get_tenant_tier(tenant_id, second) == PricingTier.PRO
+    second.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_unknown_tenant_and_errors_are_not_cached():
+    tenant_id = uuid4()
+    assert await get_tenant_tier(tenant_id, _session(None)) == PricingTier.FREE
+
+    failing = AsyncMock()
+    failing.execute.side_effect = Exception("DB down")
+    assert await get_tenant_tier(tenant_id, failing) == PricingTier.FREE
+
+    assert await get_tenant_tier(tenant_id, _session("growth")) == PricingTier.GROWTH
+
+
+@pytest.mark.asyncio
+async def test_plan_change_invalidates_cached_entitlements():
+    tenant = Tenant(id=uuid4(), name="Acme", plan="starter")
+    get_entitlement_cache().put(tenant.id, PricingTier.STARTER)
+
+    tenant.plan = "enterprise"
+
+    db = _session("enterprise")
+    assert await get_tenant_tier(tenant.id, db) == PricingTier.ENTERPRISE
+    db.execute.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_resolved_entitlements_skip_tier_queries():
+    tenant_id = uuid4()
+    db = _session("trial")
+    remember_entitlements(db, tenant_id, "growth")
+    assert (await resolve_entitlements(tenant_id, db)).tier == PricingTier.GROWTH
+
+    user = MagicMock(tenant_id=tenant_id)
+    async with TierGuard(user, db, entitlements=Entitlements(tenant_id, PricingTier.STARTER)) as guard:
+        assert guard.limit("max_aws_accounts") == 5
+    db.execute.assert_not_awaited()
@@ -13,6 +13,7 @@ import app.models.notification_settings
 import app.models.remediation
 import app.models.background_job
 import app.models.attribution
+import app.models.cloud
 import app.models.carbon_settings
 import app.models.cost_audit
 import app.models.discovered_account
@@ -38,6 +39,82 @@ def mock_retry(*args, **kwargs):
     return decorator
 tenacity.retry = mock_retry
 
+@pytest.fixture(autouse=True)
+def reset_sts_credential_broker():
+    """Process-wide STS credentials must not leak between tests."""
+    from app.shared.adapters.credential_broker import get_sts_credential_broker
+    get_sts_credential_broker().clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_principal_cache():
+    """Authenticated principals and tenant entitlements are cached per process."""
+    from app.shared.core.principal_cache import reset_principal_cache
+    from app.shared.core.pricing import reset_entitlement_cache
+    reset_principal_cache()
+    reset_entitlement_cache()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_slack_delivery():
+    """Shared Slack clients, dedup windows and channel buckets are per-process state."""
+    from app.modules.notifications.domain.slack import get_slack_delivery
+    from app.shared.adapters import rate_limiter
+    get_slack_delivery().clear()
+    rate_limiter._distributed_limiters.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_llm_response_cache():
+    """Cached LLM responses must not replay across tests."""
+    from app.shared.llm.response_cache import reset_llm_response_cache
+    reset_llm_response_cache()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_tokenizer_registry():
+    """Loaded (possibly patched) tiktoken encodings are cached per process."""
+    from app.shared.llm.tokenizer import get_tokenizer_registry
+    get_tokenizer_registry().clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_provider_health():
+    """LLM provider circuit state must not carry over between tests."""
+    from app.shared.llm.provider_health import reset_provider_health
+    reset_provider_health()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_replica_router():
+    """Replica health probes and tenant write markers are per-process state."""
+    from app.shared.db.replica import reset_replica_router
+    reset_replica_router()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_admission_cache():
+    """Drop per-process LLM admission snapshots and clients between tests."""
+    from app.shared.llm.admission import reset_admission_cache
+    reset_admission_cache()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_forecast_store():
+    """Grounding forecasts must not leak between tests."""
+    from app.shared.analysis.forecast_store import reset_forecast_store
+    reset_forecast_store()
+    yield
+
+
 @pytest.fixture(autouse=True)
 def set_testing_env():
     """Ensure TESTING is set for all tests"""
@@ -28,7 +28,7 @@ async def test_graceful_degradation_soft_limit():
     from app.shared.analysis.forecaster import SymbolicForecaster
 
     with patch("app.shared.llm.analyzer.UsageTracker", return_value=usage_tracker_mock):
-        with patch("app.shared.llm.analyzer.LLMFactory.create") as mock_factory:
+        with patch("app.shared.llm.factory.LLMFactory.create") as mock_factory:
             with patch.object(LLMBudgetManager, "check_and_reserve", AsyncMock(return_value=Decimal("0.01"))):
                 with patch.object(SymbolicForecaster, "forecast", AsyncMock(return_value={"total_forecasted_cost": 0, "forecast": []})):
                     # Configure mocked DB budget lookup
@@ -5,12 +5,17 @@ Tests:
 1. RequestIDMiddleware
 2. SecurityHeadersMiddleware
 3. TimeoutMiddleware
+4. Streaming responses through the pure-ASGI stack
 """
 
+import asyncio
+
+import structlog
 from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
 from fastapi.testclient import TestClient
 
-from app.shared.core.middleware import RequestIDMiddleware, SecurityHeadersMiddleware
+from app.shared.core.middleware import RequestIDMiddleware, SecurityHeadersMiddleware, get_request_id
 
 
 class TestRequestIDMiddleware:
@@ -35,6 +40,24 @@ class TestRequestIDMiddleware:
         # Should have request ID header
         assert "x-request-id" in response.headers or response.status_code == 200
 
+    def test_request_id_propagates_to_context(self):
+        """A client-supplied ID is echoed once and visible to handlers and structlog."""
+        app = FastAPI()
+        app.add_middleware(RequestIDMiddleware)
+
+        @app.get("/test")
+        async def test_route():
+            return {
+                "request_id": get_request_id(),
+                "logged": structlog.contextvars.get_contextvars().get("request_id"),
+            }
+
+        response = TestClient(app).get("/test", headers={"X-Request-ID": "req-123"})
+
+        assert response.json() == {"request_id": "req-123", "logged": "req-123"}
+        assert response.headers.get_list("x-request-id") == ["req-123"]
+        assert get_request_id() is None
+
 
 class TestSecurityHeadersMiddleware:
     """Test SecurityHeadersMiddleware."""
@@ -58,6 +81,37 @@ class TestSecurityHeadersMiddleware:
         # Check for common security headers
         # (exact headers depend on implementation)
         assert response.status_code == 200
+        assert response.headers["x-content-type-options"] == "nosniff"
+        assert response.headers["x-frame-options"] == "DENY"
+        assert "frame-ancestors 'none'" in response.headers["content-security-policy"]
+
+    def test_docs_skip_strict_csp(self):
+        app = FastAPI()
+        app.add_middleware(SecurityHeadersMiddleware)
+
+        response = TestClient(app).get("/openapi.json")
+
+        assert response.headers["x-frame-options"] == "DENY"
+        assert "content-security-policy" not in response.headers
+
+    def test_streaming_response_passes_through(self):
+        """Chunks of a streaming response arrive intact, with headers added."""
+        app = FastAPI()
+        app.add_middleware(SecurityHeadersMiddleware)
+        app.add_middleware(RequestIDMiddleware)
+
+        @app.get("/stream")
+        async def stream_route():
+            async def chunks():
+                for i in range(3):
+                    yield f"data: {i}\n\n"
+            return StreamingResponse(chunks(), media_type="text/event-stream")
+
+        response = TestClient(app).get("/stream")
+
+        assert response.text == "data: 0\n\ndata: 1\n\ndata: 2\n\n"
+        assert response.headers["x-content-type-options"] == "nosniff"
+        assert "x-request-id" in response.headers
 
 
 class TestTimeoutMiddleware:
@@ -83,6 +137,40 @@ class TestTimeoutMiddleware:
         response = client.get("/test")
         assert response.status_code == 200
 
+    def test_slow_response_times_out(self):
+        from app.shared.core.timeout import TimeoutMiddleware
+
+        app = FastAPI()
+        app.add_middleware(TimeoutMiddleware, timeout_seconds=0.05)
+
+        @app.get("/slow")
+        async def slow_route():
+            await asyncio.sleep(1)
+            return {"status": "late"}
+
+        response = TestClient(app).get("/slow")
+        assert response.status_code == 504
+        assert response.json()["error"] == "gateway_timeout"
+
+    def test_deadline_ends_once_response_starts(self):
+        """A stream that outlives the timeout is not cut off after its headers are sent."""
+        from app.shared.core.timeout import TimeoutMiddleware
+
+        app = FastAPI()
+        app.add_middleware(TimeoutMiddleware, timeout_seconds=0.05)
+
+        @app.get("/stream")
+        async def stream_route():
+            async def chunks():
+                yield "first,"
+                await asyncio.sleep(0.1)
+                yield "second"
+            return StreamingResponse(chunks())
+
+        response = TestClient(app).get("/stream")
+        assert response.status_code == 200
+        assert response.text == "first,second"
+
 
 class TestRateLimitMiddleware:
     """Test rate limiting."""
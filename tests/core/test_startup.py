@@ -0,0 +1,122 @@
+"""
+Tests for startup cost
+
+Tests:
+1. Importing app.main does not load heavy optional dependencies
+2. Import-time budget
+3. Routers from the manifest are mounted under their prefixes
+4. StartupTimer phases
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from fastapi import APIRouter, FastAPI
+
+from app.shared.core.startup import RouterSpec, StartupTimer, include_routers
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Loaded on first use (adapter factory, forecaster, LLM analyzer, lifespan)
+HEAVY_MODULES = [
+    "pandas",
+    "prophet",
+    "codecarbon",
+    "langchain_core",
+    "google.cloud.bigquery",
+    "google.cloud.compute_v1",
+    "azure.mgmt.costmanagement",
+]
+
+# Generous: a cold import measured ~2.7s locally, ~7s before lazy loading
+IMPORT_BUDGET_SECONDS = 8.0
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - started
+print(json.dumps({
+    "elapsed": elapsed,
+    "loaded": [m for m in %r if m in sys.modules],
+    "paths": sorted(app.main.app.openapi()["paths"]),
+}))
+""" % (HEAVY_MODULES,)
+
+
+def _probe_app_import() -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=REPO_ROOT,
+        env={**os.environ, "PYTHONPATH": str(REPO_ROOT)},
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+class TestColdImport:
+    """Measured in a fresh interpreter; the test session has everything loaded."""
+
+    def test_cold_import_within_budget_and_without_heavy_modules(self):
+        probe = _probe_app_import()
+
+        assert probe["loaded"] == []
+        assert probe["elapsed"] < IMPORT_BUDGET_SECONDS
+        for prefix in ("/api/v1/costs", "/api/v1/zombies", "/api/v1/audit", "/api/v1/settings/onboard"):
+            assert any(path.startswith(prefix) for path in probe["paths"]), prefix
+
+
+class TestRouterManifest:
+    def test_include_routers_mounts_each_spec(self, monkeypatch):
+        import types
+
+        module = types.ModuleType("fake_router_module")
+        module.router = APIRouter()
+        module.public = APIRouter()
+
+        @module.router.get("/ping")
+        async def ping():
+            return {"ok": True}
+
+        @module.public.get("/status")
+        async def status():
+            return {"ok": True}
+
+        monkeypatch.setitem(sys.modules, "fake_router_module", module)
+        app = FastAPI()
+        timer = StartupTimer()
+
+        include_routers(app, [
+            RouterSpec("fake_router_module", "/api/v1/fake"),
+            RouterSpec("fake_router_module", attr="public"),
+        ], timer)
+
+        paths = set(app.openapi()["paths"])
+        assert paths == {"/api/v1/fake/ping", "/status"}
+        assert "router:fake_router_module" in timer.phases
+
+    def test_main_manifest_modules_are_unique(self):
+        from app.main import ROUTER_MANIFEST
+
+        specs = [(spec.module, spec.prefix) for spec in ROUTER_MANIFEST]
+        assert len(specs) == len(set(specs))
+
+
+class TestStartupTimer:
+    def test_phases_accumulate_and_report_in_ms(self):
+        timer = StartupTimer()
+        timer.record("routers", 0.25)
+        timer.record("routers", 0.25)
+        with timer.phase("scheduler"):
+            pass
+
+        timings = timer.report()
+
+        assert timings["routers"] == 500.0
+        assert "scheduler" in timings
@@ -0,0 +1,110 @@
+"""
+Tests for buffered audit writes: the per-unit-of-work buffer written at
+commit and discarded when the unit of work ends without one.
+
+Runs against a temporary SQLite database so the multi-row inserts execute for real.
+"""
+import uuid
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import app.main  # noqa: F401 - configures all mappers
+from app.models.tenant import Tenant, User
+from app.modules.governance.domain.security.audit_log import (
+    AuditEventType,
+    AuditLog,
+    AUDIT_BUFFER_KEY,
+    AuditLogger,
+)
+
+pytest.importorskip("aiosqlite")
+
+TABLES = [Tenant.__table__, User.__table__, AuditLog.__table__]
+
+
+@pytest_asyncio.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'audit.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda c: Tenant.metadata.create_all(c, tables=TABLES))
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def sessions(engine):
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+async def _logged(sessions):
+    async with sessions() as db:
+        result = await db.execute(select(AuditLog).order_by(AuditLog.event_timestamp))
+        return result.scalars().all()
+
+
+@pytest.mark.asyncio
+async def test_unit_of_work_entries_written_in_one_insert_at_commit(engine, sessions):
+    inserts = []
+    event.listen(engine.sync_engine, "before_cursor_execute",
+                 lambda *args: inserts.append(args[2]) if "INSERT INTO audit_logs" in args[2] else None)
+
+    async with sessions() as db:
+        tenant = Tenant(id=uuid.uuid4(), name="Audited")
+        db.add(tenant)  # pending until commit: the entries must be written after it
+        audit = AuditLogger(db, tenant.id, correlation_id="corr-1")
+        for event_type in (AuditEventType.TENANT_CREATED, AuditEventType.SETTINGS_UPDATED,
+                           AuditEventType.AUTO_PILOT_ENABLED):
+            await audit.log(event_type=event_type)
+        assert inserts == []
+        await db.commit()
+
+    assert len(inserts) == 1
+    logs = await _logged(sessions)
+    assert [log.event_type for log in logs] == ["tenant.created", "settings.updated", "settings.auto_pilot_enabled"]
+    assert {log.correlation_id for log in logs} == {"corr-1"}
+
+
+@pytest.mark.asyncio
+async def test_rollback_discards_buffered_entries(sessions):
+    async with sessions() as db:
+        tenant = Tenant(id=uuid.uuid4(), name="Audited")
+        db.add(tenant)
+        await db.commit()
+        await AuditLogger(db, tenant.id).log(event_type=AuditEventType.SYSTEM_ERROR)
+        await db.rollback()
+        await db.commit()
+
+    assert await _logged(sessions) == []
+
+
+@pytest.mark.asyncio
+async def test_close_without_commit_discards_buffered_entries(sessions):
+    tenant_id = uuid.uuid4()
+    async with sessions() as db:
+        db.add(Tenant(id=tenant_id, name="Audited"))
+        await db.commit()
+        await AuditLogger(db, tenant_id).log(event_type=AuditEventType.SYSTEM_ERROR)
+        await db.close()
+        assert AUDIT_BUFFER_KEY not in db.info
+
+        # The session is reusable; a later commit must not write the abandoned entry
+        db.add(User(id=uuid.uuid4(), tenant_id=tenant_id, email="a@example.com"))
+        await db.commit()
+
+    assert await _logged(sessions) == []
+
+
+@pytest.mark.asyncio
+async def test_savepoint_rollback_keeps_buffered_entries(sessions):
+    tenant_id = uuid.uuid4()
+    async with sessions() as db:
+        db.add(Tenant(id=tenant_id, name="Audited"))
+        await AuditLogger(db, tenant_id).log(event_type=AuditEventType.TENANT_CREATED)
+        savepoint = await db.begin_nested()
+        await savepoint.rollback()
+        await db.commit()
+
+    assert [log.event_type for log in await _logged(sessions)] == ["tenant.created"]
@@ -10,12 +10,13 @@ Tests:
 
 import pytest
 import uuid
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import MagicMock
 
 from app.modules.governance.domain.security.audit_log import (
     AuditEventType,
     AuditLog,
     AuditLogger,
+    AUDIT_BUFFER_KEY,
 )
 
 
@@ -97,10 +98,8 @@ class TestAuditLogger:
     
     @pytest.mark.asyncio
     async def test_log_creates_entry(self):
-        """AuditLogger.log() should create AuditLog entry."""
-        mock_db = AsyncMock()
-        mock_db.add = MagicMock()
-        mock_db.flush = AsyncMock()
+        """AuditLogger.log() should buffer the entry on the session without a round-trip."""
+        mock_db = MagicMock(info={})
         
         tenant_id = uuid.uuid4()
         logger = AuditLogger(mock_db, tenant_id)
@@ -111,17 +110,16 @@ class TestAuditLogger:
             success=True
         )
         
-        assert mock_db.add.called
-        assert mock_db.flush.called
+        mock_db.flush.assert_not_called()
+        assert [row["id"] for row in mock_db.info[AUDIT_BUFFER_KEY]] == [entry.id]
         assert entry.event_type == "auth.login"
         assert entry.success is True
+        assert entry.correlation_id == logger.correlation_id
 
     @pytest.mark.asyncio
     async def test_log_with_details_triggers_masking(self):
         """AuditLogger.log() should mask details."""
-        mock_db = AsyncMock()
-        mock_db.add = MagicMock()
-        mock_db.flush = AsyncMock()
+        mock_db = MagicMock(info={})
         
         tenant_id = uuid.uuid4()
         logger = AuditLogger(mock_db, tenant_id)
@@ -0,0 +1,106 @@
+"""
+Tests for audit log keyset pagination and streaming export.
+
+Runs against a temporary SQLite database so the (event_timestamp, id) row
+comparisons execute for real, including rows that share a timestamp.
+"""
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from uuid import UUID, uuid4
+
+import pytest
+import pytest_asyncio
+from fastapi import Response
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import app.main  # noqa: F401 - configures all mappers
+from app.models.tenant import Tenant, User
+from app.modules.governance.api.v1 import audit as audit_api
+from app.modules.governance.domain.security.audit_log import AuditLog
+from app.shared.core.auth import CurrentUser
+
+pytest.importorskip("aiosqlite")
+
+TABLES = [Tenant.__table__, User.__table__, AuditLog.__table__]
+
+
+@pytest_asyncio.fixture
+async def db(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'audit.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda c: Tenant.metadata.create_all(c, tables=TABLES))
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def admin(db):
+    tenant = Tenant(id=uuid4(), name="Audited")
+    db.add(tenant)
+    base = datetime(2026, 1, 1, 12, 0, 0)
+    # Seven rows, the middle three sharing a timestamp
+    offsets = [0, 1, 2, 2, 2, 3, 4]
+    db.add_all([
+        AuditLog(tenant_id=tenant.id, event_type="login", event_timestamp=base + timedelta(minutes=m),
+                 actor_email="a@b.com", success=True)
+        for m in offsets
+    ])
+    await db.commit()
+    return CurrentUser(id=uuid4(), email="admin@test.com", tenant_id=tenant.id, role="admin")
+
+
+async def _page(db, admin, cursor=None, order="desc"):
+    response = Response()
+    logs = await audit_api.get_audit_logs(
+        admin, db, limit=3, offset=0, event_type=None,
+        sort_by="event_timestamp", order=order, cursor=cursor, response=response,
+    )
+    return logs, response.headers.get("X-Next-Cursor")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("order", ["desc", "asc"])
+async def test_cursor_walks_every_row_once(db, admin, order):
+    seen, cursor, pages = [], None, 0
+    while True:
+        logs, cursor = await _page(db, admin, cursor, order)
+        seen.extend(logs)
+        pages += 1
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert len({log.id for log in seen}) == 7
+    keys = [(log.event_timestamp, log.id) for log in seen]
+    assert keys == sorted(keys, reverse=order == "desc")
+
+
+@pytest.mark.asyncio
+async def test_export_streams_all_pages_and_resumes(db, admin):
+    with patch.object(audit_api, "EXPORT_PAGE_SIZE", 2):
+        response = await audit_api.export_audit_logs(admin, db, None, None, None)
+        body = "".join([chunk async for chunk in response.body_iterator])
+        rows = list(csv.DictReader(io.StringIO(body)))
+        assert len(rows) == 7
+        assert list(rows[0]) == audit_api.EXPORT_COLUMNS
+
+        # Resume after the fourth row, as a client would after a dropped connection
+        last = rows[3]
+        response = await audit_api.export_audit_logs(
+            admin, db, None, None, None, export_format="jsonl",
+            after_timestamp=datetime.fromisoformat(last["event_timestamp"]), after_id=UUID(last["id"]),
+        )
+        resumed = [json.loads(line) async for line in _lines(response)]
+
+    assert response.media_type == "application/x-ndjson"
+    assert [r["id"] for r in resumed] == [r["id"] for r in rows[4:]]
+
+
+async def _lines(response):
+    body = "".join([chunk async for chunk in response.body_iterator])
+    for line in body.splitlines():
+        yield line
@@ -0,0 +1,114 @@
+"""
+Tests for HealthSnapshotService - one aggregate query per dashboard section, snapshot history and pruning.
+
+Runs against a temporary SQLite database so the FILTER aggregates execute for real.
+"""
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import app.main  # noqa: F401 - configures all mappers
+from app.models.aws_connection import AWSConnection
+from app.models.background_job import BackgroundJob, JobStatus
+from app.models.health_snapshot import HealthSnapshot
+from app.models.llm import LLMBudget, LLMUsage
+from app.models.tenant import Tenant
+from app.modules.governance.domain.health_snapshot import HealthSnapshotService
+
+pytest.importorskip("aiosqlite")
+
+TABLES = [
+    Tenant.__table__, BackgroundJob.__table__, LLMUsage.__table__,
+    LLMBudget.__table__, AWSConnection.__table__, HealthSnapshot.__table__,
+]
+
+
+@pytest_asyncio.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'health.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda c: Tenant.metadata.create_all(c, tables=TABLES))
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def db(engine):
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+
+
+@pytest.mark.asyncio
+async def test_compute_issues_one_query_per_section(engine, db):
+    now = datetime.now(timezone.utc)
+    active = Tenant(id=uuid4(), name="Active", plan="growth", last_accessed_at=now - timedelta(hours=1))
+    dormant = Tenant(id=uuid4(), name="Dormant", plan="pro", last_accessed_at=now - timedelta(days=30))
+    trial = Tenant(id=uuid4(), name="Trial", plan="trial")
+    db.add_all([active, dormant, trial])
+    db.add_all([
+        BackgroundJob(tenant_id=active.id, job_type="zombie_scan", status=JobStatus.PENDING, scheduled_for=now, created_at=now),
+        BackgroundJob(tenant_id=active.id, job_type="zombie_scan", status=JobStatus.DEAD_LETTER, scheduled_for=now, created_at=now),
+        BackgroundJob(
+            tenant_id=active.id, job_type="zombie_scan", status=JobStatus.FAILED, scheduled_for=now,
+            created_at=now, completed_at=now - timedelta(hours=2),
+        ),
+        # Outside the 24h window: excluded by the outer WHERE, not just by FILTER
+        BackgroundJob(
+            tenant_id=active.id, job_type="zombie_scan", status=JobStatus.FAILED, scheduled_for=now,
+            created_at=now - timedelta(days=3), completed_at=now - timedelta(days=2),
+        ),
+        LLMUsage(
+            tenant_id=active.id, provider="groq", model="llama", input_tokens=1, output_tokens=1,
+            total_tokens=2, cost_usd=Decimal("0.50"), created_at=now,
+        ),
+        LLMUsage(
+            tenant_id=active.id, provider="groq", model="llama", input_tokens=1, output_tokens=1,
+            total_tokens=2, cost_usd=Decimal("4.00"), created_at=now - timedelta(days=2),
+        ),
+    ])
+    await db.flush()
+
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute",
+                 lambda *args: statements.append(args[2]))
+    metrics = await HealthSnapshotService(db).compute(now)
+
+    selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    assert len(selects) == 4
+    # Job and LLM aggregates are bounded by an indexed outer predicate
+    assert "WHERE background_jobs.status IN" in next(s for s in selects if "FROM background_jobs" in s)
+    assert "WHERE llm_usage.created_at >=" in next(s for s in selects if "FROM llm_usage" in s)
+    assert metrics["tenants"] == {
+        "total_tenants": 3, "active_last_24h": 1, "active_last_7d": 1,
+        "trial_tenants": 1, "paid_tenants": 2, "churn_risk": 1,
+    }
+    assert metrics["job_queue"]["pending_jobs"] == 1
+    assert metrics["job_queue"]["dead_letter_count"] == 1
+    assert metrics["job_queue"]["failed_last_24h"] == 1
+    assert metrics["llm_usage"]["total_requests_24h"] == 1
+    assert metrics["llm_usage"]["estimated_cost_24h"] == 0.5
+    assert metrics["aws_connections"]["total_connections"] == 0
+
+
+@pytest.mark.asyncio
+async def test_latest_history_and_prune(db):
+    service = HealthSnapshotService(db)
+    now = datetime.now(timezone.utc)
+    for days_ago in (100, 3, 1):
+        await service.capture(now - timedelta(days=days_ago))
+    await db.commit()
+
+    latest = await service.latest()
+    assert latest.captured_at.replace(tzinfo=timezone.utc) > now - timedelta(days=2)
+    assert latest.metrics["tenants"]["total_tenants"] == 0
+
+    history = await service.history(now - timedelta(days=7))
+    assert [s.captured_at for s in history] == sorted(s.captured_at for s in history)
+    assert len(history) == 2
+
+    assert await service.prune(retention_days=90, now=now) == 1
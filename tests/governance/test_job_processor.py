@@ -192,6 +192,49 @@ class TestJobProcessor:
         
         assert mock_job.attempts == 1
     
+    @pytest.mark.asyncio
+    async def test_batchable_jobs_run_in_one_execute_batch_call(self):
+        """Pending analysis jobs are handed to the handler together; each keeps its own outcome."""
+        mock_db = AsyncMock()
+        mock_db.begin_nested = MagicMock()
+        mock_ctx = MagicMock()
+        mock_ctx.__aenter__ = AsyncMock()
+        mock_ctx.__aexit__ = AsyncMock(return_value=False)
+        mock_db.begin_nested.return_value = mock_ctx
+
+        ok_job, failing_job = create_mock_job(), create_mock_job(attempts=0, max_attempts=3)
+        zombie_job = create_mock_job(job_type=JobType.ZOMBIE_SCAN)
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = [ok_job, zombie_job, failing_job]
+        mock_db.execute.return_value = mock_result
+
+        class BatchHandler:
+            batchable = True
+            execute_batch = AsyncMock(return_value={
+                ok_job.id: {"status": "completed"},
+                failing_job.id: RuntimeError("provider down"),
+            })
+
+        class SingleHandler:
+            batchable = False
+            execute = AsyncMock(return_value={"status": "completed"})
+
+        def factory(job_type):
+            return BatchHandler if job_type == JobType.FINOPS_ANALYSIS.value else SingleHandler
+
+        with patch("app.modules.governance.domain.jobs.processor.get_handler_factory", side_effect=factory), \
+             patch("app.shared.db.session.set_session_tenant_id", AsyncMock()):
+            results = await JobProcessor(mock_db).process_pending_jobs()
+
+        BatchHandler.execute_batch.assert_awaited_once()
+        assert BatchHandler.execute_batch.await_args.args[0] == [ok_job, failing_job]
+        SingleHandler.execute.assert_awaited_once()
+        assert results["processed"] == 3
+        assert ok_job.status == JobStatus.COMPLETED.value and ok_job.result == {"status": "completed"}
+        assert failing_job.status == JobStatus.PENDING.value
+        assert failing_job.error_message == "provider down"
+        assert failing_job.attempts == 1
+
     @pytest.mark.asyncio
     async def test_handles_missing_handler(self):
         """Should set error message if no handler for job type."""
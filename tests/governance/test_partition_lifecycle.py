@@ -0,0 +1,238 @@
+"""
+Tests for PartitionLifecycleService - planning from catalog state, per-tier retention,
+dry-run vs apply, and default-partition checks.
+
+Planning is pure; runs go through a fake PostgreSQL session that answers the catalog
+queries and records the DDL it is given.
+"""
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import app.main  # noqa: F401 - configures all mappers
+from app.models.tenant import Tenant
+from app.modules.governance.domain.partition_lifecycle import (
+    Partition,
+    PartitionLifecycleService,
+    PartitionPolicy,
+    add_months,
+    parse_bound,
+)
+
+pytest.importorskip("aiosqlite")
+
+TODAY = date(2026, 10, 18)
+COSTS = PartitionPolicy("cost_records", "recorded_at", timestamped=False, min_retention_days=365)
+AUDIT = PartitionPolicy("audit_logs", "event_timestamp", timestamped=True, min_retention_days=730)
+
+
+def _month(year: int, month: int, name: str = None) -> Partition:
+    start = date(year, month, 1)
+    return Partition(name or f"cost_records_{year}_{month:02d}", start, add_months(start, 1))
+
+
+class FakePostgres:
+    """Answers the service's catalog queries; records everything else."""
+
+    def __init__(self, partitions, archives=(), plans=("growth",), default_rows=0, fail_on=None):
+        self.bind = SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+        self.partitions = partitions
+        self.archives = list(archives)
+        self.plans = list(plans)
+        self.default_rows = default_rows
+        self.fail_on = fail_on
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    async def execute(self, statement, params=None):
+        sql = str(statement)
+        result = MagicMock()
+        if "pg_inherits" in sql:
+            result.all.return_value = [
+                SimpleNamespace(name=name, bound=bound) for name, bound in self.partitions
+            ]
+        elif "relkind" in sql:
+            result.scalars.return_value.all.return_value = self.archives
+        elif "tenants" in sql:
+            result.scalars.return_value.all.return_value = self.plans
+        elif "SELECT count(*)" in sql:
+            result.scalar.return_value = self.default_rows
+        elif "SELECT EXISTS" in sql:
+            result.scalar.return_value = params["start"] == date(2026, 11, 1)
+        else:
+            if self.fail_on and self.fail_on in sql:
+                raise RuntimeError("canceling statement due to lock timeout")
+            self.statements.append(sql)
+        return result
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+def _bound(start: str, end: str) -> str:
+    return f"FOR VALUES FROM ('{start}') TO ('{end}')"
+
+
+@pytest.fixture
+def service():
+    return PartitionLifecycleService(MagicMock(), policies=(COSTS,))
+
+
+class TestPlan:
+    def test_precreates_only_uncovered_months(self, service):
+        partitions = [_month(2026, 10), _month(2026, 11, name="cost_records_p2026_11"), Partition("cost_records_default", None, None)]
+
+        actions = service.plan(COSTS, partitions, [], retention_days=None, today=TODAY)
+
+        assert [(a.action, a.partition, a.start) for a in actions] == [
+            ("create", "cost_records_2026_12", date(2026, 12, 1)),
+            ("create", "cost_records_2027_01", date(2027, 1, 1)),
+        ]
+
+    def test_archives_partitions_entirely_past_retention(self, service):
+        partitions = [_month(2025, 9), _month(2025, 10), _month(2025, 11)] + [
+            _month(2026, m) for m in range(10, 13)
+        ] + [_month(2027, 1)]
+
+        actions = service.plan(COSTS, partitions, [], retention_days=365, today=TODAY)
+
+        # Cutoff 2025-10-18: October 2025 still holds rows inside retention
+        assert [(a.action, a.partition) for a in actions] == [("archive", "cost_records_2025_09")]
+
+    def test_drop_mode_and_expired_archives(self, service):
+        service.expired_action = "drop"
+        service.archive_retention_days = 365
+        archives = ["cost_records_archive_2024_09", "cost_records_archive_2024_11", "cost_records_archive"]
+        partitions = [_month(2025, 1)] + [_month(2026, m) for m in range(10, 13)] + [_month(2027, 1)]
+
+        actions = service.plan(COSTS, partitions, archives, retention_days=365, today=TODAY)
+
+        assert [(a.action, a.partition) for a in actions] == [
+            ("drop", "cost_records_2025_01"),
+            ("drop_archive", "cost_records_archive_2024_09"),
+        ]
+
+    def test_unlimited_retention_keeps_everything(self, service):
+        actions = service.plan(COSTS, [_month(2019, 1)], ["cost_records_archive_2018_01"], None, TODAY)
+        assert all(a.action == "create" for a in actions)
+
+
+def test_parse_bound_handles_date_and_timestamptz_keys():
+    assert parse_bound(_bound("2026-01-01", "2026-02-01")) == (date(2026, 1, 1), date(2026, 2, 1))
+    assert parse_bound(_bound("2026-04-01 00:00:00+00", "2026-05-01 00:00:00+00")) == (
+        date(2026, 4, 1), date(2026, 5, 1)
+    )
+    assert parse_bound("FOR VALUES FROM (MINVALUE) TO ('2026-01-01')") is None
+
+
+@pytest_asyncio.fixture
+async def db(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'partitions.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda c: Tenant.metadata.create_all(c, tables=[Tenant.__table__]))
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("plans, expected", [
+    ([], 365),
+    (["trial", "starter", "growth"], 365),
+    (["starter", "pro"], 730),
+    (["growth", "enterprise"], None),
+])
+async def test_retention_is_longest_tier_present(db, plans, expected):
+    for plan in plans:
+        db.add(Tenant(id=uuid4(), name=f"{plan} tenant", plan=plan))
+    await db.flush()
+
+    assert await PartitionLifecycleService(db).retention_days(COSTS) == expected
+
+
+@pytest.mark.asyncio
+async def test_run_is_a_no_op_outside_postgres(db):
+    report = await PartitionLifecycleService(db).run()
+    assert report["skipped"] is True
+
+
+class TestRun:
+    CATALOG = [
+        ("cost_records_2025_09", _bound("2025-09-01", "2025-10-01")),
+        ("cost_records_2026_10", _bound("2026-10-01", "2026-11-01")),
+        ("cost_records_2026_12", _bound("2026-12-01", "2027-01-01")),
+        ("cost_records_2027_01", _bound("2027-01-01", "2027-02-01")),
+        ("cost_records_default", "DEFAULT"),
+    ]
+
+    @pytest.mark.asyncio
+    async def test_dry_run_executes_no_ddl(self):
+        db = FakePostgres(self.CATALOG)
+
+        report = await PartitionLifecycleService(db, policies=(COSTS,)).run(dry_run=True, today=TODAY)
+
+        assert db.statements == [] and db.commits == 0
+        assert [(a["action"], a["partition"], a["outcome"]) for a in report["actions"]] == [
+            ("create", "cost_records_2026_11", "planned"),
+            ("archive", "cost_records_2025_09", "planned"),
+        ]
+        assert report["default_rows"] == {"cost_records": 0}
+
+    @pytest.mark.asyncio
+    async def test_apply_runs_each_action_in_its_own_transaction(self):
+        db = FakePostgres(self.CATALOG)
+
+        report = await PartitionLifecycleService(db, policies=(COSTS,)).run(today=TODAY)
+
+        assert db.statements == [
+            "SET LOCAL lock_timeout = '5s'",
+            'CREATE TABLE "cost_records_2026_11" PARTITION OF "cost_records" FOR VALUES FROM (\'2026-11-01\') TO (\'2026-12-01\')',
+            "SET LOCAL lock_timeout = '5s'",
+            'ALTER TABLE "cost_records" DETACH PARTITION "cost_records_2025_09"',
+            'ALTER TABLE "cost_records_2025_09" RENAME TO "cost_records_archive_2025_09"',
+        ]
+        assert db.commits == 2
+        assert {a["outcome"] for a in report["actions"]} == {"applied"}
+
+    @pytest.mark.asyncio
+    async def test_timestamptz_bounds_are_written_in_utc(self):
+        db = FakePostgres([("audit_logs_p2026_10", _bound("2026-10-01 00:00:00+00", "2026-11-01 00:00:00+00"))])
+        service = PartitionLifecycleService(db, policies=(AUDIT,))
+        service.precreate_months = 1
+
+        await service.run(today=TODAY)
+
+        assert db.statements[-1] == (
+            'CREATE TABLE "audit_logs_2026_11" PARTITION OF "audit_logs" FOR VALUES '
+            "FROM ('2026-11-01 00:00:00+00') TO ('2026-12-01 00:00:00+00')"
+        )
+
+    @pytest.mark.asyncio
+    async def test_rows_in_default_block_the_matching_create(self):
+        db = FakePostgres(self.CATALOG, default_rows=3)
+
+        report = await PartitionLifecycleService(db, policies=(COSTS,)).run(today=TODAY)
+
+        create = next(a for a in report["actions"] if a["action"] == "create")
+        assert create["outcome"] == "blocked"
+        assert not any("CREATE TABLE" in s for s in db.statements)
+        assert report["default_rows"] == {"cost_records": 3}
+
+    @pytest.mark.asyncio
+    async def test_failed_action_rolls_back_and_the_run_continues(self):
+        db = FakePostgres(self.CATALOG, fail_on="CREATE TABLE")
+
+        report = await PartitionLifecycleService(db, policies=(COSTS,)).run(today=TODAY)
+
+        outcomes = {a["action"]: a["outcome"] for a in report["actions"]}
+        assert outcomes == {"create": "failed", "archive": "applied"}
+        assert db.rollbacks == 1 and db.commits == 1
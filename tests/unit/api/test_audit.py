@@ -122,7 +122,7 @@ async def test_export_audit_logs_success(mock_db, admin_user):
     mock_log.correlation_id = "c-1"
     
     mock_res = MagicMock()
-    mock_res.scalars.return_value.all.return_value = [mock_log]
+    mock_res.all.return_value = [mock_log]
     mock_db.execute.return_value = mock_res
     
     # Coverage for start_date, end_date, event_type
@@ -134,6 +134,25 @@ async def test_export_audit_logs_success(mock_db, admin_user):
         event_type="test-event"
     )
     assert response.media_type == "text/csv"
+    body = "".join([chunk async for chunk in response.body_iterator])
+    assert body.splitlines()[0].startswith("id,event_type,event_timestamp")
+    assert "test-event" in body
+    # A short first page ends the stream without another query
+    assert mock_db.execute.await_count == 1
+
+@pytest.mark.asyncio
+async def test_export_audit_logs_resume_requires_both_bounds(mock_db, admin_user):
+    with pytest.raises(HTTPException) as exc:
+        await export_audit_logs(admin_user, mock_db, after_id=uuid4())
+    assert exc.value.status_code == 400
+
+@pytest.mark.asyncio
+async def test_get_audit_logs_invalid_cursor(mock_db, admin_user):
+    with pytest.raises(HTTPException) as exc:
+        await get_audit_logs(admin_user, mock_db, limit=50, offset=0, event_type=None,
+                             sort_by="event_timestamp", order="desc", cursor="not-a-cursor")
+    assert exc.value.status_code == 400
+    mock_db.execute.assert_not_awaited()
 
 @pytest.mark.asyncio
 async def test_export_audit_logs_error(mock_db, admin_user):
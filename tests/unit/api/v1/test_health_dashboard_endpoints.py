@@ -2,42 +2,71 @@
 Tests for Investor Health Dashboard API Endpoints
 """
 import pytest
-from unittest.mock import AsyncMock, MagicMock
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
 from app.modules.health_dashboard import get_investor_health_dashboard
 
+METRICS = {
+    "tenants": {
+        "total_tenants": 10, "active_last_24h": 5, "active_last_7d": 8,
+        "trial_tenants": 2, "paid_tenants": 8, "churn_risk": 1,
+    },
+    "job_queue": {
+        "pending_jobs": 1, "running_jobs": 2, "failed_last_24h": 0, "dead_letter_count": 0,
+        "avg_processing_time_ms": 150.0, "p50_processing_time_ms": 100.0,
+        "p95_processing_time_ms": 200.0, "p99_processing_time_ms": 300.0,
+    },
+    "llm_usage": {
+        "total_requests_24h": 1000, "cache_hit_rate": 0.85,
+        "estimated_cost_24h": 2.5, "budget_utilization": 40.0,
+    },
+    "aws_connections": {"total_connections": 5, "verified_connections": 4, "failed_connections": 1},
+}
+
+
+def _snapshot(age: timedelta):
+    return MagicMock(captured_at=datetime.now(timezone.utc) - age, metrics=METRICS)
+
 
 @pytest.mark.asyncio
-async def test_get_investor_health_dashboard_handler_success():
-    """Test get_investor_health_dashboard direct handler call."""
+async def test_get_investor_health_dashboard_serves_latest_snapshot():
+    """A recent snapshot is served without recomputing."""
     mock_admin = MagicMock()
     mock_admin.role = "admin"
-    
     mock_db = AsyncMock()
-    
-    # Mock sequence of scalar/execute calls
-    # 5 tenant metrics scalars
-    # 4 job health scalars (pending, running, failed, dlq)
-    # 3 LLM metrics scalars (requests, cost, utilization)
-    # 2 AWS connection scalars (total, verified)
-    mock_db.scalar.side_effect = [
-        10, 5, 8, 2, 8, # tenants (5)
-        1, 2, 0, 0,    # jobs (4)
-        1000, 2.5, 0.4, # llm (3)
-        5, 4            # aws (2)
-    ]
-    
-    # Job processing stats Result (1 execute call)
-    mock_job_stats = MagicMock()
-    mock_job_stats.one.return_value = [150.0, 100.0, 200.0, 300.0] # avg, p50, p95, p99
-    
-    # AWS Connection Result - Wait, the code uses scalar for AWS connections now, not execute
-    
-    mock_db.execute.side_effect = [mock_job_stats]
-    
-    response = await get_investor_health_dashboard(mock_admin, mock_db)
-    
+
+    with patch("app.modules.governance.api.v1.health_dashboard.HealthSnapshotService") as service_cls:
+        service = service_cls.return_value
+        service.latest = AsyncMock(return_value=_snapshot(timedelta(minutes=1)))
+        service.capture = AsyncMock()
+
+        response = await get_investor_health_dashboard(mock_admin, mock_db)
+
+    service.capture.assert_not_awaited()
     assert response.system.status == "healthy"
     assert response.tenants.total_tenants == 10
     assert response.job_queue.pending_jobs == 1
     assert response.llm_usage.total_requests_24h == 1000
     assert response.aws_connections.failed_connections == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("refresh, latest", [
+    (True, _snapshot(timedelta(minutes=1))),
+    (False, None),
+    (False, _snapshot(timedelta(hours=2))),
+])
+async def test_get_investor_health_dashboard_captures_when_needed(refresh, latest):
+    """Forced refresh, a missing snapshot or a stale one trigger a capture."""
+    mock_db = AsyncMock()
+
+    with patch("app.modules.governance.api.v1.health_dashboard.HealthSnapshotService") as service_cls:
+        service = service_cls.return_value
+        service.latest = AsyncMock(return_value=latest)
+        service.capture = AsyncMock(return_value=_snapshot(timedelta(0)))
+
+        response = await get_investor_health_dashboard(MagicMock(), mock_db, refresh=refresh)
+
+    service.capture.assert_awaited_once()
+    mock_db.commit.assert_awaited_once()
+    assert response.tenants.paid_tenants == 8
@@ -0,0 +1,135 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import jwt
+import pytest
+from fastapi import Request
+
+from app.shared.core.auth import get_current_user
+from app.shared.core.principal_cache import PrincipalCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+        self.sets = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    async def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+
+    async def expire(self, key, seconds):
+        pass
+
+    async def smembers(self, key):
+        return set(self.sets.get(key, set()))
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+            self.sets.pop(key, None)
+
+
+def _principal(tenant_id, role="member"):
+    return {"id": str(uuid4()), "email": "a@b.com", "tenant_id": str(tenant_id), "role": role, "tier": "growth"}
+
+
+@pytest.mark.asyncio
+async def test_hit_skips_loader_until_local_ttl_expires():
+    clock = FakeClock()
+    cache = PrincipalCache(ttl_seconds=60, local_ttl_seconds=5, backend="memory", clock=clock)
+    principal = _principal(uuid4())
+    load = AsyncMock(return_value=principal)
+
+    assert await cache.get("sub", load) == principal
+    assert await cache.get("sub", load) == principal
+    assert load.await_count == 1
+
+    clock.now += 6
+    await cache.get("sub", load)
+    assert load.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load():
+    cache = PrincipalCache(backend="memory")
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return _principal(uuid4())
+
+    results = await asyncio.gather(*(cache.get("sub", load) for _ in range(20)))
+    assert calls == 1
+    assert all(r == results[0] for r in results)
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_is_shared_and_invalidated_per_tenant():
+    redis = FakeRedis()
+    tenant_id = uuid4()
+    worker_a = PrincipalCache(backend="redis", redis_client=redis)
+    worker_b = PrincipalCache(backend="redis", redis_client=redis)
+    load = AsyncMock(side_effect=lambda: _principal(tenant_id))
+
+    await worker_a.get("alice", load)
+    await worker_a.get("bob", load)
+    await worker_b.get("alice", load)
+    assert load.await_count == 2  # worker_b read alice from Redis
+
+    await worker_a.invalidate_tenant(tenant_id)
+    assert redis.values == {}
+    await worker_a.get("alice", load)
+    assert load.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_not_found_is_not_cached():
+    cache = PrincipalCache(backend="memory")
+    load = AsyncMock(side_effect=[None, _principal(uuid4())])
+
+    assert await cache.get("sub", load) is None
+    assert await cache.get("sub", load) is not None
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_queries_db_once_per_principal():
+    user_id, tenant_id = uuid4(), uuid4()
+    token = jwt.encode({"sub": str(user_id), "aud": "authenticated"}, "test_secret", algorithm="HS256")
+    credentials = MagicMock(credentials=token)
+    db = AsyncMock()
+    row = MagicMock()
+    row.one_or_none.return_value = (MagicMock(id=user_id, tenant_id=tenant_id, email="a@b.com", role="admin"), "growth")
+    db.execute.return_value = row
+
+    with patch("app.shared.core.auth.get_settings") as settings, \
+         patch("app.shared.core.auth.set_session_tenant_id", new=AsyncMock()) as set_tenant:
+        settings.return_value.SUPABASE_JWT_SECRET = "test_secret"
+        for _ in range(3):
+            request = MagicMock(spec=Request)
+            user = await get_current_user(request, credentials, db)
+            assert user.tenant_id == tenant_id
+            assert request.state.tier == "growth"
+
+        from app.shared.core.principal_cache import get_principal_cache
+        await get_principal_cache().invalidate_user(user_id)
+        await get_current_user(MagicMock(spec=Request), credentials, db)
+
+    assert db.execute.await_count == 2
+    assert set_tenant.await_count == 4
@@ -0,0 +1,246 @@
+"""
+Tests for read-replica routing
+"""
+import asyncio
+import time
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.shared.core.dependencies import read_db
+from app.shared.db.session import get_db
+from app.shared.db.replica import (
+    PRIMARY,
+    REPLICA,
+    ReadConsistency,
+    ReplicaRouter,
+    ReplicaStatus,
+    note_tenant_write,
+    stronger,
+)
+
+TENANT = uuid.uuid4()
+
+
+@pytest_asyncio.fixture
+async def replica_maker():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+def _status(lag=0.0, caught_up=False, replayed_at=None, healthy=True):
+    return ReplicaStatus(healthy, lag, caught_up, replayed_at, time.monotonic())
+
+
+def _cache(enabled=True, last_write=None):
+    return MagicMock(
+        enabled=enabled,
+        get_last_write=AsyncMock(return_value=last_write),
+        set_last_write=AsyncMock(return_value=True),
+    )
+
+
+class TestRoute:
+    @pytest.mark.asyncio
+    async def test_without_replica_everything_reads_primary(self):
+        router = ReplicaRouter(session_maker=None)
+        assert await router.route(ReadConsistency.BOUNDED_STALENESS, TENANT) == (PRIMARY, "no_replica")
+
+    @pytest.mark.asyncio
+    async def test_primary_mode_never_touches_replica(self, replica_maker):
+        router = ReplicaRouter(session_maker=replica_maker)
+        with patch.object(router, "_probe", AsyncMock()) as probe:
+            assert await router.route(ReadConsistency.PRIMARY, TENANT) == (PRIMARY, "requested")
+        probe.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_healthy_replica_serves_bounded_staleness(self, replica_maker):
+        router = ReplicaRouter(session_maker=replica_maker)
+        assert await router.route(ReadConsistency.BOUNDED_STALENESS, TENANT) == (REPLICA, "ok")
+
+    @pytest.mark.asyncio
+    async def test_lagging_replica_falls_back(self, replica_maker):
+        router = ReplicaRouter(session_maker=replica_maker, max_lag_seconds=30)
+        with patch.object(router, "_probe", AsyncMock(return_value=_status(lag=45.0))):
+            assert await router.route(ReadConsistency.BOUNDED_STALENESS, TENANT) == (PRIMARY, "replica_lag")
+
+    @pytest.mark.asyncio
+    async def test_failed_probe_falls_back(self):
+        broken = MagicMock(side_effect=RuntimeError("connection refused"))
+        router = ReplicaRouter(session_maker=broken)
+        assert await router.route(ReadConsistency.BOUNDED_STALENESS, TENANT) == (PRIMARY, "replica_unavailable")
+
+    @pytest.mark.asyncio
+    async def test_concurrent_reads_share_one_probe(self, replica_maker):
+        router = ReplicaRouter(session_maker=replica_maker)
+
+        async def slow_probe(now):
+            await asyncio.sleep(0.01)
+            return _status()
+
+        with patch.object(router, "_probe", AsyncMock(side_effect=slow_probe)) as probe:
+            routes = await asyncio.gather(
+                *(router.route(ReadConsistency.BOUNDED_STALENESS, TENANT) for _ in range(5))
+            )
+        assert set(routes) == {(REPLICA, "ok")}
+        probe.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_probe_is_reused_within_check_interval(self, replica_maker):
+        router = ReplicaRouter(session_maker=replica_maker, check_interval_seconds=60)
+        with patch.object(router, "_probe", AsyncMock(return_value=_status())) as probe:
+            await router.route(ReadConsistency.BOUNDED_STALENESS, TENANT)
+            await router.route(ReadConsistency.BOUNDED_STALENESS, TENANT)
+        probe.assert_awaited_once()
+
+
+class TestReadYourWrites:
+    @pytest.mark.asyncio
+    async def test_replica_behind_tenant_write_reads_primary(self, replica_maker):
+        router = ReplicaRouter(session_maker=replica_maker)
+        replayed_at = datetime.now(timezone.utc)
+        router.record_write(str(TENANT), replayed_at.timestamp() + 5)
+        with patch.object(router, "_probe", AsyncMock(return_value=_status(lag=2.0, replayed_at=replayed_at))), \
+             patch("app.shared.db.replica.get_cache_service", return_value=_cache()):
+            assert await router.route(ReadConsistency.READ_YOUR_WRITES, TENANT) == (PRIMARY, "behind_write")
+            # Other tenants have nothing pending
+            assert await router.route(ReadConsistency.READ_YOUR_WRITES, uuid.uuid4()) == (REPLICA, "ok")
+
+    @pytest.mark.asyncio
+    async def test_replica_past_shared_write_marker_serves(self, replica_maker):
+        router = ReplicaRouter(session_maker=replica_maker)
+        replayed_at = datetime.now(timezone.utc)
+        cache = _cache(last_write=replayed_at.timestamp() - 5)
+        with patch.object(router, "_probe", AsyncMock(return_value=_status(lag=2.0, replayed_at=replayed_at))), \
+             patch("app.shared.db.replica.get_cache_service", return_value=cache):
+            assert await router.route(ReadConsistency.READ_YOUR_WRITES, TENANT) == (REPLICA, "ok")
+
+    @pytest.mark.asyncio
+    async def test_without_shared_markers_only_caught_up_replica_serves(self, replica_maker):
+        router = ReplicaRouter(session_maker=replica_maker)
+        cache = _cache(enabled=False)
+        with patch("app.shared.db.replica.get_cache_service", return_value=cache):
+            with patch.object(router, "_probe", AsyncMock(return_value=_status(lag=1.0))):
+                assert await router.route(ReadConsistency.READ_YOUR_WRITES, TENANT) == (PRIMARY, "write_unknown")
+            router._status = None
+            with patch.object(router, "_probe", AsyncMock(return_value=_status(caught_up=True))):
+                assert await router.route(ReadConsistency.READ_YOUR_WRITES, TENANT) == (REPLICA, "ok")
+
+    @pytest.mark.asyncio
+    async def test_commit_records_noted_tenant_writes(self, replica_maker):
+        router = ReplicaRouter(session_maker=replica_maker)
+        cache = _cache()
+        with patch("app.shared.db.replica.get_replica_router", return_value=router), \
+             patch("app.shared.db.replica.get_cache_service", return_value=cache):
+            async with replica_maker() as session:
+                note_tenant_write(session, TENANT)
+                await session.execute(text("SELECT 1"))
+                await session.rollback()
+                assert router._writes == {}
+
+                note_tenant_write(session, TENANT)
+                await session.execute(text("SELECT 1"))
+                await session.commit()
+            for task in list(router._publishing):
+                await task
+
+        assert str(TENANT) in router._writes
+        cache.set_last_write.assert_awaited_once()
+
+
+class TestReplicaSessions:
+    @pytest.mark.asyncio
+    async def test_replica_session_gets_rls_context(self, replica_maker):
+        router = ReplicaRouter(session_maker=replica_maker)
+        session = await router.open_replica_session(ReadConsistency.BOUNDED_STALENESS, TENANT)
+        try:
+            assert session.info["read_target"] == REPLICA
+            assert session.info["rls_context_set"] is True
+            assert (await session.connection()).info["rls_context_set"] is True
+        finally:
+            await session.close()
+
+    @pytest.mark.asyncio
+    async def test_connection_failure_falls_back_and_marks_unavailable(self, replica_maker):
+        router = ReplicaRouter(session_maker=replica_maker, check_interval_seconds=60)
+        with patch("app.shared.db.replica.prepare_read_session", AsyncMock(side_effect=OSError("reset"))):
+            assert await router.open_replica_session(ReadConsistency.BOUNDED_STALENESS, TENANT) is None
+        assert router._status.healthy is False
+        assert await router.route(ReadConsistency.BOUNDED_STALENESS, TENANT) == (PRIMARY, "replica_unavailable")
+
+
+class TestReadDbDependency:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("header, expected_replica", [
+        ("", True),
+        ("bounded_staleness", True),
+        ("primary", False),
+        ("nonsense", True),
+    ])
+    async def test_header_can_only_strengthen(self, replica_maker, header, expected_replica):
+        router = ReplicaRouter(session_maker=replica_maker)
+        primary_db = MagicMock()
+        primary = MagicMock(return_value=primary_db)
+        request = MagicMock(headers={"X-Read-Consistency": header})
+        request.app.dependency_overrides = {get_db: primary}
+        user = MagicMock(tenant_id=TENANT)
+
+        with patch("app.shared.core.dependencies.get_replica_router", return_value=router):
+            gen = read_db()(request, user)
+            session = await gen.__anext__()
+            assert (session is not primary_db) is expected_replica
+            # The primary session is only opened when the read falls back to it
+            assert primary.called is not expected_replica
+            with pytest.raises(StopAsyncIteration):
+                await gen.__anext__()
+
+    @pytest.mark.asyncio
+    async def test_fallback_opens_and_closes_a_get_db_session(self):
+        closed = []
+
+        async def primary_db(request):
+            try:
+                yield "primary-session"
+            finally:
+                closed.append(True)
+
+        request = MagicMock(headers={})
+        request.app.dependency_overrides = {get_db: primary_db}
+        router = ReplicaRouter(session_maker=None)
+
+        with patch("app.shared.core.dependencies.get_replica_router", return_value=router):
+            gen = read_db()(request, MagicMock(tenant_id=TENANT))
+            assert await gen.__anext__() == "primary-session"
+            with pytest.raises(StopAsyncIteration):
+                await gen.__anext__()
+        assert closed == [True]
+
+    @pytest.mark.asyncio
+    async def test_request_session_checks_out_no_connection_until_used(self, replica_maker):
+        from app.shared.db.session import set_session_tenant_id
+
+        request = MagicMock()
+        del request.state.tenant_id
+        with patch("app.shared.db.session.async_session_maker", replica_maker):
+            gen = get_db(request)
+            session = await gen.__anext__()
+        try:
+            await set_session_tenant_id(session, TENANT)
+            assert not session.in_transaction()
+
+            await session.execute(text("SELECT 1"))
+            assert (await session.connection()).info["rls_context_set"] is True
+        finally:
+            await gen.aclose()
+
+    def test_stronger_keeps_the_endpoint_floor(self):
+        assert stronger(ReadConsistency.READ_YOUR_WRITES, ReadConsistency.BOUNDED_STALENESS) \
+            is ReadConsistency.READ_YOUR_WRITES
+        assert stronger(ReadConsistency.BOUNDED_STALENESS, ReadConsistency.PRIMARY) is ReadConsistency.PRIMARY
+        assert stronger(ReadConsistency.PRIMARY, None) is ReadConsistency.PRIMARY
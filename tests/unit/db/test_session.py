@@ -86,3 +86,77 @@ def test_check_rls_policy_no_leak():
     
     # Should not raise
     check_rls_policy(mock_conn, None, "SELECT 1", None, None, False)
+
+
+def test_rls_classification_uses_statement_tables():
+    """Exemptions apply per referenced table, not per substring."""
+    from sqlalchemy import select
+    from sqlalchemy.dialects import postgresql
+    from types import SimpleNamespace
+    from app.models.tenant import Tenant, User
+    from app.modules.governance.domain.security.audit_log import AuditLog
+    from app.shared.db.rls_classifier import StatementClassifier
+
+    classifier = StatementClassifier()
+
+    auth = select(User, Tenant.plan).join(Tenant, User.tenant_id == Tenant.id).compile(dialect=postgresql.dialect())
+    assert not classifier.classify(str(auth), SimpleNamespace(compiled=auth)).enforced
+
+    # Mentions "FROM users" but also reads a tenant table
+    mixed = select(AuditLog).where(AuditLog.actor_id.in_(select(User.id))).compile(dialect=postgresql.dialect())
+    result = classifier.classify(str(mixed), SimpleNamespace(compiled=mixed))
+    assert result.enforced
+    assert result.tables == {"audit_logs", "users"}
+
+    assert not classifier.classify("SELECT 1").enforced
+    assert classifier.classify('INSERT INTO "public"."cost_records" (id) VALUES ($1)').enforced
+
+
+def test_rls_classification_ignores_from_inside_function_calls():
+    """FROM in EXTRACT/substring arguments is not a table reference; subqueries still are."""
+    from app.shared.db.rls_classifier import StatementClassifier
+
+    classifier = StatementClassifier()
+
+    assert not classifier.classify("SELECT now()").enforced
+    extract = classifier.classify("SELECT EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) AS lag")
+    assert extract.tables == frozenset() and not extract.enforced
+    assert not classifier.classify("SELECT substring(version() FROM 'PostgreSQL ([0-9.]+)')").enforced
+    assert not classifier.classify("SELECT 'rows from cost_records' AS note").enforced
+
+    nested = classifier.classify(
+        "SELECT EXTRACT(EPOCH FROM max(created_at)) FROM users "
+        "WHERE tenant_id IN (SELECT tenant_id FROM cost_records)"
+    )
+    assert nested.tables == {"users", "cost_records"}
+    assert nested.enforced
+    assert classifier.classify("SELECT coalesce((SELECT sum(cost_usd) FROM llm_usage), 0)").enforced
+
+
+def test_check_rls_policy_allows_function_from_without_tenant_context():
+    mock_conn = MagicMock()
+    mock_conn.info = {"rls_context_set": False}
+    statement = "SELECT EXTRACT(epoch FROM now())"
+
+    with patch("app.shared.db.session.settings") as mock_settings:
+        mock_settings.TESTING = False
+        assert check_rls_policy(mock_conn, None, statement, None, None, False) == (statement, None)
+
+
+def test_check_rls_policy_caches_classification():
+    """A repeated statement is classified once."""
+    from app.shared.db import rls_classifier
+
+    classifier = rls_classifier.StatementClassifier()
+    mock_conn = MagicMock()
+    mock_conn.info = {"rls_context_set": True}
+    statement = "SELECT * FROM audit_logs WHERE tenant_id = $1"
+
+    with patch("app.shared.db.session.settings") as mock_settings, \
+         patch("app.shared.db.session.get_statement_classifier", return_value=classifier), \
+         patch.object(rls_classifier, "_text_tables", wraps=rls_classifier._text_tables) as scan:
+        mock_settings.TESTING = False
+        for _ in range(3):
+            assert check_rls_policy(mock_conn, None, statement, None, None, False) == (statement, None)
+
+    assert scan.call_count == 1
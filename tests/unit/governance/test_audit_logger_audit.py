@@ -6,7 +6,7 @@ from app.modules.governance.domain.security.audit_log import AuditLogger, AuditE
 
 @pytest.fixture
 def mock_db():
-    mock = MagicMock()
+    mock = MagicMock(info={})
     mock.add = MagicMock()
     mock.flush = AsyncMock()
     return mock
@@ -42,8 +42,10 @@ async def test_log_creation_success(mock_db):
     assert entry.details == {"size": 100}
     assert entry.success is True
     
-    mock_db.add.assert_called_once_with(entry)
-    mock_db.flush.assert_awaited_once()
+    # Buffered for the commit-time batch insert, no per-entry flush
+    assert [row["id"] for row in mock_db.info["audit_buffer"]] == [entry.id]
+    mock_db.add.assert_not_called()
+    mock_db.flush.assert_not_awaited()
 
 @pytest.mark.asyncio
 async def test_sensitive_data_masking(mock_db):
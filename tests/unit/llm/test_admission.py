@@ -0,0 +1,134 @@
+"""
+Tests for AdmissionCache - one-load tenant snapshots, threshold invalidation and BYOK client reuse.
+
+Runs against a temporary SQLite database so the snapshot's joined load executes for real.
+"""
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import app.models.aws_connection  # noqa: F401 - registers relationship targets
+import app.models.background_job  # noqa: F401
+import app.models.notification_settings  # noqa: F401
+from app.models.llm import LLMBudget, LLMBudgetReservation, LLMSpendLedger, LLMUsage
+from app.models.tenant import Tenant
+from app.shared.llm.admission import AdmissionCache
+from app.shared.llm.budget_manager import BudgetStatus
+
+pytest.importorskip("aiosqlite")
+
+TABLES = [
+    Tenant.__table__,
+    LLMBudget.__table__,
+    LLMUsage.__table__,
+    LLMSpendLedger.__table__,
+    LLMBudgetReservation.__table__,
+]
+
+
+@pytest_asyncio.fixture
+async def db(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'admission.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda c: Tenant.metadata.create_all(c, tables=TABLES))
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def tenant(db):
+    tenant = Tenant(id=uuid4(), name="Acme", plan="growth")
+    db.add(tenant)
+    db.add(LLMBudget(
+        tenant_id=tenant.id,
+        monthly_limit_usd=Decimal("10"),
+        alert_threshold_percent=80,
+        hard_limit=True,
+        preferred_provider="openai",
+        preferred_model="gpt-4o",
+        openai_api_key="sk-tenant-key-123456789",
+    ))
+    await db.flush()
+    return tenant
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _count_queries(db):
+    statements = []
+    event.listen(db.bind.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+@pytest.mark.asyncio
+async def test_snapshot_loads_once_until_ttl(db, tenant):
+    clock = _Clock()
+    cache = AdmissionCache(ttl_seconds=60, max_clients=4, clock=clock)
+    statements = _count_queries(db)
+
+    first = await cache.get(db, tenant.id)
+    loaded = len(statements)
+    second = await cache.get(db, tenant.id)
+
+    assert second is first
+    assert len(statements) == loaded
+    assert first.tier == "growth"
+    assert first.budget.preferred_provider == "openai"
+    assert first.budget.byok_providers == ("openai",)
+    assert "sk-tenant" not in repr(first)
+    assert first.status == BudgetStatus.OK
+
+    clock.now += 61
+    assert (await cache.get(db, tenant.id)) is not first
+
+
+@pytest.mark.asyncio
+async def test_crossing_a_threshold_drops_the_snapshot(db, tenant):
+    cache = AdmissionCache(ttl_seconds=60, max_clients=4)
+    await cache.get(db, tenant.id)
+
+    cache.note_spend(tenant.id, Decimal("2"))
+    assert cache.peek(tenant.id).spent == Decimal("2")
+
+    cache.note_spend(tenant.id, Decimal("8.5"))  # past the 80% alert threshold
+    assert cache.peek(tenant.id) is None
+
+    cache.invalidate(tenant.id)
+    assert (await cache.get(db, tenant.id)).status == BudgetStatus.OK  # ledger is empty
+
+
+@pytest.mark.asyncio
+async def test_tenant_without_budget_has_no_budget_settings(db):
+    tenant = Tenant(id=uuid4(), name="NoBudget", plan="not-a-tier")
+    db.add(tenant)
+    await db.flush()
+
+    snapshot = await AdmissionCache(ttl_seconds=60, max_clients=4).get(db, tenant.id)
+
+    assert snapshot.budget is None
+    assert snapshot.tier == "free"
+    assert snapshot.status == BudgetStatus.OK
+
+
+def test_byok_clients_are_reused_and_bounded():
+    cache = AdmissionCache(ttl_seconds=60, max_clients=2)
+    with patch("app.shared.llm.factory.LLMFactory.create", side_effect=lambda *a, **k: MagicMock()) as create:
+        first = cache.client("openai", "gpt-4o", "key-a")
+        assert cache.client("openai", "gpt-4o", "key-a") is first
+        cache.client("openai", "gpt-4o", "key-b")
+        cache.client("groq", "llama-3.3-70b-versatile", None)
+
+        assert create.call_count == 3
+        assert cache.client("openai", "gpt-4o", "key-a") is not first  # evicted
@@ -135,7 +135,7 @@ async def test_analyze_flow_success(mock_llm, usage_summary, mock_db, mock_forec
     with patch.object(FinOpsAnalyzer, '_load_system_prompt', return_value="System prompt"):
         analyzer = FinOpsAnalyzer(mock_llm, mock_db)
     
-    with patch("app.shared.llm.analyzer.SymbolicForecaster", side_effect=lambda *args: mock_forecaster):
+    with patch("app.shared.analysis.forecast_store.SymbolicForecaster", side_effect=lambda *args: mock_forecaster):
         mock_cache = MagicMock()
         mock_cache.get_analysis = AsyncMock(return_value=None)
         mock_cache.set_analysis = AsyncMock() 
@@ -191,7 +191,7 @@ async def test_llm_invocation_primary_failure_fallback(mock_llm_factory, usage_s
     mock_tracker.check_budget = AsyncMock(return_value="ok")
 
     with patch("app.shared.llm.analyzer.get_cache_service", return_value=mock_cache), \
-         patch("app.shared.llm.analyzer.LLMFactory.create", return_value=fallback_llm) as mock_factory, \
+         patch("app.shared.llm.factory.LLMFactory.create", return_value=fallback_llm) as mock_factory, \
          patch("app.shared.llm.analyzer.LLMGuardrails", new=MockGuardrails), \
          patch("app.shared.llm.analyzer.UsageTracker", return_value=mock_tracker), \
          patch("app.shared.llm.analyzer.get_settings") as mock_settings, \
@@ -208,7 +208,7 @@ async def test_llm_invocation_primary_failure_fallback(mock_llm_factory, usage_s
 async def test_process_results_fallback(mock_llm, mock_db, mock_forecaster):
     analyzer = FinOpsAnalyzer(mock_llm, mock_db)
     
-    with patch("app.shared.llm.analyzer.SymbolicForecaster", side_effect=lambda *args: mock_forecaster):
+    with patch("app.shared.analysis.forecast_store.SymbolicForecaster", side_effect=lambda *args: mock_forecaster):
         class MockGuardrailsFail:
             @classmethod
             def validate_output(cls, output, schema):
@@ -0,0 +1,182 @@
+"""
+Tests for BatchAnalysisPipeline - per-tenant prefetching under RLS context,
+client reuse, per-provider concurrency and bulk usage recording across a
+tenant cohort.
+"""
+import asyncio
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.shared.core.exceptions import BudgetExceededError
+from app.shared.llm.batch_analysis import BatchAnalysisPipeline, BatchItem
+from app.shared.llm.budget_manager import LLMBudgetManager
+
+MODULE = "app.shared.llm.batch_analysis"
+
+
+def _budget(limit="10", hard_limit=True):
+    return SimpleNamespace(
+        monthly_limit_usd=Decimal(limit),
+        alert_threshold_percent=Decimal("80"),
+        hard_limit=hard_limit,
+        preferred_provider="groq",
+        preferred_model="llama-3.3-70b-versatile",
+    )
+
+
+def _analyzer(invoke):
+    analyzer = MagicMock()
+    analyzer.llm = MagicMock(model_name="llama-3.3-70b-versatile")
+    analyzer.prompt_version = "v1"
+    analyzer._check_cache_and_delta = AsyncMock(return_value=(None, False))
+    analyzer._resolve_provider_and_model = MagicMock(return_value=("groq", "llama-3.3-70b-versatile", "byok"))
+    analyzer._invoke_llm = invoke
+    analyzer._is_json_response = MagicMock(return_value=True)
+    analyzer._process_analysis_results = AsyncMock(side_effect=lambda content, tenant_id, summary, **kwargs: {"content": content})
+    return analyzer
+
+
+@pytest.fixture
+def pipeline_deps():
+    manager = MagicMock()
+    manager.get_budgets = AsyncMock()
+    manager.classify_budget = LLMBudgetManager.classify_budget
+    manager.check_and_reserve = AsyncMock()
+    manager.release_reservation = AsyncMock()
+    manager.record_usage_bulk = AsyncMock()
+    ledger = MagicMock()
+    ledger.get_balances = AsyncMock()
+    compactor = MagicMock()
+    compactor.return_value.compact.side_effect = lambda summary: ({"summary": summary}, SimpleNamespace(final_tokens=100))
+    factory = MagicMock()
+    factory.create.side_effect = lambda *a, **k: MagicMock()
+    contexts = []
+
+    async def set_tenant(db, tenant_id):
+        db.info["rls_tenant_id"] = tenant_id
+        contexts.append(tenant_id)
+
+    with patch(f"{MODULE}.LLMBudgetManager", manager), \
+         patch("app.shared.db.session.set_session_tenant_id", set_tenant), \
+         patch(f"{MODULE}.SpendLedger", ledger), \
+         patch(f"{MODULE}.PromptCompactor", compactor), \
+         patch(f"{MODULE}.LLMFactory", factory), \
+         patch(f"{MODULE}.LLMGuardrails.sanitize_input", AsyncMock(side_effect=lambda data: dict(data))), \
+         patch("app.shared.analysis.forecaster.SymbolicForecaster.forecast", AsyncMock(return_value={})), \
+         patch(f"{MODULE}.get_llm_response_cache", return_value=None):
+        yield SimpleNamespace(manager=manager, ledger=ledger, factory=factory, contexts=contexts)
+
+
+def _db():
+    db = MagicMock()
+    db.info = {}
+    return db
+
+
+def _balances(spent="0"):
+    return lambda db, tenant_ids: {t: SimpleNamespace(spent=Decimal(spent)) for t in tenant_ids}
+
+
+@pytest.mark.asyncio
+async def test_cohort_reads_and_writes_each_tenant_under_its_rls_context(pipeline_deps):
+    tenants = [uuid4() for _ in range(5)]
+    db = _db()
+    seen = []
+
+    async def get_budgets(session, tenant_ids):
+        seen.append(("budgets", session.info["rls_tenant_id"], set(tenant_ids)))
+        return {t: _budget() for t in tenant_ids}
+
+    async def record_usage_bulk(session, entries, budgets):
+        seen.append(("usage", session.info["rls_tenant_id"], {e.tenant_id for e in entries}))
+
+    pipeline_deps.manager.get_budgets.side_effect = get_budgets
+    pipeline_deps.manager.record_usage_bulk.side_effect = record_usage_bulk
+    pipeline_deps.ledger.get_balances.side_effect = _balances(spent="1")
+    invoke = AsyncMock(return_value=('{"ok": true}', {"token_usage": {"prompt_tokens": 10, "completion_tokens": 5}}))
+    pipeline = BatchAnalysisPipeline(_analyzer(invoke), db, concurrency_per_provider=2)
+
+    outcomes = await pipeline.run([BatchItem(t, MagicMock(records=[])) for t in tenants])
+
+    assert all(o.ok for o in outcomes)
+    # Each tenant's budget read and usage write only ever touch that tenant's rows
+    assert [entry for entry in seen if entry[0] == "budgets"] == [("budgets", t, {t}) for t in tenants]
+    assert [entry for entry in seen if entry[0] == "usage"] == [("usage", t, {t}) for t in tenants]
+    assert "rls_tenant_id" not in db.info
+    # Every tenant resolved to the same BYOK provider/model/key: one client
+    assert pipeline_deps.factory.create.call_count == 1
+    pipeline_deps.manager.release_reservation.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_usage_is_recorded_for_the_provider_that_served_the_call(pipeline_deps):
+    tenant = uuid4()
+    pipeline_deps.manager.get_budgets.return_value = {}
+    pipeline_deps.ledger.get_balances.side_effect = _balances()
+    invoke = AsyncMock(return_value=('{"ok": true}', {"served_provider": "openai", "served_model": "gpt-4o-mini"}))
+    pipeline = BatchAnalysisPipeline(_analyzer(invoke), _db())
+
+    await pipeline.run([BatchItem(tenant, MagicMock(records=[]))])
+
+    [entry] = pipeline_deps.manager.record_usage_bulk.await_args.args[1]
+    assert (entry.provider, entry.model) == ("openai", "gpt-4o-mini")
+
+
+@pytest.mark.asyncio
+async def test_invocations_are_bounded_per_provider(pipeline_deps):
+    tenants = [uuid4() for _ in range(6)]
+    pipeline_deps.manager.get_budgets.return_value = {}
+    pipeline_deps.ledger.get_balances.side_effect = _balances()
+    in_flight, peak = 0, 0
+
+    async def invoke(*args, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return '{"ok": true}', {}
+
+    pipeline = BatchAnalysisPipeline(_analyzer(invoke), _db(), concurrency_per_provider=2)
+    outcomes = await pipeline.run([BatchItem(t, MagicMock(records=[])) for t in tenants])
+
+    assert all(o.ok for o in outcomes)
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_hard_limit_and_invoke_failures_are_isolated(pipeline_deps):
+    over, failing, ok = uuid4(), uuid4(), uuid4()
+    pipeline_deps.manager.get_budgets.side_effect = lambda db, tenant_ids: (
+        {over: _budget(limit="1")} if over in tenant_ids else {}
+    )
+    pipeline_deps.ledger.get_balances.side_effect = lambda db, tenant_ids: {
+        t: SimpleNamespace(spent=Decimal("5" if t == over else "0")) for t in tenant_ids
+    }
+
+    async def invoke(formatted_data, *args, **kwargs):
+        if str(failing) in formatted_data:
+            raise RuntimeError("provider down")
+        return '{"ok": true}', {}
+
+    analyzer = _analyzer(invoke)
+    pipeline = BatchAnalysisPipeline(analyzer, _db(), concurrency_per_provider=2)
+    outcomes = await pipeline.run([
+        BatchItem(over, MagicMock(records=[])),
+        BatchItem(failing, SimpleNamespace(records=[], tenant=str(failing))),
+        BatchItem(ok, MagicMock(records=[])),
+    ])
+
+    by_tenant = {o.tenant_id: o for o in outcomes}
+    assert isinstance(by_tenant[over].error, BudgetExceededError)
+    assert isinstance(by_tenant[failing].error, RuntimeError)
+    assert by_tenant[ok].ok and by_tenant[ok].result == {"content": '{"ok": true}'}
+    # The failed call's reservation is returned; only the successful one is recorded
+    pipeline_deps.manager.release_reservation.assert_awaited_once()
+    assert pipeline_deps.manager.release_reservation.await_args.args[0] == failing
+    entries = pipeline_deps.manager.record_usage_bulk.await_args.args[1]
+    assert [e.tenant_id for e in entries] == [ok]
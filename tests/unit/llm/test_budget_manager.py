@@ -35,6 +35,9 @@ class LLMUsage(Base):
     operation_id = Column(String)
     request_type = Column(String)
 
+# Load the real ledger module before app.models.llm is mocked below
+from app.shared.llm.spend_ledger import LedgerBalance, Reservation  # noqa: E402
+
 class mock_tier(Enum):
     FREE = "free"
     PRO = "pro"
@@ -78,13 +81,20 @@ def mock_db():
 def tenant_id():
     return uuid4()
 
+@pytest.fixture
+def mock_ledger():
+    with patch("app.shared.llm.budget_manager.SpendLedger") as ledger:
+        ledger.settle = AsyncMock(return_value=LedgerBalance(Decimal("1.00"), Decimal("0")))
+        ledger.get_balance = AsyncMock(return_value=LedgerBalance(Decimal("1.00"), Decimal("0")))
+        yield ledger
+
 def test_estimate_cost():
     cost = LLMBudgetManager.estimate_cost(500, 500, "gpt-4o")
     assert isinstance(cost, Decimal)
     assert cost == Decimal("0.0062")
 
 @pytest.mark.asyncio
-async def test_check_and_reserve_success(mock_db, tenant_id):
+async def test_check_and_reserve_success(mock_db, tenant_id, mock_ledger):
     budget = LLMBudget(
         tenant_id=tenant_id,
         monthly_limit_usd=Decimal("10.00"),
@@ -92,11 +102,13 @@ async def test_check_and_reserve_success(mock_db, tenant_id):
     )
     mock_result = MagicMock()
     mock_result.scalar_one_or_none.return_value = budget
-    mock_usage_result = MagicMock()
-    mock_usage_result.scalar.return_value = Decimal("1.00")
-    mock_db.execute.side_effect = [mock_result, mock_usage_result]
-    reserved = await LLMBudgetManager.check_and_reserve(tenant_id, mock_db, model="gpt-4o")
+    mock_db.execute.return_value = mock_result
+    mock_ledger.reserve = AsyncMock(return_value=Reservation(True, LedgerBalance(Decimal("1.00"), Decimal("0.0062"))))
+    reserved = await LLMBudgetManager.check_and_reserve(tenant_id, mock_db, model="gpt-4o", operation_id="op-1")
     assert reserved == Decimal("0.0062")
+    mock_ledger.reserve.assert_awaited_once_with(
+        mock_db, tenant_id, Decimal("0.0062"), Decimal("10.00"), operation_id="op-1"
+    )
 
 @pytest.mark.asyncio
 async def test_check_and_reserve_no_budget(mock_db, tenant_id):
@@ -107,32 +119,31 @@ async def test_check_and_reserve_no_budget(mock_db, tenant_id):
         await LLMBudgetManager.check_and_reserve(tenant_id, mock_db)
 
 @pytest.mark.asyncio
-async def test_check_and_reserve_exceeded(mock_db, tenant_id):
+async def test_check_and_reserve_exceeded(mock_db, tenant_id, mock_ledger):
     budget = LLMBudget(
         tenant_id=tenant_id,
         monthly_limit_usd=Decimal("0.01")
     )
     mock_result = MagicMock()
     mock_result.scalar_one_or_none.return_value = budget
-    mock_usage_result = MagicMock()
-    mock_usage_result.scalar.return_value = Decimal("0.009")
-    mock_db.execute.side_effect = [mock_result, mock_usage_result]
-    with pytest.raises(BudgetExceededError):
+    mock_db.execute.return_value = mock_result
+    mock_ledger.reserve = AsyncMock(return_value=Reservation(False, LedgerBalance(Decimal("0.009"), Decimal("0"))))
+    with pytest.raises(BudgetExceededError) as exc:
         await LLMBudgetManager.check_and_reserve(tenant_id, mock_db, model="gpt-4o")
+    assert exc.value.details["current_usage"] == 0.009
 
 @pytest.mark.asyncio
-async def test_record_usage_success(mock_db, tenant_id):
+async def test_record_usage_success(mock_db, tenant_id, mock_ledger):
     # Mock result for _check_budget_and_alert
     budget = LLMBudget(tenant_id=tenant_id, monthly_limit_usd=Decimal("10.00"), alert_threshold_percent=80, alert_sent_at=None)
     mock_result = MagicMock()
     mock_result.scalar_one_or_none.return_value = budget
     mock_usage_result = MagicMock()
     mock_usage_result.scalar.return_value = Decimal("1.00")
-    # record_usage does: 
+    # record_usage does:
     # 1. get_tenant_tier (mocked)
-    # 2. _check_budget_and_alert: 
-    #    - query budget
-    #    - query sum usage
+    # 2. SpendLedger.settle (mocked)
+    # 3. _check_budget_and_alert: query budget
     mock_db.execute.side_effect = [mock_result, mock_usage_result]
 
     await LLMBudgetManager.record_usage(
@@ -144,9 +155,10 @@ async def test_record_usage_success(mock_db, tenant_id):
     )
     assert mock_db.add.called
     assert mock_db.flush.called
+    mock_ledger.settle.assert_awaited_once()
 
 @pytest.mark.asyncio
-async def test_record_usage_explicit_cost(mock_db, tenant_id):
+async def test_record_usage_explicit_cost(mock_db, tenant_id, mock_ledger):
     budget = LLMBudget(tenant_id=tenant_id, monthly_limit_usd=Decimal("10.00"), alert_threshold_percent=80, alert_sent_at=None)
     mock_result = MagicMock()
     mock_result.scalar_one_or_none.return_value = budget
@@ -2,12 +2,6 @@ import pytest
 import json
 from unittest.mock import MagicMock, patch, AsyncMock
 from uuid import uuid4
-import sys
-
-# Mocks MUST be set up before importing the module under test
-sys.modules["pandas"] = MagicMock()
-sys.modules["numpy"] = MagicMock()
-sys.modules["prophet"] = MagicMock()
 
 from app.shared.llm.factory import LLMFactory, AnalysisComplexity
 from langchain_core.language_models.chat_models import BaseChatModel
@@ -55,20 +49,23 @@ def test_select_provider_byok(mock_settings):
 def test_select_provider_waterfall_simple(mock_settings):
     mock_settings.return_value.GROQ_API_KEY = "gsk-..."
     # SIMPLE => Groq preferred
-    prov, _ = LLMFactory.select_provider("a" * 400) # 100 tokens
+    with patch("app.shared.llm.tokenizer.count_tokens", return_value=100):
+        prov, _ = LLMFactory.select_provider("a" * 400)
     assert prov == "groq"
 
 def test_select_provider_waterfall_medium(mock_settings):
     mock_settings.return_value.GROQ_API_KEY = None
     mock_settings.return_value.GOOGLE_API_KEY = "g-key"
     # MEDIUM => Google preferred if Groq missing
-    prov, _ = LLMFactory.select_provider("a" * 8000) # 2000 tokens
+    with patch("app.shared.llm.tokenizer.count_tokens", return_value=2000):
+        prov, _ = LLMFactory.select_provider("a" * 8000)
     assert prov == "google"
 
 def test_select_provider_waterfall_complex(mock_settings):
     mock_settings.return_value.OPENAI_API_KEY = "sk-..."
     # COMPLEX => OpenAI preferred
-    prov, _ = LLMFactory.select_provider("a" * 20000) # 5000 tokens
+    with patch("app.shared.llm.tokenizer.count_tokens", return_value=5000):
+        prov, _ = LLMFactory.select_provider("a" * 20000)
     assert prov == "openai"
 
 def test_estimate_cost():
@@ -75,3 +75,45 @@ async def test_sanitize_input_nested_injection():
         assert res["user_query"] == "[REDACTED]"
         assert res["metadata"][1] == "[REDACTED]"
         assert res["metadata"][0] == "safe"
+
+@pytest.mark.asyncio
+async def test_rule_hits_are_counted_per_rule():
+    before = LLMGuardrails.rule_hits()
+    await LLMGuardrails.sanitize_input({"a": "please jailbreak", "b": ["Bypass it", "safe"]})
+    after = LLMGuardrails.rule_hits()
+    assert after.get("jailbreak", 0) - before.get("jailbreak", 0) == 1
+    assert after.get("bypass", 0) - before.get("bypass", 0) == 1
+
+@pytest.mark.asyncio
+async def test_repeated_strings_are_scanned_once():
+    payload = {"records": [{"service": "Amazon EC2", "note": "Dan mode"} for _ in range(50)]}
+    with patch("app.shared.llm.guardrails.AdversarialArbiter.is_adversarial", new=AsyncMock(return_value=False)) as arb:
+        res = await LLMGuardrails.sanitize_input(payload)
+    # "Dan mode" is a direct rule hit; "Amazon EC2" is clean
+    assert all(r["note"] == "[REDACTED]" for r in res["records"])
+    assert all(r["service"] == "Amazon EC2" for r in res["records"])
+    arb.assert_not_awaited()
+
+@pytest.mark.asyncio
+async def test_sanitize_scales_linearly_with_payload_size():
+    import time
+
+    def payload(n):
+        return {"records": [
+            {"service": f"svc-{i}", "region": f"us-east-{i % 4}", "cost": i * 1.5, "tags": [f"team-{i}", "prod"]}
+            for i in range(n)
+        ]}
+
+    small, large = payload(5_000), payload(40_000)
+    await LLMGuardrails.sanitize_input(payload(100))  # warm up compiled engine
+
+    start = time.perf_counter()
+    await LLMGuardrails.sanitize_input(small)
+    t_small = time.perf_counter() - start
+    start = time.perf_counter()
+    await LLMGuardrails.sanitize_input(large)
+    t_large = time.perf_counter() - start
+
+    # 8x the data: linear scaling stays well under a quadratic 64x
+    assert t_large < t_small * 20, f"5k: {t_small:.3f}s, 40k: {t_large:.3f}s"
+    assert t_large < 5.0
@@ -0,0 +1,84 @@
+"""
+Tests for PromptCompactor - token-budgeted cost summary compaction
+"""
+import random
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from app.schemas.costs import CloudUsageSummary, CostRecord
+from app.shared.llm.prompt_compaction import PromptCompactor, render
+
+
+def _count(text: str, model: str) -> int:
+    return len(text) // 4
+
+
+def _summary(n_services: int, days: int = 14, spike: str = None) -> CloudUsageSummary:
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    records = []
+    for d in range(days):
+        for s in range(n_services):
+            amount = Decimal(str(100 / (s + 1)))
+            if spike == f"svc-{s}" and d == days - 1:
+                amount *= 5
+            for region in ("us-east-1", "eu-west-1"):
+                records.append(CostRecord(
+                    date=start + timedelta(days=d),
+                    amount=amount,
+                    service=f"svc-{s}",
+                    region=region,
+                    usage_type=f"usage-{s % 3}",
+                ))
+    return CloudUsageSummary(
+        tenant_id="t-1",
+        provider="aws",
+        start_date=date(2026, 1, 1),
+        end_date=date(2026, 1, days),
+        total_cost=sum((r.amount for r in records), Decimal("0")),
+        records=records,
+        by_region={"us-east-1": Decimal("10"), "eu-west-1": Decimal("10")},
+    )
+
+
+def test_small_summary_is_kept_whole():
+    payload, report = PromptCompactor(6000, count_tokens=_count).compact(_summary(3, days=5))
+    assert report.services_kept == report.services_total == 3
+    assert report.aggregated_cost == 0
+    assert payload["long_tail"]["services"] == 0
+    assert len(payload["daily_totals"]) == 5
+
+
+def test_large_summary_fits_budget_and_reports_dropped():
+    summary = _summary(200)
+    payload, report = PromptCompactor(2000, count_tokens=_count).compact(summary)
+
+    assert report.within_budget
+    assert report.final_tokens < report.original_tokens
+    assert report.records_in == len(summary.records)
+    assert report.services_kept < report.services_total
+    assert payload["long_tail"]["services"] == report.services_total - report.services_kept
+    # Kept + aggregated cost adds back up to the total
+    kept = sum(s["cost"] for s in payload["top_services"])
+    assert abs(kept + payload["long_tail"]["services_cost"] - float(summary.total_cost)) < 0.01
+    assert 0 < report.aggregated_cost_share < 1
+
+
+def test_identical_inputs_render_identically():
+    a = _summary(40)
+    b = a.model_copy(update={"records": random.Random(7).sample(a.records, len(a.records))})
+    compactor = PromptCompactor(1500, count_tokens=_count)
+    assert render(compactor.compact(a)[0]) == render(compactor.compact(b)[0])
+
+
+def test_top_services_are_ordered_by_cost():
+    payload, _ = PromptCompactor(6000, count_tokens=_count).compact(_summary(10))
+    costs = [s["cost"] for s in payload["top_services"]]
+    assert costs == sorted(costs, reverse=True)
+    assert payload["top_services"][0]["service"] == "svc-0"
+
+
+def test_change_highlights_flag_latest_day_spike():
+    payload, _ = PromptCompactor(6000, count_tokens=_count).compact(_summary(5, spike="svc-2"))
+    highlights = payload["change_highlights"]
+    assert [h["service"] for h in highlights] == ["svc-2"]
+    assert highlights[0]["change_pct"] == 400.0
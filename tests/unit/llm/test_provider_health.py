@@ -0,0 +1,129 @@
+"""
+Tests for ProviderHealth - shared LLM circuit breaker and health-aware routing
+"""
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from app.shared.llm.analyzer import FinOpsAnalyzer
+from app.shared.llm.circuit_breaker import CircuitState
+from app.shared.llm.provider_health import ProviderHealth
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _health(redis=None, clock=None):
+    return ProviderHealth(
+        window_seconds=60, error_rate_threshold=0.5, min_requests=4, recovery_seconds=30,
+        redis=redis, clock=clock or Clock(),
+    )
+
+
+async def _fail(health, provider, times):
+    for _ in range(times):
+        await health.record(provider, ok=False, latency=0.1)
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_on_error_rate_after_min_requests():
+    health = _health()
+    await health.record("groq", ok=True, latency=0.2)
+    await _fail(health, "groq", 2)
+    assert await health.allow("groq")  # 3 requests: below min_requests
+
+    await _fail(health, "groq", 1)
+
+    assert (await health.stats("groq")).state == CircuitState.OPEN
+    assert not await health.allow("groq")
+    assert await health.allow("openai")
+
+
+@pytest.mark.asyncio
+async def test_half_open_admits_one_probe_across_workers():
+    redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    clock = Clock()
+    worker_a, worker_b = _health(redis, clock), _health(redis, clock)
+    await _fail(worker_a, "groq", 4)
+    assert not await worker_b.allow("groq")  # open state is shared
+
+    clock.now += 31
+    admitted = [await worker_a.allow("groq"), await worker_b.allow("groq")]
+
+    assert admitted == [True, False]
+    await worker_a.record("groq", ok=True, latency=0.3)
+    assert (await worker_b.stats("groq")).state == CircuitState.CLOSED
+    assert await worker_b.allow("groq")
+
+
+@pytest.mark.asyncio
+async def test_failed_probe_reopens_circuit():
+    clock = Clock()
+    health = _health(clock=clock)
+    await _fail(health, "groq", 4)
+    clock.now += 31
+    assert await health.allow("groq")
+
+    await health.record("groq", ok=False, latency=5.0)
+
+    assert (await health.stats("groq")).state == CircuitState.OPEN
+    assert not await health.allow("groq")
+
+
+@pytest.mark.asyncio
+async def test_fallbacks_ordered_by_latency_and_price():
+    health = _health()
+    await health.record("groq", ok=True, latency=4.0)
+    await health.record("openai", ok=True, latency=0.5)
+    await health.record("anthropic", ok=True, latency=0.4)
+
+    route = health.route("google", "gemini-2.0-flash")
+
+    assert route[0] == ("google", "gemini-2.0-flash")
+    # openai: 2nd fastest + cheapest beats anthropic (fastest, priciest) and groq (slowest)
+    assert [p for p, _ in route[1:]] == ["openai", "anthropic", "groq"]
+
+
+@pytest.mark.asyncio
+async def test_store_errors_fall_back_to_process_state():
+    broken = MagicMock()
+    broken.hgetall.side_effect = ConnectionError("down")
+    broken.pipeline.side_effect = ConnectionError("down")
+    health = _health(redis=broken)
+
+    await _fail(health, "groq", 4)
+
+    assert not await health.allow("groq")
+
+
+@pytest.mark.asyncio
+async def test_analyzer_skips_open_primary_without_calling_it():
+    calls = []
+
+    def _llm(name):
+        async def _ainvoke(input, config=None, **kwargs):
+            calls.append(name)
+            return MagicMock(content="{}", response_metadata={})
+        return RunnableLambda(_ainvoke)
+
+    with patch.object(FinOpsAnalyzer, "_load_system_prompt", return_value="System"):
+        analyzer = FinOpsAnalyzer(_llm("groq"))
+
+    with patch("app.shared.llm.analyzer.get_provider_health", return_value=_health()) as get_health, \
+         patch("app.shared.llm.factory.LLMFactory.create", side_effect=lambda p, model=None, **kwargs: _llm(p)), \
+         patch("app.shared.llm.analyzer.get_settings") as mock_settings:
+        mock_settings.return_value.LLM_PROVIDER = "groq"
+        await _fail(get_health.return_value, "groq", 4)
+
+        content, _ = await analyzer._invoke_llm("{}", "groq", "llama-3.3-70b-versatile", None)
+
+    assert content == "{}"
+    assert calls and "groq" not in calls
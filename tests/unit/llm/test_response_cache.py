@@ -0,0 +1,84 @@
+"""
+Tests for LLMResponseCache - content-addressed, tenant-scoped LLM response reuse
+"""
+import pytest
+
+from app.shared.llm.response_cache import (
+    InMemoryResponseBackend,
+    LLMResponseCache,
+    RedisResponseBackend,
+    prompt_version,
+)
+
+fakeredis = pytest.importorskip("fakeredis")
+
+VERSION = prompt_version("system", "user {cost_data}")
+
+
+def _cache(backend=None, max_entries=3):
+    return LLMResponseCache(backend or InMemoryResponseBackend(), ttl_seconds=60, max_entries=max_entries)
+
+
+def test_key_ignores_whitespace_but_not_model_or_version():
+    key = LLMResponseCache.key('{"a": 1,\n  "b": 2}', "groq", "llama", VERSION)
+    assert key == LLMResponseCache.key('{"a": 1, "b": 2}', "GROQ", "llama", VERSION)
+    assert key != LLMResponseCache.key('{"a": 1, "b": 2}', "groq", "llama-2", VERSION)
+    assert key != LLMResponseCache.key('{"a": 1, "b": 2}', "groq", "llama", prompt_version("system v2", "user"))
+
+
+@pytest.mark.asyncio
+async def test_hit_miss_and_tenant_isolation():
+    cache = _cache()
+    key = cache.key("prompt", "openai", "gpt-4o", VERSION)
+
+    assert await cache.get("tenant-a", key) is None
+    await cache.set("tenant-a", key, {"content": "{}"})
+
+    assert await cache.get("tenant-a", key) == {"content": "{}"}
+    assert await cache.get("tenant-b", key) is None
+
+
+@pytest.mark.asyncio
+async def test_oldest_entries_evicted_past_cap():
+    cache = _cache(max_entries=2)
+    for i in range(3):
+        await cache.set("t", f"k{i}", {"content": str(i)})
+
+    assert await cache.get("t", "k0") is None
+    assert await cache.get("t", "k2") == {"content": "2"}
+
+
+@pytest.mark.asyncio
+async def test_invalidate_one_tenant_or_all():
+    cache = _cache()
+    await cache.set("a", "k", {"content": "1"})
+    await cache.set("b", "k", {"content": "2"})
+
+    assert await cache.invalidate("a") == 1
+    assert await cache.get("a", "k") is None
+    assert await cache.get("b", "k") is not None
+    assert await cache.invalidate() == 1
+    assert await cache.get("b", "k") is None
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_evicts_and_invalidates():
+    redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    cache = _cache(RedisResponseBackend(redis), max_entries=2)
+    for i in range(3):
+        await cache.set("t", f"k{i}", {"content": str(i)})
+
+    assert await cache.get("t", "k0") is None
+    assert await cache.get("t", "k1") == {"content": "1"}
+    assert await cache.invalidate() == 2
+    assert await cache.get("t", "k2") is None
+
+
+@pytest.mark.asyncio
+async def test_backend_errors_degrade_to_miss():
+    class Broken(InMemoryResponseBackend):
+        async def get(self, scope, key):
+            raise ConnectionError("down")
+
+    cache = _cache(Broken())
+    assert await cache.get("t", "k") is None
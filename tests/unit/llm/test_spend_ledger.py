@@ -0,0 +1,211 @@
+"""
+Tests for SpendLedger - atomic monthly LLM spend, reservation expiry and reconcile.
+
+Runs against a temporary SQLite database so the conditional UPDATE and upserts execute for real.
+"""
+import asyncio
+from unittest.mock import AsyncMock, patch
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models.llm import LLMBudgetReservation, LLMSpendLedger, LLMUsage
+from app.models.tenant import Tenant
+from app.shared.llm.spend_ledger import SpendLedger, period_start
+
+pytest.importorskip("aiosqlite")
+
+TABLES = [Tenant.__table__, LLMUsage.__table__, LLMSpendLedger.__table__, LLMBudgetReservation.__table__]
+
+
+@pytest_asyncio.fixture
+async def session_maker(tmp_path):
+    # File-backed so concurrent sessions get their own connections
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'ledger.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda c: LLMUsage.metadata.create_all(c, tables=TABLES))
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def db(session_maker):
+    async with session_maker() as session:
+        yield session
+
+
+def _usage(tenant_id, cost, created_at=None):
+    return LLMUsage(
+        tenant_id=tenant_id,
+        provider="groq",
+        model="llama-3.3-70b-versatile",
+        input_tokens=100,
+        output_tokens=100,
+        total_tokens=200,
+        cost_usd=Decimal(cost),
+        created_at=created_at or datetime.now(timezone.utc),
+    )
+
+
+@pytest.mark.asyncio
+async def test_first_read_seeds_from_current_month_usage(db):
+    tenant_id = uuid4()
+    last_month = datetime.now(timezone.utc).replace(day=1) - timedelta(days=3)
+    db.add_all([_usage(tenant_id, "1.25"), _usage(tenant_id, "0.75"), _usage(tenant_id, "9.00", last_month)])
+    await db.flush()
+
+    balance = await SpendLedger.get_balance(db, tenant_id)
+
+    assert balance.spent == Decimal("2.00")
+    assert balance.reserved == Decimal("0")
+    row = (await db.execute(select(LLMSpendLedger))).scalar_one()
+    assert row.period_start == period_start()
+
+
+@pytest.mark.asyncio
+async def test_reserve_then_settle_moves_reservation_into_spent(db):
+    tenant_id = uuid4()
+
+    reservation = await SpendLedger.reserve(db, tenant_id, Decimal("1.00"), Decimal("10"), operation_id="op-1")
+    assert reservation.granted
+    assert reservation.balance.reserved == Decimal("1.00")
+
+    db.add(_usage(tenant_id, "0.40"))
+    await db.flush()
+    balance = await SpendLedger.settle(db, tenant_id, Decimal("0.40"), operation_id="op-1")
+
+    assert balance.spent == Decimal("0.40")
+    assert balance.reserved == Decimal("0")
+    assert (await db.execute(select(LLMBudgetReservation))).first() is None
+
+
+@pytest.mark.asyncio
+async def test_reserve_denied_when_it_would_exceed_limit(db):
+    tenant_id = uuid4()
+    db.add(_usage(tenant_id, "9.50"))
+    await db.flush()
+
+    first = await SpendLedger.reserve(db, tenant_id, Decimal("0.40"), Decimal("10"), operation_id="a")
+    second = await SpendLedger.reserve(db, tenant_id, Decimal("0.40"), Decimal("10"), operation_id="b")
+
+    assert first.granted
+    assert not second.granted
+    assert second.balance.committed == Decimal("9.90")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reservations_never_overcommit(session_maker):
+    tenant_id = uuid4()
+    async with session_maker() as session:
+        await SpendLedger.get_balance(session, tenant_id)
+        await session.commit()
+
+    async def attempt(i):
+        async with session_maker() as session:
+            result = await SpendLedger.reserve(session, tenant_id, Decimal("1"), Decimal("5"), operation_id=f"op-{i}")
+            await session.commit()
+            return result.granted
+
+    granted = await asyncio.gather(*(attempt(i) for i in range(12)))
+
+    assert sum(granted) == 5
+    async with session_maker() as session:
+        assert (await SpendLedger.get_balance(session, tenant_id)).reserved == Decimal("5")
+
+
+@pytest.mark.asyncio
+async def test_expired_reservations_are_released(db):
+    tenant_id = uuid4()
+    await SpendLedger.reserve(db, tenant_id, Decimal("4"), Decimal("5"), operation_id="stale", ttl=timedelta(seconds=-1))
+
+    # The stale reservation no longer counts against the budget
+    reservation = await SpendLedger.reserve(db, tenant_id, Decimal("4"), Decimal("5"), operation_id="fresh")
+
+    assert reservation.granted
+    assert reservation.balance.reserved == Decimal("4")
+
+
+@pytest.mark.asyncio
+async def test_release_returns_reservation(db):
+    tenant_id = uuid4()
+    await SpendLedger.reserve(db, tenant_id, Decimal("2"), Decimal("5"), operation_id="op")
+
+    await SpendLedger.release(db, tenant_id, "op")
+
+    assert (await SpendLedger.get_balance(db, tenant_id)).reserved == Decimal("0")
+
+
+@pytest.mark.asyncio
+async def test_reconcile_rebuilds_drifted_rows(db):
+    tenant_a, tenant_b = uuid4(), uuid4()
+    db.add_all([Tenant(id=tenant_a, name="A"), Tenant(id=tenant_b, name="B")])
+    db.add_all([_usage(tenant_a, "3.00"), _usage(tenant_b, "1.00")])
+    await db.flush()
+    await SpendLedger.get_balance(db, tenant_a)
+    await SpendLedger.reserve(db, tenant_a, Decimal("1"), Decimal("10"), operation_id="live")
+
+    # Simulate drift: usage written without going through the ledger
+    db.add(_usage(tenant_a, "2.00"))
+    await db.flush()
+
+    result = await SpendLedger.reconcile(db)
+
+    assert result["rows"] == 2
+    assert abs(result["drift_usd"] - 2.0) < 1e-9
+    a = await SpendLedger.get_balance(db, tenant_a)
+    b = await SpendLedger.get_balance(db, tenant_b)
+    assert a.spent == Decimal("5.00")
+    assert a.reserved == Decimal("1")
+    assert b.spent == Decimal("1.00")
+
+
+@pytest.mark.asyncio
+async def test_reconcile_runs_each_tenant_under_its_rls_context(db):
+    """Under RLS an unscoped SUM sees nothing; each tenant's rows are read with its own context."""
+    tenants = sorted([uuid4(), uuid4(), uuid4()])
+    db.add_all([Tenant(id=t, name=str(t)) for t in tenants])
+    db.add_all([_usage(t, "1.00") for t in tenants])
+    await db.flush()
+
+    contexts = []
+    rebuilt = []
+    reconcile = SpendLedger.reconcile
+
+    async def scoped(session, period=None, tenant_id=None):
+        if tenant_id is not None:
+            rebuilt.append((contexts[-1], tenant_id))
+        return await reconcile(session, period, tenant_id)
+
+    with patch("app.shared.db.session.set_session_tenant_id",
+               AsyncMock(side_effect=lambda session, tid: contexts.append(tid))), \
+         patch.object(SpendLedger, "reconcile", side_effect=scoped):
+        result = await SpendLedger.reconcile(db)
+
+    assert rebuilt == [(t, t) for t in tenants]
+    assert result["tenants"] == 3 and result["rows"] == 3
+    assert "rls_tenant_id" not in db.info
+
+
+@pytest.mark.asyncio
+async def test_settle_many_settles_each_tenant_in_one_pass(db):
+    first, second = uuid4(), uuid4()
+    await SpendLedger.reserve(db, first, Decimal("1.00"), Decimal("10"), operation_id="a1")
+    await SpendLedger.reserve(db, first, Decimal("1.00"), Decimal("10"), operation_id="a2")
+    await SpendLedger.reserve(db, second, Decimal("1.00"), Decimal("10"), operation_id="b1")
+
+    balances = await SpendLedger.settle_many(db, [
+        (first, Decimal("0.25"), "a1"),
+        (first, Decimal("0.50"), "a2"),
+        (second, Decimal("0.10"), "b1"),
+    ])
+
+    assert balances[first].spent == Decimal("0.75")
+    assert balances[first].reserved == Decimal("0")
+    assert balances[second].spent == Decimal("0.10")
+    assert (await db.execute(select(LLMBudgetReservation))).first() is None
+    assert (await SpendLedger.get_balances(db, [first, second]))[second].spent == Decimal("0.10")
@@ -0,0 +1,201 @@
+"""
+Tests for streaming analysis - incremental JSON parsing and FinOpsAnalyzer.analyze_stream.
+"""
+import json
+from datetime import date
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from app.schemas.costs import CloudUsageSummary
+from app.shared.llm.analyzer import FinOpsAnalyzer
+from app.shared.llm.stream_parser import IncrementalAnalysisParser
+
+RECOMMENDATION = {
+    "action": "Delete idle volume",
+    "resource": "vol-123",
+    "type": "ebs",
+    "estimated_savings": "$12/mo",
+    "priority": "high",
+    "effort": "low",
+    "confidence": "high",
+}
+ANALYSIS = {
+    "insights": ["EC2 spend rose 20%", "S3 is flat"],
+    "recommendations": [RECOMMENDATION],
+    "anomalies": [{"resource": "ec2", "issue": "spike", "cost_impact": "$40", "severity": "low"}],
+    "forecast": {"next_30_days": "$900"},
+}
+
+
+def _feed(parser, text, size):
+    events = []
+    for i in range(0, len(text), size):
+        events.extend(parser.feed(text[i:i + size]))
+    return events
+
+
+@pytest.mark.parametrize("size", [1, 7, 10_000])
+def test_items_are_emitted_as_they_complete(size):
+    parser = IncrementalAnalysisParser()
+    text = "```json\n" + json.dumps(ANALYSIS, indent=2) + "\n```"
+
+    events = _feed(parser, text, size)
+
+    assert [e for e, _ in events] == ["insight", "insight", "recommendation", "anomaly", "forecast"]
+    assert events[0][1] == "EC2 spend rose 20%"
+    assert events[2][1]["resource_type"] == "ebs"
+    assert parser.complete
+    assert parser.result()["forecast"] == {"next_30_days": "$900"}
+
+
+def test_item_is_emitted_before_the_array_closes():
+    parser = IncrementalAnalysisParser()
+
+    events = parser.feed('{"insights": ["first, with \\"quotes\\" and ]", "sec')
+
+    assert events == [("insight", 'first, with "quotes" and ]')]
+    assert parser.feed('ond"]') == [("insight", "second")]
+
+
+def test_invalid_items_are_skipped_and_malformed_tail_keeps_completed_items():
+    parser = IncrementalAnalysisParser()
+    text = '{"insights": ["ok", 42], "recommendations": [{"action": "x"}, ' + json.dumps(RECOMMENDATION) + '], "anomalies": [{"resou'
+
+    events = parser.feed(text)
+
+    assert [e for e, _ in events] == ["insight", "recommendation"]
+    assert parser.invalid_items == 2
+    assert not parser.complete
+    assert parser.has_items()
+
+
+@pytest.mark.asyncio
+async def test_analyze_stream_emits_tokens_items_and_partial_result():
+    # Valid items, then the output is cut off mid-object
+    content = json.dumps(ANALYSIS)[:-40]
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content=content)]))
+    analyzer = FinOpsAnalyzer(llm)
+    summary = CloudUsageSummary(
+        tenant_id="t1", provider="aws", start_date=date(2026, 1, 1), end_date=date(2026, 1, 31),
+        total_cost=Decimal("100"), records=[],
+    )
+    mock_cache = MagicMock(get_analysis=AsyncMock(return_value=None), set_analysis=AsyncMock())
+
+    with patch("app.shared.llm.analyzer.get_cache_service", return_value=mock_cache), \
+         patch("app.shared.llm.analyzer.LLMGuardrails.sanitize_input", AsyncMock(side_effect=lambda d: dict(d))), \
+         patch("app.shared.analysis.forecast_store.SymbolicForecaster.forecast", AsyncMock(return_value={})), \
+         patch("app.shared.llm.analyzer.get_settings") as mock_settings:
+        mock_settings.return_value.LLM_PROVIDER = "groq"
+        mock_settings.return_value.LLM_PROMPT_TOKEN_BUDGET = 6000
+        mock_settings.return_value.ENABLE_DELTA_ANALYSIS = False
+        events = [e async for e in analyzer.analyze_stream(summary, provider="groq", model="llama-3.3-70b-versatile")]
+
+    kinds = [kind for kind, _ in events]
+    assert kinds.count("token") > 1
+    assert "".join(data["text"] for kind, data in events if kind == "token") == content
+    assert kinds.index("insight") < kinds.index("recommendation") < len(kinds) - 1
+    assert kinds[-1] == "result"
+    result = events[-1][1]
+    assert result["insights"] == ANALYSIS["insights"]
+    assert result["recommendations"][0]["resource"] == "vol-123"
+    assert result["llm_raw"]["partial"] is True
+
+
+@pytest.mark.asyncio
+async def test_analyze_stream_records_usage_from_stream_metadata():
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content=json.dumps(ANALYSIS))]))
+    analyzer = FinOpsAnalyzer(llm)
+    analyzer._prepare_prompt = AsyncMock(return_value=("{}", 0.01, "llama-3.3-70b-versatile", {}))
+    analyzer._setup_client_and_usage = AsyncMock(return_value=(None, "groq", "llama-3.3-70b-versatile", None))
+    analyzer._check_cache_and_delta = AsyncMock(return_value=(None, False))
+    analyzer._process_analysis_results = AsyncMock(return_value={"insights": ANALYSIS["insights"]})
+    tenant_id = uuid4()
+
+    async def _stream(*args, **kwargs):
+        yield "token", json.dumps(ANALYSIS)
+        yield "metadata", {"usage_metadata": {"input_tokens": 321, "output_tokens": 54}}
+
+    analyzer._stream_llm = _stream
+    with patch("app.shared.llm.analyzer.LLMBudgetManager") as manager, \
+         patch("app.shared.llm.analyzer.get_llm_response_cache", return_value=None):
+        manager.record_usage = AsyncMock()
+        manager.release_reservation = AsyncMock()
+        events = [e async for e in analyzer.analyze_stream(MagicMock(records=[]), tenant_id=tenant_id, db=MagicMock())]
+
+    assert events[-1] == ("result", {"insights": ANALYSIS["insights"]})
+    kwargs = manager.record_usage.await_args.kwargs
+    assert (kwargs["prompt_tokens"], kwargs["completion_tokens"], kwargs["provider"]) == (321, 54, "groq")
+    manager.release_reservation.assert_not_awaited()
+
+
+def _stream_analyzer(stream):
+    analyzer = FinOpsAnalyzer(GenericFakeChatModel(messages=iter([])))
+    analyzer._prepare_prompt = AsyncMock(return_value=('{"cost": 1}', 0.01, "llama-3.3-70b-versatile", {}))
+    analyzer._setup_client_and_usage = AsyncMock(return_value=(None, "groq", "llama-3.3-70b-versatile", None))
+    analyzer._check_cache_and_delta = AsyncMock(return_value=(None, False))
+    analyzer._stream_llm = stream
+    return analyzer
+
+
+@pytest.mark.asyncio
+async def test_abandoned_stream_bills_generated_tokens_to_the_serving_provider():
+    async def _stream(*args, **kwargs):
+        yield "metadata", {"served_provider": "openai", "served_model": "gpt-4o-mini"}
+        yield "token", '{"insights": ["EC2 spend rose'
+        yield "token", ' 20%"]'
+
+    analyzer = _stream_analyzer(_stream)
+    with patch("app.shared.llm.analyzer.LLMBudgetManager") as manager, \
+         patch("app.shared.llm.analyzer.get_llm_response_cache", return_value=None), \
+         patch("app.shared.llm.analyzer.count_tokens", side_effect=lambda text, model: len(text)):
+        manager.record_usage = AsyncMock()
+        manager.release_reservation = AsyncMock()
+        stream = analyzer.analyze_stream(MagicMock(records=[]), tenant_id=uuid4(), db=MagicMock())
+        assert (await stream.__anext__())[0] == "token"
+        await stream.aclose()  # client disconnected
+
+    manager.release_reservation.assert_not_awaited()
+    kwargs = manager.record_usage.await_args.kwargs
+    assert (kwargs["provider"], kwargs["model"]) == ("openai", "gpt-4o-mini")
+    assert (kwargs["prompt_tokens"], kwargs["completion_tokens"]) == (len('{"cost": 1}'), len('{"insights": ["EC2 spend rose'))
+
+
+@pytest.mark.asyncio
+async def test_stream_that_fails_before_any_token_releases_its_reservation():
+    async def _stream(*args, **kwargs):
+        raise RuntimeError("all providers failed")
+        yield  # pragma: no cover
+
+    analyzer = _stream_analyzer(_stream)
+    with patch("app.shared.llm.analyzer.LLMBudgetManager") as manager, \
+         patch("app.shared.llm.analyzer.get_llm_response_cache", return_value=None):
+        manager.record_usage = AsyncMock()
+        manager.release_reservation = AsyncMock()
+        with pytest.raises(RuntimeError):
+            _ = [e async for e in analyzer.analyze_stream(MagicMock(records=[]), tenant_id=uuid4(), db=MagicMock())]
+
+    manager.release_reservation.assert_awaited_once()
+    manager.record_usage.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_stream_metadata_names_the_provider_that_served_it():
+    analyzer = FinOpsAnalyzer(GenericFakeChatModel(messages=iter([])))
+    fallback = GenericFakeChatModel(messages=iter([AIMessage(content="{}")]))
+
+    async def _candidates(*args, **kwargs):
+        yield "groq", "llama-3.3-70b-versatile", None, RuntimeError("circuit open")
+        yield "openai", "gpt-4o-mini", fallback, None
+
+    analyzer._route_candidates = _candidates
+    with patch("app.shared.llm.analyzer.get_provider_health", return_value=MagicMock(record=AsyncMock())):
+        events = [e async for e in analyzer._stream_llm("{}", "groq", "llama-3.3-70b-versatile", None)]
+
+    served = {"served_provider": "openai", "served_model": "gpt-4o-mini"}
+    assert events[0] == ("metadata", served)
+    assert events[-1][0] == "metadata" and served.items() <= events[-1][1].items()
@@ -0,0 +1,74 @@
+"""
+Tests for TokenizerRegistry - cached encodings, per-provider mapping and bounded counting
+"""
+from unittest.mock import patch
+
+from app.shared.llm.tokenizer import (
+    CharRatioEstimator,
+    EncodingTokenizer,
+    TokenizerRegistry,
+)
+
+
+class WordEncoding:
+    """Stand-in tiktoken encoding: one token per whitespace-separated word."""
+
+    def __init__(self):
+        self.chars_encoded = 0
+
+    def encode(self, text, disallowed_special=()):
+        self.chars_encoded += len(text)
+        return text.split()
+
+
+def test_each_encoding_is_loaded_once():
+    registry = TokenizerRegistry()
+    with patch("tiktoken.get_encoding", return_value=WordEncoding()) as get_encoding:
+        for _ in range(50):
+            assert registry.count("three word text", "gpt-4") == 3
+            registry.count("llama text", "llama-3.3-70b-versatile")
+
+    # gpt-4 and llama-3 share cl100k_base
+    get_encoding.assert_called_once_with("cl100k_base")
+
+
+def test_failed_load_is_remembered_and_falls_back_to_estimate():
+    registry = TokenizerRegistry()
+    with patch("tiktoken.get_encoding", side_effect=OSError("offline")) as get_encoding:
+        assert registry.count("12345678") == 2
+        assert registry.count("12345678") == 2
+
+    assert get_encoding.call_count == 1
+
+
+def test_models_map_to_provider_tokenizers():
+    registry = TokenizerRegistry()
+    with patch("tiktoken.get_encoding", side_effect=lambda name: WordEncoding()):
+        gpt4o = registry.tokenizer_for("gpt-4o-mini")
+        claude = registry.tokenizer_for("claude-3-5-sonnet")
+        gemini = registry.tokenizer_for("gemini-2.0-flash")
+
+    assert isinstance(gpt4o, EncodingTokenizer) and gpt4o.name == "o200k_base"
+    assert isinstance(claude, CharRatioEstimator) and claude.chars_per_token == 3.5
+    assert isinstance(gemini, CharRatioEstimator)
+    assert registry.spec_for("unknown-model").encoding == "cl100k_base"
+    assert registry.context_window("claude-3-opus") == 200_000
+
+
+def test_at_most_stops_encoding_past_the_limit():
+    encoding = WordEncoding()
+    registry = TokenizerRegistry()
+    text = "word " * 200_000
+    with patch("tiktoken.get_encoding", return_value=encoding):
+        assert registry.at_most("short text", 10)
+        assert not registry.at_most(text, 1000)
+
+    assert encoding.chars_encoded < len(text) // 50
+
+
+def test_bounded_count_matches_full_count_within_limit():
+    tokenizer = EncodingTokenizer("cl100k_base", WordEncoding())
+    text = " ".join(f"w{i}" for i in range(5000))
+
+    assert tokenizer.count(text, limit=10_000) == tokenizer.count(text) == 5000
+    assert tokenizer.count(text, limit=100) > 100
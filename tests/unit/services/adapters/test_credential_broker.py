@@ -0,0 +1,124 @@
+"""
+Tests for the process-wide STS Credential Broker
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+
+from app.shared.adapters.credential_broker import STSCredentialBroker
+from app.shared.adapters.aws_multitenant import MultiTenantAWSAdapter
+
+ROLE_ARN = "arn:aws:iam::123456789012:role/ValdrixRole"
+EXTERNAL_ID = "vx-test"
+
+
+def _creds(access_key: str = "ASIA1", ttl: timedelta = timedelta(hours=1)) -> dict:
+    return {
+        "AccessKeyId": access_key,
+        "SecretAccessKey": "secret",
+        "SessionToken": "token",
+        "Expiration": datetime.now(timezone.utc) + ttl,
+    }
+
+
+@pytest.mark.asyncio
+async def test_broker_reuses_credentials_until_refresh_window():
+    broker = STSCredentialBroker(use_redis=False)
+    fetch = AsyncMock(return_value=_creds())
+
+    first = await broker.get_credentials(ROLE_ARN, EXTERNAL_ID, fetch)
+    second = await broker.get_credentials(ROLE_ARN, EXTERNAL_ID, fetch)
+
+    assert first is second
+    fetch.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_broker_refreshes_ahead_of_expiration():
+    broker = STSCredentialBroker(refresh_ahead=timedelta(minutes=5), use_redis=False)
+    # Still valid for 2 minutes, but inside the refresh-ahead window
+    fetch = AsyncMock(side_effect=[_creds("OLD", timedelta(minutes=2)), _creds("NEW")])
+
+    await broker.get_credentials(ROLE_ARN, EXTERNAL_ID, fetch)
+    refreshed = await broker.get_credentials(ROLE_ARN, EXTERNAL_ID, fetch)
+
+    assert refreshed["AccessKeyId"] == "NEW"
+    assert fetch.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_broker_serves_still_valid_credentials_when_refresh_fails():
+    broker = STSCredentialBroker(refresh_ahead=timedelta(minutes=5), use_redis=False)
+    fetch = AsyncMock(side_effect=[_creds("OLD", timedelta(minutes=2)), RuntimeError("sts down")])
+
+    await broker.get_credentials(ROLE_ARN, EXTERNAL_ID, fetch)
+    creds = await broker.get_credentials(ROLE_ARN, EXTERNAL_ID, fetch)
+
+    assert creds["AccessKeyId"] == "OLD"
+
+
+@pytest.mark.asyncio
+async def test_broker_single_flight_on_concurrent_refresh():
+    broker = STSCredentialBroker(use_redis=False)
+
+    async def slow_fetch():
+        await asyncio.sleep(0.01)
+        return _creds()
+
+    fetch = AsyncMock(side_effect=slow_fetch)
+    results = await asyncio.gather(*[
+        broker.get_credentials(ROLE_ARN, EXTERNAL_ID, fetch) for _ in range(20)
+    ])
+
+    fetch.assert_awaited_once()
+    assert all(r is results[0] for r in results)
+
+
+@pytest_asyncio.fixture
+async def fake_redis():
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    yield client
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_broker_shares_encrypted_credentials_across_workers(fake_redis):
+    worker_a = STSCredentialBroker(redis_client=fake_redis)
+    worker_b = STSCredentialBroker(redis_client=fake_redis)
+    fetch_a = AsyncMock(return_value=_creds("SHARED"))
+    fetch_b = AsyncMock(return_value=_creds("UNUSED"))
+
+    await worker_a.get_credentials(ROLE_ARN, EXTERNAL_ID, fetch_a)
+    creds = await worker_b.get_credentials(ROLE_ARN, EXTERNAL_ID, fetch_b)
+
+    assert creds["AccessKeyId"] == "SHARED"
+    fetch_b.assert_not_awaited()
+    # Secrets are never stored in plaintext
+    raw = await fake_redis.get(STSCredentialBroker.cache_key(ROLE_ARN, EXTERNAL_ID))
+    assert "secret" not in raw and "SHARED" not in raw
+
+    await worker_b.invalidate(ROLE_ARN, EXTERNAL_ID)
+    assert not await fake_redis.exists(STSCredentialBroker.cache_key(ROLE_ARN, EXTERNAL_ID))
+
+
+@pytest.mark.asyncio
+async def test_fresh_adapters_share_one_assume_role():
+    """Adapters built per job (CUR, Parquet, scheduler) hit STS only once."""
+    connection = MagicMock()
+    connection.role_arn = ROLE_ARN
+    connection.external_id = EXTERNAL_ID
+
+    mock_sts = AsyncMock()
+    mock_sts.assume_role.return_value = {"Credentials": _creds()}
+
+    for _ in range(5):
+        adapter = MultiTenantAWSAdapter(connection)
+        adapter.session = MagicMock()
+        adapter.session.client.return_value.__aenter__.return_value = mock_sts
+        await adapter.get_credentials()
+
+    mock_sts.assume_role.assert_awaited_once()
@@ -0,0 +1,186 @@
+"""
+Tests for CostIngestionHandler - concurrent per-connection ingestion and checkpoints
+"""
+import asyncio
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.aws_connection import AWSConnection
+from app.models.background_job import BackgroundJob
+from app.modules.governance.domain.jobs.handlers.costs import (
+    CostIngestionHandler,
+    IngestionIncompleteError,
+)
+
+
+class FakeAdapter:
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+
+    async def stream_cost_and_usage(self, start_date, end_date, granularity="DAILY"):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("provider unavailable")
+        yield {"cost_usd": 1.5}
+        yield {"cost_usd": 2.5}
+
+
+class FakePersistence:
+    def __init__(self, db):
+        self.db = db
+
+    async def save_records_stream(self, records, tenant_id, account_id):
+        count = 0
+        async for _ in records:
+            count += 1
+        return {"records_saved": count}
+
+
+def _make_connections(tenant_id, n):
+    conns = []
+    for i in range(n):
+        conn = AWSConnection(
+            id=uuid4(),
+            tenant_id=tenant_id,
+            aws_account_id=f"{i:012d}",
+            role_arn=f"arn:aws:iam::{i:012d}:role/Valdrix",
+            external_id="vx-test",
+        )
+        conns.append(conn)
+    return conns
+
+
+def _make_db(connections):
+    db = MagicMock(spec=AsyncSession)
+    aws_result = MagicMock()
+    aws_result.scalars.return_value.all.return_value = connections
+    empty_result = MagicMock()
+    empty_result.scalars.return_value.all.return_value = []
+    db.execute = AsyncMock(side_effect=[aws_result, empty_result, empty_result, MagicMock()])
+    db.commit = AsyncMock()
+    return db
+
+
+def _session_factory():
+    sessions = []
+
+    def factory():
+        session = MagicMock()
+        session.execute = AsyncMock()
+        session.commit = AsyncMock()
+        session.rollback = AsyncMock()
+        ctx = MagicMock()
+        ctx.__aenter__ = AsyncMock(return_value=session)
+        ctx.__aexit__ = AsyncMock(return_value=False)
+        sessions.append(session)
+        return ctx
+
+    return factory, sessions
+
+
+@pytest.fixture
+def sample_job():
+    job = MagicMock(spec=BackgroundJob)
+    job.id = uuid4()
+    job.tenant_id = uuid4()
+    job.payload = {}
+    return job
+
+
+@pytest.fixture
+def ingestion_patches():
+    with patch("app.shared.db.session.set_session_tenant_id", new=AsyncMock()), \
+         patch("app.modules.reporting.domain.persistence.CostPersistenceService", FakePersistence), \
+         patch("app.modules.reporting.domain.attribution_engine.AttributionEngine") as mock_engine:
+        mock_engine.return_value.apply_rules_to_tenant = AsyncMock()
+        yield mock_engine
+
+
+@pytest.mark.asyncio
+async def test_ingestion_skips_checkpointed_connections(sample_job, ingestion_patches):
+    conns = _make_connections(sample_job.tenant_id, 3)
+    sample_job.payload = {"checkpoint": {"completed_connections": [str(conns[0].id)]}}
+    factory, sessions = _session_factory()
+    handler = CostIngestionHandler(session_factory=factory)
+
+    with patch("app.shared.adapters.factory.AdapterFactory.get_adapter", return_value=FakeAdapter()):
+        result = await handler.execute(sample_job, _make_db(conns))
+
+    assert result["status"] == "completed"
+    assert result["failed_connections"] == []
+    assert len(result["details"]) == 2
+    assert len(sessions) == 2
+    assert set(sample_job.payload["checkpoint"]["completed_connections"]) == {str(c.id) for c in conns}
+    ingestion_patches.return_value.apply_rules_to_tenant.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_ingestion_does_not_checkpoint_failed_connections(sample_job, ingestion_patches):
+    conns = _make_connections(sample_job.tenant_id, 2)
+    factory, sessions = _session_factory()
+    handler = CostIngestionHandler(session_factory=factory)
+
+    def get_adapter(conn):
+        return FakeAdapter(fail=conn is conns[1])
+
+    with patch("app.shared.adapters.factory.AdapterFactory.get_adapter", side_effect=get_adapter):
+        result = await handler.execute(sample_job, _make_db(conns))
+
+    statuses = {d["connection_id"]: d.get("status") for d in result["details"]}
+    assert statuses[str(conns[1].id)] == "failed"
+    assert sample_job.payload["checkpoint"]["completed_connections"] == [str(conns[0].id)]
+    # Partial ingestion is visible on the job result, not just in the logs
+    assert result["status"] == "partial"
+    assert result["connections_failed"] == 1
+    assert result["failed_connections"] == [{
+        "connection_id": str(conns[1].id),
+        "provider": "aws",
+        "status": "failed",
+        "error": "provider unavailable",
+    }]
+    # Failure is recorded on the connection in its own session
+    failed_session = sessions[1]
+    failed_session.rollback.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_ingestion_defers_slow_connections_and_keeps_progress(sample_job, ingestion_patches):
+    conns = _make_connections(sample_job.tenant_id, 4)
+    factory, _ = _session_factory()
+    handler = CostIngestionHandler(session_factory=factory)
+    handler.timeout_seconds = 0.25  # budget = 0.2s
+
+    def get_adapter(conn):
+        return FakeAdapter(delay=5.0 if conn is conns[3] else 0.01)
+
+    with patch("app.shared.adapters.factory.AdapterFactory.get_adapter", side_effect=get_adapter):
+        with pytest.raises(IngestionIncompleteError) as exc:
+            await handler.execute(sample_job, _make_db(conns))
+
+    assert exc.value.details["remaining_connections"] == 1
+    assert set(sample_job.payload["checkpoint"]["completed_connections"]) == {str(c.id) for c in conns[:3]}
+    # Attribution waits until every connection has been ingested
+    ingestion_patches.return_value.apply_rules_to_tenant.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_ingestion_concurrency_benchmark(sample_job, ingestion_patches):
+    """60 connections at 50ms each: sequential would take >= 3s."""
+    n, delay = 60, 0.05
+    conns = _make_connections(sample_job.tenant_id, n)
+    factory, _ = _session_factory()
+    handler = CostIngestionHandler(session_factory=factory)
+
+    with patch("app.shared.adapters.factory.AdapterFactory.get_adapter", return_value=FakeAdapter(delay=delay)):
+        start = time.perf_counter()
+        result = await handler.execute(sample_job, _make_db(conns))
+        elapsed = time.perf_counter() - start
+
+    sequential = n * delay
+    assert result["status"] == "completed"
+    assert len(sample_job.payload["checkpoint"]["completed_connections"]) == n
+    assert elapsed < sequential / 2, f"concurrent ingestion took {elapsed:.2f}s (sequential ~{sequential:.2f}s)"
@@ -236,3 +236,48 @@ async def test_finops_analysis_handler_success(mock_db, sample_job):
                 assert result["status"] == "completed"
                 assert result["analysis_length"] == len("Long analysis text")
                 mock_analyzer.analyze.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_finops_analysis_handler_batches_jobs_through_the_pipeline(mock_db):
+    """Several analysis jobs run as one BatchAnalysisPipeline pass."""
+    from app.shared.llm.batch_analysis import BatchOutcome
+
+    jobs = []
+    for _ in range(3):
+        job = MagicMock(spec=BackgroundJob)
+        job.id, job.tenant_id = uuid4(), uuid4()
+        jobs.append(job)
+    mock_db.info = {}
+    no_conn, with_conn = MagicMock(), MagicMock()
+    no_conn.scalar_one_or_none.return_value = None
+    with_conn.scalar_one_or_none.return_value = MagicMock()
+    mock_db.execute.side_effect = [with_conn, no_conn, with_conn]
+    contexts = []
+
+    async def set_tenant(db, tenant_id):
+        contexts.append(tenant_id)
+
+    async def run(items):
+        return [
+            BatchOutcome(item.tenant_id, item.key, result={"insights": []}) if i == 0
+            else BatchOutcome(item.tenant_id, item.key, error=RuntimeError("provider down"))
+            for i, item in enumerate(items)
+        ]
+
+    with patch("app.shared.adapters.aws_multitenant.MultiTenantAWSAdapter") as mock_adapter_cls, \
+         patch("app.shared.db.session.set_session_tenant_id", set_tenant), \
+         patch("app.shared.llm.analyzer.FinOpsAnalyzer"), \
+         patch("app.shared.llm.factory.LLMFactory.create"), \
+         patch("app.shared.llm.batch_analysis.BatchAnalysisPipeline") as mock_pipeline_cls:
+        mock_adapter_cls.return_value.get_daily_costs = AsyncMock(return_value=MagicMock())
+        mock_pipeline_cls.return_value.run = AsyncMock(side_effect=run)
+
+        outcomes = await FinOpsAnalysisHandler().execute_batch(jobs, mock_db)
+
+    mock_pipeline_cls.return_value.run.assert_awaited_once()
+    assert [item.key for item in mock_pipeline_cls.return_value.run.await_args.args[0]] == [jobs[0].id, jobs[2].id]
+    assert contexts == [job.tenant_id for job in jobs]
+    assert outcomes[jobs[0].id] == {"status": "completed", "analysis_length": 1}
+    assert outcomes[jobs[1].id] == {"status": "skipped", "reason": "no_aws_connection"}
+    assert isinstance(outcomes[jobs[2].id], RuntimeError)
@@ -36,7 +36,8 @@ def test_select_provider_waterfall_simple():
     with patch("app.shared.llm.factory.get_settings") as mock_settings:
         mock_settings.return_value.GROQ_API_KEY = "sk-groq-valid-key-long-enough"
         
-        provider, complexity = LLMProviderSelector.select_provider("A" * 100) # ~25 tokens
+        with patch("app.shared.llm.tokenizer.count_tokens", return_value=25):
+            provider, complexity = LLMProviderSelector.select_provider("A" * 100)
         assert complexity == AnalysisComplexity.SIMPLE
         assert provider == "groq"
 
@@ -47,7 +48,8 @@ def test_select_provider_waterfall_medium():
         mock_settings.return_value.GROQ_API_KEY = "sk-groq-valid-key-long-enough"
         mock_settings.return_value.GOOGLE_API_KEY = "google-valid-key-long-enough"
         
-        provider, complexity = LLMProviderSelector.select_provider("A" * 6000) # ~1500 tokens
+        with patch("app.shared.llm.tokenizer.count_tokens", return_value=1500):
+            provider, complexity = LLMProviderSelector.select_provider("A" * 6000)
         assert complexity == AnalysisComplexity.MEDIUM
         assert provider == "google"
 
@@ -57,7 +59,8 @@ def test_select_provider_waterfall_complex():
     with patch("app.shared.llm.factory.get_settings") as mock_settings:
         mock_settings.return_value.OPENAI_API_KEY = "sk-openai-valid-key-long-enough"
         
-        provider, complexity = LLMProviderSelector.select_provider("A" * 20000) # ~5000 tokens
+        with patch("app.shared.llm.tokenizer.count_tokens", return_value=5000):
+            provider, complexity = LLMProviderSelector.select_provider("A" * 20000)
         assert complexity == AnalysisComplexity.COMPLEX
         assert provider == "openai"
 
@@ -324,12 +324,11 @@ async def test_check_budget_cache_soft_limit(mock_db):
 
 @pytest.mark.asyncio
 async def test_get_monthly_usage_scalar(mock_db):
-    """Test get_monthly_usage with scalar result."""
+    """Test get_monthly_usage reads spent from the ledger row."""
+    from app.shared.llm.spend_ledger import LedgerBalance
     tracker = UsageTracker(mock_db)
-    mock_result = MagicMock()
-    # scalar() returns a Decimal directly
-    mock_result.scalar.return_value = Decimal("12.34")
-    mock_db.execute.return_value = mock_result
+    balance = LedgerBalance(spent=Decimal("12.34"), reserved=Decimal("1.00"))
     
-    result = await tracker.get_monthly_usage(uuid4())
+    with patch("app.shared.llm.spend_ledger.SpendLedger.get_balance", new=AsyncMock(return_value=balance)):
+        result = await tracker.get_monthly_usage(uuid4())
     assert result == Decimal("12.34")
@@ -1,17 +1,91 @@
 """
 Tests for EmailService - SMTP Notifications
+
+Delivery tests run against a local aiosmtpd debugging server.
 """
+import asyncio
+import email
+import socket
 import pytest
-from unittest.mock import patch
+import pytest_asyncio
+from unittest.mock import AsyncMock, patch
 from datetime import datetime, timezone
-from app.modules.notifications.domain.email_service import EmailService
+
+import app.modules.notifications.domain.email_service as email_module
+from app.modules.notifications.domain.email_service import (
+    EmailOutbox,
+    EmailService,
+    SMTPConnectionPool,
+    shutdown_email_outboxes,
+)
+
+aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+from aiosmtpd.smtp import AuthResult  # noqa: E402
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class RecordingHandler:
+    """Accepts mail and records it; can temporarily or permanently reject recipients."""
+
+    def __init__(self):
+        self.messages = []
+        self.reject_rcpt = {}  # address -> list of reply codes to return in order
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        replies = self.reject_rcpt.get(address)
+        if replies:
+            return replies.pop(0)
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        return "250 Message accepted for delivery"
+
+
+def _html_of(envelope) -> str:
+    msg = email.message_from_bytes(envelope.content)
+    return next(p for p in msg.walk() if p.get_content_type() == "text/html").get_payload(decode=True).decode()
+
+
+def _authenticator(server, session, envelope, mechanism, auth_data):
+    ok = auth_data.login == b"user" and auth_data.password == b"password"
+    return AuthResult(success=ok)
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    port = _free_port()
+    controller = aiosmtpd_controller.Controller(
+        handler,
+        hostname="127.0.0.1",
+        port=port,
+        authenticator=_authenticator,
+        auth_require_tls=False,
+    )
+    controller.start()
+    yield handler, port
+    controller.stop()
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def reset_outboxes():
+    yield
+    await shutdown_email_outboxes()
 
 
 @pytest.fixture
-def email_service():
+def email_service(smtp_server):
+    _, port = smtp_server
     return EmailService(
-        smtp_host="localhost",
-        smtp_port=1025,
+        smtp_host="127.0.0.1",
+        smtp_port=port,
         smtp_user="user",
         smtp_password="password",
         from_email="noreply@v.io"
@@ -23,64 +97,155 @@ def test_escape_html():
     assert escape_html("<script>") == "&lt;script&gt;"
 
 
+def test_carbon_template_renders_and_escapes(email_service):
+    body = email_service._build_email_html({
+        "alert_status": "exceeded",
+        "current_usage_kg": 150.456,
+        "budget_kg": 100,
+        "usage_percent": 150.4,
+        "recommendations": ["<b>Move</b> to us-west-2"],
+    })
+    assert "150.46 kg" in body
+    assert "width: 100%" in body
+    assert "&lt;b&gt;Move&lt;/b&gt;" in body
+    assert "$" not in body
+
+
 @pytest.mark.asyncio
-async def test_send_carbon_alert_success(email_service):
+async def test_send_carbon_alert_success(email_service, smtp_server):
     """Test sending carbon alert email."""
-    with patch("smtplib.SMTP") as mock_smtp_cls:
-        mock_smtp = mock_smtp_cls.return_value.__enter__.return_value
-        
-        budget_status = {
-            "tier": "growth",
-            "current_usage": 1500,
-            "budget_limit": 1000,
-            "utilization": 150.0,
-            "is_exceeded": True
-        }
-        
-        res = await email_service.send_carbon_alert(["to@v.io"], budget_status)
-        
-        assert res is True
-        mock_smtp.sendmail.assert_called_once()
-        mock_smtp.login.assert_called_once_with("user", "password")
+    handler, _ = smtp_server
+    budget_status = {
+        "alert_status": "exceeded",
+        "current_usage_kg": 150.0,
+        "budget_kg": 100,
+        "usage_percent": 150.0,
+    }
+
+    res = await email_service.send_carbon_alert(["to@v.io", "ops@v.io"], budget_status)
+
+    assert res is True
+    assert len(handler.messages) == 1
+    assert handler.messages[0].rcpt_tos == ["to@v.io", "ops@v.io"]
+    assert "Carbon Alert" in _html_of(handler.messages[0])
 
 
 @pytest.mark.asyncio
-async def test_send_carbon_alert_failure(email_service):
-    """Test graceful failure on SMTP error."""
-    with patch("smtplib.SMTP") as mock_smtp_cls:
-        mock_smtp = mock_smtp_cls.return_value.__enter__.return_value
-        mock_smtp.sendmail.side_effect = Exception("smtp fail")
-        
-        res = await email_service.send_carbon_alert(["to@v.io"], {"tier": "starter"})
-        assert res is False
+async def test_send_carbon_alert_no_recipients(email_service):
+    assert await email_service.send_carbon_alert([], {}) is False
 
 
 @pytest.mark.asyncio
-async def test_send_dunning_notification(email_service):
+async def test_send_carbon_alert_failure():
+    """Test graceful failure when the SMTP server is unreachable."""
+    port = _free_port()
+    service = EmailService("127.0.0.1", port, "user", "password", "noreply@v.io")
+    outbox = EmailOutbox(
+        SMTPConnectionPool("127.0.0.1", port, "user", "password", timeout=1),
+        max_retries=2,
+        retry_base_delay=0.01,
+    )
+    with patch.object(email_module, "get_email_outbox", return_value=outbox):
+        res = await service.send_carbon_alert(["to@v.io"], {"alert_status": "warning"})
+    assert res is False
+    await outbox.close()
+
+
+@pytest.mark.asyncio
+async def test_send_dunning_notification(email_service, smtp_server):
     """Test dunning notification email."""
-    with patch("smtplib.SMTP") as mock_smtp_cls:
-        mock_smtp = mock_smtp_cls.return_value.__enter__.return_value
-        
-        res = await email_service.send_dunning_notification(
-            "to@v.io", 1, 3, datetime.now(timezone.utc), "growth"
-        )
-        assert res is True
-        mock_smtp.sendmail.assert_called_once()
+    handler, _ = smtp_server
+    res = await email_service.send_dunning_notification(
+        "to@v.io", 1, 3, datetime.now(timezone.utc), "growth"
+    )
+    assert res is True
+    assert handler.messages[0].rcpt_tos == ["to@v.io"]
+    assert "Attempt 1 of 3" in _html_of(handler.messages[0])
 
 
 @pytest.mark.asyncio
-async def test_send_payment_recovered(email_service):
+async def test_send_payment_recovered(email_service, smtp_server):
     """Test payment recovered notification email."""
-    with patch("smtplib.SMTP") as mock_smtp_cls:
-        mock_smtp_cls.return_value.__enter__.return_value
-        res = await email_service.send_payment_recovered_notification("to@v.io")
-        assert res is True
+    res = await email_service.send_payment_recovered_notification("to@v.io")
+    assert res is True
+    assert len(smtp_server[0].messages) == 1
 
 
 @pytest.mark.asyncio
-async def test_send_account_downgraded(email_service):
+async def test_send_account_downgraded(email_service, smtp_server):
     """Test account downgraded notification email."""
-    with patch("smtplib.SMTP") as mock_smtp_cls:
-        mock_smtp_cls.return_value.__enter__.return_value
-        res = await email_service.send_account_downgraded_notification("to@v.io")
-        assert res is True
+    res = await email_service.send_account_downgraded_notification("to@v.io")
+    assert res is True
+    assert len(smtp_server[0].messages) == 1
+
+
+@pytest.mark.asyncio
+async def test_sessions_are_pooled_across_messages(email_service, smtp_server):
+    """A dunning sweep reuses pooled sessions instead of one handshake per email."""
+    handler, port = smtp_server
+    recipients = [f"tenant{i}@v.io" for i in range(40)]
+
+    results = await asyncio.gather(*(
+        email_service.send_dunning_notification(r, 1, 3, datetime.now(timezone.utc), "starter")
+        for r in recipients
+    ))
+
+    assert all(results)
+    assert sorted(m.rcpt_tos[0] for m in handler.messages) == sorted(recipients)
+    outbox = email_module.get_email_outbox("127.0.0.1", port, "user", "password")
+    assert outbox.pool.connections_opened <= email_module.SMTP_POOL_SIZE
+
+    # Later sends reuse the idle session
+    assert await email_service.send_payment_recovered_notification("late@v.io") is True
+    assert outbox.pool.connections_opened <= email_module.SMTP_POOL_SIZE
+
+
+@pytest.mark.asyncio
+async def test_transient_rejection_is_retried(smtp_server):
+    handler, port = smtp_server
+    handler.reject_rcpt["busy@v.io"] = ["451 Try again later"]
+    outbox = EmailOutbox(
+        SMTPConnectionPool("127.0.0.1", port, "user", "password"),
+        retry_base_delay=0.01,
+    )
+    service = EmailService("127.0.0.1", port, "user", "password", "noreply@v.io")
+
+    with patch.object(email_module, "get_email_outbox", return_value=outbox):
+        res = await service.send_payment_recovered_notification("busy@v.io")
+
+    assert res is True
+    assert len(handler.messages) == 1
+    await outbox.close()
+
+
+@pytest.mark.asyncio
+async def test_permanent_rejection_is_not_retried(smtp_server):
+    handler, port = smtp_server
+    handler.reject_rcpt["gone@v.io"] = ["550 No such user", "550 No such user"]
+    outbox = EmailOutbox(
+        SMTPConnectionPool("127.0.0.1", port, "user", "password"),
+        retry_base_delay=0.01,
+    )
+    service = EmailService("127.0.0.1", port, "user", "password", "noreply@v.io")
+
+    with patch.object(email_module, "get_email_outbox", return_value=outbox):
+        bad = await service.send_payment_recovered_notification("gone@v.io")
+        good = await service.send_payment_recovered_notification("ok@v.io")
+
+    assert bad is False
+    assert good is True
+    # Second 550 reply was never consumed
+    assert handler.reject_rcpt["gone@v.io"] == ["550 No such user"]
+    await outbox.close()
+
+
+@pytest.mark.asyncio
+async def test_outbox_backpressure_when_full():
+    pool = SMTPConnectionPool("127.0.0.1", 1, None, None)
+    outbox = EmailOutbox(pool, max_size=1, workers=0)
+    outbox._queue.put_nowait(AsyncMock())
+
+    submit = asyncio.create_task(outbox.submit(AsyncMock(), "a@v.io", ["b@v.io"]))
+    await asyncio.sleep(0.05)
+    assert not submit.done()  # Producer blocks instead of growing the queue
+    submit.cancel()
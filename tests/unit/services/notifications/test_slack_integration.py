@@ -159,3 +159,89 @@ class TestGetSlackService:
             result = get_slack_service()
             assert isinstance(result, SlackService)
 
+
+
+class TestSharedDelivery:
+    """Tests for the process-wide Slack delivery layer."""
+
+    def test_client_is_shared_per_token(self):
+        a = SlackService("xoxb-shared", "#a")
+        b = SlackService("xoxb-shared", "#b")
+        assert a.client is b.client
+        assert SlackService("xoxb-other", "#a").client is not a.client
+
+    @pytest.mark.asyncio
+    async def test_dedup_is_shared_across_instances(self):
+        first = SlackService("xoxb-test", "#alerts")
+        second = SlackService("xoxb-test", "#alerts")
+        other_channel = SlackService("xoxb-test", "#finance")
+
+        with patch.object(first.client, "chat_postMessage", new_callable=AsyncMock) as mock_post:
+            await first.send_alert("Budget Alert", "msg", "warning")
+            assert await second.send_alert("Budget Alert", "msg", "warning") is True
+            await other_channel.send_alert("Budget Alert", "msg", "warning")
+
+        assert mock_post.call_count == 2
+        assert [c.kwargs["channel"] for c in mock_post.call_args_list] == ["#alerts", "#finance"]
+
+    @pytest.mark.asyncio
+    async def test_failed_alert_releases_dedup_claim(self):
+        from slack_sdk.errors import SlackApiError
+        service = SlackService("xoxb-test", "#alerts")
+
+        with patch.object(service.client, "chat_postMessage", new_callable=AsyncMock) as mock_post:
+            mock_post.side_effect = [
+                SlackApiError(message="fatal_error", response={"error": "fatal_error"}),
+                {"ok": True},
+            ]
+            assert await service.send_alert("Retry Me", "msg") is False
+            assert await service.send_alert("Retry Me", "msg") is True
+
+        assert mock_post.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_dedup_across_workers_via_redis(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        from app.modules.notifications.domain.slack import SlackDelivery
+
+        redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+        worker_a = SlackService("xoxb-test", "#alerts", delivery=SlackDelivery(redis_client=redis))
+        worker_b = SlackService("xoxb-test", "#alerts", delivery=SlackDelivery(redis_client=redis))
+        worker_b.client = worker_a.client
+
+        with patch.object(worker_a.client, "chat_postMessage", new_callable=AsyncMock) as mock_post:
+            await worker_a.send_alert("Zombie Resources Detected!", "msg")
+            await worker_b.send_alert("Zombie Resources Detected!", "msg")
+
+        assert mock_post.call_count == 1
+        key = SlackDelivery.dedup_key("#alerts", "Zombie Resources Detected!", "warning")
+        assert 0 < await redis.ttl(key) <= 3600
+
+    @pytest.mark.asyncio
+    async def test_ratelimited_retries_after_retry_after(self):
+        from slack_sdk.errors import SlackApiError
+        from slack_sdk.web.async_slack_response import AsyncSlackResponse
+        service = SlackService("xoxb-test", "#alerts")
+
+        response = AsyncSlackResponse(
+            client=None, http_verb="POST", api_url="", req_args={},
+            data={"ok": False, "error": "ratelimited"},
+            headers={"Retry-After": "0"}, status_code=429,
+        )
+        with patch.object(service.client, "chat_postMessage", new_callable=AsyncMock) as mock_post:
+            mock_post.side_effect = [SlackApiError(message="ratelimited", response=response), {"ok": True}]
+            assert await service.send_digest({"total_cost": 1}) is True
+
+        assert mock_post.call_count == 2
+
+    def test_coalesce_digests(self):
+        from app.modules.notifications.domain.slack import coalesce_digests
+        merged = coalesce_digests([
+            {"tenant_name": "Acme", "total_cost": 10.5, "carbon_kg": 1.0, "zombie_count": 2, "period": "p"},
+            {"tenant_name": "Acme", "total_cost": 4.5, "carbon_kg": 0.5, "zombie_count": 1, "period": "p"},
+        ])
+        assert merged["total_cost"] == 15.0
+        assert merged["carbon_kg"] == 1.5
+        assert merged["zombie_count"] == 3
+        assert merged["connection_count"] == 2
+        assert merged["tenant_name"] == "Acme"
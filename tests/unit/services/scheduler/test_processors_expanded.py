@@ -2,9 +2,11 @@ import pytest
 import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
-from datetime import date
+from datetime import date, datetime, timezone
+from decimal import Decimal
 from app.modules.governance.domain.scheduler.processors import AnalysisProcessor, SavingsProcessor
 from app.models.remediation import RemediationAction
+from app.schemas.costs import CloudUsageSummary, CostRecord
 
 @pytest.fixture
 def mock_db():
@@ -142,3 +144,42 @@ class TestSavingsProcessorExpanded:
         assert processor._map_action_to_enum("stop rds instance db-300") == RemediationAction.STOP_RDS_INSTANCE
         assert processor._map_action_to_enum("delete rds instance db-400") == RemediationAction.DELETE_RDS_INSTANCE
         assert processor._map_action_to_enum("unknown action") is None
+
+
+class TestTenantDigest:
+    @pytest.mark.asyncio
+    async def test_one_digest_per_tenant_for_many_connections(self, mock_db, mock_tenant):
+        mock_tenant.notification_settings.slack_enabled = True
+        mock_tenant.aws_connections = [MagicMock(region="us-east-1") for _ in range(3)]
+        costs = CloudUsageSummary(
+            tenant_id=str(mock_tenant.id),
+            provider="aws",
+            start_date=date.today(),
+            end_date=date.today(),
+            total_cost=Decimal("10"),
+            records=[CostRecord(date=datetime.now(timezone.utc), amount=Decimal("10"), service="AmazonEC2")],
+        )
+
+        with patch("app.modules.governance.domain.scheduler.processors.get_settings") as mock_settings, \
+             patch("app.modules.governance.domain.scheduler.processors.MultiTenantAWSAdapter") as mock_adapter, \
+             patch("app.modules.governance.domain.scheduler.processors.LLMFactory"), \
+             patch("app.modules.governance.domain.scheduler.processors.FinOpsAnalyzer") as mock_analyzer, \
+             patch("app.modules.governance.domain.scheduler.processors.ZombieDetector") as mock_detector, \
+             patch("app.modules.notifications.domain.SlackService") as mock_slack_cls, \
+             patch.dict("sys.modules", {"app.models.analysis": MagicMock()}):
+            mock_settings.return_value.SLACK_BOT_TOKEN = "xoxb"
+            mock_settings.return_value.SLACK_CHANNEL_ID = "C1"
+            mock_adapter.return_value.get_daily_costs = AsyncMock(return_value=costs)
+            mock_adapter.return_value.get_credentials = AsyncMock(return_value={})
+            mock_analyzer.return_value.analyze = AsyncMock()
+            mock_detector.return_value.scan_all = AsyncMock(return_value={"volumes": [1]})
+            mock_slack_cls.return_value.send_digest = AsyncMock(return_value=True)
+
+            await AnalysisProcessor().process_tenant(mock_db, mock_tenant, date.today(), date.today())
+
+        mock_slack_cls.return_value.send_digest.assert_awaited_once()
+        digest = mock_slack_cls.return_value.send_digest.call_args.args[0]
+        assert digest["connection_count"] == 3
+        assert digest["total_cost"] == 30.0
+        assert digest["zombie_count"] == 3
+        assert digest["carbon_kg"] > 0
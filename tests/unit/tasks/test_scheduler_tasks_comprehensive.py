@@ -5,7 +5,8 @@ from app.tasks.scheduler_tasks import (
     run_cohort_analysis,
     _remediation_sweep_logic,
     _billing_sweep_logic,
-    _maintenance_sweep_logic
+    _maintenance_sweep_logic,
+    _partition_lifecycle_logic
 )
 from app.modules.governance.domain.scheduler.cohorts import TenantCohort
 from app.models.tenant import Tenant
@@ -153,4 +154,25 @@ async def test_maintenance_sweep_success(mock_db):
                 
                 mock_persist.finalize_batch.assert_called_with(days_ago=2)
                 mock_refresh.assert_called_with(mock_db)
-                mock_db.execute.assert_called() # Archive call
+                # Partition archival moved to scheduler.partition_lifecycle
+                assert not any(
+                    "archive_old_cost_partitions" in str(c.args[0]) for c in mock_db.execute.call_args_list if c.args
+                )
+
+
+@pytest.mark.asyncio
+async def test_partition_lifecycle_honours_dry_run_setting(mock_db):
+    """The scheduled run passes PARTITION_LIFECYCLE_DRY_RUN through to the service."""
+    with patch("app.tasks.scheduler_tasks.async_session_maker") as mock_maker, \
+         patch("app.modules.governance.domain.partition_lifecycle.PartitionLifecycleService") as service_cls, \
+         patch("app.shared.core.config.get_settings") as mock_settings:
+        mock_maker.return_value.__aenter__.return_value = mock_db
+        mock_settings.return_value.PARTITION_LIFECYCLE_DRY_RUN = True
+        service_cls.return_value.run = AsyncMock(
+            return_value={"dry_run": True, "skipped": False, "actions": [], "default_rows": {}}
+        )
+
+        await _partition_lifecycle_logic()
+
+    service_cls.assert_called_once_with(mock_db)
+    service_cls.return_value.run.assert_awaited_once_with(dry_run=True)